@@ -17,6 +17,7 @@ from speednik.agents.base import Agent
 from speednik.agents.hold_right import HoldRightAgent
 from speednik.agents.idle import IdleAgent
 from speednik.agents.jump_runner import JumpRunnerAgent
+from speednik.agents.numpy_policy import NumpyPolicyAgent
 from speednik.agents.registry import AGENT_REGISTRY, resolve_agent
 from speednik.agents.scripted import ScriptedAgent
 from speednik.agents.spindash import SpindashAgent
@@ -39,6 +40,7 @@ __all__ = [
     "JumpRunnerAgent",
     "SpindashAgent",
     "ScriptedAgent",
+    "NumpyPolicyAgent",
     "AGENT_REGISTRY",
     "resolve_agent",
 ]
@@ -0,0 +1,71 @@
+"""speednik/agents/numpy_policy — PPO actor evaluated in pure NumPy (Layer 3).
+
+Runs the actor MLP of a PPO checkpoint from weights exported with
+PPOAgent.export_numpy (or export_numpy_weights), so evaluation needs no
+torch. Greedy actions match PPOAgent up to float32 rounding.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+# npz keys, one weight/bias pair per Linear layer of the actor. Weights
+# are stored (in_features, out_features) so a layer is ``x @ w + b``.
+WEIGHT_KEYS = ("w0", "b0", "w1", "b1", "w2", "b2")
+
+
+def save_policy_weights(
+    path: str | Path, layers: list[tuple[np.ndarray, np.ndarray]],
+) -> None:
+    """Write actor layers, given as (weight[in, out], bias[out]) pairs.
+
+    Raises:
+        ValueError: If there are not exactly three layers.
+    """
+    if len(layers) != len(WEIGHT_KEYS) // 2:
+        raise ValueError(f"Expected 3 actor layers, got {len(layers)}")
+    arrays = {}
+    for i, (w, b) in enumerate(layers):
+        arrays[f"w{i}"] = np.asarray(w, dtype=np.float32)
+        arrays[f"b{i}"] = np.asarray(b, dtype=np.float32)
+    np.savez(path, **arrays)
+
+
+class NumpyPolicyAgent:
+    """Greedy PPO actor running on exported NumPy weights.
+
+    Stateless, so a single instance can serve any number of episodes
+    through act_batch.
+    """
+
+    def __init__(self, weights_path: str) -> None:
+        with np.load(weights_path) as data:
+            missing = [k for k in WEIGHT_KEYS if k not in data]
+            if missing:
+                raise ValueError(f"{weights_path} is missing {missing}")
+            self._layers = [
+                (data[f"w{i}"].astype(np.float32), data[f"b{i}"].astype(np.float32))
+                for i in range(3)
+            ]
+        self.obs_dim = self._layers[0][0].shape[0]
+        self.num_actions = self._layers[-1][0].shape[1]
+
+    def logits(self, obs: np.ndarray) -> np.ndarray:
+        """Actor logits for a (N, obs_dim) batch."""
+        (w0, b0), (w1, b1), (w2, b2) = self._layers
+        h = np.tanh(np.asarray(obs, dtype=np.float32) @ w0 + b0)
+        h = np.tanh(h @ w1 + b1)
+        return h @ w2 + b2
+
+    def act(self, obs: np.ndarray) -> int:
+        """Return the greedy action for the given observation."""
+        return int(self.logits(obs[None, :]).argmax())
+
+    def act_batch(self, obs: np.ndarray) -> np.ndarray:
+        """Greedy actions for a (N, obs_dim) batch, as an int64 array."""
+        return self.logits(obs).argmax(axis=-1)
+
+    def reset(self) -> None:
+        """No internal state to reset."""
@@ -2,16 +2,20 @@
 
 Wraps a trained CleanRL PPO checkpoint as an Agent. Requires torch.
 The network architecture mirrors tools/ppo_speednik.py so that
-state_dict checkpoints load correctly.
+state_dict checkpoints load correctly. export_numpy writes the actor for
+NumpyPolicyAgent, which evaluates the same policy without torch.
 """
 
 from __future__ import annotations
 
+from pathlib import Path
+
 import numpy as np
 import torch
 import torch.nn as nn
 
 from speednik.agents.actions import NUM_ACTIONS
+from speednik.agents.numpy_policy import save_policy_weights
 from speednik.observation import OBS_DIM
 
 
@@ -72,5 +76,32 @@ class PPOAgent:
             logits = self.model.actor(obs_tensor)
             return logits.argmax(dim=-1).item()
 
+    def act_batch(self, obs: np.ndarray) -> np.ndarray:
+        """Greedy actions for a (N, obs_dim) batch in one forward pass."""
+        with torch.no_grad():
+            obs_tensor = torch.from_numpy(
+                np.ascontiguousarray(obs, dtype=np.float32)
+            ).to(self.device)
+            logits = self.model.actor(obs_tensor)
+            return logits.argmax(dim=-1).cpu().numpy()
+
+    def export_numpy(self, path: str | Path) -> None:
+        """Write the actor weights as an .npz for NumpyPolicyAgent."""
+        linears = [m for m in self.model.actor if isinstance(m, nn.Linear)]
+        save_policy_weights(path, [
+            (m.weight.detach().cpu().numpy().T, m.bias.detach().cpu().numpy())
+            for m in linears
+        ])
+
     def reset(self) -> None:
         """No internal state to reset."""
+
+
+def export_numpy_weights(
+    model_path: str,
+    out_path: str | Path,
+    obs_dim: int = OBS_DIM,
+    num_actions: int = NUM_ACTIONS,
+) -> None:
+    """Convert a PPO checkpoint into NumPy actor weights (see export_numpy)."""
+    PPOAgent(model_path, obs_dim=obs_dim, num_actions=num_actions).export_numpy(out_path)
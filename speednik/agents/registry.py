@@ -8,6 +8,7 @@ from __future__ import annotations
 from speednik.agents.hold_right import HoldRightAgent
 from speednik.agents.idle import IdleAgent
 from speednik.agents.jump_runner import JumpRunnerAgent
+from speednik.agents.numpy_policy import NumpyPolicyAgent
 from speednik.agents.scripted import ScriptedAgent
 from speednik.agents.spindash import SpindashAgent
 
@@ -17,6 +18,7 @@ AGENT_REGISTRY: dict[str, type] = {
     "jump_runner": JumpRunnerAgent,
     "spindash": SpindashAgent,
     "scripted": ScriptedAgent,
+    "ppo_numpy": NumpyPolicyAgent,
 }
 
 try:
@@ -0,0 +1,1756 @@
+"""speednik/batch.py — Vectorized batch simulation (Layer 2).
+
+Steps N independent players on the same stage in lockstep. Player state is
+held as struct-of-arrays (one NumPy array per PhysicsState / Player field,
+one (N, count) array per mutable entity field) and every frame runs the
+same pipeline as sim_step — state machine, physics steps 1–4, sensor casts
+against a shared TileGrid, collision resolution, world bounds, pit death,
+rings, springs, checkpoints, launch pipes, liquid zones, enemies, damage
+and the goal — as whole-array operations.
+
+Results are bit-identical to sim_step for the same inputs: trig comes from
+tables built with the math module over the 256 byte angles, and every float
+expression is evaluated in the same order as the scalar code. Entities are
+checked in stage order, like the scalar loops, wherever the order matters.
+
+No Pyxel imports.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional, Sequence
+
+import numpy as np
+
+from speednik.agents.actions import ACTION_MAP
+from speednik.constants import (
+    ACCELERATION,
+    AIR_ACCELERATION,
+    ANGLE_STEPS,
+    BOSS_ASCEND_DURATION,
+    BOSS_DESCEND_DURATION,
+    BOSS_ESCALATION_HP,
+    BOSS_HIT_INVULN,
+    BOSS_IDLE_DURATION,
+    BOSS_IDLE_SPEED,
+    BOSS_IDLE_SPEED_ESC,
+    BOSS_INDICATOR_LEAD,
+    BOSS_VULNERABLE_DURATION,
+    BOSS_VULNERABLE_DURATION_ESC,
+    CHECKPOINT_ACTIVATION_RADIUS,
+    CHOPPER_JUMP_INTERVAL,
+    CHOPPER_JUMP_VELOCITY,
+    CRAB_PATROL_RANGE,
+    CRAB_PATROL_SPEED,
+    DECELERATION,
+    ENEMY_BOUNCE_VELOCITY,
+    EXTRA_LIFE_THRESHOLD,
+    FALL_SPEED_THRESHOLD,
+    FRICTION,
+    GOAL_ACTIVATION_RADIUS,
+    GRAVITY,
+    HURT_KNOCKBACK_X,
+    HURT_KNOCKBACK_Y,
+    INVULNERABILITY_DURATION,
+    JUMP_FORCE,
+    JUMP_RELEASE_CAP,
+    LIQUID_RISE_SPEED,
+    MAX_SCATTER_RINGS,
+    MAX_X_SPEED,
+    MIN_ROLL_SPEED,
+    PIPE_ENTRY_HITBOX_H,
+    PIPE_ENTRY_HITBOX_W,
+    PIT_DEATH_MARGIN,
+    RING_COLLECTION_RADIUS,
+    ROLLING_DECELERATION,
+    ROLLING_FRICTION,
+    ROLLING_HEIGHT_RADIUS,
+    ROLLING_WIDTH_RADIUS,
+    SCATTER_RING_LIFETIME,
+    SLIP_DURATION,
+    SLIP_SPEED_THRESHOLD,
+    SLOPE_FACTOR_ROLL_DOWN,
+    SLOPE_FACTOR_ROLL_UP,
+    SLOPE_FACTOR_RUNNING,
+    SPINDASH_BASE_SPEED,
+    SPINDASH_CHARGE_INCREMENT,
+    SPINDASH_DECAY_DIVISOR,
+    SPINDASH_KILL_THRESHOLD,
+    SPINDASH_MAX_CHARGE,
+    SPRING_COOLDOWN_FRAMES,
+    SPRING_HITBOX_H,
+    SPRING_HITBOX_W,
+    SPRING_RIGHT_VELOCITY,
+    SPRING_UP_VELOCITY,
+    STANDING_HEIGHT_RADIUS,
+    STANDING_WIDTH_RADIUS,
+    TOP_SPEED,
+    WALL_ANGLE_THRESHOLD,
+    WALL_SENSOR_EXTENT,
+)
+from speednik.enemies import _HITBOX_SIZES, Enemy
+from speednik.objects import Checkpoint, LaunchPipe, LiquidZone, Spring
+from speednik.physics import InputState, PhysicsState, byte_angle_to_rad, sign
+from speednik.player import PlayerState, ScatteredRing
+from speednik.terrain import (
+    DOWN,
+    FULL,
+    LEFT,
+    MAX_SENSOR_RANGE,
+    NOT_SOLID,
+    RIGHT,
+    SURFACE_LOOP,
+    TILE_SIZE,
+    TOP_ONLY,
+    UP,
+    TileGrid,
+    get_quadrant,
+)
+from speednik.terrain import _AIR_LAND_DISTANCE, _EJECT_SCAN_TILES, _GROUND_SNAP_DISTANCE
+
+# ---------------------------------------------------------------------------
+# Lookup tables
+# ---------------------------------------------------------------------------
+
+_ANGLES = range(ANGLE_STEPS)
+_SIN = np.array([math.sin(byte_angle_to_rad(a)) for a in _ANGLES])
+_COS = np.array([math.cos(byte_angle_to_rad(a)) for a in _ANGLES])
+_SIN_SIGN = np.array([sign(s) for s in _SIN.tolist()])
+_DEG = np.array([a * 360.0 / ANGLE_STEPS for a in _ANGLES])
+_QUADRANT = np.array([get_quadrant(a) for a in _ANGLES], dtype=np.int64)
+
+# Per-quadrant sensor directions (see terrain._QUADRANT_FLOOR_CEILING)
+_FLOOR_DIR = np.array([DOWN, RIGHT, UP, LEFT], dtype=np.int64)
+_CEILING_DIR = np.array([UP, LEFT, DOWN, RIGHT], dtype=np.int64)
+
+# Sensor offsets as (x_per_width, x_per_height, y_per_width, y_per_height)
+# multipliers per quadrant, mirroring find_floor / find_ceiling.
+_FLOOR_A = np.array([(-1, 0, 0, 1), (0, 1, 1, 0), (1, 0, 0, -1), (0, -1, -1, 0)])
+_FLOOR_B = np.array([(1, 0, 0, 1), (0, 1, -1, 0), (-1, 0, 0, -1), (0, -1, 1, 0)])
+_CEILING_C = np.array([(-1, 0, 0, -1), (0, -1, 1, 0), (1, 0, 0, 1), (0, 1, -1, 0)])
+_CEILING_D = np.array([(1, 0, 0, -1), (0, -1, -1, 0), (-1, 0, 0, 1), (0, 1, 1, 0)])
+
+# Player state codes index into this tuple.
+PLAYER_STATES: tuple[PlayerState, ...] = tuple(PlayerState)
+_STANDING = PLAYER_STATES.index(PlayerState.STANDING)
+_RUNNING = PLAYER_STATES.index(PlayerState.RUNNING)
+_JUMPING = PLAYER_STATES.index(PlayerState.JUMPING)
+_ROLLING = PLAYER_STATES.index(PlayerState.ROLLING)
+_SPINDASH = PLAYER_STATES.index(PlayerState.SPINDASH)
+_HURT = PLAYER_STATES.index(PlayerState.HURT)
+_DEAD = PLAYER_STATES.index(PlayerState.DEAD)
+
+# Animation codes index into this tuple (see player._update_animation).
+ANIM_NAMES: tuple[str, ...] = ("idle", "running", "rolling", "spindash", "hurt", "dead")
+_STATE_TO_ANIM = np.array(
+    [ANIM_NAMES.index(name) for name in
+     ("idle", "running", "rolling", "rolling", "spindash", "hurt", "dead")],
+    dtype=np.int64,
+)
+_ANIM_RUNNING = ANIM_NAMES.index("running")
+_ANIM_SPEED_RUNNING_BASE = 8
+_ANIM_SPEED_RUNNING_MIN = 2
+_ANIM_FRAMES_RUNNING = 4
+
+# Boss state codes index into this tuple (see Enemy.boss_state).
+BOSS_STATES: tuple[str, ...] = ("", "idle", "descend", "vulnerable", "ascend")
+_BOSS_IDLE = BOSS_STATES.index("idle")
+_BOSS_DESCEND = BOSS_STATES.index("descend")
+_BOSS_VULNERABLE = BOSS_STATES.index("vulnerable")
+_BOSS_ASCEND = BOSS_STATES.index("ascend")
+
+# Action index -> button flags, from agents.actions.ACTION_MAP.
+_ACTION_FLAGS = {
+    name: np.array([getattr(ACTION_MAP[a], name) for a in sorted(ACTION_MAP)])
+    for name in ("left", "right", "jump_held", "down_held", "up_held")
+}
+
+
+# ---------------------------------------------------------------------------
+# Data classes
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchInput:
+    """Input flags for N players, one bool array per InputState field."""
+
+    left: np.ndarray
+    right: np.ndarray
+    jump_pressed: np.ndarray
+    jump_held: np.ndarray
+    down_held: np.ndarray
+    up_held: np.ndarray
+
+    @classmethod
+    def from_inputs(cls, inputs: Sequence[InputState]) -> "BatchInput":
+        """Stack per-player InputStates."""
+        return cls(**{
+            name: np.array([getattr(inp, name) for inp in inputs], dtype=bool)
+            for name in ("left", "right", "jump_pressed", "jump_held", "down_held", "up_held")
+        })
+
+    @classmethod
+    def from_actions(
+        cls, actions: np.ndarray, prev_jump_held: np.ndarray,
+    ) -> "BatchInput":
+        """Vectorized agents.actions.action_to_input.
+
+        Args:
+            actions: Integer action per player (0–7).
+            prev_jump_held: Jump held on the previous frame, per player.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        jump_held = _ACTION_FLAGS["jump_held"][actions]
+        return cls(
+            left=_ACTION_FLAGS["left"][actions],
+            right=_ACTION_FLAGS["right"][actions],
+            jump_pressed=jump_held & ~np.asarray(prev_jump_held, dtype=bool),
+            jump_held=jump_held,
+            down_held=_ACTION_FLAGS["down_held"][actions],
+            up_held=_ACTION_FLAGS["up_held"][actions],
+        )
+
+
+@dataclass
+class BatchEvents:
+    """What happened to each player during one batch_step."""
+
+    rings: np.ndarray  # world rings collected this frame
+    died: np.ndarray  # pit death this frame
+    goal: np.ndarray  # inside the goal radius this frame
+    damaged: np.ndarray  # hurt or killed by an enemy this frame
+
+
+@dataclass
+class BatchSim:
+    """N players on one stage, as struct-of-arrays.
+
+    Field names follow PhysicsState, Player and SimState. ``state`` holds
+    indices into PLAYER_STATES and ``anim`` indices into ANIM_NAMES.
+    Entity fields are prefixed with the entity kind and hold one column per
+    entity, in stage order; ``enemy_boss_state`` holds indices into
+    BOSS_STATES. Scattered rings live in ``scatter_*`` slots, a slot being
+    free when its timer is 0.
+    """
+
+    grid: TileGrid
+    start_x: float
+    start_y: float
+    level_width: int
+    level_height: int
+    goal_x: float
+    goal_y: float
+    ring_x: np.ndarray  # world rings sorted by x
+    ring_y: np.ndarray
+    ring_order: np.ndarray  # ring_x[i] is template ring ring_order[i]
+
+    # Entity layout, one entry per entity in stage order
+    springs: tuple[Spring, ...]
+    checkpoints: tuple[Checkpoint, ...]
+    pipes: tuple[LaunchPipe, ...]
+    liquid_zones: tuple[LiquidZone, ...]
+    enemies: tuple[Enemy, ...]
+
+    # PhysicsState
+    x: np.ndarray = field(repr=False)
+    y: np.ndarray = field(repr=False)
+    x_vel: np.ndarray = field(repr=False)
+    y_vel: np.ndarray = field(repr=False)
+    ground_speed: np.ndarray = field(repr=False)
+    angle: np.ndarray = field(repr=False)
+    on_ground: np.ndarray = field(repr=False)
+    is_rolling: np.ndarray = field(repr=False)
+    facing_right: np.ndarray = field(repr=False)
+    spinrev: np.ndarray = field(repr=False)
+    is_charging_spindash: np.ndarray = field(repr=False)
+    slip_timer: np.ndarray = field(repr=False)
+    adhesion_miss_count: np.ndarray = field(repr=False)
+
+    # Player
+    state: np.ndarray = field(repr=False)
+    rings: np.ndarray = field(repr=False)
+    lives: np.ndarray = field(repr=False)
+    invulnerability_timer: np.ndarray = field(repr=False)
+    anim: np.ndarray = field(repr=False)
+    anim_frame: np.ndarray = field(repr=False)
+    anim_timer: np.ndarray = field(repr=False)
+    prev_jump_held: np.ndarray = field(repr=False)
+
+    # SimState
+    ring_collected: np.ndarray = field(repr=False)  # (N, num_rings), sorted order
+    frame: np.ndarray = field(repr=False)
+    max_x_reached: np.ndarray = field(repr=False)
+    rings_collected: np.ndarray = field(repr=False)
+    deaths: np.ndarray = field(repr=False)
+    goal_reached: np.ndarray = field(repr=False)
+    player_dead: np.ndarray = field(repr=False)
+
+    # Player extras
+    respawn_x: np.ndarray = field(repr=False)
+    respawn_y: np.ndarray = field(repr=False)
+    respawn_rings: np.ndarray = field(repr=False)
+    in_pipe: np.ndarray = field(repr=False)
+    scatter_x: np.ndarray = field(repr=False)  # (N, slots)
+    scatter_y: np.ndarray = field(repr=False)
+    scatter_vx: np.ndarray = field(repr=False)
+    scatter_vy: np.ndarray = field(repr=False)
+    scatter_timer: np.ndarray = field(repr=False)
+
+    # Entities, (N, count) each
+    spring_cooldown: np.ndarray = field(repr=False)
+    checkpoint_activated: np.ndarray = field(repr=False)
+    liquid_current_y: np.ndarray = field(repr=False)
+    liquid_active: np.ndarray = field(repr=False)
+    enemy_x: np.ndarray = field(repr=False)
+    enemy_y: np.ndarray = field(repr=False)
+    enemy_alive: np.ndarray = field(repr=False)
+    enemy_patrol_dir: np.ndarray = field(repr=False)
+    enemy_jump_timer: np.ndarray = field(repr=False)
+    enemy_y_vel: np.ndarray = field(repr=False)
+    enemy_boss_state: np.ndarray = field(repr=False)
+    enemy_boss_timer: np.ndarray = field(repr=False)
+    enemy_boss_hp: np.ndarray = field(repr=False)
+    enemy_boss_escalated: np.ndarray = field(repr=False)
+    enemy_boss_target_x: np.ndarray = field(repr=False)
+    enemy_boss_hit_timer: np.ndarray = field(repr=False)
+
+    # Static entity columns derived from the layout
+    _tables: _EntityTables = field(repr=False)
+
+    @property
+    def num_envs(self) -> int:
+        return len(self.x)
+
+    def physics_state(self, i: int) -> PhysicsState:
+        """PhysicsState of player i (a copy)."""
+        return PhysicsState(
+            x=float(self.x[i]),
+            y=float(self.y[i]),
+            x_vel=float(self.x_vel[i]),
+            y_vel=float(self.y_vel[i]),
+            ground_speed=float(self.ground_speed[i]),
+            angle=int(self.angle[i]),
+            on_ground=bool(self.on_ground[i]),
+            is_rolling=bool(self.is_rolling[i]),
+            facing_right=bool(self.facing_right[i]),
+            spinrev=float(self.spinrev[i]),
+            is_charging_spindash=bool(self.is_charging_spindash[i]),
+            slip_timer=int(self.slip_timer[i]),
+            adhesion_miss_count=int(self.adhesion_miss_count[i]),
+        )
+
+    def player_state(self, i: int) -> PlayerState:
+        """PlayerState of player i."""
+        return PLAYER_STATES[int(self.state[i])]
+
+    def scattered_rings(self, i: int) -> list[ScatteredRing]:
+        """Scattered rings of player i, oldest first (copies)."""
+        live = np.flatnonzero(self.scatter_timer[i] > 0)
+        return [
+            ScatteredRing(
+                x=float(self.scatter_x[i, k]),
+                y=float(self.scatter_y[i, k]),
+                vx=float(self.scatter_vx[i, k]),
+                vy=float(self.scatter_vy[i, k]),
+                timer=int(self.scatter_timer[i, k]),
+            )
+            for k in live.tolist()
+        ]
+
+
+class _EntityTables:
+    """Per-entity constants of a stage as NumPy columns, in stage order."""
+
+    def __init__(
+        self,
+        springs: Sequence[Spring],
+        checkpoints: Sequence[Checkpoint],
+        pipes: Sequence[LaunchPipe],
+        liquid_zones: Sequence[LiquidZone],
+        enemies: Sequence[Enemy],
+    ) -> None:
+        def column(items, name, dtype=np.float64):
+            return np.array([getattr(item, name) for item in items], dtype=dtype)
+
+        # Springs: hitbox left/top edges as objects.check_spring_collision
+        # computes them.
+        self.spring_left = np.array([sp.x - SPRING_HITBOX_W / 2 for sp in springs])
+        self.spring_top = np.array([sp.y - SPRING_HITBOX_H / 2 for sp in springs])
+        self.spring_up = np.array([sp.direction == "up" for sp in springs], dtype=bool)
+        self.spring_right = np.array([sp.direction == "right" for sp in springs], dtype=bool)
+
+        self.checkpoint_x = column(checkpoints, "x")
+        self.checkpoint_y = column(checkpoints, "y")
+
+        self.pipe_left = np.array([pp.x - PIPE_ENTRY_HITBOX_W / 2 for pp in pipes])
+        self.pipe_top = np.array([pp.y - PIPE_ENTRY_HITBOX_H / 2 for pp in pipes])
+        for name in ("exit_x", "exit_y", "vel_x", "vel_y"):
+            setattr(self, "pipe_" + name, column(pipes, name))
+
+        self.liquid_trigger_x = column(liquid_zones, "trigger_x")
+        self.liquid_exit_x = column(liquid_zones, "exit_x")
+        self.liquid_ceiling_y = column(liquid_zones, "ceiling_y")
+
+        sizes = [_HITBOX_SIZES.get(e.enemy_type, (16, 16)) for e in enemies]
+        self.enemy_w = np.array([w for w, _ in sizes], dtype=np.int64)
+        self.enemy_h = np.array([h for _, h in sizes], dtype=np.int64)
+        self.enemy_shielded = np.array(
+            [e.enemy_type == "enemy_guardian" and e.shielded for e in enemies], dtype=bool,
+        )
+        types = [e.enemy_type for e in enemies]
+        self.crabs = np.array([i for i, t in enumerate(types) if t == "enemy_crab"], dtype=np.intp)
+        self.choppers = np.array(
+            [i for i, t in enumerate(types) if t == "enemy_chopper"], dtype=np.intp,
+        )
+        self.bosses = np.array(
+            [i for i, t in enumerate(types) if t == "enemy_egg_piston"], dtype=np.intp,
+        )
+        self.is_boss = np.array([t == "enemy_egg_piston" for t in types], dtype=bool)
+        crabs = [enemies[i] for i in self.crabs]
+        self.crab_max_x = np.array([e.origin_x + CRAB_PATROL_RANGE for e in crabs])
+        self.crab_min_x = np.array([e.origin_x - CRAB_PATROL_RANGE for e in crabs])
+        self.chopper_base_y = column([enemies[i] for i in self.choppers], "base_y")
+        bosses = [enemies[i] for i in self.bosses]
+        for name in ("boss_hover_y", "boss_ground_y", "boss_left_x", "boss_right_x"):
+            setattr(self, name, column(bosses, name))
+
+        # Starting values of the mutable entity columns, for reset_batch.
+        self.start: dict[str, np.ndarray] = {
+            "spring_cooldown": column(springs, "cooldown", np.int64),
+            "checkpoint_activated": column(checkpoints, "activated", bool),
+            "liquid_current_y": column(liquid_zones, "current_y"),
+            "liquid_active": column(liquid_zones, "active", bool),
+        }
+        for name, dtype in _ENEMY_FIELDS.items():
+            values = [getattr(e, name) for e in enemies]
+            if name == "boss_state":
+                values = [BOSS_STATES.index(v) for v in values]
+            self.start["enemy_" + name] = np.array(values, dtype=dtype)
+
+
+# Enemy.packed_fields and their column dtypes.
+_ENEMY_FIELDS: dict[str, type] = {
+    "x": np.float64,
+    "y": np.float64,
+    "alive": bool,
+    "patrol_dir": np.int64,
+    "jump_timer": np.int64,
+    "y_vel": np.float64,
+    "boss_state": np.int64,
+    "boss_timer": np.int64,
+    "boss_hp": np.int64,
+    "boss_escalated": bool,
+    "boss_target_x": np.float64,
+    "boss_hit_timer": np.int64,
+}
+
+
+# ---------------------------------------------------------------------------
+# Factory
+# ---------------------------------------------------------------------------
+
+def create_batch_sim(stage_name: str, num_envs: int) -> BatchSim:
+    """Create num_envs players at the start of a stage.
+
+    Uses the process-wide stage cache (see simulation.get_stage_template),
+    with every entity create_sim would load.
+    """
+    from speednik.simulation import get_stage_template
+
+    template = get_stage_template(stage_name)
+    stage = template.stage
+    grid = stage.tile_grid
+    if grid is None:
+        grid = TileGrid.from_tiles(stage.tiles_dict)
+    sx, sy = stage.player_start
+    return create_batch_sim_from_grid(
+        grid,
+        float(sx),
+        float(sy),
+        num_envs,
+        level_width=stage.level_width,
+        level_height=stage.level_height,
+        rings=[(r.x, r.y) for r in template.rings],
+        goal=(template.goal_x, template.goal_y),
+        springs=template.springs,
+        checkpoints=template.checkpoints,
+        pipes=template.pipes,
+        liquid_zones=template.liquid_zones,
+        enemies=template.enemies,
+    )
+
+
+def create_batch_sim_from_grid(
+    grid: TileGrid,
+    start_x: float,
+    start_y: float,
+    num_envs: int,
+    *,
+    level_width: int = 99999,
+    level_height: int = 99999,
+    rings: Sequence[tuple[float, float]] = (),
+    goal: tuple[float, float] = (0.0, 0.0),
+    springs: Sequence[Spring] = (),
+    checkpoints: Sequence[Checkpoint] = (),
+    pipes: Sequence[LaunchPipe] = (),
+    liquid_zones: Sequence[LiquidZone] = (),
+    enemies: Sequence[Enemy] = (),
+) -> BatchSim:
+    """Create a batch from a tile grid (the batch analogue of create_sim_from_lookup).
+
+    The entities are read, not kept: each player gets its own copy of their
+    mutable state, starting from their current values.
+    """
+    ring_xy = np.array(rings, dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(ring_xy[:, 0], kind="stable")
+    n = num_envs
+    tables = _EntityTables(springs, checkpoints, pipes, liquid_zones, enemies)
+    slots = 2 * MAX_SCATTER_RINGS
+    batch = BatchSim(
+        grid=grid,
+        start_x=float(start_x),
+        start_y=float(start_y),
+        level_width=level_width,
+        level_height=level_height,
+        goal_x=float(goal[0]),
+        goal_y=float(goal[1]),
+        ring_x=ring_xy[order, 0].copy(),
+        ring_y=ring_xy[order, 1].copy(),
+        ring_order=order,
+        springs=tuple(springs),
+        checkpoints=tuple(checkpoints),
+        pipes=tuple(pipes),
+        liquid_zones=tuple(liquid_zones),
+        enemies=tuple(enemies),
+        x=np.zeros(n),
+        y=np.zeros(n),
+        x_vel=np.zeros(n),
+        y_vel=np.zeros(n),
+        ground_speed=np.zeros(n),
+        angle=np.zeros(n, dtype=np.int64),
+        on_ground=np.zeros(n, dtype=bool),
+        is_rolling=np.zeros(n, dtype=bool),
+        facing_right=np.zeros(n, dtype=bool),
+        spinrev=np.zeros(n),
+        is_charging_spindash=np.zeros(n, dtype=bool),
+        slip_timer=np.zeros(n, dtype=np.int64),
+        adhesion_miss_count=np.zeros(n, dtype=np.int64),
+        state=np.zeros(n, dtype=np.int64),
+        rings=np.zeros(n, dtype=np.int64),
+        lives=np.zeros(n, dtype=np.int64),
+        invulnerability_timer=np.zeros(n, dtype=np.int64),
+        anim=np.zeros(n, dtype=np.int64),
+        anim_frame=np.zeros(n, dtype=np.int64),
+        anim_timer=np.zeros(n, dtype=np.int64),
+        prev_jump_held=np.zeros(n, dtype=bool),
+        ring_collected=np.zeros((n, len(order)), dtype=bool),
+        frame=np.zeros(n, dtype=np.int64),
+        max_x_reached=np.zeros(n),
+        rings_collected=np.zeros(n, dtype=np.int64),
+        deaths=np.zeros(n, dtype=np.int64),
+        goal_reached=np.zeros(n, dtype=bool),
+        player_dead=np.zeros(n, dtype=bool),
+        respawn_x=np.zeros(n),
+        respawn_y=np.zeros(n),
+        respawn_rings=np.zeros(n, dtype=np.int64),
+        in_pipe=np.zeros(n, dtype=bool),
+        scatter_x=np.zeros((n, slots)),
+        scatter_y=np.zeros((n, slots)),
+        scatter_vx=np.zeros((n, slots)),
+        scatter_vy=np.zeros((n, slots)),
+        scatter_timer=np.zeros((n, slots), dtype=np.int64),
+        _tables=tables,
+        **{
+            name: np.zeros((n, len(start)), dtype=start.dtype)
+            for name, start in tables.start.items()
+        },
+    )
+    reset_batch(batch)
+    return batch
+
+
+def reset_batch(batch: BatchSim, mask: Optional[np.ndarray] = None) -> None:
+    """Return the selected players (default: all) to the stage start.
+
+    Matches the state create_sim / create_player produce.
+    """
+    if mask is None:
+        mask = np.ones(batch.num_envs, dtype=bool)
+    b = batch
+    b.x[mask] = b.start_x
+    b.y[mask] = b.start_y
+    b.respawn_x[mask] = b.start_x
+    b.respawn_y[mask] = b.start_y
+    for name in ("x_vel", "y_vel", "ground_speed", "spinrev", "max_x_reached"):
+        getattr(b, name)[mask] = 0.0
+    for name in (
+        "angle", "slip_timer", "adhesion_miss_count", "rings",
+        "invulnerability_timer", "anim_frame", "anim_timer",
+        "frame", "rings_collected", "deaths", "respawn_rings", "scatter_timer",
+    ):
+        getattr(b, name)[mask] = 0
+    for name in (
+        "is_rolling", "is_charging_spindash", "prev_jump_held",
+        "goal_reached", "player_dead", "in_pipe",
+    ):
+        getattr(b, name)[mask] = False
+    b.on_ground[mask] = True
+    b.facing_right[mask] = True
+    b.state[mask] = _STANDING
+    b.lives[mask] = 3
+    b.anim[mask] = ANIM_NAMES.index("idle")
+    b.ring_collected[mask] = False
+    for name, start in b._tables.start.items():
+        getattr(b, name)[mask] = start
+
+
+# ---------------------------------------------------------------------------
+# Frame update
+# ---------------------------------------------------------------------------
+
+def batch_step(batch: BatchSim, inp: BatchInput) -> BatchEvents:
+    """Advance every player one frame. Mirrors simulation.sim_step."""
+    b = batch
+    live = ~b.player_dead
+
+    # player_update: DEAD players are frozen, pipes move their riders
+    active = live & (b.state != _DEAD) & ~b.in_pipe
+    _pre_physics(b, inp, active)
+
+    moving = active & (b.state != _HURT)
+    _apply_input(b, inp, moving)
+    _apply_slope_factor(b, active)
+    gravity = active & ~b.on_ground
+    b.y_vel = np.where(gravity, b.y_vel + GRAVITY, b.y_vel)
+    _apply_movement(b, active)
+
+    _resolve_collision(b, active)
+
+    _update_slip_timer(b, active)
+    _post_physics(b, active)
+    b.invulnerability_timer = np.where(
+        active & (b.invulnerability_timer > 0),
+        b.invulnerability_timer - 1,
+        b.invulnerability_timer,
+    )
+    _update_scattered_rings(b, active)
+    _update_animation(b, active)
+    b.prev_jump_held = np.where(active, inp.jump_held, b.prev_jump_held)
+
+    # World boundary enforcement
+    left = live & (b.x < 0)
+    b.x = np.where(left, 0.0, b.x)
+    b.x_vel = np.where(left & (b.x_vel < 0), 0.0, b.x_vel)
+    b.ground_speed = np.where(left & (b.ground_speed < 0), 0.0, b.ground_speed)
+    right = live & (b.x > b.level_width)
+    b.x = np.where(right, float(b.level_width), b.x)
+    b.x_vel = np.where(right & (b.x_vel > 0), 0.0, b.x_vel)
+    b.ground_speed = np.where(right & (b.ground_speed > 0), 0.0, b.ground_speed)
+
+    # Pit death
+    died = live & (b.y > b.level_height + PIT_DEATH_MARGIN) & (b.state != _DEAD)
+    b.state = np.where(died, _DEAD, b.state)
+    b.on_ground &= ~died
+    b.deaths += died
+
+    b.max_x_reached = np.where(live & (b.x > b.max_x_reached), b.x, b.max_x_reached)
+
+    rings = _collect_rings(b, _vulnerable(b, live))
+    _check_springs(b, live)
+    _check_checkpoints(b, live)
+    _update_pipes(b, live)
+    _update_liquid_zones(b, live)
+    b.spring_cooldown -= live[:, None] & (b.spring_cooldown > 0)
+    _update_enemies(b, live)
+    damaged = _check_enemies(b, live)
+
+    dx = b.goal_x - b.x
+    dy = b.goal_y - b.y
+    goal = _vulnerable(b, live) & (
+        dx * dx + dy * dy < GOAL_ACTIVATION_RADIUS * GOAL_ACTIVATION_RADIUS
+    )
+    b.goal_reached |= goal
+
+    b.frame += live
+    return BatchEvents(rings=rings, died=died, goal=goal, damaged=damaged)
+
+
+# ---------------------------------------------------------------------------
+# Player state machine
+# ---------------------------------------------------------------------------
+
+def _pre_physics(b: BatchSim, inp: BatchInput, active: np.ndarray) -> None:
+    """Vectorized player._pre_physics."""
+    state = b.state
+
+    # JUMPING: variable jump height on release
+    released = active & (state == _JUMPING) & b.prev_jump_held & ~inp.jump_held
+    b.y_vel = np.where(released & (b.y_vel < JUMP_RELEASE_CAP), JUMP_RELEASE_CAP, b.y_vel)
+
+    # SPINDASH: release, charge or decay
+    spindash = active & (state == _SPINDASH)
+    release = spindash & ~inp.down_held
+    charge = spindash & inp.down_held & inp.jump_pressed
+    decay = spindash & inp.down_held & ~inp.jump_pressed
+    speed = SPINDASH_BASE_SPEED + np.floor(b.spinrev / 2)
+    b.ground_speed = np.where(release, np.where(b.facing_right, speed, -speed), b.ground_speed)
+    spinrev = np.where(charge, np.minimum(b.spinrev + SPINDASH_CHARGE_INCREMENT, SPINDASH_MAX_CHARGE), b.spinrev)
+    spinrev = np.where(decay, spinrev - spinrev / SPINDASH_DECAY_DIVISOR, spinrev)
+    b.spinrev = np.where(release, 0.0, spinrev)
+    b.is_charging_spindash &= ~release
+    b.is_rolling |= release
+
+    # Ground states
+    grounded = active & b.on_ground & (
+        (state == _STANDING) | (state == _RUNNING) | (state == _ROLLING)
+    )
+    jump = grounded & inp.jump_pressed
+    if jump.any():
+        sin_a = _SIN[b.angle]
+        cos_a = _COS[b.angle]
+        gs = b.ground_speed
+        b.x_vel = np.where(jump, gs * cos_a - JUMP_FORCE * sin_a, b.x_vel)
+        b.y_vel = np.where(jump, gs * -sin_a - JUMP_FORCE * cos_a, b.y_vel)
+        b.on_ground &= ~jump
+        b.angle = np.where(jump, 0, b.angle)
+        b.ground_speed = np.where(jump, 0.0, b.ground_speed)
+
+    upright = grounded & ~jump & ((state == _STANDING) | (state == _RUNNING)) & inp.down_held
+    slow = np.abs(b.ground_speed) < MIN_ROLL_SPEED
+    to_spindash = upright & slow
+    to_roll = upright & ~slow
+    b.is_charging_spindash |= to_spindash
+    b.ground_speed = np.where(to_spindash, 0.0, b.ground_speed)
+    b.is_rolling |= to_roll
+
+    new_state = np.where(release, _ROLLING, state)
+    new_state = np.where(jump, _JUMPING, new_state)
+    new_state = np.where(to_spindash, _SPINDASH, new_state)
+    b.state = np.where(to_roll, _ROLLING, new_state)
+
+
+def _post_physics(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized player._post_physics (first matching rule wins)."""
+    state = b.state
+    on_ground = b.on_ground
+    moving = np.abs(b.ground_speed) > 0
+    new_state = state.copy()
+    pending = active.copy()
+
+    landed = pending & (state == _JUMPING) & on_ground
+    new_state[landed] = np.where(
+        b.is_rolling[landed], _ROLLING, np.where(moving[landed], _RUNNING, _STANDING),
+    )
+    pending &= ~landed
+
+    fell = pending & ((state == _STANDING) | (state == _RUNNING) | (state == _ROLLING)) & ~on_ground
+    new_state[fell] = _JUMPING
+    pending &= ~fell
+
+    unrolled = pending & (state == _ROLLING) & ~b.is_rolling
+    new_state[unrolled] = _STANDING
+    pending &= ~unrolled
+
+    recovered = pending & (state == _HURT) & on_ground & (b.invulnerability_timer <= 0)
+    new_state[recovered] = _STANDING
+    pending &= ~recovered
+
+    new_state[pending & (state == _STANDING) & moving & on_ground] = _RUNNING
+    new_state[pending & (state == _RUNNING) & ~moving & on_ground] = _STANDING
+    b.state = new_state
+
+
+def _update_animation(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized player._update_animation."""
+    new_anim = _STATE_TO_ANIM[b.state]
+    changed = active & (new_anim != b.anim)
+    b.anim = np.where(changed, new_anim, b.anim)
+    b.anim_frame = np.where(changed, 0, b.anim_frame)
+    b.anim_timer = np.where(changed, 0, b.anim_timer)
+
+    speed = np.abs(b.ground_speed)
+    running = active & ~changed & (b.anim == _ANIM_RUNNING) & (speed > 0)
+    anim_speed = np.maximum(
+        _ANIM_SPEED_RUNNING_MIN,
+        np.trunc(_ANIM_SPEED_RUNNING_BASE - speed).astype(np.int64),
+    )
+    timer = np.where(running, b.anim_timer + 1, b.anim_timer)
+    advance = running & (timer >= anim_speed)
+    b.anim_timer = np.where(advance, 0, timer)
+    b.anim_frame = np.where(advance, (b.anim_frame + 1) % _ANIM_FRAMES_RUNNING, b.anim_frame)
+
+
+# ---------------------------------------------------------------------------
+# Physics steps 1–4
+# ---------------------------------------------------------------------------
+
+def _toward_zero(v: np.ndarray, amount: float, mask: np.ndarray) -> np.ndarray:
+    """Subtract amount from |v| where mask, stopping at zero (friction)."""
+    pos = mask & (v > 0)
+    neg = mask & (v < 0)
+    dec = np.where(pos, v - amount, np.where(neg, v + amount, v))
+    dec = np.where(pos & (dec < 0), 0.0, dec)
+    return np.where(neg & (dec > 0), 0.0, dec)
+
+
+def _apply_input(b: BatchSim, inp: BatchInput, active: np.ndarray) -> None:
+    """Vectorized physics.apply_input."""
+    gs = b.ground_speed
+    ground = active & b.on_ground & ~b.is_rolling
+    rolling = active & b.on_ground & b.is_rolling
+    air = active & ~b.on_ground
+
+    # Standing / running
+    slipping = ground & (b.slip_timer > 0)
+    steer = ground & ~slipping
+    go_left = steer & inp.left
+    go_right = steer & ~inp.left & inp.right
+    coast = steer & ~inp.left & ~inp.right
+    below_top = np.abs(gs) < TOP_SPEED
+
+    new_gs = _toward_zero(gs, FRICTION, slipping | coast)
+
+    brake_l = go_left & (gs > 0)
+    braked = gs - DECELERATION
+    new_gs = np.where(brake_l, np.where(braked < 0, -DECELERATION, braked), new_gs)
+    new_gs = np.where(go_left & ~(gs > 0) & below_top, gs - ACCELERATION, new_gs)
+
+    brake_r = go_right & (gs < 0)
+    braked = gs + DECELERATION
+    new_gs = np.where(brake_r, np.where(braked > 0, DECELERATION, braked), new_gs)
+    new_gs = np.where(go_right & ~(gs < 0) & below_top, gs + ACCELERATION, new_gs)
+
+    # Rolling
+    roll_gs = np.where(rolling & inp.left & (gs > 0), gs - ROLLING_DECELERATION, gs)
+    roll_gs = np.where(rolling & ~(inp.left & (gs > 0)) & inp.right & (gs < 0), gs + ROLLING_DECELERATION, roll_gs)
+    roll_gs = _toward_zero(roll_gs, ROLLING_FRICTION, rolling)
+    new_gs = np.where(rolling, roll_gs, new_gs)
+    b.is_rolling &= ~(rolling & (np.abs(roll_gs) < MIN_ROLL_SPEED))
+
+    # Airborne
+    air_l = air & inp.left
+    air_r = air & ~inp.left & inp.right
+    x_vel = np.where(air_l, b.x_vel - AIR_ACCELERATION, b.x_vel)
+    x_vel = np.where(air_r, b.x_vel + AIR_ACCELERATION, x_vel)
+
+    b.facing_right = np.where(go_left | air_l, False, np.where(go_right | air_r, True, b.facing_right))
+
+    # Hard clamp
+    grounded = active & b.on_ground
+    b.ground_speed = np.where(grounded, np.clip(new_gs, -MAX_X_SPEED, MAX_X_SPEED), gs)
+    b.x_vel = np.where(air, np.clip(x_vel, -MAX_X_SPEED, MAX_X_SPEED), b.x_vel)
+
+
+def _apply_slope_factor(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized physics.apply_slope_factor."""
+    grounded = active & b.on_ground
+    sin_a = _SIN[b.angle]
+    gs = b.ground_speed
+    uphill = (gs != 0) & (np.sign(gs) == _SIN_SIGN[b.angle])
+    factor = np.where(
+        b.is_rolling,
+        np.where(uphill, SLOPE_FACTOR_ROLL_UP, SLOPE_FACTOR_ROLL_DOWN),
+        SLOPE_FACTOR_RUNNING,
+    )
+    b.ground_speed = np.where(grounded, gs - factor * sin_a, gs)
+
+
+def _apply_movement(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized physics.apply_movement."""
+    grounded = active & b.on_ground
+    gs = b.ground_speed
+    b.x_vel = np.where(grounded, gs * _COS[b.angle], b.x_vel)
+    b.y_vel = np.where(grounded, gs * -_SIN[b.angle], b.y_vel)
+    b.x = np.where(active, b.x + b.x_vel, b.x)
+    b.y = np.where(active, b.y + b.y_vel, b.y)
+
+
+def _calculate_landing_speed(b: BatchSim, mask: np.ndarray) -> None:
+    """Vectorized physics.calculate_landing_speed."""
+    deg = _DEG[b.angle]
+    neg_sign = -_SIN_SIGN[b.angle]
+    flat = (deg >= 339.0) | (deg <= 23.0)
+    slope = ((24.0 <= deg) & (deg <= 45.0)) | ((316.0 <= deg) & (deg <= 338.0))
+    y_based = np.where(slope, b.y_vel * 0.5 * neg_sign, b.y_vel * neg_sign)
+    speed = np.where(~flat & (np.abs(y_based) > np.abs(b.x_vel)), y_based, b.x_vel)
+    b.ground_speed = np.where(mask, speed, b.ground_speed)
+
+
+def _update_slip_timer(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized physics.update_slip_timer."""
+    deg = _DEG[b.angle]
+    slip = active & b.on_ground & (np.abs(b.ground_speed) < SLIP_SPEED_THRESHOLD) & (
+        (46.0 <= deg) & (deg <= 315.0)
+    )
+    timer = np.where(active & (b.slip_timer > 0), b.slip_timer - 1, b.slip_timer)
+    b.slip_timer = np.where(slip, SLIP_DURATION, timer)
+
+
+# ---------------------------------------------------------------------------
+# Sensor casts
+# ---------------------------------------------------------------------------
+
+class _Hits:
+    """Accumulates the first matching outcome per sensor, in priority order."""
+
+    def __init__(self, n: int, empty_cell: int) -> None:
+        self.found = np.zeros(n, dtype=bool)
+        self.distance = np.zeros(n)
+        self.cell = np.full(n, empty_cell, dtype=np.int64)
+        self.open = np.ones(n, dtype=bool)
+
+    def hit(self, cond: np.ndarray, distance: np.ndarray, cell: np.ndarray) -> None:
+        m = self.open & cond
+        self.found |= m
+        self.distance = np.where(m, distance, self.distance)
+        self.cell = np.where(m, cell, self.cell)
+        self.open &= ~m
+
+    def miss(self, cond: np.ndarray) -> None:
+        self.open &= ~cond
+
+
+def _accepts(grid: TileGrid, cell: np.ndarray, allow_top: np.ndarray) -> np.ndarray:
+    """Solidity filter: floor sensors pass TOP_ONLY while falling."""
+    sol = grid.cell_solidity(cell)
+    return (sol != NOT_SOLID) & ((sol != TOP_ONLY) | allow_top)
+
+
+def _cast_vertical(
+    grid: TileGrid, direction: int, sx: np.ndarray, sy: np.ndarray, allow_top: np.ndarray,
+) -> _Hits:
+    """Vectorized terrain._sensor_cast_down / _sensor_cast_up."""
+    ix = sx.astype(np.int64)
+    tx = ix // TILE_SIZE
+    col = ix % TILE_SIZE
+    ty = sy.astype(np.int64) // TILE_SIZE
+    cur = grid.cell_index(tx, ty)
+    above = grid.cell_index(tx, ty - 1)
+    below = grid.cell_index(tx, ty + 1)
+    cur_ok = _accepts(grid, cur, allow_top)
+    above_ok = _accepts(grid, above, allow_top)
+    below_ok = _accepts(grid, below, allow_top)
+    h = grid.column_heights(cur, col).astype(np.int64)
+    ha = grid.column_heights(above, col).astype(np.int64)
+    hb = grid.column_heights(below, col).astype(np.int64)
+    r = MAX_SENSOR_RANGE
+    hits = _Hits(len(sx), grid.rows * grid.cols)
+    empty = cur_ok & (h == 0)
+    full = cur_ok & (h == TILE_SIZE)
+
+    if direction == DOWN:
+        # Extension into the tile below, unless it would leave a loop
+        loop_exit = (grid.cell_tile_type(cur) == SURFACE_LOOP) & (grid.cell_tile_type(below) != SURFACE_LOOP)
+        d = ((ty + 1) * TILE_SIZE + (TILE_SIZE - hb)) - sy
+        hits.hit(empty & below_ok & ~loop_exit & (hb > 0) & (np.abs(d) <= r), d, below)
+        hits.miss(empty)
+        # Regression into the tile above
+        surface = np.where(ha < TILE_SIZE, (ty - 1) * TILE_SIZE + (TILE_SIZE - ha), (ty - 1) * TILE_SIZE)
+        d = surface - sy
+        hits.hit(full & above_ok & (np.abs(d) <= r), d, above)
+        d = ty * TILE_SIZE - sy
+        hits.hit(full & (np.abs(d) <= r), d, cur)
+        hits.miss(full)
+        # Surface within this tile
+        d = (ty * TILE_SIZE + (TILE_SIZE - h)) - sy
+        hits.hit(cur_ok & (np.abs(d) <= r), d, cur)
+        hits.miss(cur_ok)
+        # No solid tile here: extension below
+        d = ((ty + 1) * TILE_SIZE + (TILE_SIZE - hb)) - sy
+        hits.hit(below_ok & (hb > 0) & (np.abs(d) <= r), d, below)
+    else:
+        # Extension into the tile above
+        d = sy - ((ty - 1) * TILE_SIZE + ha)
+        hits.hit(empty & above_ok & (ha > 0) & (np.abs(d) <= r), d, above)
+        hits.miss(empty)
+        # Regression into the tile below
+        d = sy - ((ty + 1) * TILE_SIZE + hb)
+        hits.hit(full & below_ok & (hb < TILE_SIZE) & (np.abs(d) <= r), d, below)
+        d = sy - (ty + 1) * TILE_SIZE
+        hits.hit(full & (np.abs(d) <= r), d, cur)
+        hits.miss(full)
+        # Top of the solid within this tile
+        d = sy - (ty * TILE_SIZE + (TILE_SIZE - h))
+        hits.hit(cur_ok & (np.abs(d) <= r), d, cur)
+        hits.miss(cur_ok)
+        # No solid tile here: extension above, then regression below
+        d = sy - ((ty - 1) * TILE_SIZE + (TILE_SIZE - ha))
+        hits.hit(above_ok & (ha > 0) & (np.abs(d) <= r), d, above)
+        d = sy - ((ty + 1) * TILE_SIZE + (TILE_SIZE - hb))
+        hits.hit(below_ok & (hb > 0) & (np.abs(d) <= r), d, below)
+    return hits
+
+
+def _cast_horizontal(
+    grid: TileGrid, direction: int, sx: np.ndarray, sy: np.ndarray, allow_top: np.ndarray,
+) -> _Hits:
+    """Vectorized terrain._sensor_cast_right / _sensor_cast_left."""
+    iy = sy.astype(np.int64)
+    ty = iy // TILE_SIZE
+    width_row = TILE_SIZE - 1 - iy % TILE_SIZE
+    tx = sx.astype(np.int64) // TILE_SIZE
+    cur = grid.cell_index(tx, ty)
+    left = grid.cell_index(tx - 1, ty)
+    right = grid.cell_index(tx + 1, ty)
+    cur_ok = _accepts(grid, cur, allow_top)
+    left_ok = _accepts(grid, left, allow_top)
+    right_ok = _accepts(grid, right, allow_top)
+    r = MAX_SENSOR_RANGE
+    hits = _Hits(len(sx), grid.rows * grid.cols)
+
+    if direction == RIGHT:
+        # Distance to the leftmost solid pixel of a tile (or -1 marker)
+        e = grid.row_left_edges(cur, width_row).astype(np.int64)
+        e_ahead = grid.row_left_edges(right, width_row).astype(np.int64)
+        e_behind = grid.row_left_edges(left, width_row).astype(np.int64)
+        d = tx * TILE_SIZE + e - sx
+        d_ahead = (tx + 1) * TILE_SIZE + e_ahead - sx
+        d_behind = (tx - 1) * TILE_SIZE + e_behind - sx
+        ahead, ahead_ok, behind, behind_ok = right, right_ok, left, left_ok
+    else:
+        # Distance from the pixel past the rightmost solid column
+        e = grid.row_right_edges(cur, width_row).astype(np.int64)
+        e_ahead = grid.row_right_edges(left, width_row).astype(np.int64)
+        e_behind = grid.row_right_edges(right, width_row).astype(np.int64)
+        d = sx - (tx * TILE_SIZE + e + 1)
+        d_ahead = sx - ((tx - 1) * TILE_SIZE + e_ahead + 1)
+        d_behind = sx - ((tx + 1) * TILE_SIZE + e_behind + 1)
+        ahead, ahead_ok, behind, behind_ok = left, left_ok, right, right_ok
+
+    empty = cur_ok & (e < 0)
+    hits.hit(empty & ahead_ok & (e_ahead >= 0) & (np.abs(d_ahead) <= r), d_ahead, ahead)
+    hits.miss(empty)
+    hits.miss(cur_ok & (d < -r))
+    hits.hit(cur_ok & (d <= r), d, cur)
+    hits.hit(cur_ok & behind_ok & (e_behind >= 0) & (np.abs(d_behind) <= r), d_behind, behind)
+    hits.hit(cur_ok, d, cur)
+    # No solid tile here: extension ahead, then regression behind
+    hits.hit(ahead_ok & (e_ahead >= 0) & (np.abs(d_ahead) <= r), d_ahead, ahead)
+    hits.hit(behind_ok & (e_behind >= 0) & (np.abs(d_behind) <= r), d_behind, behind)
+    return hits
+
+
+class _Sensed:
+    """Sensor outcome per player: found, distance, tile angle and type."""
+
+    def __init__(self, n: int) -> None:
+        self.found = np.zeros(n, dtype=bool)
+        self.distance = np.zeros(n)
+        self.angle = np.zeros(n, dtype=np.int64)
+        self.tile_type = np.zeros(n, dtype=np.int64)
+
+
+def _cast(
+    grid: TileGrid,
+    directions: np.ndarray,
+    sx: np.ndarray,
+    sy: np.ndarray,
+    allow_top: np.ndarray,
+) -> _Sensed:
+    """Dispatch casts per direction (terrain._sensor_cast for arrays)."""
+    out = _Sensed(len(sx))
+    for direction in (DOWN, RIGHT, UP, LEFT):
+        sel = np.flatnonzero(directions == direction)
+        if len(sel) == 0:
+            continue
+        cast = _cast_vertical if direction in (DOWN, UP) else _cast_horizontal
+        hits = cast(grid, direction, sx[sel], sy[sel], allow_top[sel])
+        out.found[sel] = hits.found
+        out.distance[sel] = hits.distance
+        out.angle[sel] = grid.cell_angles(hits.cell)
+        out.tile_type[sel] = grid.cell_tile_type(hits.cell)
+    return out
+
+
+def _pick_closer(first: _Sensed, second: _Sensed) -> _Sensed:
+    """Combine a sensor pair: the found one, else the closer (first wins ties)."""
+    use_second = second.found & (~first.found | (np.abs(second.distance) < np.abs(first.distance)))
+    out = _Sensed(len(first.found))
+    out.found = first.found | second.found
+    out.distance = np.where(use_second, second.distance, np.where(first.found, first.distance, 0.0))
+    out.angle = np.where(use_second, second.angle, np.where(first.found, first.angle, 0))
+    out.tile_type = np.where(use_second, second.tile_type, np.where(first.found, first.tile_type, 0))
+    return out
+
+
+def _radii(b: BatchSim, sel: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(width_radius, height_radius) per selected player (terrain._get_radii)."""
+    small = b.is_rolling[sel] | ~b.on_ground[sel]
+    return (
+        np.where(small, ROLLING_WIDTH_RADIUS, STANDING_WIDTH_RADIUS),
+        np.where(small, ROLLING_HEIGHT_RADIUS, STANDING_HEIGHT_RADIUS),
+    )
+
+
+def _sensor_pair(
+    b: BatchSim,
+    sel: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    dir_table: np.ndarray,
+    allow_top: np.ndarray,
+) -> _Sensed:
+    """Cast a sensor pair positioned by per-quadrant offset tables."""
+    q = _QUADRANT[b.angle[sel]]
+    w, h = _radii(b, sel)
+    x, y = b.x[sel], b.y[sel]
+    directions = dir_table[q]
+    a, c = first[q], second[q]
+    # Both sensors go through one cast call: [first..., second...]
+    sx = np.concatenate((x + (a[:, 0] * w + a[:, 1] * h), x + (c[:, 0] * w + c[:, 1] * h)))
+    sy = np.concatenate((y + (a[:, 2] * w + a[:, 3] * h), y + (c[:, 2] * w + c[:, 3] * h)))
+    both = _cast(
+        b.grid,
+        np.concatenate((directions, directions)),
+        sx,
+        sy,
+        np.concatenate((allow_top, allow_top)),
+    )
+    n = len(sel)
+    return _pick_closer(_slice(both, slice(0, n)), _slice(both, slice(n, None)))
+
+
+def _find_floor(b: BatchSim, sel: np.ndarray) -> _Sensed:
+    """Vectorized terrain.find_floor for players sel."""
+    return _sensor_pair(b, sel, _FLOOR_A, _FLOOR_B, _FLOOR_DIR, b.y_vel[sel] >= 0)
+
+
+def _find_ceiling(b: BatchSim, sel: np.ndarray) -> _Sensed:
+    """Vectorized terrain.find_ceiling for players sel."""
+    return _sensor_pair(b, sel, _CEILING_C, _CEILING_D, _CEILING_DIR, np.zeros(len(sel), dtype=bool))
+
+
+def _find_wall_push(b: BatchSim, sel: np.ndarray, wall_direction: int) -> _Sensed:
+    """Vectorized terrain.find_wall_push (E/F sensors) for players sel."""
+    q = _QUADRANT[b.angle[sel]]
+    horizontal = (q == 0) | (q == 2)
+    x, y = b.x[sel], b.y[sel]
+    if wall_direction == LEFT:
+        disabled = horizontal & (b.x_vel[sel] > 0)
+        offset = -WALL_SENSOR_EXTENT
+    else:
+        disabled = horizontal & (b.x_vel[sel] < 0)
+        offset = WALL_SENSOR_EXTENT
+    # In wall quadrants the sensor moves up by the extent but still casts
+    # horizontally, exactly as find_wall_push does for LEFT/RIGHT.
+    sx = np.where(horizontal, x + offset, x)
+    sy = np.where(horizontal, y, y - WALL_SENSOR_EXTENT)
+    directions = np.full(len(sel), wall_direction, dtype=np.int64)
+    result = _cast(b.grid, directions, sx, sy, np.zeros(len(sel), dtype=bool))
+    floor_range = (result.angle <= WALL_ANGLE_THRESHOLD) | (result.angle >= ANGLE_STEPS - WALL_ANGLE_THRESHOLD)
+    rejected = disabled | (result.found & (floor_range | (result.tile_type == SURFACE_LOOP)))
+    result.found &= ~rejected
+    result.distance = np.where(rejected, 0.0, result.distance)
+    result.angle = np.where(rejected, 0, result.angle)
+    result.tile_type = np.where(rejected, 0, result.tile_type)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Collision resolution
+# ---------------------------------------------------------------------------
+
+def _snap_to_floor(b: BatchSim, sel: np.ndarray, result: _Sensed, quadrant: np.ndarray) -> None:
+    """Vectorized terrain._snap_to_floor for players sel."""
+    d = result.distance
+    y = b.y[sel]
+    x = b.x[sel]
+    b.y[sel] = np.where(quadrant == 0, y + d, np.where(quadrant == 2, y - d, y))
+    b.x[sel] = np.where(quadrant == 1, x + d, np.where(quadrant == 3, x - d, x))
+    b.angle[sel] = result.angle
+
+
+def _resolve_collision(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized terrain.resolve_collision for active players."""
+    sel = np.flatnonzero(active)
+    if len(sel) == 0:
+        return
+    quadrant = _QUADRANT[b.angle[sel]]
+
+    # --- Floor sensors ---
+    floor = _find_floor(b, sel)
+    on_ground = b.on_ground[sel]
+    snap = on_ground & floor.found & (np.abs(floor.distance) <= _GROUND_SNAP_DISTANCE)
+
+    if snap.any():
+        s = sel[snap]
+        _snap_to_floor(b, s, _slice(floor, snap), quadrant[snap])
+        b.adhesion_miss_count[s] = 0
+        # Two-pass snap when the quadrant changed
+        new_q = _QUADRANT[b.angle[s]]
+        changed = new_q != quadrant[snap]
+        if changed.any():
+            s2 = s[changed]
+            floor2 = _find_floor(b, s2)
+            ok = floor2.found & (np.abs(floor2.distance) <= _GROUND_SNAP_DISTANCE)
+            if ok.any():
+                _snap_to_floor(b, s2[ok], _slice(floor2, ok), new_q[changed][ok])
+
+    missed = on_ground & ~snap
+    if missed.any():
+        m = sel[missed]
+        adhere = (
+            (quadrant[missed] != 0)
+            & (np.abs(b.ground_speed[m]) >= FALL_SPEED_THRESHOLD)
+            & ~floor.found[missed]
+            & (b.adhesion_miss_count[m] < 2)
+        )
+        b.adhesion_miss_count[m[adhere]] += 1
+        detach = m[~adhere]
+        b.on_ground[detach] = False
+        b.angle[detach] = 0
+        b.adhesion_miss_count[detach] = 0
+
+    land = ~on_ground & floor.found & (b.y_vel[sel] >= 0) & (floor.distance <= _AIR_LAND_DISTANCE)
+    if land.any():
+        s = sel[land]
+        landed = _slice(floor, land)
+        _snap_to_floor(b, s, landed, quadrant[land])
+        b.on_ground[s] = True
+        b.angle[s] = landed.angle
+        mask = np.zeros(b.num_envs, dtype=bool)
+        mask[s] = True
+        _calculate_landing_speed(b, mask)
+
+    # --- Wall sensors (both cast before either push) ---
+    wall_left = _find_wall_push(b, sel, LEFT)
+    wall_right = _find_wall_push(b, sel, RIGHT)
+    horizontal = (quadrant == 0) | (quadrant == 2)
+
+    push = wall_left.found & (wall_left.distance < 0)
+    if push.any():
+        _wall_push(b, sel, push & horizontal, push & ~horizontal, -wall_left.distance, toward_positive=True)
+    push = wall_right.found & (wall_right.distance < 0)
+    if push.any():
+        _wall_push(b, sel, push & horizontal, push & ~horizontal, wall_right.distance, toward_positive=False)
+
+    # --- Ceiling sensors ---
+    check = ~b.on_ground[sel] | (quadrant != 0)
+    if check.any():
+        c = sel[check]
+        ceiling = _find_ceiling(b, c)
+        cq = quadrant[check]
+        hit = ceiling.found & (ceiling.distance < 0)
+        down = c[hit & (cq == 0)]
+        if len(down):
+            b.y[down] -= ceiling.distance[hit & (cq == 0)]
+            b.y_vel[down] = np.where(b.y_vel[down] < 0, 0.0, b.y_vel[down])
+        up = c[hit & (cq == 2)]
+        if len(up):
+            b.y[up] += ceiling.distance[hit & (cq == 2)]
+            b.y_vel[up] = np.where(b.y_vel[up] > 0, 0.0, b.y_vel[up])
+
+    # --- Solid ejection pass ---
+    inside = _is_inside_solid(b, sel)
+    if inside.any():
+        _eject_from_solid(b, sel[inside])
+
+
+def _slice(result: _Sensed, index) -> _Sensed:
+    out = _Sensed(0)
+    out.found = result.found[index]
+    out.distance = result.distance[index]
+    out.angle = result.angle[index]
+    out.tile_type = result.tile_type[index]
+    return out
+
+
+def _wall_push(
+    b: BatchSim,
+    sel: np.ndarray,
+    horizontal: np.ndarray,
+    vertical: np.ndarray,
+    delta: np.ndarray,
+    toward_positive: bool,
+) -> None:
+    """Apply a wall push and zero velocity into the wall.
+
+    ``delta`` is added to x (or y); toward_positive says which velocity sign
+    points into the wall being pushed away from.
+    """
+    h = sel[horizontal]
+    if len(h):
+        b.x[h] += delta[horizontal]
+        into = b.x_vel[h] < 0 if toward_positive else b.x_vel[h] > 0
+        b.x_vel[h[into]] = 0.0
+        stop = h[into & b.on_ground[h]]
+        b.ground_speed[stop] = 0.0
+    v = sel[vertical]
+    if len(v):
+        b.y[v] += delta[vertical]
+        into = b.y_vel[v] < 0 if toward_positive else b.y_vel[v] > 0
+        b.y_vel[v[into]] = 0.0
+
+
+def _is_inside_solid(b: BatchSim, sel: np.ndarray) -> np.ndarray:
+    """Vectorized terrain._is_inside_solid."""
+    grid = b.grid
+    ix = b.x[sel].astype(np.int64)
+    tx = ix // TILE_SIZE
+    col = ix % TILE_SIZE
+    ty = b.y[sel].astype(np.int64) // TILE_SIZE
+    cell = grid.cell_index(tx, ty)
+    above = grid.cell_index(tx, ty - 1)
+    h = grid.column_heights(cell, col).astype(np.int64)
+    return (
+        (grid.cell_solidity(cell) == FULL)
+        & (grid.cell_tile_type(cell) != SURFACE_LOOP)
+        & (grid.cell_tile_type(above) != SURFACE_LOOP)
+        & (h != 0)
+        & (b.y[sel] >= (ty + 1) * TILE_SIZE - h)
+    )
+
+
+def _eject_from_solid(b: BatchSim, sel: np.ndarray) -> None:
+    """Vectorized terrain._eject_from_solid (rare, so kept simple)."""
+    grid = b.grid
+    ix = b.x[sel].astype(np.int64)
+    tx = ix // TILE_SIZE
+    col = ix % TILE_SIZE
+    ty = b.y[sel].astype(np.int64) // TILE_SIZE
+    pending = np.ones(len(sel), dtype=bool)
+
+    for dy in range(1, _EJECT_SCAN_TILES + 1):
+        check_ty = ty - dy
+        cell = grid.cell_index(tx, check_ty)
+        free = pending & (grid.cell_solidity(cell) != FULL)
+        b.y[sel[free]] = ((check_ty + 1) * TILE_SIZE - 1)[free].astype(np.float64)
+        pending &= ~free
+        h = grid.column_heights(cell, col).astype(np.int64)
+        partial = pending & (h < TILE_SIZE)
+        b.y[sel[partial]] = ((check_ty + 1) * TILE_SIZE - h - 1)[partial].astype(np.float64)
+        pending &= ~partial
+
+    for dx in range(1, _EJECT_SCAN_TILES + 1):
+        free = pending & (grid.cell_solidity(grid.cell_index(tx - dx, ty)) != FULL)
+        b.x[sel[free]] = ((tx - dx + 1) * TILE_SIZE - 1)[free].astype(np.float64)
+        pending &= ~free
+        free = pending & (grid.cell_solidity(grid.cell_index(tx + dx, ty)) != FULL)
+        b.x[sel[free]] = ((tx + dx) * TILE_SIZE)[free].astype(np.float64)
+        pending &= ~free
+
+    b.y[sel[pending]] -= float(TILE_SIZE)
+
+    # _reset_to_airborne
+    b.on_ground[sel] = False
+    b.angle[sel] = 0
+    b.x_vel[sel] = 0.0
+    b.y_vel[sel] = 0.0
+    b.ground_speed[sel] = 0.0
+
+
+# ---------------------------------------------------------------------------
+# Entities
+# ---------------------------------------------------------------------------
+
+def _collect_rings(b: BatchSim, collecting: np.ndarray) -> np.ndarray:
+    """Vectorized objects.check_ring_collection over the sorted ring arrays."""
+    n = b.num_envs
+    count = np.zeros(n, dtype=np.int64)
+    if len(b.ring_x) == 0:
+        return count
+    # Rings within the collection radius lie strictly inside this x window;
+    # widen by a pixel so float rounding never drops a candidate.
+    reach = RING_COLLECTION_RADIUS + 1
+    lo = np.searchsorted(b.ring_x, b.x - reach, side="left")
+    hi = np.searchsorted(b.ring_x, b.x + reach, side="right")
+    width = np.where(collecting, hi - lo, 0)
+    w = int(width.max())
+    if w == 0:
+        return count
+    envs = np.flatnonzero(width > 0)
+    idx = lo[envs, None] + np.arange(w)
+    valid = idx < hi[envs, None]
+    idx = np.minimum(idx, len(b.ring_x) - 1)
+    dx = b.ring_x[idx] - b.x[envs, None]
+    dy = b.ring_y[idx] - b.y[envs, None]
+    hit = (
+        valid
+        & ~b.ring_collected[envs[:, None], idx]
+        & (dx * dx + dy * dy < RING_COLLECTION_RADIUS * RING_COLLECTION_RADIUS)
+    )
+    rows, cols = np.nonzero(hit)
+    b.ring_collected[envs[rows], idx[rows, cols]] = True
+    count[envs] = hit.sum(axis=1)
+
+    old = b.rings
+    b.rings = old + count
+    b.lives += b.rings // EXTRA_LIFE_THRESHOLD - old // EXTRA_LIFE_THRESHOLD
+    b.rings_collected += count
+    return count
+
+
+def _vulnerable(b: BatchSim, mask: np.ndarray) -> np.ndarray:
+    """Players in *mask* that entities interact with (not DEAD or HURT)."""
+    return mask & (b.state != _DEAD) & (b.state != _HURT)
+
+
+def _player_rect(b: BatchSim) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized player.get_player_rect: (x, y, w, h) per player."""
+    small = b.is_rolling | ~b.on_ground
+    w = np.where(small, ROLLING_WIDTH_RADIUS * 2, STANDING_WIDTH_RADIUS * 2)
+    h = np.where(small, ROLLING_HEIGHT_RADIUS * 2, STANDING_HEIGHT_RADIUS * 2)
+    return b.x - w // 2, b.y - h // 2, w, h
+
+
+def _overlap(rect, bx, by, bw, bh) -> np.ndarray:
+    """objects.aabb_overlap of each player rect against (E,) or (N, E) boxes."""
+    px, py, pw, ph = (v[:, None] for v in rect)
+    return (px < bx + bw) & (px + pw > bx) & (py < by + bh) & (py + ph > by)
+
+
+def _check_springs(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized objects.check_spring_collision."""
+    t = b._tables
+    if not len(t.spring_left):
+        return
+    rect = _player_rect(b)
+    hits = (
+        _vulnerable(b, live)[:, None]
+        & (b.spring_cooldown == 0)
+        & _overlap(rect, t.spring_left, t.spring_top, SPRING_HITBOX_W, SPRING_HITBOX_H)
+    )
+    if not hits.any():
+        return
+    for s in np.flatnonzero(hits.any(axis=0)).tolist():
+        m = hits[:, s]
+        if t.spring_up[s]:
+            b.y_vel[m] = SPRING_UP_VELOCITY
+            b.x_vel[m] = b.ground_speed[m]
+        elif t.spring_right[s]:
+            b.x_vel[m] = SPRING_RIGHT_VELOCITY
+            b.y_vel[m] = 0.0
+        if t.spring_up[s] or t.spring_right[s]:
+            b.on_ground[m] = False
+            b.ground_speed[m] = 0.0
+            b.angle[m] = 0
+            b.is_rolling[m] = False
+            b.state[m] = _JUMPING
+        b.spring_cooldown[m, s] = SPRING_COOLDOWN_FRAMES
+
+
+def _check_checkpoints(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized objects.check_checkpoint_collision."""
+    t = b._tables
+    if not len(t.checkpoint_x):
+        return
+    ok = _vulnerable(b, live)
+    radius_sq = CHECKPOINT_ACTIVATION_RADIUS * CHECKPOINT_ACTIVATION_RADIUS
+    for c in range(len(t.checkpoint_x)):
+        dx = t.checkpoint_x[c] - b.x
+        dy = t.checkpoint_y[c] - b.y
+        hit = ok & ~b.checkpoint_activated[:, c] & (dx * dx + dy * dy < radius_sq)
+        if hit.any():
+            b.checkpoint_activated[hit, c] = True
+            b.respawn_x[hit] = t.checkpoint_x[c]
+            b.respawn_y[hit] = t.checkpoint_y[c]
+            b.respawn_rings[hit] = b.rings[hit]
+
+
+def _update_pipes(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized objects.update_pipe_travel."""
+    t = b._tables
+    if not len(t.pipe_left):
+        return
+    riding = live & b.in_pipe
+    if riding.any():
+        b.x = np.where(riding, b.x + b.x_vel, b.x)
+        b.y = np.where(riding, b.y + b.y_vel, b.y)
+        pending = riding.copy()
+        for p in range(len(t.pipe_left)):
+            exits = pending & (
+                ((b.x_vel > 0) & (b.x >= t.pipe_exit_x[p]) & (t.pipe_vel_x[p] > 0))
+                | ((b.x_vel < 0) & (b.x <= t.pipe_exit_x[p]) & (t.pipe_vel_x[p] < 0))
+                | ((b.y_vel < 0) & (b.y <= t.pipe_exit_y[p]) & (t.pipe_vel_y[p] < 0))
+                | ((b.y_vel > 0) & (b.y >= t.pipe_exit_y[p]) & (t.pipe_vel_y[p] > 0))
+            )
+            if exits.any():
+                b.x[exits] = t.pipe_exit_x[p]
+                b.y[exits] = t.pipe_exit_y[p]
+                b.in_pipe[exits] = False
+                b.invulnerability_timer[exits] = 0
+                pending &= ~exits
+
+    hits = _vulnerable(b, live & ~riding)[:, None] & _overlap(
+        _player_rect(b), t.pipe_left, t.pipe_top, PIPE_ENTRY_HITBOX_W, PIPE_ENTRY_HITBOX_H,
+    )
+    enter = hits.any(axis=1)
+    if enter.any():
+        pipe = hits[enter].argmax(axis=1)  # first pipe in stage order
+        b.in_pipe[enter] = True
+        b.x_vel[enter] = t.pipe_vel_x[pipe]
+        b.y_vel[enter] = t.pipe_vel_y[pipe]
+        b.ground_speed[enter] = 0.0
+        b.on_ground[enter] = False
+        b.angle[enter] = 0
+        b.is_rolling[enter] = False
+        b.state[enter] = _JUMPING
+        b.invulnerability_timer[enter] = 9999
+
+
+def _update_liquid_zones(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized objects.update_liquid_zones."""
+    t = b._tables
+    for z in range(len(t.liquid_trigger_x)):
+        active = (b.x > t.liquid_trigger_x[z]) & (b.x < t.liquid_exit_x[z])
+        b.liquid_active[:, z] = np.where(live, active, b.liquid_active[:, z])
+        active &= live
+        level = b.liquid_current_y[:, z]
+        ceiling = t.liquid_ceiling_y[z]
+        rise = active & (level > ceiling)
+        risen = level - LIQUID_RISE_SPEED
+        level = np.where(rise, np.where(risen < ceiling, ceiling, risen), level)
+        b.liquid_current_y[:, z] = level
+        _, py, _, ph = _player_rect(b)
+        _damage(b, _vulnerable(b, active) & (py + ph > level))
+
+
+def _update_enemies(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized enemies.update_enemies (crabs, choppers, Egg Piston)."""
+    t = b._tables
+    if len(t.crabs):
+        c = t.crabs
+        m = live[:, None] & b.enemy_alive[:, c]
+        d = b.enemy_patrol_dir[:, c]
+        x = b.enemy_x[:, c] + d * CRAB_PATROL_SPEED
+        right = x >= t.crab_max_x
+        left = ~right & (x <= t.crab_min_x)
+        x = np.where(right, t.crab_max_x, np.where(left, t.crab_min_x, x))
+        d = np.where(right, -1, np.where(left, 1, d))
+        b.enemy_x[:, c] = np.where(m, x, b.enemy_x[:, c])
+        b.enemy_patrol_dir[:, c] = np.where(m, d, b.enemy_patrol_dir[:, c])
+
+    if len(t.choppers):
+        c = t.choppers
+        m = live[:, None] & b.enemy_alive[:, c]
+        y = b.enemy_y[:, c]
+        y_vel = b.enemy_y_vel[:, c]
+        timer = b.enemy_jump_timer[:, c]
+        waiting = m & (y >= t.chopper_base_y) & (y_vel >= 0)
+        flying = m & ~waiting
+        timer = np.where(waiting, timer - 1, timer)
+        jump = waiting & (timer <= 0)
+        fall_vel = y_vel + GRAVITY
+        y_vel = np.where(waiting, np.where(jump, CHOPPER_JUMP_VELOCITY, 0.0), y_vel)
+        y_vel = np.where(flying, fall_vel, y_vel)
+        y = np.where(waiting, t.chopper_base_y, np.where(flying, y + fall_vel, y))
+        b.enemy_y[:, c] = y
+        b.enemy_y_vel[:, c] = y_vel
+        b.enemy_jump_timer[:, c] = np.where(jump, CHOPPER_JUMP_INTERVAL, timer)
+
+    if len(t.bosses):
+        _update_bosses(b, live)
+
+
+def _update_bosses(b: BatchSim, live: np.ndarray) -> None:
+    """Vectorized enemies._update_egg_piston, one branch per boss state."""
+    t = b._tables
+    c = t.bosses
+    m = live[:, None] & b.enemy_alive[:, c]
+    x = b.enemy_x[:, c]
+    y = b.enemy_y[:, c]
+    d = b.enemy_patrol_dir[:, c]
+    state = b.enemy_boss_state[:, c]
+    timer = b.enemy_boss_timer[:, c]
+    target = b.enemy_boss_target_x[:, c]
+    escalated = b.enemy_boss_escalated[:, c]
+    hit_timer = b.enemy_boss_hit_timer[:, c]
+    b.enemy_boss_hit_timer[:, c] = np.where(m & (hit_timer > 0), hit_timer - 1, hit_timer)
+    hover, ground = t.boss_hover_y, t.boss_ground_y
+
+    # IDLE: patrol at hover height, pick the landing target, then descend
+    idle = m & (state == _BOSS_IDLE)
+    ix = x + d * np.where(escalated, BOSS_IDLE_SPEED_ESC, BOSS_IDLE_SPEED)
+    right = ix >= t.boss_right_x
+    left = ~right & (ix <= t.boss_left_x)
+    ix = np.where(right, t.boss_right_x, np.where(left, t.boss_left_x, ix))
+    d = np.where(idle & right, -1, np.where(idle & left, 1, d))
+    pick = idle & (timer == BOSS_INDICATOR_LEAD)
+    target = np.where(pick, np.maximum(t.boss_left_x, np.minimum(ix, t.boss_right_x)), target)
+
+    # DESCEND: drop from hover to ground, then become vulnerable
+    descend = m & (state == _BOSS_DESCEND)
+    progress = 1.0 - (timer / BOSS_DESCEND_DURATION)
+    dy = hover + (ground - hover) * progress
+
+    # ASCEND: rise back to hover height, then idle
+    ascend = m & (state == _BOSS_ASCEND)
+    progress = 1.0 - (timer / BOSS_ASCEND_DURATION)
+    ay = ground + (hover - ground) * progress
+
+    x = np.where(idle, ix, np.where(descend, target, x))
+    y = np.where(idle, hover, np.where(descend, dy, np.where(ascend, ay, y)))
+    timer = np.where(m, timer - 1, timer)
+    done = m & (timer <= 0)
+    to_descend = done & idle
+    to_vulnerable = done & descend
+    to_ascend = done & (state == _BOSS_VULNERABLE)
+    to_idle = done & ascend
+    y = np.where(to_vulnerable, ground, np.where(to_idle, hover, y))
+    timer = np.where(to_descend, BOSS_DESCEND_DURATION, timer)
+    timer = np.where(
+        to_vulnerable,
+        np.where(escalated, BOSS_VULNERABLE_DURATION_ESC, BOSS_VULNERABLE_DURATION),
+        timer,
+    )
+    timer = np.where(to_ascend, BOSS_ASCEND_DURATION, timer)
+    timer = np.where(to_idle, BOSS_IDLE_DURATION, timer)
+    state = np.where(to_descend, _BOSS_DESCEND, state)
+    state = np.where(to_vulnerable, _BOSS_VULNERABLE, state)
+    state = np.where(to_ascend, _BOSS_ASCEND, state)
+    state = np.where(to_idle, _BOSS_IDLE, state)
+
+    b.enemy_x[:, c] = x
+    b.enemy_y[:, c] = y
+    b.enemy_patrol_dir[:, c] = d
+    b.enemy_boss_state[:, c] = state
+    b.enemy_boss_timer[:, c] = timer
+    b.enemy_boss_target_x[:, c] = target
+
+
+def _check_enemies(b: BatchSim, live: np.ndarray) -> np.ndarray:
+    """Vectorized enemies.check_enemy_collision; returns who was damaged.
+
+    Enemies are checked in stage order and a player stops at the first
+    bounce or damage, as in the scalar loop. Nothing else a hit changes
+    feeds back into later checks the same frame, so the player's rect and
+    speeds are read once.
+    """
+    t = b._tables
+    damaged = np.zeros(b.num_envs, dtype=bool)
+    if not len(t.enemy_w):
+        return damaged
+    w, h = t.enemy_w, t.enemy_h
+    ex = b.enemy_x - w / 2
+    ey = b.enemy_y - h / 2
+    hits = (
+        _vulnerable(b, live)[:, None]
+        & b.enemy_alive
+        & _overlap(_player_rect(b), ex, ey, w, h)
+    )
+    if not hits.any():
+        return damaged
+
+    spin_kill = b.is_rolling & (np.abs(b.ground_speed) >= SPINDASH_KILL_THRESHOLD)
+    # Bounce: player centre above the enemy's while rolling or descending
+    stomping = b.is_rolling | (b.y_vel > 0)
+    can_hurt = b.invulnerability_timer <= 0
+    going = np.ones(b.num_envs, dtype=bool)
+    for e in np.flatnonzero(hits.any(axis=0)).tolist():
+        m = going & hits[:, e]
+        if not m.any():
+            continue
+        above = b.y < b.enemy_y[:, e]
+        if t.is_boss[e]:
+            vulnerable = b.enemy_boss_state[:, e] == _BOSS_VULNERABLE
+            strike = m & vulnerable & spin_kill & (b.enemy_boss_hit_timer[:, e] <= 0)
+            if strike.any():
+                hp = b.enemy_boss_hp[strike, e] - 1
+                b.enemy_boss_hp[strike, e] = hp
+                b.enemy_boss_hit_timer[strike, e] = BOSS_HIT_INVULN
+                b.enemy_boss_escalated[strike, e] |= hp <= BOSS_ESCALATION_HP
+                b.enemy_alive[strike, e] = hp > 0
+            bounce = m & vulnerable & ~strike & above & stomping
+            hurt = m & ~strike & ~bounce & can_hurt
+        elif t.enemy_shielded[e]:
+            b.enemy_alive[m & spin_kill, e] = False
+            bounce = np.zeros_like(m)
+            hurt = m & ~spin_kill & can_hurt
+        else:
+            bounce = m & ~spin_kill & above & stomping
+            b.enemy_alive[m & (spin_kill | bounce), e] = False
+            hurt = m & ~spin_kill & ~bounce & can_hurt
+        b.y_vel[bounce] = ENEMY_BOUNCE_VELOCITY
+        _damage(b, hurt)
+        damaged |= hurt
+        going &= ~(bounce | hurt)
+    return damaged
+
+
+def _damage(b: BatchSim, mask: np.ndarray) -> None:
+    """Vectorized player.damage_player."""
+    hit = mask & (b.invulnerability_timer <= 0) & (b.state != _DEAD)
+    if not hit.any():
+        return
+    hurt = hit & (b.rings > 0)
+    for i in np.flatnonzero(hurt).tolist():
+        _scatter_rings(b, i)
+    b.rings[hurt] = 0
+    b.invulnerability_timer[hurt] = INVULNERABILITY_DURATION
+    b.x_vel[hurt] = np.where(b.facing_right[hurt], -HURT_KNOCKBACK_X, HURT_KNOCKBACK_X)
+    b.ground_speed[hurt] = 0.0
+    b.is_rolling[hurt] = False
+    b.is_charging_spindash[hurt] = False
+    b.state[hit] = np.where(hurt[hit], _HURT, _DEAD)
+    b.y_vel[hit] = HURT_KNOCKBACK_Y
+    b.on_ground[hit] = False
+
+
+@lru_cache(maxsize=None)
+def _scatter_fan(count: int) -> tuple[np.ndarray, np.ndarray]:
+    """(vx, vy) of player._scatter_rings' fan of *count* rings."""
+    vx, vy = [], []
+    for i in range(count):
+        angle = math.pi / 2 + (i + 1) * math.pi / (count + 1)
+        if i % 2 == 1:
+            angle = math.pi - angle
+        speed = 3.0 + (i % 4) * 0.5
+        vx.append(speed * math.cos(angle))
+        vy.append(-abs(speed * math.sin(angle)))
+    return np.array(vx), np.array(vy)
+
+
+def _scatter_rings(b: BatchSim, i: int) -> None:
+    """player._scatter_rings for player i, appended after its live rings."""
+    count = min(int(b.rings[i]), MAX_SCATTER_RINGS)
+    names = ("scatter_x", "scatter_y", "scatter_vx", "scatter_vy", "scatter_timer")
+    live = np.flatnonzero(b.scatter_timer[i] > 0)
+    used = len(live) + count
+    slots = b.scatter_timer.shape[1]
+    if used > slots:
+        grow = max(used, 2 * slots) - slots
+        for name in names:
+            old = getattr(b, name)
+            setattr(b, name, np.concatenate(
+                [old, np.zeros((b.num_envs, grow), dtype=old.dtype)], axis=1,
+            ))
+    # Keep the survivors in order at the front so slots stay oldest-first.
+    for name in names:
+        row = getattr(b, name)[i]
+        row[:len(live)] = row[live]
+        row[len(live):] = 0
+    vx, vy = _scatter_fan(count)
+    new = slice(len(live), used)
+    b.scatter_x[i, new] = b.x[i]
+    b.scatter_y[i, new] = b.y[i]
+    b.scatter_vx[i, new] = vx
+    b.scatter_vy[i, new] = vy
+    b.scatter_timer[i, new] = SCATTER_RING_LIFETIME
+
+
+def _update_scattered_rings(b: BatchSim, active: np.ndarray) -> None:
+    """Vectorized player._update_scattered_rings and _check_ring_collection."""
+    rows = np.flatnonzero(active & (b.scatter_timer > 0).any(axis=1))
+    if not len(rows):
+        return
+    timer = b.scatter_timer[rows]
+    live = timer > 0
+    vy = np.where(live, b.scatter_vy[rows] + GRAVITY, b.scatter_vy[rows])
+    x = np.where(live, b.scatter_x[rows] + b.scatter_vx[rows], b.scatter_x[rows])
+    y = np.where(live, b.scatter_y[rows] + vy, b.scatter_y[rows])
+    timer = np.where(live, timer - 1, timer)
+    dx = x - b.x[rows, None]
+    dy = y - b.y[rows, None]
+    caught = (
+        (timer > 0)
+        & (dx * dx + dy * dy < RING_COLLECTION_RADIUS * RING_COLLECTION_RADIUS)
+    )
+    b.rings[rows] += caught.sum(axis=1)
+    timer[caught] = 0
+    b.scatter_x[rows] = x
+    b.scatter_y[rows] = y
+    b.scatter_vy[rows] = vy
+    b.scatter_timer[rows] = timer
@@ -0,0 +1,254 @@
+"""speednik/desync.py — Deterministic state hashing and desync detection.
+
+Hashes the full mutable SimState (everything sim_snapshot captures) into a
+canonical digest that is identical across processes and machines, and
+records/checks traces of those digests every N frames. A trace is small
+enough to ship alongside an input log, and re-simulating against it
+reports the first checkpoint frame and the state fields that diverged.
+
+Typical use — verifying a physics rewrite is bit-exact::
+
+    trace = record_trace(create_sim("hillside"), inputs, interval=30)
+    ...  # swap implementation, or load trace on another machine
+    desync = check_trace(create_sim("hillside"), inputs, trace)
+    assert desync is None, desync
+
+No Pyxel imports.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Iterable
+
+from speednik.enemies import Enemy
+from speednik.physics import InputState
+from speednik.simulation import SimState, sim_snapshot, sim_step
+
+# Bytes per field digest. Eight is plenty to make accidental collisions
+# between two diverged states negligible.
+DIGEST_SIZE = 8
+
+
+# ---------------------------------------------------------------------------
+# Canonical encoding
+# ---------------------------------------------------------------------------
+
+def _encode(value: object) -> bytes:
+    """Stable byte encoding of a plain snapshot value.
+
+    ``repr`` of floats is the shortest exact round-trip form, so equal
+    encodings mean bit-identical values on every platform. Dicts are
+    encoded by their values (keys are dataclass field names, fixed order).
+    """
+    if isinstance(value, dict):
+        value = tuple(value.values())
+    return repr(value).encode()
+
+
+def state_fields(sim: SimState) -> dict[str, bytes]:
+    """Canonical encoding of every mutable field of *sim*, keyed by path.
+
+    Player attributes get one entry each (``player.physics.x``,
+    ``player.state``...); each enemy gets its own entry (``enemies[3]``)
+    and the remaining entity lists one entry per list.
+    """
+    snap = sim_snapshot(sim)
+    fields: dict[str, bytes] = {}
+    names = ("frame", "max_x_reached", "rings_collected", "deaths",
+             "goal_reached", "player_dead")
+    for name, value in zip(names, snap.counters):
+        fields[name] = _encode(value)
+    for name, value in snap.physics.items():
+        fields[f"player.physics.{name}"] = _encode(value)
+    for name, value in snap.player.items():
+        fields[f"player.{name}"] = _encode(value)
+    fields["player.scattered_rings"] = _encode(snap.scattered_rings)
+    fields["rings"] = _encode(snap.rings)
+    fields["springs"] = _encode(snap.springs)
+    fields["checkpoints"] = _encode(snap.checkpoints)
+    fields["liquid_zones"] = _encode(snap.liquid_zones)
+    width = len(Enemy.packed_fields)
+    for i in range(len(snap.enemies) // width):
+        fields[f"enemies[{i}]"] = _encode(snap.enemies[i * width:(i + 1) * width])
+    return fields
+
+
+def state_digests(sim: SimState) -> dict[str, bytes]:
+    """Per-field digests of *sim*, in the order of state_fields."""
+    blake = hashlib.blake2b
+    return {
+        name: blake(data, digest_size=DIGEST_SIZE).digest()
+        for name, data in state_fields(sim).items()
+    }
+
+
+def sim_hash(sim: SimState) -> str:
+    """Canonical hex digest of the full mutable state of *sim*.
+
+    Two sims hash equal iff (barring collisions) every field sim_snapshot
+    captures is identical. Terrain and static entity data are not hashed.
+    """
+    snap = sim_snapshot(sim)
+    data = repr((
+        snap.counters,
+        tuple(snap.physics.values()),
+        tuple(snap.player.values()),
+        snap.scattered_rings,
+        snap.rings,
+        snap.springs,
+        snap.checkpoints,
+        snap.liquid_zones,
+        snap.enemies,
+    )).encode()
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Hash traces
+# ---------------------------------------------------------------------------
+
+@dataclass
+class HashCheckpoint:
+    """State digests recorded at one frame."""
+
+    frame: int
+    digests: dict[str, bytes]
+
+
+@dataclass
+class HashTrace:
+    """Digests recorded every ``interval`` frames of a run (frame 0 included)."""
+
+    interval: int
+    checkpoints: list[HashCheckpoint] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (digests as hex strings)."""
+        return {
+            "interval": self.interval,
+            "checkpoints": [
+                {"frame": cp.frame,
+                 "digests": {k: v.hex() for k, v in cp.digests.items()}}
+                for cp in self.checkpoints
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> HashTrace:
+        return cls(
+            interval=int(data["interval"]),
+            checkpoints=[
+                HashCheckpoint(
+                    frame=int(cp["frame"]),
+                    digests={k: bytes.fromhex(v) for k, v in cp["digests"].items()},
+                )
+                for cp in data["checkpoints"]
+            ],
+        )
+
+
+class DesyncReason(Enum):
+    STATE = "state"    # digests differ at a checkpoint
+    LENGTH = "length"  # inputs and trace end at different frames
+
+
+@dataclass
+class Desync:
+    """First checkpoint at which a replay diverged from its trace.
+
+    For a LENGTH desync *frame* is the replay frame where the inputs and
+    the trace stopped lining up, and *fields* is empty.
+    """
+
+    frame: int
+    fields: list[str]
+    reason: DesyncReason = DesyncReason.STATE
+
+    def __str__(self) -> str:
+        if self.reason is DesyncReason.LENGTH:
+            return f"length mismatch at frame {self.frame}: inputs and trace differ"
+        return f"desync at frame {self.frame}: {', '.join(self.fields)}"
+
+
+def _diff_fields(expected: dict[str, bytes], actual: dict[str, bytes]) -> list[str]:
+    names = list(expected)
+    names += [name for name in actual if name not in expected]
+    return [name for name in names if expected.get(name) != actual.get(name)]
+
+
+def record_trace(
+    sim: SimState,
+    inputs: Iterable[InputState],
+    interval: int = 60,
+) -> HashTrace:
+    """Step *sim* through *inputs*, recording digests every *interval* frames.
+
+    Checkpoints are taken before the first step and after every
+    *interval*-th step; the final frame is always included.
+
+    Raises:
+        ValueError: If interval is not positive.
+    """
+    if interval < 1:
+        raise ValueError(f"interval must be positive, got {interval}")
+    trace = HashTrace(interval=interval)
+    trace.checkpoints.append(HashCheckpoint(sim.frame, state_digests(sim)))
+    steps = 0
+    for inp in inputs:
+        sim_step(sim, inp)
+        steps += 1
+        if steps % interval == 0:
+            trace.checkpoints.append(HashCheckpoint(sim.frame, state_digests(sim)))
+    if steps % interval:
+        trace.checkpoints.append(HashCheckpoint(sim.frame, state_digests(sim)))
+    return trace
+
+
+def check_trace(
+    sim: SimState,
+    inputs: Iterable[InputState],
+    trace: HashTrace,
+) -> Desync | None:
+    """Re-simulate *inputs* on *sim* and compare against *trace*.
+
+    Stops at the first checkpoint whose digests differ and reports its
+    frame and the fields that differ there; the true first divergent frame
+    lies in the preceding interval (record with ``interval=1`` to pin it
+    exactly). A checkpoint that doesn't fall on the replay's frame, a
+    checkpoint left over when the inputs run out, or an input beyond the
+    trace's last checkpoint is reported as a LENGTH desync. Returns None
+    if every checkpoint matches.
+    """
+    expected = iter(trace.checkpoints)
+    interval = trace.interval
+
+    def compare() -> Desync | None:
+        cp = next(expected, None)
+        if cp is None or cp.frame != sim.frame:
+            return Desync(frame=sim.frame, fields=[], reason=DesyncReason.LENGTH)
+        actual = state_digests(sim)
+        if actual != cp.digests:
+            return Desync(frame=cp.frame, fields=_diff_fields(cp.digests, actual))
+        return None
+
+    desync = compare()
+    if desync is not None:
+        return desync
+    steps = 0
+    for inp in inputs:
+        sim_step(sim, inp)
+        steps += 1
+        if steps % interval == 0:
+            desync = compare()
+            if desync is not None:
+                return desync
+    if steps % interval:
+        desync = compare()
+        if desync is not None:
+            return desync
+    if next(expected, None) is not None:
+        return Desync(frame=sim.frame, fields=[], reason=DesyncReason.LENGTH)
+    return None
@@ -60,7 +60,7 @@ class LiveBot:
         cam_x = int(self.camera.x)
         cam_y = int(self.camera.y)
         pyxel.camera(cam_x, cam_y)
-        renderer.draw_terrain(self.tiles_dict, cam_x, cam_y)
+        renderer.terrain_renderer(self.tiles_dict).draw(cam_x, cam_y)
         renderer.draw_player(self.player, self.frame)
 
 
@@ -389,7 +389,7 @@ def draw_quad_split(bots: list[LiveBot], frame_count: int) -> None:
         cam_y = int(bot.camera.y)
         pyxel.camera(cam_x - qx, cam_y - qy)
 
-        renderer.draw_terrain(bot.tiles_dict, cam_x, cam_y)
+        renderer.terrain_renderer(bot.tiles_dict).draw(cam_x, cam_y, qw, qh)
         renderer.draw_player(bot.player, frame_count)
 
         # Labels in screen space
@@ -576,7 +576,7 @@ def _draw_running() -> None:
     pyxel.camera(cam_x, cam_y)
 
     # Draw terrain from primary bot
-    renderer.draw_terrain(primary.tiles_dict, cam_x, cam_y)
+    renderer.terrain_renderer(primary.tiles_dict).draw(cam_x, cam_y)
 
     # Draw level boundary lines for BOUNDARY PATROL
     if stage.name == "BOUNDARY PATROL":
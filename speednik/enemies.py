@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from speednik.constants import (
     BOSS_ARENA_HALF_W,
@@ -41,8 +42,12 @@ from speednik.constants import (
     SPINDASH_KILL_THRESHOLD,
 )
 from speednik.objects import aabb_overlap
+from speednik.packed import packed
 from speednik.player import Player, PlayerState, damage_player, get_player_rect
 
+if TYPE_CHECKING:
+    from speednik.spatial import SpatialIndex
+
 
 # ---------------------------------------------------------------------------
 # Events
@@ -61,6 +66,11 @@ class EnemyEvent(Enum):
 # Data model
 # ---------------------------------------------------------------------------
 
+@packed(
+    "x", "y", "alive", "patrol_dir", "jump_timer", "y_vel",
+    "boss_state", "boss_timer", "boss_hp", "boss_escalated",
+    "boss_target_x", "boss_hit_timer",
+)
 @dataclass
 class Enemy:
     """An enemy entity in the world."""
@@ -109,6 +119,24 @@ def _get_enemy_rect(enemy: Enemy) -> tuple[float, float, int, int]:
     return (enemy.x - w / 2, enemy.y - h / 2, w, h)
 
 
+def enemy_x_extent(enemy: Enemy) -> tuple[float, float]:
+    """Horizontal span the enemy's hitbox can cover over its whole behavior.
+
+    Crabs patrol ±CRAB_PATROL_RANGE around their origin and the Egg Piston
+    stays inside its arena; every other type keeps its x. Used to bucket
+    enemies in the broad-phase spatial index.
+    """
+    w, _ = _HITBOX_SIZES.get(enemy.enemy_type, (16, 16))
+    lo = hi = enemy.x
+    if enemy.enemy_type == "enemy_crab":
+        lo = min(lo, enemy.origin_x - CRAB_PATROL_RANGE)
+        hi = max(hi, enemy.origin_x + CRAB_PATROL_RANGE)
+    elif enemy.enemy_type == "enemy_egg_piston":
+        lo = min(lo, enemy.boss_left_x, enemy.boss_target_x)
+        hi = max(hi, enemy.boss_right_x, enemy.boss_target_x)
+    return (lo - w / 2, hi + w / 2)
+
+
 # ---------------------------------------------------------------------------
 # Loading
 # ---------------------------------------------------------------------------
@@ -273,18 +301,30 @@ def _boss_ascend(enemy: Enemy) -> None:
 def check_enemy_collision(
     player: Player,
     enemies: list[Enemy],
+    index: SpatialIndex[Enemy] | None = None,
 ) -> list[EnemyEvent]:
-    """Check player against all alive enemies. Returns events."""
+    """Check player against all alive enemies. Returns events.
+
+    If *index* is given only enemies near the player are tested, and
+    destroyed enemies are dropped from it.
+    """
     if player.state in (PlayerState.DEAD, PlayerState.HURT):
         return []
 
     events: list[EnemyEvent] = []
-    for enemy in enemies:
+    if index is None:
+        candidates = enemies
+    else:
+        px, _, pw, _ = get_player_rect(player)
+        candidates = index.query(px, px + pw)
+    for enemy in candidates:
         if not enemy.alive:
             continue
         result = _check_single_enemy(player, enemy)
         if result is not None:
             events.extend(result)
+            if index is not None and not enemy.alive:
+                index.remove(enemy)
             # Stop checking after first hit this frame
             if any(e in (EnemyEvent.PLAYER_DAMAGED, EnemyEvent.BOUNCE) for e in result):
                 break
@@ -11,12 +11,33 @@ import numpy as np
 from gymnasium import spaces
 
 from speednik.agents.actions import NUM_ACTIONS, action_to_input
-from speednik.observation import OBS_DIM, extract_observation
+from speednik.camera import Camera, camera_update, create_camera
+from speednik.observation import (
+    OBS_DIM,
+    OBS_MODES,
+    extract_grid_observation,
+    extract_observation,
+    grid_observation_space,
+)
 from speednik.simulation import SimState, create_sim, sim_step
 
 
 class SpeednikEnv(gym.Env):
-    """Gymnasium environment for Speednik — a Sonic 2 homage."""
+    """Gymnasium environment for Speednik — a Sonic 2 homage.
+
+    With ``frame_skip=k`` each step() repeats the action for k simulation
+    frames, summing the per-frame rewards and stopping early on
+    termination or truncation; the observation and info are computed once,
+    after the last frame. ``max_steps`` always counts simulation frames.
+
+    ``obs_mode="grid"`` returns the egocentric occupancy grid of
+    speednik.observation (``grid_scale`` pixels per cell) instead of the
+    26-dim vector.
+
+    ``render_mode="rgb_array"`` makes render() return a (224, 256, 3)
+    uint8 frame drawn by the headless NumPy rasterizer (speednik.raster),
+    following a game camera that is updated every simulation frame.
+    """
 
     metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 60}
 
@@ -25,23 +46,38 @@ class SpeednikEnv(gym.Env):
         stage: str = "hillside",
         render_mode: str | None = None,
         max_steps: int = 3600,
+        frame_skip: int = 1,
+        obs_mode: str = "vector",
+        grid_scale: int = 8,
     ) -> None:
         super().__init__()
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be positive, got {frame_skip}")
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"obs_mode must be one of {OBS_MODES}, got {obs_mode!r}")
         self.stage_name = stage
         self.render_mode = render_mode
         self.max_steps = max_steps
-
-        self.observation_space = spaces.Box(
-            low=-np.inf,
-            high=np.inf,
-            shape=(OBS_DIM,),
-            dtype=np.float32,
-        )
+        self.frame_skip = frame_skip
+        self.obs_mode = obs_mode
+        self.grid_scale = grid_scale
+
+        if obs_mode == "grid":
+            self.observation_space = grid_observation_space(grid_scale)
+        else:
+            self.observation_space = spaces.Box(
+                low=-np.inf,
+                high=np.inf,
+                shape=(OBS_DIM,),
+                dtype=np.float32,
+            )
         self.action_space = spaces.Discrete(NUM_ACTIONS)
 
         self.sim: SimState | None = None
         self._step_count = 0
         self._prev_jump_held = False
+        self._camera: Camera | None = None
+        self._rasterizer = None
 
     def reset(
         self,
@@ -53,23 +89,51 @@ class SpeednikEnv(gym.Env):
         self.sim = create_sim(self.stage_name)
         self._step_count = 0
         self._prev_jump_held = False
+        if self.render_mode == "rgb_array":
+            p = self.sim.player.physics
+            self._camera = create_camera(
+                self.sim.level_width, self.sim.level_height, p.x, p.y,
+            )
         return self._get_obs(), self._get_info()
 
     def step(
         self, action: int
     ) -> tuple[np.ndarray, float, bool, bool, dict]:
-        inp = self._action_to_input(action)
-        events = sim_step(self.sim, inp)
-        self._step_count += 1
+        sim = self.sim
+        reward = 0.0
+        terminated = truncated = False
+        for _ in range(self.frame_skip):
+            inp = self._action_to_input(action)
+            events = sim_step(sim, inp)
+            if self._camera is not None:
+                camera_update(self._camera, sim.player, inp)
+            self._step_count += 1
+            reward += self._compute_reward(events)
+            terminated = bool(sim.goal_reached or sim.player_dead)
+            truncated = self._step_count >= self.max_steps
+            if terminated or truncated:
+                break
 
         obs = self._get_obs()
-        reward = self._compute_reward(events)
-        terminated = bool(self.sim.goal_reached or self.sim.player_dead)
-        truncated = self._step_count >= self.max_steps
         info = self._get_info()
 
         return obs, reward, terminated, truncated, info
 
+    def render(self) -> np.ndarray | None:
+        """The current frame as (H, W, 3) uint8 RGB in ``rgb_array`` mode.
+
+        Returns None in other modes or before the first reset().
+        """
+        if self.render_mode != "rgb_array" or self.sim is None:
+            return None
+        if self._rasterizer is None:
+            from speednik.raster import SimRasterizer
+
+            self._rasterizer = SimRasterizer(self.stage_name)
+        return self._rasterizer.render(
+            self.sim, int(self._camera.x), int(self._camera.y),
+        )
+
     def _action_to_input(self, action: int):
         inp, self._prev_jump_held = action_to_input(
             action, self._prev_jump_held
@@ -77,6 +141,8 @@ class SpeednikEnv(gym.Env):
         return inp
 
     def _get_obs(self) -> np.ndarray:
+        if self.obs_mode == "grid":
+            return extract_grid_observation(self.sim, scale=self.grid_scale)
         return extract_observation(self.sim)
 
     def _compute_reward(self, events: list) -> float:
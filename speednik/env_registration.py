@@ -4,6 +4,11 @@ Import this module to register all environments::
 
     import speednik.env_registration
     env = gymnasium.make("speednik/Hillside-v0")
+
+Every id also has a native vector entry point, so ``gymnasium.make_vec``
+builds a single SpeednikVectorEnv rather than a SyncVectorEnv of envs::
+
+    envs = gymnasium.make_vec("speednik/Hillside-v0", num_envs=64)
 """
 
 import gymnasium as gym
@@ -11,6 +16,7 @@ import gymnasium as gym
 gym.register(
     id="speednik/Hillside-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "hillside", "max_steps": 3600},
     max_episode_steps=3600,
 )
@@ -18,6 +24,7 @@ gym.register(
 gym.register(
     id="speednik/Pipeworks-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "pipeworks", "max_steps": 5400},
     max_episode_steps=5400,
 )
@@ -25,6 +32,7 @@ gym.register(
 gym.register(
     id="speednik/Skybridge-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "skybridge", "max_steps": 7200},
     max_episode_steps=7200,
 )
@@ -33,6 +41,7 @@ gym.register(
 gym.register(
     id="speednik/Hillside-NoRay-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "hillside", "max_steps": 3600, "use_raycasts": False},
     max_episode_steps=3600,
 )
@@ -40,6 +49,7 @@ gym.register(
 gym.register(
     id="speednik/Pipeworks-NoRay-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "pipeworks", "max_steps": 5400, "use_raycasts": False},
     max_episode_steps=5400,
 )
@@ -47,6 +57,52 @@ gym.register(
 gym.register(
     id="speednik/Skybridge-NoRay-v0",
     entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
     kwargs={"stage": "skybridge", "max_steps": 7200, "use_raycasts": False},
     max_episode_steps=7200,
 )
+
+# FrameSkip4 variants (each step repeats the action for 4 frames; the frame
+# budget is unchanged, so episodes are a quarter as many agent steps)
+gym.register(
+    id="speednik/Hillside-FrameSkip4-v0",
+    entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
+    kwargs={"stage": "hillside", "max_steps": 3600, "frame_skip": 4},
+    max_episode_steps=900,
+)
+
+gym.register(
+    id="speednik/Pipeworks-FrameSkip4-v0",
+    entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
+    kwargs={"stage": "pipeworks", "max_steps": 5400, "frame_skip": 4},
+    max_episode_steps=1350,
+)
+
+gym.register(
+    id="speednik/Skybridge-FrameSkip4-v0",
+    entry_point="speednik.env:SpeednikEnv",
+    vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
+    kwargs={"stage": "skybridge", "max_steps": 7200, "frame_skip": 4},
+    max_episode_steps=1800,
+)
+
+# Grid variants (egocentric occupancy-grid observations for CNN policies,
+# at 1/4 and 1/8 resolution)
+for _name, _stage, _max_steps in (
+    ("Hillside", "hillside", 3600),
+    ("Pipeworks", "pipeworks", 5400),
+    ("Skybridge", "skybridge", 7200),
+):
+    for _scale in (4, 8):
+        gym.register(
+            id=f"speednik/{_name}-Grid{_scale}-v0",
+            entry_point="speednik.env:SpeednikEnv",
+            vector_entry_point="speednik.vector_env:SpeednikVectorEnv",
+            kwargs={
+                "stage": _stage, "max_steps": _max_steps,
+                "obs_mode": "grid", "grid_scale": _scale,
+            },
+            max_episode_steps=_max_steps,
+        )
@@ -3,16 +3,33 @@
 Loads stage data from pipeline-generated JSON files (tile_map.json,
 collision.json, entities.json, meta.json) and constructs the runtime level
 representation. Unified loader for all stages.
+
+Terrain can also be compiled into a packed binary (tiles.bin) holding the
+TileGrid's arrays, derived tables included. When a compiled file newer than
+its JSON sources is present, load_stage memory-maps it and builds the grid
+on the mapped pages instead of parsing tile_map.json/collision.json.
 """
 
 from __future__ import annotations
 
 import json
+import struct
 from dataclasses import dataclass
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
+
+import numpy as np
 
-from speednik.terrain import Tile, TileLookup
+from speednik.terrain import (
+    TILE_SIZE,
+    GridTables,
+    TerrainPyramid,
+    Tile,
+    TileGrid,
+    TileLookup,
+    grid_tables,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -24,12 +41,13 @@ class StageData:
     """All runtime data for a loaded stage."""
 
     tile_lookup: TileLookup
-    tiles_dict: dict
+    tiles_dict: Mapping[tuple[int, int], Tile]
     entities: list[dict]
     player_start: tuple[float, float]
     checkpoints: list[dict]
     level_width: int
     level_height: int
+    tile_grid: Optional[TileGrid] = None
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +63,42 @@ _DATA_DIRS: dict[str, Path] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Compiled terrain format
+# ---------------------------------------------------------------------------
+
+COMPILED_FILENAME = "tiles.bin"
+
+# Header: magic, format version, tile size, rows, cols (little-endian).
+# The header is followed by the TileGrid's GridTables in field order, each
+# flat over rows * cols cells plus the trailing empty cell:
+#   heights    (n + 1, TILE_SIZE) uint8  height_array per tile
+#   angles     (n + 1,)           uint8  byte angle
+#   solidity   (n + 1,)           uint8  NOT_SOLID / TOP_ONLY / FULL / LRB_ONLY
+#   tile_type  (n + 1,)           uint8  surface type from tile_map.json
+#   occupied   (n + 1,)           uint8  1 where tile_map.json has a tile
+#   widths, left_edges, right_edges (n + 1, TILE_SIZE) int8  edge tables
+# followed by the TerrainPyramid's prefix counts (4-byte aligned, since
+# every table above is a multiple of 4 bytes):
+#   live_sums, full_sums (rows + 1, cols + 1) int32
+_COMPILED_MAGIC = b"SPKT"
+_COMPILED_VERSION = 3
+_COMPILED_HEADER = struct.Struct("<4sHHII")
+# Bytes per cell of each GridTables array, in file order.
+_COMPILED_WIDTHS = (TILE_SIZE, 1, 1, 1, 1, TILE_SIZE, TILE_SIZE, TILE_SIZE)
+_COMPILED_SIGNED = frozenset({"widths", "left_edges", "right_edges"})
+
+
+class TileArrays(NamedTuple):
+    """Dense (rows, cols) terrain arrays packed from the JSON sources."""
+
+    heights: np.ndarray
+    angles: np.ndarray
+    solidity: np.ndarray
+    tile_type: np.ndarray
+    occupied: np.ndarray
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -62,38 +116,73 @@ def load_stage(stage_name: str) -> StageData:
         ValueError: If stage_name is not recognized.
         FileNotFoundError: If stage data files are missing.
     """
-    data_dir = _DATA_DIRS.get(stage_name)
-    if data_dir is None:
-        raise ValueError(f"Unknown stage: {stage_name!r}")
+    data_dir = _data_dir(stage_name)
+
+    compiled = _compiled_path_if_fresh(data_dir)
+    if compiled is not None:
+        grid = TileGrid.from_tables(*_read_compiled(compiled))
+    else:
+        tile_map = _read_json(data_dir / "tile_map.json")
+        collision = _read_json(data_dir / "collision.json")
+        tiles = _build_tiles(tile_map, collision)
+        cols = max((len(row) for row in tile_map), default=0)
+        grid = TileGrid.from_tiles(tiles, cols=cols, rows=len(tile_map))
 
-    tile_map = _read_json(data_dir / "tile_map.json")
-    collision = _read_json(data_dir / "collision.json")
     entities = _read_json(data_dir / "entities.json")
     meta = _read_json(data_dir / "meta.json")
 
-    tiles = _build_tiles(tile_map, collision)
-
-    def tile_lookup(tx: int, ty: int) -> Optional[Tile]:
-        return tiles.get((tx, ty))
-
     ps = meta["player_start"]
     player_start = (float(ps["x"]), float(ps["y"]))
 
     return StageData(
-        tile_lookup=tile_lookup,
-        tiles_dict=tiles,
+        tile_lookup=grid.lookup,
+        tiles_dict=grid.tiles,
         entities=entities,
         player_start=player_start,
         checkpoints=meta.get("checkpoints", []),
         level_width=meta["width_px"],
         level_height=meta["height_px"],
+        tile_grid=grid,
     )
 
 
+def compile_stage(stage_name: str, out_path: Path | None = None) -> Path:
+    """Compile a stage's tile_map.json/collision.json into packed binary.
+
+    Args:
+        stage_name: One of "hillside", "pipeworks", "skybridge".
+        out_path: Destination file. Defaults to tiles.bin in the stage's
+            data directory, where load_stage picks it up.
+
+    Returns:
+        Path of the written file.
+    """
+    data_dir = _data_dir(stage_name)
+    tile_map = _read_json(data_dir / "tile_map.json")
+    collision = _read_json(data_dir / "collision.json")
+    arrays = _pack_tiles(tile_map, collision)
+    rows, cols = arrays.occupied.shape
+
+    if out_path is None:
+        out_path = data_dir / COMPILED_FILENAME
+    out_path = Path(out_path)
+    pyramid = TerrainPyramid.from_cells(arrays.heights, arrays.solidity, arrays.occupied)
+    _write_compiled(out_path, rows, cols, grid_tables(*arrays), pyramid)
+    return out_path
+
+
 # ---------------------------------------------------------------------------
 # Internal helpers
 # ---------------------------------------------------------------------------
 
+def _data_dir(stage_name: str) -> Path:
+    """Return the data directory for a stage, or raise ValueError."""
+    data_dir = _DATA_DIRS.get(stage_name)
+    if data_dir is None:
+        raise ValueError(f"Unknown stage: {stage_name!r}")
+    return data_dir
+
+
 def _build_tiles(
     tile_map: list[list],
     collision: list[list],
@@ -113,6 +202,112 @@ def _build_tiles(
     return tiles
 
 
+def _pack_tiles(tile_map: list[list], collision: list[list]) -> TileArrays:
+    """Pack tile_map and collision JSON arrays into dense uint8 arrays."""
+    rows = len(tile_map)
+    cols = max((len(row) for row in tile_map), default=0)
+    heights = np.zeros((rows, cols, TILE_SIZE), dtype=np.uint8)
+    angles = np.zeros((rows, cols), dtype=np.uint8)
+    solidity = np.zeros((rows, cols), dtype=np.uint8)
+    tile_type = np.zeros((rows, cols), dtype=np.uint8)
+    occupied = np.zeros((rows, cols), dtype=np.uint8)
+    for ty, (tm_row, col_row) in enumerate(zip(tile_map, collision)):
+        for tx, (cell, sol) in enumerate(zip(tm_row, col_row)):
+            if cell is None:
+                continue
+            heights[ty, tx] = cell["height_array"]
+            angles[ty, tx] = cell["angle"]
+            solidity[ty, tx] = sol
+            tile_type[ty, tx] = cell.get("type", 0)
+            occupied[ty, tx] = 1
+    return TileArrays(heights, angles, solidity, tile_type, occupied)
+
+
+def _write_compiled(
+    path: Path, rows: int, cols: int, tables: GridTables, pyramid: TerrainPyramid,
+) -> None:
+    """Write a grid's tables and pyramid in the compiled stage format."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_COMPILED_HEADER.pack(
+            _COMPILED_MAGIC, _COMPILED_VERSION, TILE_SIZE, rows, cols,
+        ))
+        for array in (*tables, pyramid.live_sums, pyramid.full_sums):
+            f.write(np.ascontiguousarray(array).tobytes())
+    # Atomic replace so concurrent loaders never map a half-written file.
+    tmp_path.replace(path)
+
+
+def _read_header(path: Path) -> tuple[bytes, int, int, int, int]:
+    """(magic, version, tile size, rows, cols) of a compiled stage file."""
+    with open(path, "rb") as f:
+        header = f.read(_COMPILED_HEADER.size)
+    if len(header) < _COMPILED_HEADER.size:
+        raise ValueError(f"Truncated compiled stage: {path}")
+    return _COMPILED_HEADER.unpack(header)
+
+
+def _read_compiled(path: Path) -> tuple[int, int, GridTables, TerrainPyramid]:
+    """Memory-map a compiled stage file; return (rows, cols, tables, pyramid).
+
+    The tables and the pyramid's prefix counts are read-only views of the
+    mapping, so every process that loads the same stage shares the same
+    physical pages.
+
+    Raises:
+        ValueError: If the file is not a compiled stage of a supported version.
+    """
+    magic, version, tile_size, rows, cols = _read_header(path)
+    if magic != _COMPILED_MAGIC or version != _COMPILED_VERSION:
+        raise ValueError(f"Not a compiled stage (v{_COMPILED_VERSION}): {path}")
+    if tile_size != TILE_SIZE:
+        raise ValueError(f"Compiled stage tile size {tile_size} != {TILE_SIZE}: {path}")
+
+    raw = np.memmap(path, dtype=np.uint8, mode="r")
+    cells = rows * cols + 1
+    sums_shape = (rows + 1, cols + 1)
+    sums_bytes = 4 * sums_shape[0] * sums_shape[1]
+    expected = _COMPILED_HEADER.size + cells * sum(_COMPILED_WIDTHS) + 2 * sums_bytes
+    if raw.size != expected:
+        raise ValueError(f"Compiled stage size {raw.size} != {expected}: {path}")
+
+    offset = _COMPILED_HEADER.size
+    arrays = []
+    for name, width in zip(GridTables._fields, _COMPILED_WIDTHS):
+        array = raw[offset:offset + cells * width]
+        if name in _COMPILED_SIGNED:
+            array = array.view(np.int8)
+        arrays.append(array.reshape(cells, width) if width > 1 else array)
+        offset += cells * width
+    sums = []
+    for _ in range(2):
+        sums.append(raw[offset:offset + sums_bytes].view("<i4").reshape(sums_shape))
+        offset += sums_bytes
+    return rows, cols, GridTables(*arrays), TerrainPyramid(*sums)
+
+
+def _compiled_path_if_fresh(data_dir: Path) -> Path | None:
+    """Return the compiled stage path if it exists, is not older than its
+    sources and was written in the current format version."""
+    compiled = data_dir / COMPILED_FILENAME
+    try:
+        compiled_mtime = compiled.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    for source in ("tile_map.json", "collision.json"):
+        source_path = data_dir / source
+        if source_path.exists() and source_path.stat().st_mtime_ns > compiled_mtime:
+            return None
+    try:
+        magic, version = _read_header(compiled)[:2]
+    except ValueError:
+        return None
+    if magic != _COMPILED_MAGIC or version != _COMPILED_VERSION:
+        return None
+    return compiled
+
+
 def _read_json(path: Path):
     """Read and parse a JSON file."""
     with open(path) as f:
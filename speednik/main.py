@@ -79,6 +79,7 @@ from speednik.objects import (
 from speednik.level import load_stage
 from speednik.physics import InputState
 from speednik.player import Player, PlayerState, create_player, get_player_rect, player_update
+from speednik.spatial import EntityIndex
 
 # ---------------------------------------------------------------------------
 # Stage configuration
@@ -128,6 +129,7 @@ class App:
         self.player: Player | None = None
         self.camera = None
         self.tiles_dict: dict | None = None
+        self.terrain: renderer.TerrainRenderer | None = None
         self.tile_lookup = None
         self.rings: list = []
         self.springs: list = []
@@ -135,6 +137,7 @@ class App:
         self.pipes: list = []
         self.liquid_zones: list = []
         self.enemies: list = []
+        self.entity_index: EntityIndex | None = None
         self.goal_x = 0.0
         self.goal_y = 0.0
         self.active_stage = 0
@@ -290,6 +293,7 @@ class App:
 
         self.active_stage = stage_num
         self.tiles_dict = stage.tiles_dict
+        self.terrain = renderer.TerrainRenderer(stage.tiles_dict)
         self.tile_lookup = stage.tile_lookup
 
         # Player
@@ -326,6 +330,11 @@ class App:
             ]
             self.enemies.extend(load_enemies(boss_entities))
 
+        # Broad-phase index over the entity lists above
+        self.entity_index = EntityIndex.build(
+            self.rings, self.springs, self.checkpoints, self.pipes, self.enemies,
+        )
+
         # Reset state
         self.timer_frames = 0
         self.death_timer = 0
@@ -362,7 +371,10 @@ class App:
         self.timer_frames += 1
 
         # Ring collection
-        ring_events = check_ring_collection(self.player, self.rings)
+        index = self.entity_index
+        ring_events = check_ring_collection(
+            self.player, self.rings, index.rings(self.rings),
+        )
         for event in ring_events:
             if event == RingEvent.COLLECTED:
                 play_sfx(SFX_RING)
@@ -371,19 +383,23 @@ class App:
                 self.lives += 1
 
         # Spring collision
-        spring_events = check_spring_collision(self.player, self.springs)
+        spring_events = check_spring_collision(
+            self.player, self.springs, index.springs(self.springs),
+        )
         for event in spring_events:
             if event == SpringEvent.LAUNCHED:
                 play_sfx(SFX_SPRING)
 
         # Checkpoint collision
-        cp_events = check_checkpoint_collision(self.player, self.checkpoints)
+        cp_events = check_checkpoint_collision(
+            self.player, self.checkpoints, index.checkpoints(self.checkpoints),
+        )
         for event in cp_events:
             if event == CheckpointEvent.ACTIVATED:
                 play_sfx(SFX_CHECKPOINT)
 
         # Pipe travel
-        update_pipe_travel(self.player, self.pipes)
+        update_pipe_travel(self.player, self.pipes, index.pipes(self.pipes))
 
         # Liquid zones
         liquid_events = update_liquid_zones(self.player, self.liquid_zones)
@@ -393,7 +409,9 @@ class App:
 
         # Enemy update and collision
         update_enemies(self.enemies)
-        enemy_events = check_enemy_collision(self.player, self.enemies)
+        enemy_events = check_enemy_collision(
+            self.player, self.enemies, index.enemies(self.enemies),
+        )
         for event in enemy_events:
             if event == EnemyEvent.DESTROYED:
                 play_sfx(SFX_ENEMY_DESTROY)
@@ -446,7 +464,7 @@ class App:
         cam_y = int(self.camera.y)
         pyxel.camera(cam_x, cam_y)
 
-        renderer.draw_terrain(self.tiles_dict, cam_x, cam_y)
+        self.terrain.draw(cam_x, cam_y)
 
         # Rings
         for ring in self.rings:
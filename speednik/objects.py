@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING
 
 from speednik.constants import (
     CHECKPOINT_ACTIVATION_RADIUS,
@@ -23,8 +24,12 @@ from speednik.constants import (
     SPRING_RIGHT_VELOCITY,
     SPRING_UP_VELOCITY,
 )
+from speednik.packed import packed
 from speednik.player import Player, PlayerState, damage_player, get_player_rect
 
+if TYPE_CHECKING:
+    from speednik.spatial import SpatialIndex
+
 
 # ---------------------------------------------------------------------------
 # Events
@@ -73,6 +78,7 @@ def aabb_overlap(
 # Ring entity
 # ---------------------------------------------------------------------------
 
+@packed("collected")
 @dataclass
 class Ring:
     """A ring placed in the world by the level designer."""
@@ -85,6 +91,7 @@ class Ring:
 # Spring entity
 # ---------------------------------------------------------------------------
 
+@packed("cooldown")
 @dataclass
 class Spring:
     """A directional spring that launches the player."""
@@ -98,6 +105,7 @@ class Spring:
 # Checkpoint entity
 # ---------------------------------------------------------------------------
 
+@packed("activated")
 @dataclass
 class Checkpoint:
     """A checkpoint post that saves the player's respawn point."""
@@ -125,6 +133,7 @@ class LaunchPipe:
 # Liquid zone entity
 # ---------------------------------------------------------------------------
 
+@packed("current_y", "active")
 @dataclass
 class LiquidZone:
     """A zone where liquid rises from the floor toward a ceiling."""
@@ -208,9 +217,13 @@ def load_liquid_zones(entities: list[dict]) -> list[LiquidZone]:
 def check_ring_collection(
     player: Player,
     rings: list[Ring],
+    index: SpatialIndex[Ring] | None = None,
 ) -> list[RingEvent]:
     """Check if the player collects any world rings.
 
+    If *index* is given only rings near the player are tested, and
+    collected rings are dropped from it.
+
     Returns a list of events for the caller to map to SFX/visuals.
     """
     if player.state in (PlayerState.DEAD, PlayerState.HURT):
@@ -220,13 +233,16 @@ def check_ring_collection(
     px, py = player.physics.x, player.physics.y
     radius_sq = RING_COLLECTION_RADIUS * RING_COLLECTION_RADIUS
 
-    for ring in rings:
+    candidates = rings if index is None else index.query(px, px)
+    for ring in candidates:
         if ring.collected:
             continue
         dx = ring.x - px
         dy = ring.y - py
         if dx * dx + dy * dy < radius_sq:
             ring.collected = True
+            if index is not None:
+                index.remove(ring)
             old_rings = player.rings
             player.rings += 1
             events.append(RingEvent.COLLECTED)
@@ -245,8 +261,12 @@ def check_ring_collection(
 def check_spring_collision(
     player: Player,
     springs: list[Spring],
+    index: SpatialIndex[Spring] | None = None,
 ) -> list[SpringEvent]:
-    """Check if the player hits any springs. Override velocity on contact."""
+    """Check if the player hits any springs. Override velocity on contact.
+
+    If *index* is given only springs near the player are tested.
+    """
     if player.state in (PlayerState.DEAD, PlayerState.HURT):
         return []
 
@@ -254,7 +274,8 @@ def check_spring_collision(
     px, py, pw, ph = get_player_rect(player)
     phys = player.physics
 
-    for spring in springs:
+    candidates = springs if index is None else index.query(px, px + pw)
+    for spring in candidates:
         if spring.cooldown > 0:
             continue
 
@@ -302,8 +323,12 @@ def update_spring_cooldowns(springs: list[Spring]) -> None:
 def check_checkpoint_collision(
     player: Player,
     checkpoints: list[Checkpoint],
+    index: SpatialIndex[Checkpoint] | None = None,
 ) -> list[CheckpointEvent]:
-    """Check if the player activates any checkpoints."""
+    """Check if the player activates any checkpoints.
+
+    If *index* is given only checkpoints near the player are tested.
+    """
     if player.state in (PlayerState.DEAD, PlayerState.HURT):
         return []
 
@@ -311,7 +336,8 @@ def check_checkpoint_collision(
     px, py = player.physics.x, player.physics.y
     radius_sq = CHECKPOINT_ACTIVATION_RADIUS * CHECKPOINT_ACTIVATION_RADIUS
 
-    for cp in checkpoints:
+    candidates = checkpoints if index is None else index.query(px, px)
+    for cp in candidates:
         if cp.activated:
             continue
         dx = cp.x - px
@@ -333,8 +359,13 @@ def check_checkpoint_collision(
 def update_pipe_travel(
     player: Player,
     pipes: list[LaunchPipe],
+    index: SpatialIndex[LaunchPipe] | None = None,
 ) -> list[PipeEvent]:
-    """Handle pipe entry, travel, and exit."""
+    """Handle pipe entry, travel, and exit.
+
+    If *index* is given only pipes near the player are tested for entry;
+    the exit scan always walks the full list in order.
+    """
     events: list[PipeEvent] = []
     phys = player.physics
 
@@ -371,7 +402,8 @@ def update_pipe_travel(
 
     px, py, pw, ph = get_player_rect(player)
 
-    for pipe in pipes:
+    candidates = pipes if index is None else index.query(px, px + pw)
+    for pipe in candidates:
         # Entry hitbox centered on pipe position
         ex = pipe.x - PIPE_ENTRY_HITBOX_W / 2
         ey = pipe.y - PIPE_ENTRY_HITBOX_H / 2
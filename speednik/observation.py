@@ -2,15 +2,24 @@
 
 Produces a flat numpy vector for agent consumption. Default is a
 26-dimensional vector with 7-ray terrain raycasts (T-010-17).
+
+The "grid" observation mode is an egocentric occupancy grid for CNN
+policies instead: (channels, rows, cols) cells around the player at 1/4
+or 1/8 pixel resolution, sliced out of a per-stage low-res terrain map
+(see extract_grid_observation).
 """
 
 from __future__ import annotations
 
+import math
+import weakref
+
 import numpy as np
+from gymnasium import spaces
 
-from speednik.constants import MAX_X_SPEED
+from speednik.constants import MAX_X_SPEED, SCREEN_HEIGHT, SCREEN_WIDTH
 from speednik.simulation import SimState
-from speednik.terrain import cast_terrain_ray
+from speednik.terrain import NOT_SOLID, TILE_SIZE, TileGrid, cast_terrain_ray, cast_terrain_rays
 
 OBS_DIM = 26
 OBS_DIM_BASE = 12
@@ -18,14 +27,23 @@ OBS_DIM_BASE = 12
 RAY_ANGLES = [-45, -30, -15, 0, 15, 30, 45]
 MAX_RAY_RANGE = 128.0
 
+# Ray angles for each facing, as used by extract_observation.
+_RAY_ANGLES_RIGHT = np.array(RAY_ANGLES, dtype=np.float64)
+_RAY_ANGLES_LEFT = 180.0 - _RAY_ANGLES_RIGHT
+
+# Below this many rays per grid the scalar caster beats the batched one.
+_MIN_BATCHED_RAYS = 192
+
 
 def extract_observation(
-    sim: SimState, *, use_raycasts: bool = True
+    sim: SimState, *, use_raycasts: bool = True, out: np.ndarray | None = None
 ) -> np.ndarray:
     """Extract an observation vector from the current simulation state.
 
     Returns a 26-dim vector by default (with terrain raycasts), or a 12-dim
-    vector when use_raycasts=False.
+    vector when use_raycasts=False. When *out* is given (a float32 array of
+    that length, e.g. a row of a preallocated batch), it is filled in place
+    and returned instead of allocating a new array.
 
     Layout:
         [0]  x position (normalized by level_width)
@@ -42,36 +60,248 @@ def extract_observation(
         [11] time fraction (frame / 3600.0)
         [12-25] terrain raycasts (7 rays × 2: distance, surface_angle)
     """
-    p = sim.player.physics
     obs_dim = OBS_DIM if use_raycasts else OBS_DIM_BASE
-    obs = np.zeros(obs_dim, dtype=np.float32)
-
-    # Player kinematics (6)
-    obs[0] = p.x / sim.level_width
-    obs[1] = p.y / sim.level_height
-    obs[2] = p.x_vel / MAX_X_SPEED
-    obs[3] = p.y_vel / MAX_X_SPEED
-    obs[4] = float(p.on_ground)
-    obs[5] = p.ground_speed / MAX_X_SPEED
-
-    # Player state (3)
-    obs[6] = float(p.is_rolling)
-    obs[7] = float(p.facing_right)
-    obs[8] = p.angle / 255.0
-
-    # Progress (3)
-    obs[9] = sim.max_x_reached / sim.level_width
-    obs[10] = (sim.goal_x - p.x) / sim.level_width
-    obs[11] = float(sim.frame) / 3600.0
+    if out is None:
+        out = np.empty(obs_dim, dtype=np.float32)
+    elif out.shape != (obs_dim,):
+        raise ValueError(f"out has shape {out.shape}, expected ({obs_dim},)")
+
+    p = sim.player.physics
+    out[:OBS_DIM_BASE] = _base_features(sim)
 
     # Terrain raycasts (7 rays × 2 = 14 values)
     if use_raycasts:
-        for i, angle_deg in enumerate(RAY_ANGLES):
+        i = OBS_DIM_BASE
+        for angle_deg in RAY_ANGLES:
             effective_angle = angle_deg if p.facing_right else (180 - angle_deg)
             dist, surf_angle = cast_terrain_ray(
                 sim.tile_lookup, p.x, p.y - 8, effective_angle, MAX_RAY_RANGE
             )
-            obs[12 + i * 2] = dist / MAX_RAY_RANGE
-            obs[12 + i * 2 + 1] = surf_angle / 255.0
+            out[i] = dist / MAX_RAY_RANGE
+            out[i + 1] = surf_angle / 255.0
+            i += 2
+
+    return out
+
+
+def extract_observations(
+    sims: list[SimState],
+    *,
+    use_raycasts: bool = True,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Batched extract_observation: row i of the result describes sims[i].
+
+    *out*, if given, must be a float32 array of shape (len(sims), obs_dim)
+    and is filled in place. Rays of sims that share a TileGrid are cast in
+    one vectorized pass; values match extract_observation exactly.
+    """
+    n = len(sims)
+    obs_dim = OBS_DIM if use_raycasts else OBS_DIM_BASE
+    if out is None:
+        out = np.empty((n, obs_dim), dtype=np.float32)
+    elif out.shape != (n, obs_dim):
+        raise ValueError(f"out has shape {out.shape}, expected ({n}, {obs_dim})")
+    if n == 0:
+        return out
+
+    out[:, :OBS_DIM_BASE] = [_base_features(sim) for sim in sims]
+    if not use_raycasts:
+        return out
+
+    by_grid: dict[int, list[int]] = {}
+    for i, sim in enumerate(sims):
+        grid = sim.tile_grid
+        if grid is not None and sim.tile_lookup in (grid, grid.lookup):
+            by_grid.setdefault(id(grid), []).append(i)
+        else:
+            extract_observation(sim, out=out[i])
+
+    ray_count = len(RAY_ANGLES)
+    for rows in by_grid.values():
+        if len(rows) * ray_count < _MIN_BATCHED_RAYS:
+            for i in rows:
+                extract_observation(sims[i], out=out[i])
+            continue
+        group = [sims[i] for i in rows]
+        physics = [sim.player.physics for sim in group]
+        xs = np.array([p.x for p in physics])
+        ys = np.array([p.y for p in physics]) - 8
+        facing = np.array([p.facing_right for p in physics])
+        angles = np.where(facing[:, None], _RAY_ANGLES_RIGHT, _RAY_ANGLES_LEFT)
+        dist, surf = cast_terrain_rays(
+            group[0].tile_grid, xs[:, None], ys[:, None], angles, MAX_RAY_RANGE
+        )
+        rays = np.empty((len(rows), ray_count, 2))
+        rays[:, :, 0] = dist / MAX_RAY_RANGE
+        rays[:, :, 1] = surf / 255.0
+        out[rows, OBS_DIM_BASE:] = rays.reshape(len(rows), -1)
+
+    return out
+
+
+def _base_features(sim: SimState) -> tuple[float, ...]:
+    """The 12 non-raycast observation values, in layout order."""
+    p = sim.player.physics
+    return (
+        # Player kinematics (6)
+        p.x / sim.level_width,
+        p.y / sim.level_height,
+        p.x_vel / MAX_X_SPEED,
+        p.y_vel / MAX_X_SPEED,
+        float(p.on_ground),
+        p.ground_speed / MAX_X_SPEED,
+        # Player state (3)
+        float(p.is_rolling),
+        float(p.facing_right),
+        p.angle / 255.0,
+        # Progress (3)
+        sim.max_x_reached / sim.level_width,
+        (sim.goal_x - p.x) / sim.level_width,
+        float(sim.frame) / 3600.0,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Occupancy grid observations
+# ---------------------------------------------------------------------------
+
+OBS_MODES = ("vector", "grid")
+
+# Channel order of grid observations. "solid" is the fraction of solid
+# pixels in the cell, "angle" the surface angle / 255 of the tile under
+# solid cells; the entity channels are 1.0 where such an entity's center
+# falls in the cell.
+GRID_CHANNELS = ("solid", "angle", "rings", "enemies", "springs")
+
+# Pixels per grid cell (1/4 and 1/8 resolution).
+GRID_SCALES = (4, 8)
+
+# Window size in pixels, centered on the player (one screen).
+GRID_WINDOW = (SCREEN_WIDTH, SCREEN_HEIGHT)
+
+_mips: weakref.WeakKeyDictionary[TileGrid, dict[int, np.ndarray]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def grid_shape(scale: int = 8) -> tuple[int, int, int]:
+    """(channels, rows, cols) of grid observations at *scale* px per cell.
+
+    Raises:
+        ValueError: If *scale* is not one of GRID_SCALES.
+    """
+    if scale not in GRID_SCALES:
+        raise ValueError(f"Grid scale must be one of {GRID_SCALES}, got {scale}")
+    width, height = GRID_WINDOW
+    return (len(GRID_CHANNELS), height // scale, width // scale)
+
+
+def grid_observation_space(scale: int = 8) -> spaces.Box:
+    """Box space of grid observations (all values in [0, 1])."""
+    return spaces.Box(low=0.0, high=1.0, shape=grid_shape(scale), dtype=np.float32)
+
+
+def terrain_mip(grid: TileGrid, scale: int) -> np.ndarray:
+    """Low-res (2, rows, cols) solid/angle map of *grid*, with a zero border.
+
+    Built once per grid and scale from the dense height arrays and cached
+    for the grid's lifetime. The border is one window wide on every side,
+    so a window around any in-level position is a plain slice.
+    """
+    by_scale = _mips.get(grid)
+    if by_scale is None:
+        by_scale = _mips[grid] = {}
+    mip = by_scale.get(scale)
+    if mip is None:
+        mip = by_scale[scale] = _build_terrain_mip(grid, scale)
+    return mip
+
+
+def _build_terrain_mip(grid: TileGrid, scale: int) -> np.ndarray:
+    _, win_rows, win_cols = grid_shape(scale)
+    per_tile = TILE_SIZE // scale
+    solid = (grid.occupied != 0) & (grid.solidity != NOT_SOLID)
+    heights = np.where(solid[:, :, None], grid.heights, 0).astype(np.int64)
+
+    # Solid pixels of each column inside each band of `scale` rows:
+    # column pixels [16 - h, 16) overlap band [a, a + scale).
+    band_top = np.arange(per_tile) * scale
+    top = TILE_SIZE - heights[:, :, None, :]
+    overlap = np.clip(
+        np.minimum(band_top[:, None] + scale, TILE_SIZE) - np.maximum(band_top[:, None], top),
+        0, scale,
+    )  # (rows, cols, band, column)
+    rows, cols = solid.shape
+    coverage = overlap.reshape(rows, cols, per_tile, per_tile, scale).sum(axis=-1)
+    coverage = coverage.transpose(0, 2, 1, 3).reshape(rows * per_tile, cols * per_tile)
+    coverage = coverage / float(scale * scale)
+    angle = np.repeat(np.repeat(grid.angles / 255.0, per_tile, axis=0), per_tile, axis=1)
+
+    mip = np.zeros(
+        (2, rows * per_tile + 2 * win_rows, cols * per_tile + 2 * win_cols),
+        dtype=np.float32,
+    )
+    inner = (slice(win_rows, win_rows + rows * per_tile),
+             slice(win_cols, win_cols + cols * per_tile))
+    mip[0][inner] = coverage
+    mip[1][inner] = np.where(coverage > 0, angle, 0.0)
+    return mip
+
+
+def extract_grid_observation(
+    sim: SimState, *, scale: int = 8, out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Egocentric occupancy grid around the player, as (channels, rows, cols).
+
+    Terrain channels are one slice of terrain_mip; entity channels only
+    visit entities the sim's spatial index returns for the window, so the
+    cost is proportional to the window, not the level. The player sits in
+    cell (rows // 2, cols // 2). Positions beyond the level read as empty.
+
+    Raises:
+        ValueError: If the sim has no TileGrid, *scale* is unsupported or
+            *out* has the wrong shape.
+    """
+    if sim.tile_grid is None:
+        raise ValueError("Grid observations need a sim with a TileGrid")
+    shape = grid_shape(scale)
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    elif out.shape != shape:
+        raise ValueError(f"out has shape {out.shape}, expected {shape}")
+    _, win_rows, win_cols = shape
+    mip = terrain_mip(sim.tile_grid, scale)
+
+    p = sim.player.physics
+    # Window origin in level cells, then in padded-mip cells (clamped so
+    # far out-of-level positions still slice a full window of border).
+    col0 = math.floor(p.x / scale) - win_cols // 2
+    row0 = math.floor(p.y / scale) - win_rows // 2
+    mc = min(max(col0 + win_cols, 0), mip.shape[2] - win_cols)
+    mr = min(max(row0 + win_rows, 0), mip.shape[1] - win_rows)
+    out[:2] = mip[:, mr:mr + win_rows, mc:mc + win_cols]
+    out[2:] = 0.0
+
+    x_min = col0 * scale
+    x_max = (col0 + win_cols) * scale - 1
+    index = sim.entity_index
+    if index is not None:
+        rings = index.rings(sim.rings).query(x_min, x_max)
+        enemies = index.enemies(sim.enemies).query(x_min, x_max)
+        springs = index.springs(sim.springs).query(x_min, x_max)
+    else:
+        rings, enemies, springs = sim.rings, sim.enemies, sim.springs
+    _mark_entities(out[2], (r for r in rings if not r.collected), col0, row0, scale)
+    _mark_entities(out[3], (e for e in enemies if e.alive), col0, row0, scale)
+    _mark_entities(out[4], springs, col0, row0, scale)
+    return out
+
 
-    return obs
+def _mark_entities(channel: np.ndarray, entities, col0: int, row0: int, scale: int) -> None:
+    rows, cols = channel.shape
+    for e in entities:
+        c = math.floor(e.x / scale) - col0
+        r = math.floor(e.y / scale) - row0
+        if 0 <= r < rows and 0 <= c < cols:
+            channel[r, c] = 1.0
@@ -0,0 +1,137 @@
+"""speednik/packed.py — Fixed-layout storage for mutable entity fields.
+
+Entity dataclasses mark the attributes that change during play with the
+@packed class decorator. Their values then live in one flat list shared by
+every entity of a PackedStore — a fixed-width row per entity, in list
+order — instead of each object's ``__dict__``. Capturing or rewinding the
+state of a whole entity list is a single list copy, which is what makes
+sim_snapshot()/sim_restore() cheap.
+
+An entity built on its own gets a private one-row list, so the classes
+behave like plain dataclasses outside a simulation. Pyxel-free.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+# ---------------------------------------------------------------------------
+# Field descriptor
+# ---------------------------------------------------------------------------
+
+class PackedField:
+    """Data descriptor keeping one attribute at a fixed offset of a row."""
+
+    __slots__ = ("offset", "width")
+
+    def __init__(self, offset: int, width: int) -> None:
+        self.offset = offset
+        self.width = width
+
+    def __get__(self, obj: Any, owner: type | None = None) -> Any:
+        if obj is None:
+            return self
+        return obj._values[obj._base + self.offset]
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        try:
+            obj._values[obj._base + self.offset] = value
+        except AttributeError:
+            # First assignment, from the dataclass __init__.
+            obj._values = [None] * self.width
+            obj._base = 0
+            obj._values[self.offset] = value
+
+
+def _copy_entity(self: Any) -> Any:
+    """Shallow copy with a private row, so it doesn't share the original's store."""
+    clone = object.__new__(type(self))
+    clone.__dict__.update(self.__dict__)
+    width = len(type(self).packed_fields)
+    clone._values = self._values[self._base:self._base + width]
+    clone._base = 0
+    return clone
+
+
+def packed(*names: str) -> Callable[[type[T]], type[T]]:
+    """Class decorator storing the dataclass fields *names* in a packed row.
+
+    Apply above ``@dataclass``. The field names are recorded on the class as
+    ``packed_fields``, in row order.
+    """
+    def wrap(cls: type[T]) -> type[T]:
+        for offset, name in enumerate(names):
+            setattr(cls, name, PackedField(offset, len(names)))
+        cls.packed_fields = names
+        cls.__copy__ = _copy_entity
+        return cls
+    return wrap
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class PackedStore(Generic[T]):
+    """Flat row storage for the packed fields of one entity list.
+
+    Building a store moves each entity's current values into the shared
+    list; the entities keep working as before. Replacing an item in the
+    middle of the list isn't detected by holds(), so build a new store
+    after editing a list in place.
+
+    Args:
+        entities: The list being packed. Kept by reference.
+    """
+
+    def __init__(self, entities: Sequence[T]) -> None:
+        values: list = []
+        for entity in entities:
+            width = len(type(entity).packed_fields)
+            base = entity._base
+            values.extend(entity._values[base:base + width])
+            entity._values = values
+            entity._base = len(values) - width
+        self.entities = entities
+        self.values = values
+        self._size = len(entities)
+
+    def holds(self, entities: Sequence[T]) -> bool:
+        """True if this store packs *entities* and the list hasn't grown or shrunk."""
+        if entities is not self.entities or len(entities) != self._size:
+            return False
+        return not entities or entities[-1]._values is self.values
+
+    def dump(self) -> tuple:
+        """All packed values, row after row."""
+        return tuple(self.values)
+
+    def load(self, values: Sequence) -> None:
+        """Overwrite every row with *values*, as returned by dump().
+
+        Raises:
+            ValueError: If *values* doesn't match this store's layout size.
+        """
+        if len(values) != len(self.values):
+            raise ValueError(
+                f"expected {len(self.values)} packed values, got {len(values)}"
+            )
+        self.values[:] = values
+
+    def copy(self) -> PackedStore[T]:
+        """Store over shallow copies of the entities, with its own values."""
+        clone = object.__new__(PackedStore)
+        values = self.values.copy()
+        entities = []
+        for entity in self.entities:
+            twin = object.__new__(type(entity))
+            twin.__dict__.update(entity.__dict__)
+            twin._values = values
+            entities.append(twin)
+        clone.entities = entities
+        clone.values = values
+        clone._size = len(entities)
+        return clone
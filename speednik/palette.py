@@ -0,0 +1,76 @@
+"""speednik/palette.py — 16-slot color palettes shared by all renderers.
+
+Pyxel-free: renderer.py loads these into pyxel.colors, raster.py turns
+them into RGB lookup tables.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Fixed palette slots (set once at init)
+BASE_PALETTE = {
+    0: 0x2090D0,   # Sky blue (background / cls color)
+    4: 0x3050D0,   # Player body (blue)
+    5: 0xD03030,   # Player accent (red, shoes)
+    6: 0xC04040,   # Enemy primary
+    7: 0xF0D000,   # Ring yellow
+    8: 0xE02020,   # Spring red
+    9: 0xE08020,   # Hazard orange
+    10: 0x2060E0,  # Water / liquid blue
+    11: 0xFFFFFF,  # UI white
+    12: 0x202020,  # UI dark
+}
+
+# Per-stage terrain colors (slots 1–3 terrain shades, 13–15 stage accents)
+STAGE_PALETTES: dict[str, dict[int, int]] = {
+    "hillside": {
+        1: 0x1B8C00,   # Dark green (earth)
+        2: 0x30C010,   # Mid green (surface)
+        3: 0x50E830,   # Light green (highlight)
+        13: 0x8B5E3C,  # Brown accent
+        14: 0xC49A6C,  # Light brown
+        15: 0x6B3A1E,  # Dark brown
+    },
+    "pipeworks": {
+        1: 0x1A5C5C,   # Dark teal
+        2: 0x2A8C8C,   # Mid teal
+        3: 0x40B0B0,   # Light teal
+        13: 0x505050,  # Dark gray
+        14: 0x808080,  # Mid gray
+        15: 0xA0A0A0,  # Light gray
+    },
+    "skybridge": {
+        1: 0x6090C0,   # Sky blue
+        2: 0x90B8E0,   # Light sky
+        3: 0xC0D8F0,   # Near-white blue
+        13: 0xC0C0C0,  # Light gray
+        14: 0xE0E0E0,  # Near-white
+        15: 0xFFFFFF,  # White
+    },
+    "devpark": {
+        0: 0x000000,   # Black background
+        1: 0x003300,   # Dark green (terrain fill)
+        2: 0x00AA00,   # Mid green (surface line)
+        3: 0x00FF00,   # Bright green (surface highlight)
+        4: 0x00CC00,   # Player body (green)
+        11: 0x00FF00,  # UI text (bright green)
+        13: 0x004400,  # Dark accent
+        14: 0x006600,  # Mid accent
+        15: 0x008800,  # Light accent
+    },
+}
+
+
+def palette_rgb(stage_name: str) -> np.ndarray:
+    """(16, 3) uint8 RGB table for a stage: base slots plus stage overrides.
+
+    Unknown stage names get the base palette with hillside terrain, which
+    is what init_palette leaves in place.
+    """
+    slots = dict(BASE_PALETTE)
+    slots.update(STAGE_PALETTES.get(stage_name, STAGE_PALETTES["hillside"]))
+    table = np.zeros((16, 3), dtype=np.uint8)
+    for slot, color in slots.items():
+        table[slot] = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+    return table
@@ -0,0 +1,552 @@
+"""speednik/raster.py — Headless NumPy software rasterizer.
+
+Draws a SimState the way the game's Pyxel renderer does — terrain height
+profiles, rings, springs, checkpoints, pipes, liquid, goal, enemies,
+player and HUD — into a ``(H, W, 3)`` uint8 RGB frame, with no Pyxel
+window. Used for ``render_mode="rgb_array"`` in SpeednikEnv (videos and
+pixel observations on headless machines).
+
+Drawing happens on an indexed ``(H, W)`` canvas with the 16 palette slots
+of speednik.palette; the RGB frame is one table lookup at the end.
+Terrain is the expensive part, so each unique height profile is
+rasterized once and screen-sized chunks of terrain are assembled from
+those tiles the first time they are on screen. The Pyxel TerrainRenderer
+copies the same tiles into its atlas.
+
+The primitives follow Pyxel's pixel rules (line stepping, circle and
+ellipse coverage, the built-in 4x6 font) closely enough that frames look
+like the game, but they are not guaranteed to be pixel-identical.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+from speednik.constants import SCREEN_HEIGHT, SCREEN_WIDTH, SPRING_HITBOX_H, SPRING_HITBOX_W
+from speednik.palette import palette_rgb
+from speednik.terrain import TILE_SIZE, GridTiles, Tile
+
+# Pyxel's built-in font for ASCII 32..126: 3x6 glyphs (row 6 holds
+# descenders), one bit per pixel, row-major from the top-left.
+_FONT_FIRST = 32
+_FONT_GLYPHS = (
+    0x00000, 0x12410, 0x2D000, 0x2FBE8, 0x1E790, 0x21508, 0x15570, 0x12000,
+    0x0A488, 0x224A0, 0x2AEA8, 0x02E80, 0x000A0, 0x00E00, 0x00010, 0x09520,
+    0x1DB70, 0x16490, 0x31538, 0x31470, 0x2DE48, 0x3CC70, 0x1CF78, 0x39520,
+    0x3DF78, 0x3DE70, 0x02080, 0x020A0, 0x0A888, 0x071C0, 0x222A0, 0x39410,
+    0x15B18, 0x15F68, 0x35D70, 0x1C918, 0x35B70, 0x3CF38, 0x3CF20, 0x1CF58,
+    0x2DF68, 0x3A4B8, 0x09350, 0x2DD68, 0x24938, 0x2FF68, 0x35B68, 0x15B50,
+    0x35D20, 0x15BD8, 0x35FA8, 0x1C470, 0x3A490, 0x2DB58, 0x2DB50, 0x2DFE8,
+    0x2D568, 0x2D490, 0x39538, 0x1A498, 0x24448, 0x324B0, 0x15000, 0x00038,
+    0x22000, 0x03B58, 0x26B70, 0x03918, 0x0BB58, 0x03B98, 0x0AE90, 0x03BCA,
+    0x26B68, 0x10490, 0x0826A, 0x25DA8, 0x324B8, 0x07FE8, 0x06B68, 0x02B50,
+    0x06B74, 0x03B59, 0x03920, 0x03CF0, 0x17498, 0x05B58, 0x05B50, 0x05BF8,
+    0x054A8, 0x05ACA, 0x072B8, 0x1AC98, 0x12490, 0x326B0, 0x1E000,
+)
+_FONT_WIDTH = 4  # advance per character
+
+_mask_cache: dict[tuple, np.ndarray] = {}
+
+
+def _glyph_mask(ch: str) -> np.ndarray | None:
+    key = ("glyph", ch)
+    mask = _mask_cache.get(key)
+    if mask is None:
+        code = ord(ch) - _FONT_FIRST
+        if not 0 <= code < len(_FONT_GLYPHS):
+            return None
+        bits = _FONT_GLYPHS[code]
+        mask = np.array(
+            [(bits >> (17 - i)) & 1 for i in range(18)], dtype=np.bool_,
+        ).reshape(6, 3)
+        _mask_cache[key] = mask
+    return mask
+
+
+def _circle_mask(r: int) -> np.ndarray:
+    key = ("circ", r)
+    mask = _mask_cache.get(key)
+    if mask is None:
+        d = np.arange(-r, r + 1)
+        mask = d[:, None] ** 2 + d[None, :] ** 2 < (r + 0.4) ** 2
+        _mask_cache[key] = mask
+    return mask
+
+
+def _ellipse_mask(w: int, h: int) -> np.ndarray:
+    key = ("elli", w, h)
+    mask = _mask_cache.get(key)
+    if mask is None:
+        rx = (w - 1) / 2
+        ry = (h - 1) / 2
+        xs = (np.arange(w) - rx) / (rx + 0.5)
+        ys = (np.arange(h) - ry) / (ry + 0.5)
+        mask = ys[:, None] ** 2 + xs[None, :] ** 2 <= 1.0
+        _mask_cache[key] = mask
+    return mask
+
+
+# ---------------------------------------------------------------------------
+# Canvas
+# ---------------------------------------------------------------------------
+
+class Canvas:
+    """Indexed-color drawing surface with a Pyxel-style primitive API.
+
+    Coordinates are world pixels shifted by the camera offset, as with
+    pyxel.camera(). Everything is clipped to the canvas.
+
+    Args:
+        width, height: Canvas size in pixels.
+    """
+
+    def __init__(self, width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT) -> None:
+        self.width = width
+        self.height = height
+        self.pixels = np.zeros((height, width), dtype=np.uint8)
+        self._ox = 0
+        self._oy = 0
+
+    def camera(self, x: int = 0, y: int = 0) -> None:
+        self._ox = int(x)
+        self._oy = int(y)
+
+    def cls(self, col: int) -> None:
+        self.pixels.fill(col)
+
+    def pset(self, x: float, y: float, col: int) -> None:
+        sx = round(x) - self._ox
+        sy = round(y) - self._oy
+        if 0 <= sx < self.width and 0 <= sy < self.height:
+            self.pixels[sy, sx] = col
+
+    def _fill(self, x0: int, y0: int, x1: int, y1: int, col: int) -> None:
+        """Fill the inclusive screen-space box, clipped."""
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self.width - 1)
+        y1 = min(y1, self.height - 1)
+        if x0 <= x1 and y0 <= y1:
+            self.pixels[y0:y1 + 1, x0:x1 + 1] = col
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, col: int) -> None:
+        x1 = round(x1) - self._ox
+        y1 = round(y1) - self._oy
+        x2 = round(x2) - self._ox
+        y2 = round(y2) - self._oy
+        if x1 == x2:
+            self._fill(x1, min(y1, y2), x1, max(y1, y2), col)
+            return
+        if y1 == y2:
+            self._fill(min(x1, x2), y1, max(x1, x2), y1, col)
+            return
+        # Step along the major axis in float32, rounding half away from
+        # zero, as Pyxel does.
+        if abs(x2 - x1) > abs(y2 - y1):
+            if x1 > x2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            steps = np.arange(x2 - x1 + 1, dtype=np.float32)
+            offset = steps * np.float32((y2 - y1) / np.float32(x2 - x1))
+            xs = x1 + np.arange(x2 - x1 + 1)
+            ys = y1 + (np.sign(offset) * np.floor(np.abs(offset) + 0.5)).astype(np.int64)
+        else:
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            steps = np.arange(y2 - y1 + 1, dtype=np.float32)
+            offset = steps * np.float32((x2 - x1) / np.float32(y2 - y1))
+            ys = y1 + np.arange(y2 - y1 + 1)
+            xs = x1 + (np.sign(offset) * np.floor(np.abs(offset) + 0.5)).astype(np.int64)
+        keep = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.pixels[ys[keep], xs[keep]] = col
+
+    def rect(self, x: float, y: float, w: int, h: int, col: int) -> None:
+        sx = round(x) - self._ox
+        sy = round(y) - self._oy
+        if w > 0 and h > 0:
+            self._fill(sx, sy, sx + w - 1, sy + h - 1, col)
+
+    def rectb(self, x: float, y: float, w: int, h: int, col: int) -> None:
+        if w <= 0 or h <= 0:
+            return
+        x = round(x)
+        y = round(y)
+        self.line(x, y, x + w - 1, y, col)
+        self.line(x, y + h - 1, x + w - 1, y + h - 1, col)
+        self.line(x, y, x, y + h - 1, col)
+        self.line(x + w - 1, y, x + w - 1, y + h - 1, col)
+
+    def stamp(self, x: int, y: int, mask: np.ndarray, col: int) -> None:
+        """Set *col* where *mask* is true, with its top-left at (x, y)."""
+        sx = x - self._ox
+        sy = y - self._oy
+        mh, mw = mask.shape
+        x0 = max(sx, 0)
+        y0 = max(sy, 0)
+        x1 = min(sx + mw, self.width)
+        y1 = min(sy + mh, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        region = self.pixels[y0:y1, x0:x1]
+        region[mask[y0 - sy:y1 - sy, x0 - sx:x1 - sx]] = col
+
+    def blit(self, x: int, y: int, src: np.ndarray, colkey: int | None = None) -> None:
+        """Copy an indexed image with its top-left at (x, y).
+
+        Pixels equal to *colkey* are left untouched.
+        """
+        sx = x - self._ox
+        sy = y - self._oy
+        sh, sw = src.shape
+        x0 = max(sx, 0)
+        y0 = max(sy, 0)
+        x1 = min(sx + sw, self.width)
+        y1 = min(sy + sh, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        part = src[y0 - sy:y1 - sy, x0 - sx:x1 - sx]
+        dst = self.pixels[y0:y1, x0:x1]
+        if colkey is None:
+            dst[...] = part
+        else:
+            np.copyto(dst, part, where=part != colkey)
+
+    def circ(self, x: float, y: float, r: int, col: int) -> None:
+        r = round(r)
+        self.stamp(round(x) - r, round(y) - r, _circle_mask(r), col)
+
+    def elli(self, x: float, y: float, w: int, h: int, col: int) -> None:
+        if w > 0 and h > 0:
+            self.stamp(round(x), round(y), _ellipse_mask(int(w), int(h)), col)
+
+    def tri(
+        self, x1: float, y1: float, x2: float, y2: float, x3: float, y3: float, col: int,
+    ) -> None:
+        xs = (round(x1), round(x2), round(x3))
+        ys = (round(y1), round(y2), round(y3))
+        left, top = min(xs), min(ys)
+        gx = np.arange(left, max(xs) + 1)[None, :]
+        gy = np.arange(top, max(ys) + 1)[:, None]
+
+        def edge(ax, ay, bx, by):
+            return (bx - ax) * (gy - ay) - (by - ay) * (gx - ax)
+
+        e0 = edge(xs[0], ys[0], xs[1], ys[1])
+        e1 = edge(xs[1], ys[1], xs[2], ys[2])
+        e2 = edge(xs[2], ys[2], xs[0], ys[0])
+        inside = ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)) | ((e0 <= 0) & (e1 <= 0) & (e2 <= 0))
+        self.stamp(left, top, inside, col)
+
+    def text(self, x: int, y: int, s: str, col: int) -> None:
+        for i, ch in enumerate(s):
+            mask = _glyph_mask(ch)
+            if mask is not None:
+                self.stamp(x + i * _FONT_WIDTH, y, mask, col)
+
+
+# ---------------------------------------------------------------------------
+# Terrain
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _surface_segments() -> np.ndarray:
+    """(TILE_SIZE, TILE_SIZE, TILE_SIZE, 2) bool masks of every surface line.
+
+    ``[y0, y1]`` holds the pixels of the line from (0, y0) to (1, y1).
+    """
+    masks = np.zeros((TILE_SIZE, TILE_SIZE, TILE_SIZE, 2), dtype=bool)
+    for y0 in range(TILE_SIZE):
+        for y1 in range(TILE_SIZE):
+            canvas = Canvas(2, TILE_SIZE)
+            canvas.line(0, y0, 1, y1, 1)
+            masks[y0, y1] = canvas.pixels != 0
+    return masks
+
+
+def _raster_profiles(profiles: np.ndarray) -> np.ndarray:
+    """(n, 16, 16) indexed rasters of n height profiles, as renderer._draw_tile.
+
+    Every column is filled and topped with the highlight first, then the
+    surface lines are drawn over them; all surface pixels share one color,
+    so this matches drawing column by column.
+    """
+    heights = np.asarray(profiles, dtype=np.intp).reshape(-1, TILE_SIZE)
+    tops = TILE_SIZE - heights
+    lit = heights > 0
+    rows = np.arange(TILE_SIZE)[None, :, None]
+    pixels = (lit[:, None, :] & (rows >= tops[:, None, :])).astype(np.uint8)
+    p, col = np.nonzero(lit)
+    pixels[p, tops[p, col], col] = 3
+    # Surface line from column c - 1 to c wherever both are lit.
+    ends = np.minimum(tops, TILE_SIZE - 1)  # unlit columns are masked below
+    masks = _surface_segments()[ends[:, :-1], ends[:, 1:]]
+    masks &= (lit[:, :-1] & lit[:, 1:])[:, :, None, None]
+    surface = np.zeros(pixels.shape, dtype=bool)
+    surface[:, :, :-1] = masks[..., 0].transpose(0, 2, 1)
+    surface[:, :, 1:] |= masks[..., 1].transpose(0, 2, 1)
+    pixels[surface] = 2
+    return pixels
+
+
+def _raster_profile(profile: np.ndarray) -> np.ndarray:
+    """16x16 indexed raster of one height profile."""
+    return _raster_profiles(profile)[0]
+
+
+def _unique_profiles(profiles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Like ``np.unique(profiles, axis=0, return_inverse=True)``, in any order.
+
+    Sorts each profile as two 64-bit words, which is much faster than
+    np.unique's row sort on stage-sized inputs.
+    """
+    words = np.ascontiguousarray(profiles, dtype=np.uint8).view("<u8")
+    order = np.lexsort(words.T[::-1])
+    ranked = words[order]
+    starts = np.ones(len(ranked), dtype=bool)
+    starts[1:] = (ranked[1:] != ranked[:-1]).any(axis=1)
+    inverse = np.empty(len(ranked), dtype=np.intp)
+    inverse[order] = np.cumsum(starts) - 1
+    return profiles[order[starts]], inverse
+
+
+class TerrainRaster:
+    """Chunk-cached terrain image for a dense height grid.
+
+    ``tiles[index[ty, tx]]`` is the indexed 16x16 raster of cell (tx, ty);
+    ``tiles[blank]`` is all zeros. The Pyxel TerrainRenderer fills its
+    atlas from these, so both renderers share one terrain rasterization.
+
+    Args:
+        heights: (rows, cols, TILE_SIZE) height profiles, indexed [ty, tx].
+        chunk_width, chunk_height: Chunk size in pixels (multiples of
+            TILE_SIZE; defaults to one screen).
+
+    Raises:
+        ValueError: If the chunk size is not a positive multiple of TILE_SIZE.
+    """
+
+    def __init__(
+        self,
+        heights: np.ndarray,
+        chunk_width: int = SCREEN_WIDTH,
+        chunk_height: int = SCREEN_HEIGHT,
+    ) -> None:
+        if min(chunk_width, chunk_height) <= 0 or chunk_width % TILE_SIZE \
+                or chunk_height % TILE_SIZE:
+            raise ValueError(
+                f"Chunk size must be a positive multiple of {TILE_SIZE}, "
+                f"got {chunk_width}x{chunk_height}"
+            )
+        rows, cols, _ = heights.shape
+        flat = heights.reshape(-1, TILE_SIZE)
+        filled = flat.any(axis=1)
+        profiles, inverse = _unique_profiles(flat[filled])
+        # One raster per unique non-empty profile, plus a blank one for
+        # empty cells and padding.
+        self.tiles = np.zeros((len(profiles) + 1, TILE_SIZE, TILE_SIZE), dtype=np.uint8)
+        self.tiles[:-1] = _raster_profiles(profiles)
+        self.blank = len(profiles)
+        index = np.full(rows * cols, self.blank, dtype=np.intp)
+        index[filled] = inverse.ravel()
+        self.index = index.reshape(rows, cols)
+        self.rows = rows
+        self.cols = cols
+        self.chunk_width = chunk_width
+        self.chunk_height = chunk_height
+        self.profile_count = len(profiles)
+        self._chunks: dict[tuple[int, int], np.ndarray] = {}
+
+    def chunk(self, cx: int, cy: int) -> np.ndarray:
+        """Indexed (chunk_height, chunk_width) image of chunk (cx, cy)."""
+        image = self._chunks.get((cx, cy))
+        if image is None:
+            tw = self.chunk_width // TILE_SIZE
+            th = self.chunk_height // TILE_SIZE
+            idx = np.full((th, tw), self.blank, dtype=self.index.dtype)
+            tx0, ty0 = cx * tw, cy * th
+            x0, y0 = max(tx0, 0), max(ty0, 0)
+            x1, y1 = min(tx0 + tw, self.cols), min(ty0 + th, self.rows)
+            if x0 < x1 and y0 < y1:
+                idx[y0 - ty0:y1 - ty0, x0 - tx0:x1 - tx0] = self.index[y0:y1, x0:x1]
+            image = (
+                self.tiles[idx]
+                .transpose(0, 2, 1, 3)
+                .reshape(self.chunk_height, self.chunk_width)
+            )
+            self._chunks[(cx, cy)] = image
+        return image
+
+    def draw(self, canvas: Canvas, camera_x: int, camera_y: int) -> None:
+        """Blit the chunks intersecting the canvas viewport."""
+        cw = self.chunk_width
+        ch = self.chunk_height
+        for cy in range(camera_y // ch, (camera_y + canvas.height - 1) // ch + 1):
+            if cy < 0 or cy * ch >= self.rows * TILE_SIZE:
+                continue
+            for cx in range(camera_x // cw, (camera_x + canvas.width - 1) // cw + 1):
+                if cx < 0 or cx * cw >= self.cols * TILE_SIZE:
+                    continue
+                canvas.blit(cx * cw, cy * ch, self.chunk(cx, cy), 0)
+
+
+def tile_heights(tiles: Mapping[tuple[int, int], Tile]) -> tuple[int, int, np.ndarray]:
+    """Dense height grid of a (tx, ty) -> Tile map, for TerrainRaster.
+
+    Returns ``(tx0, ty0, heights)`` with the profile of tile (tx, ty) at
+    ``heights[ty - ty0, tx - tx0]`` and zeros where there is no tile. The
+    grid starts at tile (0, 0) unless a tile lies at negative coordinates.
+    A TileGrid's tile map is read from its arrays without building Tiles.
+    """
+    if isinstance(tiles, GridTiles):
+        return 0, 0, tiles.heights()
+    if not tiles:
+        return 0, 0, np.zeros((0, 0, TILE_SIZE), dtype=np.uint8)
+    txs = [tx for tx, _ in tiles]
+    tys = [ty for _, ty in tiles]
+    tx0, ty0 = min(min(txs), 0), min(min(tys), 0)
+    heights = np.zeros(
+        (max(tys) - ty0 + 1, max(txs) - tx0 + 1, TILE_SIZE), dtype=np.uint8,
+    )
+    profiles = bytes(chain.from_iterable(t.height_array for t in tiles.values()))
+    heights[np.array(tys) - ty0, np.array(txs) - tx0] = np.frombuffer(
+        profiles, dtype=np.uint8,
+    ).reshape(-1, TILE_SIZE)
+    return tx0, ty0, heights
+
+
+# ---------------------------------------------------------------------------
+# Frame rasterizer
+# ---------------------------------------------------------------------------
+
+class SimRasterizer:
+    """Renders SimStates of one stage to RGB frames without Pyxel.
+
+    Layers and draw order match App._draw_gameplay; animation timers run
+    off ``sim.frame``. Player, enemy, ring and goal sprites are drawn by
+    speednik.renderer's own sprite functions with the Canvas as target. Destroy particles, which live in the Pyxel
+    renderer's module state, are not drawn.
+
+    Args:
+        stage_name: Stage whose terrain and palette to use.
+        width, height: Frame size in pixels.
+        hud: Draw the rings/time/lives overlay.
+    """
+
+    def __init__(
+        self,
+        stage_name: str,
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+        hud: bool = True,
+    ) -> None:
+        from speednik.simulation import get_stage_template
+
+        stage = get_stage_template(stage_name).stage
+        self.terrain = TerrainRaster(_stage_heights(stage))
+        self.palette = palette_rgb(stage_name)
+        self.canvas = Canvas(width, height)
+        self.hud = hud
+
+    def render_indexed(self, sim, camera_x: int, camera_y: int) -> np.ndarray:
+        """Draw *sim* with the viewport at (camera_x, camera_y).
+
+        Returns the (H, W) uint8 palette-index frame. The array is reused
+        by the next call.
+        """
+        from speednik import renderer
+
+        c = self.canvas
+        frame = sim.frame
+        c.cls(0)
+        c.camera(camera_x, camera_y)
+        self.terrain.draw(c, camera_x, camera_y)
+
+        # Cull everything else to the viewport plus a sprite margin.
+        x0 = camera_x - 48
+        x1 = camera_x + c.width + 48
+
+        for ring in sim.rings:
+            if not ring.collected and x0 <= ring.x <= x1:
+                renderer._draw_ring(int(ring.x), int(ring.y), frame, c)
+        for spring in sim.springs:
+            if not x0 <= spring.x <= x1:
+                continue
+            sx = int(spring.x - SPRING_HITBOX_W // 2)
+            sy = int(spring.y - SPRING_HITBOX_H // 2)
+            if spring.cooldown > 0:
+                c.rect(sx, sy + SPRING_HITBOX_H // 2, SPRING_HITBOX_W, SPRING_HITBOX_H // 2, 8)
+            else:
+                c.rect(sx, sy, SPRING_HITBOX_W, SPRING_HITBOX_H, 8)
+        for cp in sim.checkpoints:
+            if x0 <= cp.x <= x1:
+                color = 10 if cp.activated else 7
+                c.line(int(cp.x), int(cp.y), int(cp.x), int(cp.y) - 24, color)
+                c.circ(int(cp.x), int(cp.y) - 26, 3, color)
+        for pipe in sim.pipes:
+            px1 = int(min(pipe.x, pipe.exit_x))
+            py1 = int(min(pipe.y, pipe.exit_y)) - 12
+            px2 = int(max(pipe.x, pipe.exit_x))
+            py2 = int(max(pipe.y, pipe.exit_y)) + 12
+            c.rectb(px1, py1, px2 - px1, py2 - py1, 5)
+        for zone in sim.liquid_zones:
+            if zone.active and zone.current_y < zone.floor_y:
+                lx1 = int(zone.trigger_x)
+                lx2 = int(zone.exit_x)
+                ly = int(zone.current_y)
+                for row in range(int(zone.floor_y - zone.current_y)):
+                    if (ly + row + frame // 4) % 2 == 0:
+                        c.line(lx1, ly + row, lx2, ly + row, 10)
+        if sim.goal_x > 0:
+            renderer._draw_goal(int(sim.goal_x), int(sim.goal_y), frame, c)
+
+        for enemy in sim.enemies:
+            if (enemy.alive and enemy.enemy_type == "enemy_egg_piston"
+                    and enemy.boss_state in ("idle", "descend")
+                    and enemy.boss_timer <= 60 and frame % 8 >= 4):
+                bx = int(enemy.boss_target_x)
+                by = int(enemy.boss_ground_y)
+                for dy in range(0, 40, 8):
+                    c.pset(bx, by - dy, 9)
+                c.line(bx - 4, by, bx + 4, by, 9)
+        for enemy in sim.enemies:
+            if enemy.alive and x0 <= enemy.x <= x1:
+                drawer = renderer._ENTITY_DRAWERS.get(enemy.enemy_type)
+                if drawer is not None:
+                    drawer(int(enemy.x), int(enemy.y), frame, c)
+
+        player = sim.player
+        renderer.draw_player(player, frame, c)
+        for ring in player.scattered_rings:
+            col = 7 if ring.timer > 60 else 9
+            c.circ(int(ring.x), int(ring.y), 2, col)
+            if ring.timer > 60:
+                c.pset(int(ring.x), int(ring.y) - 1, 11)
+
+        if self.hud:
+            c.camera()
+            ring_col = 9 if player.rings == 0 and frame % 60 < 30 else 7
+            c.text(4, 4, f"RINGS: {player.rings}", ring_col)
+            seconds = frame // 60
+            c.text(90, 4, f"TIME: {seconds // 60}:{seconds % 60:02d}", 11)
+            c.text(200, 4, f"x{player.lives}", 11)
+        return c.pixels
+
+    def render(self, sim, camera_x: int, camera_y: int) -> np.ndarray:
+        """Draw *sim* and return a new (H, W, 3) uint8 RGB frame."""
+        return self.palette[self.render_indexed(sim, camera_x, camera_y)]
+
+
+def _stage_heights(stage) -> np.ndarray:
+    """(rows, cols, TILE_SIZE) height grid of a StageData."""
+    if stage.tile_grid is not None:
+        return stage.tile_grid.heights
+    cols = -(-stage.level_width // TILE_SIZE)
+    rows = -(-stage.level_height // TILE_SIZE)
+    heights = np.zeros((rows, cols, TILE_SIZE), dtype=np.uint8)
+    for (tx, ty), tile in stage.tiles_dict.items():
+        if 0 <= tx < cols and 0 <= ty < rows:
+            heights[ty, tx] = tile.height_array
+    return heights
@@ -9,70 +9,23 @@ from __future__ import annotations
 import math
 from dataclasses import dataclass, field
 
+import numpy as np
 import pyxel
 
 from speednik.constants import (
     SCREEN_HEIGHT,
     SCREEN_WIDTH,
 )
+from speednik.palette import BASE_PALETTE, STAGE_PALETTES
+from speednik.raster import Canvas, TerrainRaster, tile_heights
 from speednik.terrain import TILE_SIZE
 
 # ---------------------------------------------------------------------------
 # Palette
 # ---------------------------------------------------------------------------
 
-# Fixed palette slots (set once at init)
-_BASE_PALETTE = {
-    0: 0x2090D0,   # Sky blue (background / cls color)
-    4: 0x3050D0,   # Player body (blue)
-    5: 0xD03030,   # Player accent (red, shoes)
-    6: 0xC04040,   # Enemy primary
-    7: 0xF0D000,   # Ring yellow
-    8: 0xE02020,   # Spring red
-    9: 0xE08020,   # Hazard orange
-    10: 0x2060E0,  # Water / liquid blue
-    11: 0xFFFFFF,  # UI white
-    12: 0x202020,  # UI dark
-}
-
-# Per-stage terrain colors (slots 1–3 terrain shades, 13–15 stage accents)
-STAGE_PALETTES: dict[str, dict[int, int]] = {
-    "hillside": {
-        1: 0x1B8C00,   # Dark green (earth)
-        2: 0x30C010,   # Mid green (surface)
-        3: 0x50E830,   # Light green (highlight)
-        13: 0x8B5E3C,  # Brown accent
-        14: 0xC49A6C,  # Light brown
-        15: 0x6B3A1E,  # Dark brown
-    },
-    "pipeworks": {
-        1: 0x1A5C5C,   # Dark teal
-        2: 0x2A8C8C,   # Mid teal
-        3: 0x40B0B0,   # Light teal
-        13: 0x505050,  # Dark gray
-        14: 0x808080,  # Mid gray
-        15: 0xA0A0A0,  # Light gray
-    },
-    "skybridge": {
-        1: 0x6090C0,   # Sky blue
-        2: 0x90B8E0,   # Light sky
-        3: 0xC0D8F0,   # Near-white blue
-        13: 0xC0C0C0,  # Light gray
-        14: 0xE0E0E0,  # Near-white
-        15: 0xFFFFFF,  # White
-    },
-    "devpark": {
-        0: 0x000000,   # Black background
-        1: 0x003300,   # Dark green (terrain fill)
-        2: 0x00AA00,   # Mid green (surface line)
-        3: 0x00FF00,   # Bright green (surface highlight)
-        4: 0x00CC00,   # Player body (green)
-        11: 0x00FF00,  # UI text (bright green)
-        13: 0x004400,  # Dark accent
-        14: 0x006600,  # Mid accent
-        15: 0x008800,  # Light accent
-    },
-}
+# Palette tables live in speednik.palette so headless code can use them.
+_BASE_PALETTE = BASE_PALETTE
 
 
 def init_palette() -> None:
@@ -138,6 +91,144 @@ def _draw_tile(wx: int, wy: int, tile) -> None:
         prev_top = y_top
 
 
+# ---------------------------------------------------------------------------
+# Chunked terrain
+# ---------------------------------------------------------------------------
+
+# Profiles per atlas row: the atlas is 256 px wide, one 16x16 slot each.
+_ATLAS_COLUMNS = 16
+
+# Palette index -> hex digit, the pixel format of pyxel.Image.set.
+_HEX_DIGITS = np.array(list("0123456789abcdef"))
+
+# Most recently used TerrainRenderers, keyed by id() of their tiles dict.
+_TERRAIN_CACHE_SIZE = 4
+_terrain_cache: dict[int, tuple[dict, "TerrainRenderer"]] = {}
+
+
+class TerrainRenderer:
+    """Draws a static tile map by blitting pre-rasterized, screen-sized chunks.
+
+    Terrain is rasterized by raster.TerrainRaster, once per unique height
+    profile; those indexed tiles are copied into a Pyxel atlas image, and
+    the headless renderer draws from the same tiles. The drawable tiles are
+    bucketed into chunks of ``chunk_width`` x ``chunk_height`` pixels, and
+    a chunk's image is assembled from atlas slots the first time it becomes
+    visible; after that a frame costs one blt per chunk intersecting the
+    viewport instead of up to 48 primitives per visible tile. Pixels are
+    identical to draw_terrain's output.
+
+    Args:
+        tiles: dict mapping (tx, ty) -> Tile. Must not change afterwards.
+        chunk_width, chunk_height: Chunk size in pixels (multiples of
+            TILE_SIZE; defaults to one screen).
+
+    Raises:
+        ValueError: If the chunk size is not a positive multiple of TILE_SIZE.
+    """
+
+    def __init__(
+        self,
+        tiles: dict,
+        chunk_width: int = SCREEN_WIDTH,
+        chunk_height: int = SCREEN_HEIGHT,
+    ) -> None:
+        tx0, ty0, heights = tile_heights(tiles)
+        raster = TerrainRaster(heights, chunk_width, chunk_height)
+        self.chunk_width = chunk_width
+        self.chunk_height = chunk_height
+        cols = chunk_width // TILE_SIZE
+        rows = chunk_height // TILE_SIZE
+
+        # Cells whose profile has at least one lit pixel; the rest draw nothing.
+        drawable = raster.tiles.reshape(len(raster.tiles), -1).any(axis=1)
+        ys, xs = np.nonzero(drawable[raster.index])
+        # Atlas slot of each drawn profile, and of each drawn cell.
+        profiles, slot = np.unique(raster.index[ys, xs], return_inverse=True)
+        cx, ox = np.divmod(xs + tx0, cols)
+        cy, oy = np.divmod(ys + ty0, rows)
+        blits = np.stack([
+            ox * TILE_SIZE, oy * TILE_SIZE,
+            slot % _ATLAS_COLUMNS * TILE_SIZE, slot // _ATLAS_COLUMNS * TILE_SIZE,
+        ], axis=1)
+
+        # (cx, cy) -> (n, 4) rows of (px, py, atlas_u, atlas_v), px and py
+        # inside the chunk
+        order = np.lexsort((cy, cx))
+        keys, starts = np.unique(
+            np.stack([cx[order], cy[order]], axis=1), axis=0, return_index=True,
+        )
+        self._chunk_tiles: dict[tuple[int, int], np.ndarray] = {
+            key: chunk_blits
+            for key, chunk_blits in zip(
+                map(tuple, keys.tolist()), np.split(blits[order], starts[1:]),
+            )
+        }
+
+        atlas_rows = max((len(profiles) + _ATLAS_COLUMNS - 1) // _ATLAS_COLUMNS, 1)
+        self._atlas = pyxel.Image(_ATLAS_COLUMNS * TILE_SIZE, atlas_rows * TILE_SIZE)
+        for i, profile in enumerate(profiles.tolist()):
+            digits = _HEX_DIGITS[raster.tiles[profile]].tolist()
+            self._atlas.set(
+                (i % _ATLAS_COLUMNS) * TILE_SIZE,
+                (i // _ATLAS_COLUMNS) * TILE_SIZE,
+                ["".join(row) for row in digits],
+            )
+        self.profile_count = len(profiles)
+        self._chunk_images: dict[tuple[int, int], object] = {}
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of chunks containing at least one drawable tile."""
+        return len(self._chunk_tiles)
+
+    def _chunk_image(self, key: tuple[int, int]):
+        image = self._chunk_images.get(key)
+        if image is None:
+            image = pyxel.Image(self.chunk_width, self.chunk_height)
+            atlas = self._atlas
+            for px, py, u, v in self._chunk_tiles[key].tolist():
+                image.blt(px, py, atlas, u, v, TILE_SIZE, TILE_SIZE)
+            self._chunk_images[key] = image
+        return image
+
+    def draw(
+        self,
+        camera_x: int,
+        camera_y: int,
+        width: int = SCREEN_WIDTH,
+        height: int = SCREEN_HEIGHT,
+    ) -> None:
+        """Blit the chunks intersecting the viewport at (camera_x, camera_y).
+
+        width, height: viewport size in pixels (smaller for split views).
+        """
+        cw = self.chunk_width
+        ch = self.chunk_height
+        for cy in range(camera_y // ch, (camera_y + height - 1) // ch + 1):
+            for cx in range(camera_x // cw, (camera_x + width - 1) // cw + 1):
+                if (cx, cy) not in self._chunk_tiles:
+                    continue
+                image = self._chunk_image((cx, cy))
+                pyxel.blt(cx * cw, cy * ch, image, 0, 0, cw, ch, 0)
+
+
+def terrain_renderer(tiles: dict) -> TerrainRenderer:
+    """Shared TerrainRenderer for *tiles*, built on first use.
+
+    Callers holding the same tiles dict (e.g. several dev park bots on
+    one stage) share chunk images. A few recent maps are kept.
+    """
+    entry = _terrain_cache.get(id(tiles))
+    if entry is not None and entry[0] is tiles:
+        return entry[1]
+    terrain = TerrainRenderer(tiles)
+    if len(_terrain_cache) >= _TERRAIN_CACHE_SIZE:
+        del _terrain_cache[next(iter(_terrain_cache))]
+    _terrain_cache[id(tiles)] = (tiles, terrain)
+    return terrain
+
+
 def draw_level_bounds(
     level_width: int,
     level_height: int,
@@ -172,8 +263,14 @@ def draw_level_bounds(
 # Player
 # ---------------------------------------------------------------------------
 
-def draw_player(player, frame_count: int) -> None:
-    """Draw the player character based on state and animation."""
+def draw_player(player, frame_count: int, target: Canvas | None = None) -> None:
+    """Draw the player character based on state and animation.
+
+    Like the other sprite functions here, draws with pyxel unless *target*
+    is given: any object with pyxel's drawing methods, such as the
+    headless raster.Canvas.
+    """
+    g = pyxel if target is None else target
     # Invulnerability flicker
     if player.invulnerability_timer > 0 and frame_count % 4 < 2:
         return
@@ -185,66 +282,70 @@ def draw_player(player, frame_count: int) -> None:
 
     anim = player.anim_name
     if anim == "idle":
-        _draw_player_idle(cx, cy, right)
+        _draw_player_idle(cx, cy, right, g)
     elif anim == "running":
-        _draw_player_running(cx, cy, right, player.anim_frame)
+        _draw_player_running(cx, cy, right, player.anim_frame, g)
     elif anim == "rolling":
-        _draw_player_rolling(cx, cy, frame_count)
+        _draw_player_rolling(cx, cy, frame_count, g)
     elif anim == "spindash":
-        _draw_player_rolling(cx, cy, frame_count)
+        _draw_player_rolling(cx, cy, frame_count, g)
         # Dust lines behind player during spindash
         dust_dir = 1 if right else -1
         for i in range(3):
             dx = -dust_dir * (8 + i * 4)
             dy = 8 - i * 2
             if frame_count % 3 != i:
-                pyxel.pset(cx + dx, cy + dy, 11)
+                g.pset(cx + dx, cy + dy, 11)
     elif anim == "hurt":
-        _draw_player_hurt(cx, cy, right)
+        _draw_player_hurt(cx, cy, right, g)
     elif anim == "dead":
-        _draw_player_hurt(cx, cy, right)
+        _draw_player_hurt(cx, cy, right, g)
 
 
-def _draw_player_idle(cx: int, cy: int, right: bool) -> None:
+def _draw_player_idle(cx: int, cy: int, right: bool, target: Canvas | None = None) -> None:
     """Standing pose: body ellipse, limbs, circle head, dot eyes."""
+    g = pyxel if target is None else target
     d = 1 if right else -1
 
     # Body (torso ellipse) — elli uses top-left + full size
-    pyxel.elli(cx - 5, cy - 4, 10, 12, 4)
+    g.elli(cx - 5, cy - 4, 10, 12, 4)
 
     # Head
-    pyxel.circ(cx, cy - 9, 3, 4)
+    g.circ(cx, cy - 9, 3, 4)
 
     # Eyes (2px dots)
-    pyxel.pset(cx + d * 1, cy - 10, 11)
-    pyxel.pset(cx + d * 2, cy - 10, 11)
+    g.pset(cx + d * 1, cy - 10, 11)
+    g.pset(cx + d * 2, cy - 10, 11)
 
     # Arms (hanging)
-    pyxel.line(cx - 5, cy - 2, cx - 7, cy + 5, 4)
-    pyxel.line(cx + 5, cy - 2, cx + 7, cy + 5, 4)
+    g.line(cx - 5, cy - 2, cx - 7, cy + 5, 4)
+    g.line(cx + 5, cy - 2, cx + 7, cy + 5, 4)
 
     # Legs (standing straight)
-    pyxel.line(cx - 2, cy + 8, cx - 3, cy + 14, 4)
-    pyxel.line(cx + 2, cy + 8, cx + 3, cy + 14, 4)
+    g.line(cx - 2, cy + 8, cx - 3, cy + 14, 4)
+    g.line(cx + 2, cy + 8, cx + 3, cy + 14, 4)
 
     # Shoes
-    pyxel.pset(cx - 3, cy + 14, 5)
-    pyxel.pset(cx + 3, cy + 14, 5)
+    g.pset(cx - 3, cy + 14, 5)
+    g.pset(cx + 3, cy + 14, 5)
 
 
-def _draw_player_running(cx: int, cy: int, right: bool, frame: int) -> None:
+def _draw_player_running(
+    cx: int, cy: int, right: bool, frame: int, target: Canvas | None = None,
+) -> None:
     """Running with 4-frame limb animation."""
+    g = pyxel if target is None else target
     d = 1 if right else -1
 
     # Body
-    pyxel.elli(cx - 5, cy - 4, 10, 12, 4)
+    g.elli(cx - 5, cy - 4, 10, 12, 4)
 
     # Head (slightly forward)
-    pyxel.circ(cx + d * 2, cy - 9, 3, 4)
+    g.circ(cx + d * 2, cy - 9, 3, 4)
 
     # Eyes
-    pyxel.pset(cx + d * 3, cy - 10, 11)
-    pyxel.pset(cx + d * 4, cy - 10, 11)
+    g.pset(cx + d * 3, cy - 10, 11)
+    g.pset(cx + d * 4, cy - 10, 11)
 
     # Leg animation: x-offsets from center for front/back foot
     leg_offsets = [
@@ -256,164 +357,171 @@ def _draw_player_running(cx: int, cy: int, right: bool, frame: int) -> None:
     front_dx, back_dx = leg_offsets[frame % 4]
 
     # Legs
-    pyxel.line(cx, cy + 8, cx + front_dx, cy + 14, 4)
-    pyxel.line(cx, cy + 8, cx + back_dx, cy + 14, 4)
+    g.line(cx, cy + 8, cx + front_dx, cy + 14, 4)
+    g.line(cx, cy + 8, cx + back_dx, cy + 14, 4)
 
     # Shoes at foot positions
-    pyxel.pset(cx + front_dx, cy + 14, 5)
-    pyxel.pset(cx + back_dx, cy + 14, 5)
+    g.pset(cx + front_dx, cy + 14, 5)
+    g.pset(cx + back_dx, cy + 14, 5)
 
     # Arms swing opposite to legs
     arm_dx_front = -back_dx  # opposite of back leg
     arm_dx_back = -front_dx
-    pyxel.line(cx, cy - 2, cx + arm_dx_front * 0.6, cy + 3, 4)
-    pyxel.line(cx, cy - 2, cx + arm_dx_back * 0.6, cy + 3, 4)
+    g.line(cx, cy - 2, cx + arm_dx_front * 0.6, cy + 3, 4)
+    g.line(cx, cy - 2, cx + arm_dx_back * 0.6, cy + 3, 4)
 
 
-def _draw_player_rolling(cx: int, cy: int, frame_count: int) -> None:
+def _draw_player_rolling(cx: int, cy: int, frame_count: int, target: Canvas | None = None) -> None:
     """Spinning ball for rolling/jumping/spindash."""
+    g = pyxel if target is None else target
     # Main ball
-    pyxel.circ(cx, cy, 7, 4)
+    g.circ(cx, cy, 7, 4)
 
     # Rotating accent line
     angle = (frame_count * 15) % 360
     rad = math.radians(angle)
     lx = int(5 * math.cos(rad))
     ly = int(5 * math.sin(rad))
-    pyxel.line(cx - lx, cy - ly, cx + lx, cy + ly, 5)
+    g.line(cx - lx, cy - ly, cx + lx, cy + ly, 5)
 
 
-def _draw_player_hurt(cx: int, cy: int, right: bool) -> None:
+def _draw_player_hurt(cx: int, cy: int, right: bool, target: Canvas | None = None) -> None:
     """Knocked-back pose."""
+    g = pyxel if target is None else target
     d = 1 if right else -1
 
     # Body
-    pyxel.elli(cx - 5, cy - 4, 10, 12, 4)
+    g.elli(cx - 5, cy - 4, 10, 12, 4)
 
     # Head (tilted back)
-    pyxel.circ(cx - d * 2, cy - 9, 3, 4)
+    g.circ(cx - d * 2, cy - 9, 3, 4)
 
     # Eyes (X marks)
-    pyxel.pset(cx - d * 1, cy - 10, 5)
-    pyxel.pset(cx - d * 3, cy - 10, 5)
+    g.pset(cx - d * 1, cy - 10, 5)
+    g.pset(cx - d * 3, cy - 10, 5)
 
     # Arms flung out
-    pyxel.line(cx - 5, cy - 2, cx - 10, cy - 6, 4)
-    pyxel.line(cx + 5, cy - 2, cx + 10, cy - 6, 4)
+    g.line(cx - 5, cy - 2, cx - 10, cy - 6, 4)
+    g.line(cx + 5, cy - 2, cx + 10, cy - 6, 4)
 
     # Legs splayed
-    pyxel.line(cx - 2, cy + 8, cx - 6, cy + 14, 4)
-    pyxel.line(cx + 2, cy + 8, cx + 6, cy + 14, 4)
+    g.line(cx - 2, cy + 8, cx - 6, cy + 14, 4)
+    g.line(cx + 2, cy + 8, cx + 6, cy + 14, 4)
 
 
 # ---------------------------------------------------------------------------
 # Enemies
 # ---------------------------------------------------------------------------
 
-def _draw_enemy_crab(x: int, y: int, frame_count: int) -> None:
+def _draw_enemy_crab(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Crab: wide ellipse + animated line claws + legs."""
+    g = pyxel if target is None else target
     # Body
-    pyxel.elli(x - 8, y - 5, 16, 10, 6)
+    g.elli(x - 8, y - 5, 16, 10, 6)
 
     # Eyes
-    pyxel.pset(x - 3, y - 4, 11)
-    pyxel.pset(x + 3, y - 4, 11)
+    g.pset(x - 3, y - 4, 11)
+    g.pset(x + 3, y - 4, 11)
 
     # Claws (open/close animation)
     claw_open = frame_count % 30 < 15
     if claw_open:
         # Open claws
-        pyxel.line(x - 8, y - 2, x - 13, y - 5, 6)
-        pyxel.line(x - 13, y - 5, x - 11, y - 8, 6)
-        pyxel.line(x + 8, y - 2, x + 13, y - 5, 6)
-        pyxel.line(x + 13, y - 5, x + 11, y - 8, 6)
+        g.line(x - 8, y - 2, x - 13, y - 5, 6)
+        g.line(x - 13, y - 5, x - 11, y - 8, 6)
+        g.line(x + 8, y - 2, x + 13, y - 5, 6)
+        g.line(x + 13, y - 5, x + 11, y - 8, 6)
     else:
         # Closed claws
-        pyxel.line(x - 8, y - 2, x - 13, y - 4, 6)
-        pyxel.line(x - 13, y - 4, x - 12, y - 6, 6)
-        pyxel.line(x + 8, y - 2, x + 13, y - 4, 6)
-        pyxel.line(x + 13, y - 4, x + 12, y - 6, 6)
+        g.line(x - 8, y - 2, x - 13, y - 4, 6)
+        g.line(x - 13, y - 4, x - 12, y - 6, 6)
+        g.line(x + 8, y - 2, x + 13, y - 4, 6)
+        g.line(x + 13, y - 4, x + 12, y - 6, 6)
 
     # Legs
     for dx in (-5, -2, 2, 5):
-        pyxel.line(x + dx, y + 5, x + dx, y + 8, 6)
+        g.line(x + dx, y + 5, x + dx, y + 8, 6)
 
 
-def _draw_enemy_buzzer(x: int, y: int, frame_count: int) -> None:
+def _draw_enemy_buzzer(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Buzzer: circle body + flapping triangle wings + stinger."""
+    g = pyxel if target is None else target
     # Body
-    pyxel.circ(x, y, 5, 6)
+    g.circ(x, y, 5, 6)
 
     # Eyes
-    pyxel.pset(x - 2, y - 1, 11)
-    pyxel.pset(x + 2, y - 1, 11)
+    g.pset(x - 2, y - 1, 11)
+    g.pset(x + 2, y - 1, 11)
 
     # Wings (flap animation)
     wing_up = frame_count % 20 < 10
     wy = y - 8 if wing_up else y - 4
-    pyxel.tri(x - 5, y - 3, x - 12, wy, x - 5, y, 9)
-    pyxel.tri(x + 5, y - 3, x + 12, wy, x + 5, y, 9)
+    g.tri(x - 5, y - 3, x - 12, wy, x - 5, y, 9)
+    g.tri(x + 5, y - 3, x + 12, wy, x + 5, y, 9)
 
     # Stinger
-    pyxel.line(x, y + 5, x, y + 9, 9)
-    pyxel.pset(x, y + 9, 8)
+    g.line(x, y + 5, x, y + 9, 9)
+    g.pset(x, y + 9, 8)
 
 
-def _draw_enemy_chopper(x: int, y: int, frame_count: int) -> None:
+def _draw_enemy_chopper(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Chopper: elongated ellipse + mouth animation."""
+    g = pyxel if target is None else target
     # Body
-    pyxel.elli(x - 4, y - 8, 8, 16, 6)
+    g.elli(x - 4, y - 8, 8, 16, 6)
 
     # Eyes
-    pyxel.pset(x - 2, y - 4, 11)
-    pyxel.pset(x + 2, y - 4, 11)
+    g.pset(x - 2, y - 4, 11)
+    g.pset(x + 2, y - 4, 11)
 
     # Mouth (open/close)
     mouth_open = frame_count % 24 < 12
     if mouth_open:
-        pyxel.line(x - 3, y, x + 3, y, 12)
+        g.line(x - 3, y, x + 3, y, 12)
     else:
-        pyxel.pset(x, y, 12)
+        g.pset(x, y, 12)
 
 
-def _draw_enemy_guardian(x: int, y: int, frame_count: int) -> None:
+def _draw_enemy_guardian(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Guardian: large shielded rectangle."""
+    g = pyxel if target is None else target
     # Shield (outer)
-    pyxel.rectb(x - 12, y - 14, 24, 28, 9)
+    g.rectb(x - 12, y - 14, 24, 28, 9)
 
     # Body
-    pyxel.rect(x - 10, y - 12, 20, 24, 6)
+    g.rect(x - 10, y - 12, 20, 24, 6)
 
     # Eyes
-    pyxel.pset(x - 3, y - 6, 11)
-    pyxel.pset(x + 3, y - 6, 11)
+    g.pset(x - 3, y - 6, 11)
+    g.pset(x + 3, y - 6, 11)
 
     # Shield flash
     if frame_count % 40 < 5:
-        pyxel.rectb(x - 12, y - 14, 24, 28, 11)
+        g.rectb(x - 12, y - 14, 24, 28, 11)
 
 
-def _draw_enemy_egg_piston(x: int, y: int, frame_count: int) -> None:
+def _draw_enemy_egg_piston(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Egg Piston boss: cockpit + armor + piston."""
+    g = pyxel if target is None else target
     # Piston base
-    pyxel.rect(x - 8, y + 6, 16, 10, 12)
+    g.rect(x - 8, y + 6, 16, 10, 12)
 
     # Armor body
-    pyxel.rect(x - 10, y - 8, 20, 16, 6)
+    g.rect(x - 10, y - 8, 20, 16, 6)
 
     # Cockpit (dome)
-    pyxel.elli(x - 6, y - 14, 12, 8, 9)
+    g.elli(x - 6, y - 14, 12, 8, 9)
 
     # Cockpit glass
-    pyxel.elli(x - 4, y - 12, 8, 5, 10)
+    g.elli(x - 4, y - 12, 8, 5, 10)
 
     # Eyes inside cockpit
-    pyxel.pset(x - 2, y - 10, 12)
-    pyxel.pset(x + 2, y - 10, 12)
+    g.pset(x - 2, y - 10, 12)
+    g.pset(x + 2, y - 10, 12)
 
     # Piston detail lines
-    pyxel.line(x - 6, y + 8, x - 6, y + 14, 11)
-    pyxel.line(x + 6, y + 8, x + 6, y + 14, 11)
+    g.line(x - 6, y + 8, x - 6, y + 14, 11)
+    g.line(x + 6, y + 8, x + 6, y + 14, 11)
 
 
 def draw_boss_indicator(x: int, ground_y: int, frame_count: int) -> None:
@@ -442,15 +550,16 @@ _ENTITY_DRAWERS: dict[str, callable] = {
 # Objects
 # ---------------------------------------------------------------------------
 
-def _draw_ring(x: int, y: int, frame_count: int) -> None:
+def _draw_ring(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Ring: yellow circle with rotating highlight."""
-    pyxel.circ(x, y, 3, 7)
+    g = pyxel if target is None else target
+    g.circ(x, y, 3, 7)
     # Rotating highlight line
     angle = (frame_count * 8) % 360
     rad = math.radians(angle)
     lx = int(2 * math.cos(rad))
     ly = int(2 * math.sin(rad))
-    pyxel.line(x - lx, y - ly, x + lx, y + ly, 11)
+    g.line(x - lx, y - ly, x + lx, y + ly, 11)
 
 
 def _draw_spring(x: int, y: int, frame_count: int) -> None:
@@ -485,15 +594,16 @@ def _draw_checkpoint(x: int, y: int, frame_count: int) -> None:
     pyxel.elli(x - half_w, y - 24, half_w * 2, 6, 7)
 
 
-def _draw_goal(x: int, y: int, frame_count: int) -> None:
+def _draw_goal(x: int, y: int, frame_count: int, target: Canvas | None = None) -> None:
     """Goal post: tall post with spinning sign."""
+    g = pyxel if target is None else target
     # Post
-    pyxel.line(x, y, x, y - 32, 11)
+    g.line(x, y, x, y - 32, 11)
     # Spinning sign (compress width to simulate rotation)
     angle = (frame_count * 4) % 360
     half_w = max(1, int(abs(8 * math.cos(math.radians(angle)))))
-    pyxel.rect(x - half_w, y - 32, half_w * 2, 8, 7)
-    pyxel.rectb(x - half_w, y - 32, half_w * 2, 8, 12)
+    g.rect(x - half_w, y - 32, half_w * 2, 8, 7)
+    g.rectb(x - half_w, y - 32, half_w * 2, 8, 12)
 
 
 # Object type → draw function mapping
@@ -3,15 +3,42 @@
 from speednik.scenarios.conditions import (
     VALID_FAILURE_TYPES,
     VALID_SUCCESS_TYPES,
+    ConditionEvaluator,
+    ConditionPlan,
     FailureCondition,
     StartOverride,
     SuccessCondition,
     check_conditions,
 )
-from speednik.scenarios.loader import ScenarioDef, load_scenario, load_scenarios
-from speednik.scenarios.runner import FrameRecord, ScenarioOutcome, run_scenario
+from speednik.scenarios.loader import (
+    ScenarioDef,
+    SweepDef,
+    load_scenario,
+    load_scenarios,
+    load_sweep,
+)
+from speednik.scenarios.runner import (
+    FrameRecord,
+    ScenarioOutcome,
+    run_scenario,
+    run_scenarios_lockstep,
+)
+from speednik.scenarios.trajectory import Trajectory
 from speednik.scenarios.compare import compare_results
-from speednik.scenarios.output import print_outcome, print_summary, save_results
+from speednik.scenarios.output import (
+    ResultStream,
+    iter_results,
+    print_outcome,
+    print_summary,
+    save_results,
+)
+from speednik.scenarios.replay import (
+    Replay,
+    replay_metrics,
+    replay_sim,
+    replay_trajectory,
+    run_replay,
+)
 
 __all__ = [
     "VALID_SUCCESS_TYPES",
@@ -20,14 +47,27 @@ __all__ = [
     "FailureCondition",
     "StartOverride",
     "check_conditions",
+    "ConditionPlan",
+    "ConditionEvaluator",
     "ScenarioDef",
     "load_scenario",
     "load_scenarios",
+    "SweepDef",
+    "load_sweep",
     "FrameRecord",
+    "Trajectory",
     "ScenarioOutcome",
     "run_scenario",
+    "run_scenarios_lockstep",
     "print_outcome",
     "print_summary",
     "save_results",
+    "ResultStream",
+    "iter_results",
     "compare_results",
+    "Replay",
+    "replay_sim",
+    "run_replay",
+    "replay_trajectory",
+    "replay_metrics",
 ]
@@ -6,18 +6,72 @@ Usage::
     uv run python -m speednik.scenarios.cli --all
     uv run python -m speednik.scenarios.cli --all --agent hold_right
     uv run python -m speednik.scenarios.cli --all -o results/run_001.json
+    uv run python -m speednik.scenarios.cli --all --jobs 8
+    uv run python -m speednik.scenarios.cli scenarios/eval/*.yaml --lockstep
+    uv run python -m speednik.scenarios.cli --all -o results/run.ndjson --trajectory-npz
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
+from typing import Callable
 
-from speednik.scenarios.loader import load_scenarios
+from speednik.scenarios.loader import ScenarioDef, load_scenarios
 from speednik.scenarios.compare import compare_results
-from speednik.scenarios.output import print_outcome, print_summary, save_results
-from speednik.scenarios.runner import run_scenario
+from speednik.scenarios.output import (
+    ResultStream,
+    is_stream_path,
+    print_outcome,
+    print_summary,
+    save_results,
+)
+from speednik.scenarios.runner import ScenarioOutcome, run_scenario, run_scenarios_lockstep
+from speednik.scenarios.trajectory import Trajectory
+from speednik.simulation import get_stage_template
+
+
+def _run_in_worker(scenario_def: ScenarioDef, keep_trajectory: bool) -> ScenarioOutcome:
+    outcome = run_scenario(scenario_def)
+    if not keep_trajectory:
+        # Don't send the per-frame columns back if nobody saves them.
+        outcome.trajectory = Trajectory(capacity=1)
+    return outcome
+
+
+def run_scenarios_parallel(
+    scenario_defs: list[ScenarioDef],
+    jobs: int,
+    *,
+    keep_trajectory: bool = True,
+    on_outcome: Callable[[ScenarioOutcome], None] | None = None,
+) -> list[ScenarioOutcome]:
+    """Run scenarios across a pool of *jobs* worker processes.
+
+    *on_outcome* is called in the parent as each scenario finishes (in
+    completion order); the returned list is in *scenario_defs* order.
+
+    Stage templates are loaded in the parent first so forked workers
+    inherit them; under spawn each worker loads a stage on first use and
+    reuses it through the per-process stage cache.
+    """
+    for stage in dict.fromkeys(d.stage for d in scenario_defs):
+        get_stage_template(stage)
+
+    results: list[ScenarioOutcome | None] = [None] * len(scenario_defs)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(_run_in_worker, scenario_def, keep_trajectory): i
+            for i, scenario_def in enumerate(scenario_defs)
+        }
+        for future in as_completed(futures):
+            outcome = future.result()
+            results[futures[future]] = outcome
+            if on_outcome is not None:
+                on_outcome(outcome)
+    return results  # type: ignore[return-value]
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -33,37 +87,93 @@ def main(argv: list[str] | None = None) -> None:
         "--agent", help="Override agent for all scenarios",
     )
     parser.add_argument(
-        "--output", "-o", help="Output file path for results JSON",
+        "--output", "-o",
+        help="Output file path for results JSON (.ndjson/.jsonl streams "
+        "one result per line as scenarios finish)",
     )
     parser.add_argument(
         "--trajectory", action="store_true",
         help="Include per-frame trajectory in JSON output",
     )
+    parser.add_argument(
+        "--trajectory-npz", action="store_true",
+        help="Write trajectories as .npz sidecar files next to an "
+        ".ndjson/.jsonl output instead of inline",
+    )
     parser.add_argument(
         "--compare", help="Compare against baseline results JSON",
     )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Run scenarios in N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--lockstep", action="store_true",
+        help="Step all scenarios together, batching policy inference per frame",
+    )
     args = parser.parse_args(argv)
 
     # Must specify scenarios or --all
     if not args.scenarios and not args.all:
         parser.print_usage()
         sys.exit(2)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.lockstep and args.jobs > 1:
+        parser.error("--lockstep and --jobs are mutually exclusive")
+    if args.trajectory_npz:
+        if not (args.output and is_stream_path(args.output)):
+            parser.error("--trajectory-npz requires an .ndjson or .jsonl --output")
+        args.trajectory = True
 
     paths = [Path(s) for s in args.scenarios] if args.scenarios else None
     scenario_defs = load_scenarios(paths=paths, run_all=args.all)
 
-    results = []
-    for scenario_def in scenario_defs:
-        if args.agent:
+    if args.agent:
+        for scenario_def in scenario_defs:
             scenario_def.agent = args.agent
             scenario_def.agent_params = None
-        outcome = run_scenario(scenario_def)
-        results.append(outcome)
+
+    stream: ResultStream | None = None
+    if args.output and is_stream_path(args.output):
+        stream = ResultStream(
+            args.output,
+            include_trajectory=args.trajectory,
+            sidecar=args.trajectory_npz,
+        )
+
+    def on_outcome(outcome: ScenarioOutcome) -> None:
         print_outcome(outcome)
+        if stream is not None:
+            stream.write(outcome)
+            # Already on disk; only metrics are needed from here on.
+            outcome.trajectory = Trajectory(capacity=1)
+
+    try:
+        if args.lockstep:
+            results = run_scenarios_lockstep(scenario_defs)
+            for outcome in results:
+                on_outcome(outcome)
+        elif args.jobs > 1 and len(scenario_defs) > 1:
+            results = run_scenarios_parallel(
+                scenario_defs,
+                min(args.jobs, len(scenario_defs)),
+                keep_trajectory=bool(args.output and args.trajectory),
+                on_outcome=on_outcome,
+            )
+        else:
+            results = []
+            for scenario_def in scenario_defs:
+                outcome = run_scenario(scenario_def)
+                results.append(outcome)
+                on_outcome(outcome)
+    finally:
+        if stream is not None:
+            stream.close()
 
     print_summary(results)
 
-    if args.output:
+    if args.output and stream is None:
         save_results(results, args.output, include_trajectory=args.trajectory)
 
     if args.compare:
@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from speednik.scenarios.output import iter_results
+
 if TYPE_CHECKING:
     from speednik.scenarios.runner import ScenarioOutcome
 
@@ -193,16 +194,18 @@ def compare_results(
 ) -> int:
     """Load a baseline JSON and print a comparison against current results.
 
+    The baseline may be a JSON array or an NDJSON stream; it is read one
+    result at a time with iter_results, so trajectories (inline or
+    sidecar) are never decoded.
+
     Returns an exit code:
     - ``0``: no regressions
     - ``1``: a scenario flipped from PASS to FAIL
     - ``2``: significant metric regressions (above threshold) but no status flips
     """
-    baseline_path = Path(baseline_path)
-    with open(baseline_path) as f:
-        baseline_data = json.load(f)
-
-    baseline_by_name: dict[str, dict] = {e["name"]: e for e in baseline_data}
+    baseline_by_name: dict[str, dict] = {
+        e["name"]: e for e in iter_results(Path(baseline_path))
+    }
     current_by_name: dict[str, ScenarioOutcome] = {o.name: o for o in current}
 
     # --- Status changes ---
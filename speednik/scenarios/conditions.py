@@ -1,9 +1,17 @@
-"""speednik/scenarios/conditions — Condition dataclasses and runtime checker."""
+"""speednik/scenarios/conditions — Condition dataclasses and runtime checker.
+
+check_conditions evaluates conditions statelessly against the trajectory.
+The scenario runner instead compiles a ConditionPlan once per scenario
+and gives every run its own ConditionEvaluator, which keeps running state
+(sliding min/max of x for ``stuck``) so every condition costs O(1) per
+frame.
+"""
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
 
 if TYPE_CHECKING:
     from speednik.simulation import SimState
@@ -26,6 +34,10 @@ VALID_FAILURE_TYPES: frozenset[str] = frozenset(
     }
 )
 
+# Defaults for the ``stuck`` failure condition.
+DEFAULT_STUCK_WINDOW = 120
+DEFAULT_STUCK_TOLERANCE = 2.0
+
 
 @dataclass
 class SuccessCondition:
@@ -105,12 +117,15 @@ def _check_failure(
             return False, "player_dead"
 
     elif cond.type == "stuck":
-        window = cond.window or 120
-        tolerance = cond.tolerance or 2.0
+        window = cond.window or DEFAULT_STUCK_WINDOW
+        tolerance = cond.tolerance or DEFAULT_STUCK_TOLERANCE
         if len(trajectory) >= window:
-            recent = trajectory[-window:]
-            xs = [r.x for r in recent]
-            spread = max(xs) - min(xs)
+            if hasattr(trajectory, "tail"):
+                xs = trajectory.tail("x", window)
+                spread = float(xs.max() - xs.min())
+            else:
+                xs = [r.x for r in trajectory[-window:]]
+                spread = max(xs) - min(xs)
             if spread < tolerance:
                 return False, "stuck"
 
@@ -146,3 +161,192 @@ def check_conditions(
         return result, reason
 
     return None, None
+
+
+# ---------------------------------------------------------------------------
+# Incremental evaluation
+# ---------------------------------------------------------------------------
+
+class SlidingRange:
+    """Running min and max of the last ``window`` pushed values.
+
+    Keeps monotonic deques of candidate minima and maxima, so push() is
+    amortized O(1) and min/max are O(1) regardless of the window size.
+
+    Raises:
+        ValueError: If window is not positive.
+    """
+
+    def __init__(self, window: int) -> None:
+        if window < 1:
+            raise ValueError(f"window must be positive, got {window}")
+        self.window = window
+        self.count = 0
+        self._mins: deque[tuple[int, float]] = deque()
+        self._maxs: deque[tuple[int, float]] = deque()
+
+    def reset(self) -> None:
+        self.count = 0
+        self._mins.clear()
+        self._maxs.clear()
+
+    def push(self, value: float) -> None:
+        i = self.count
+        mins, maxs = self._mins, self._maxs
+        while mins and mins[-1][1] >= value:
+            mins.pop()
+        mins.append((i, value))
+        while maxs and maxs[-1][1] <= value:
+            maxs.pop()
+        maxs.append((i, value))
+        oldest = i - self.window
+        if mins[0][0] <= oldest:
+            mins.popleft()
+        if maxs[0][0] <= oldest:
+            maxs.popleft()
+        self.count = i + 1
+
+    @property
+    def full(self) -> bool:
+        """True once at least ``window`` values have been pushed."""
+        return self.count >= self.window
+
+    @property
+    def min(self) -> float:
+        return self._mins[0][1]
+
+    @property
+    def max(self) -> float:
+        return self._maxs[0][1]
+
+    def spread(self) -> float:
+        """max - min over the current window (0.0 if nothing was pushed)."""
+        if not self.count:
+            return 0.0
+        return self._maxs[0][1] - self._mins[0][1]
+
+
+class StuckDetector:
+    """Incremental form of the ``stuck`` failure condition.
+
+    Fires once a full window of x positions spans less than *tolerance*.
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_STUCK_WINDOW,
+        tolerance: float = DEFAULT_STUCK_TOLERANCE,
+    ) -> None:
+        self.tolerance = tolerance
+        self.range = SlidingRange(window)
+
+    def reset(self) -> None:
+        self.range.reset()
+
+    def update(self, x: float) -> bool:
+        """Push this frame's x; True if the player is now stuck."""
+        rng = self.range
+        rng.push(x)
+        return rng.full and rng.spread() < self.tolerance
+
+
+def _flatten_failure(cond: FailureCondition) -> list[FailureCondition]:
+    """Leaf conditions of a (possibly nested) ``any``, in evaluation order."""
+    if cond.type == "any":
+        leaves: list[FailureCondition] = []
+        for sub in cond.conditions or ():
+            leaves.extend(_flatten_failure(sub))
+        return leaves
+    return [cond]
+
+
+class ConditionPlan:
+    """Success and failure conditions compiled for per-frame checking.
+
+    Nested ``any`` failure conditions are flattened into one ordered list
+    of leaves. The plan holds no per-run state, so one plan can be cached
+    on a ScenarioDef and shared by any number of runs; call evaluator()
+    for each run.
+    """
+
+    def __init__(self, success: SuccessCondition, failure: FailureCondition) -> None:
+        self.success = success
+        self.failure = failure
+        # (reason, window, tolerance) per leaf; None, None for player_dead.
+        leaves: list[tuple[str, int | None, float | None]] = []
+        for leaf in _flatten_failure(failure):
+            if leaf.type == "stuck":
+                leaves.append((
+                    "stuck",
+                    leaf.window or DEFAULT_STUCK_WINDOW,
+                    leaf.tolerance or DEFAULT_STUCK_TOLERANCE,
+                ))
+            elif leaf.type == "player_dead":
+                leaves.append(("player_dead", None, None))
+        self.leaves: tuple[tuple[str, int | None, float | None], ...] = tuple(leaves)
+
+    def evaluator(self) -> ConditionEvaluator:
+        """A fresh ConditionEvaluator for one run of this plan."""
+        return ConditionEvaluator(self)
+
+
+class ConditionEvaluator:
+    """Running state of one ConditionPlan over one run.
+
+    Each ``stuck`` leaf gets its own StuckDetector. Call check() once per
+    frame, after the step; results match check_conditions on the run's
+    trajectory. reset() returns the evaluator to its state before frame 0.
+    """
+
+    def __init__(self, plan: ConditionPlan) -> None:
+        self.plan = plan
+        self.success = plan.success
+        # (reason, detector) per leaf; detector is None for player_dead.
+        self._leaves: list[tuple[str, StuckDetector | None]] = []
+        self._detectors: list[StuckDetector] = []
+        for reason, window, tolerance in plan.leaves:
+            if window is None:
+                self._leaves.append((reason, None))
+            else:
+                detector = StuckDetector(window, tolerance)
+                self._detectors.append(detector)
+                self._leaves.append((reason, detector))
+
+    def reset(self) -> None:
+        for detector in self._detectors:
+            detector.reset()
+
+    def feed(self, xs: Iterable[float]) -> None:
+        """Advance running state over frames already known not to end the
+        run (e.g. a prefix replayed from an earlier identical run)."""
+        for x in xs:
+            for detector in self._detectors:
+                detector.range.push(x)
+
+    def check(
+        self, sim: SimState, frame: int, max_frames: int,
+    ) -> tuple[bool | None, str | None]:
+        """Update running state with this frame and check every condition.
+
+        Returns ``(True, reason)`` for success, ``(False, reason)`` for
+        failure, or ``(None, None)`` if neither has triggered yet.
+        """
+        # Detectors must see every frame, even ones where an earlier
+        # condition short-circuits.
+        x = sim.player.physics.x
+        stuck = [d.update(x) for d in self._detectors] if self._detectors else ()
+
+        result, reason = _check_success(self.success, sim, (), frame, max_frames)
+        if result is not None:
+            return result, reason
+
+        k = 0
+        for reason, detector in self._leaves:
+            if detector is None:
+                if sim.player_dead:
+                    return False, reason
+            else:
+                if stuck[k]:
+                    return False, reason
+                k += 1
+        return None, None
@@ -1,15 +1,29 @@
-"""speednik/scenarios/loader — ScenarioDef and YAML loading functions."""
+"""speednik/scenarios/loader — ScenarioDef and YAML loading functions.
+
+A scenario file may carry a ``sweep`` section mapping parameter paths to
+value lists; it then describes the cartesian product of those values
+applied to the rest of the file (see SweepDef)::
+
+    sweep:
+      stage: [hillside, pipeworks]
+      agent_params.charge_frames: [2, 4, 8]
+      start_override.x: {start: 100, stop: 400, step: 100}   # inclusive
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import copy
+import itertools
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import Any
 
 import yaml
 
 from speednik.scenarios.conditions import (
     VALID_FAILURE_TYPES,
     VALID_SUCCESS_TYPES,
+    ConditionPlan,
     FailureCondition,
     StartOverride,
     SuccessCondition,
@@ -28,6 +42,21 @@ class ScenarioDef:
     failure: FailureCondition
     metrics: list[str]
     start_override: StartOverride | None = None
+    _plan: ConditionPlan | None = field(
+        default=None, init=False, repr=False, compare=False,
+    )
+
+    def condition_plan(self) -> ConditionPlan:
+        """The compiled success/failure conditions (see ConditionPlan).
+
+        Compiled when the scenario is loaded and recompiled if ``success``
+        or ``failure`` is replaced afterwards. The plan is stateless; each
+        run takes its own evaluator from it.
+        """
+        plan = self._plan
+        if plan is None or plan.success is not self.success or plan.failure is not self.failure:
+            plan = self._plan = ConditionPlan(self.success, self.failure)
+        return plan
 
 
 def _parse_success(data: dict) -> SuccessCondition:
@@ -68,7 +97,7 @@ def _parse_start_override(data: dict | None) -> StartOverride | None:
 
 def _parse_scenario(data: dict) -> ScenarioDef:
     """Parse a raw YAML dict into a ScenarioDef."""
-    return ScenarioDef(
+    scenario = ScenarioDef(
         name=data["name"],
         description=data.get("description", ""),
         stage=data["stage"],
@@ -80,15 +109,163 @@ def _parse_scenario(data: dict) -> ScenarioDef:
         metrics=data.get("metrics", []),
         start_override=_parse_start_override(data.get("start_override")),
     )
+    scenario.condition_plan()
+    return scenario
+
+
+# ---------------------------------------------------------------------------
+# Sweeps
+# ---------------------------------------------------------------------------
+
+# Sweepable top-level fields; ``agent_params.<name>`` is also accepted.
+SWEEP_FIELDS: frozenset[str] = frozenset(
+    {"stage", "agent", "max_frames", "start_override", "start_override.x", "start_override.y"}
+)
+
+
+@dataclass
+class SweepDef:
+    """A scenario template plus parameter axes to expand over.
+
+    ``axes`` is a list of ``(path, values)`` in file order; expand() yields
+    one ScenarioDef per combination, the last axis varying fastest.
+    """
+
+    base: ScenarioDef
+    axes: list[tuple[str, list[Any]]]
+
+    @property
+    def name(self) -> str:
+        return self.base.name
+
+    def points(self) -> list[dict[str, Any]]:
+        """Every parameter combination, as ``{path: value}`` dicts."""
+        paths = [path for path, _ in self.axes]
+        return [
+            dict(zip(paths, combo))
+            for combo in itertools.product(*(values for _, values in self.axes))
+        ]
+
+    def expand(self) -> list[ScenarioDef]:
+        return [apply_sweep_point(self.base, point) for point in self.points()]
+
+
+def _sweep_label(path: str) -> str:
+    return path.rsplit(".", 1)[-1]
+
+
+def apply_sweep_point(base: ScenarioDef, point: dict[str, Any]) -> ScenarioDef:
+    """Copy of *base* with each ``{path: value}`` of *point* applied.
+
+    The copy is named ``base[label=value,...]`` after the last component of
+    each path.
+
+    Raises:
+        ValueError: For an unknown path, or a start_override coordinate
+            with no base start_override to take the other one from.
+    """
+    scenario = replace(base, agent_params=copy.deepcopy(base.agent_params))
+    for path, value in point.items():
+        if path in ("stage", "agent"):
+            setattr(scenario, path, str(value))
+        elif path == "max_frames":
+            scenario.max_frames = int(value)
+        elif path == "start_override":
+            scenario.start_override = StartOverride(x=float(value[0]), y=float(value[1]))
+        elif path in ("start_override.x", "start_override.y"):
+            so = scenario.start_override
+            if so is None:
+                raise ValueError(f"Sweep over {path!r} needs a base start_override")
+            axis = path[-1]
+            scenario.start_override = replace(so, **{axis: float(value)})
+        elif path.startswith("agent_params."):
+            params = dict(scenario.agent_params or {})
+            params[path.split(".", 1)[1]] = value
+            scenario.agent_params = params
+        else:
+            raise ValueError(f"Unknown sweep parameter: {path!r}")
+    labels = ",".join(f"{_sweep_label(path)}={value}" for path, value in point.items())
+    scenario.name = f"{base.name}[{labels}]"
+    return scenario
+
+
+def _parse_sweep_values(path: str, raw: Any) -> list[Any]:
+    """A list as-is, or an inclusive ``{start, stop, step}`` range."""
+    if isinstance(raw, dict):
+        try:
+            start, stop = raw["start"], raw["stop"]
+        except KeyError as exc:
+            raise ValueError(f"Sweep range for {path!r} needs start and stop") from exc
+        step = raw.get("step", 1)
+        if step <= 0:
+            raise ValueError(f"Sweep step for {path!r} must be positive, got {step}")
+        count = int((stop - start) / step + 1e-9) + 1
+        values = [start + i * step for i in range(max(count, 0))]
+    elif isinstance(raw, list):
+        values = raw
+    else:
+        raise ValueError(f"Sweep values for {path!r} must be a list or range")
+    if not values:
+        raise ValueError(f"Sweep over {path!r} has no values")
+    return values
+
+
+def _parse_sweep(data: dict) -> SweepDef:
+    """Parse a scenario dict with a ``sweep`` section into a SweepDef."""
+    base = _parse_scenario({k: v for k, v in data.items() if k != "sweep"})
+    axes: list[tuple[str, list[Any]]] = []
+    for path, raw in data["sweep"].items():
+        if path not in SWEEP_FIELDS and not path.startswith("agent_params."):
+            raise ValueError(f"Unknown sweep parameter: {path!r}")
+        axes.append((path, _parse_sweep_values(path, raw)))
+    if not axes:
+        raise ValueError("Sweep section has no parameters")
+    sweep = SweepDef(base=base, axes=axes)
+    # Fail at load time on points that can't be applied.
+    apply_sweep_point(base, sweep.points()[0])
+    return sweep
+
+
+def load_sweep(path: Path) -> SweepDef:
+    """Load a scenario file with a ``sweep`` section.
+
+    Raises:
+        ValueError: If the file has no sweep section.
+    """
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    if "sweep" not in data:
+        raise ValueError(f"{path} has no sweep section")
+    return _parse_sweep(data)
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
 
 
 def load_scenario(path: Path) -> ScenarioDef:
-    """Load a single scenario from a YAML file."""
+    """Load a single scenario from a YAML file.
+
+    Raises:
+        ValueError: If the file defines a sweep (use load_sweep or
+            load_scenarios).
+    """
     with open(path) as f:
         data = yaml.safe_load(f)
+    if "sweep" in data:
+        raise ValueError(f"{path} defines a sweep; use load_sweep or load_scenarios")
     return _parse_scenario(data)
 
 
+def _load_file(path: Path) -> list[ScenarioDef]:
+    with open(path) as f:
+        data = yaml.safe_load(f)
+    if "sweep" in data:
+        return _parse_sweep(data).expand()
+    return [_parse_scenario(data)]
+
+
 def load_scenarios(
     paths: list[Path] | None = None,
     run_all: bool = False,
@@ -96,6 +273,8 @@ def load_scenarios(
 ) -> list[ScenarioDef]:
     """Load multiple scenarios.
 
+    Sweep files expand into one ScenarioDef per parameter combination.
+
     Args:
         paths: Explicit list of YAML file paths to load.
         run_all: If True, glob all ``*.yaml`` files under *base*.
@@ -108,4 +287,4 @@ def load_scenarios(
         paths = []
     if run_all:
         paths = sorted(base.glob("*.yaml"))
-    return [load_scenario(p) for p in paths]
+    return [scenario for p in paths for scenario in _load_file(p)]
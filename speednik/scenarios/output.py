@@ -1,12 +1,22 @@
-"""speednik/scenarios/output — Console output and JSON serialization."""
+"""speednik/scenarios/output — Console output and JSON serialization.
+
+Results are written either as one indented JSON array (``.json``) or
+streamed as NDJSON (``.ndjson``/``.jsonl``), one outcome per line as each
+scenario finishes. Streams can put trajectories in per-scenario ``.npz``
+sidecar files instead of inline, and iter_results reads either format
+back one result at a time without loading trajectories.
+"""
 
 from __future__ import annotations
 
 import json
+import re
 import sys
-from dataclasses import asdict
+from dataclasses import asdict, replace
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, Iterator
+
+from speednik.scenarios.trajectory import Trajectory
 
 if TYPE_CHECKING:
     from speednik.scenarios.runner import ScenarioOutcome
@@ -84,8 +94,14 @@ def _outcome_to_dict(
     outcome: ScenarioOutcome, include_trajectory: bool = False,
 ) -> dict:
     """Convert a ScenarioOutcome to a JSON-serializable dict."""
-    d = asdict(outcome)
-    if not include_trajectory:
+    trajectory = outcome.trajectory
+    d = asdict(replace(outcome, trajectory=[]))
+    if include_trajectory:
+        if hasattr(trajectory, "to_records"):
+            d["trajectory"] = trajectory.to_records()
+        else:
+            d["trajectory"] = [asdict(r) for r in trajectory]
+    else:
         d.pop("trajectory", None)
     return d
 
@@ -95,9 +111,245 @@ def save_results(
     path: Path | str,
     include_trajectory: bool = False,
 ) -> None:
-    """Save scenario outcomes as a JSON file."""
+    """Save scenario outcomes as a JSON file.
+
+    An ``.ndjson``/``.jsonl`` *path* writes one outcome per line instead
+    (see ResultStream).
+    """
+    if is_stream_path(path):
+        with ResultStream(path, include_trajectory) as stream:
+            for r in results:
+                stream.write(r)
+        return
     path = Path(path)
     path.parent.mkdir(parents=True, exist_ok=True)
     data = [_outcome_to_dict(r, include_trajectory) for r in results]
     path.write_text(json.dumps(data, indent=2) + "\n")
 
+
+# ---------------------------------------------------------------------------
+# Streaming (NDJSON) output
+# ---------------------------------------------------------------------------
+
+NDJSON_SUFFIXES = frozenset({".ndjson", ".jsonl"})
+
+
+def is_stream_path(path: Path | str) -> bool:
+    """True if *path* names an NDJSON results file."""
+    return Path(path).suffix in NDJSON_SUFFIXES
+
+
+def _sidecar_name(name: str, taken: set[str]) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_.-]", "_", name) or "scenario"
+    candidate, n = stem, 1
+    while candidate in taken:
+        n += 1
+        candidate = f"{stem}_{n}"
+    taken.add(candidate)
+    return f"{candidate}.npz"
+
+
+class ResultStream:
+    """Write scenario outcomes to an NDJSON file as they finish.
+
+    Each write() appends one JSON object on its own line and flushes, so a
+    long or interrupted run keeps every finished result. With
+    *include_trajectory*, trajectories go inline as records, or with
+    *sidecar* into ``<output stem>.trajectories/<name>.npz`` (see
+    Trajectory.save_npz), referenced by a ``trajectory_file`` key relative
+    to the results file.
+
+    Use as a context manager, or call close().
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        include_trajectory: bool = False,
+        sidecar: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.include_trajectory = include_trajectory
+        self.sidecar = sidecar and include_trajectory
+        self.sidecar_dir = self.path.parent / f"{self.path.stem}.trajectories"
+        self._sidecar_names: set[str] = set()
+        self._file: IO[str] = open(self.path, "w")
+
+    def write(self, outcome: ScenarioOutcome) -> None:
+        if self.sidecar:
+            d = _outcome_to_dict(outcome)
+            self.sidecar_dir.mkdir(exist_ok=True)
+            filename = _sidecar_name(outcome.name, self._sidecar_names)
+            trajectory = outcome.trajectory
+            if not isinstance(trajectory, Trajectory):
+                trajectory = Trajectory.from_records(trajectory)
+            trajectory.save_npz(self.sidecar_dir / filename)
+            d["trajectory_file"] = f"{self.sidecar_dir.name}/{filename}"
+        else:
+            d = _outcome_to_dict(outcome, self.include_trajectory)
+        self._file.write(json.dumps(d, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> ResultStream:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+# ---------------------------------------------------------------------------
+# Reading results
+# ---------------------------------------------------------------------------
+
+
+_CHUNK_SIZE = 1 << 16
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_NUMBER_START = frozenset("-0123456789")
+_NUMBER_END = re.compile(r"[\s,\]}]")
+# Everything up to the next bracket outside a string.
+_SKIP_RUN = re.compile(r'(?:[^\[\]{}"]+|"(?:[^"\\]|\\.)*")*', re.DOTALL)
+
+
+class _ArrayReader:
+    """Pull parser for the objects of a JSON array read from a text file.
+
+    Reads the file in chunks and decodes one object at a time with
+    JSONDecoder.raw_decode; skipped values are only bracket-matched, never
+    built into Python objects.
+    """
+
+    def __init__(self, f: IO[str]) -> None:
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping what was consumed; False at EOF."""
+        chunk = self.f.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self.buf, self.pos)
+
+    def peek(self) -> str:
+        """Next non-whitespace character, not consumed ('' at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def take(self, allowed: str) -> str:
+        """Consume the next non-whitespace character, one of *allowed*."""
+        ch = self.peek()
+        if not ch or ch not in allowed:
+            raise self._error(f"Expecting one of {allowed!r}")
+        self.pos += 1
+        return ch
+
+    def value(self) -> object:
+        """Decode the next value."""
+        if self.peek() in _NUMBER_START:
+            # A number cut off by the chunk boundary would still decode.
+            while _NUMBER_END.search(self.buf, self.pos) is None and self._fill():
+                pass
+        while True:
+            try:
+                value, self.pos = _DECODER.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            return value
+
+    def skip(self) -> None:
+        """Consume the next value without decoding it."""
+        if self.peek() not in "[{":
+            self.value()
+            return
+        depth = 0
+        while True:
+            self.pos = _SKIP_RUN.match(self.buf, self.pos).end()
+            if self.pos == len(self.buf) or self.buf[self.pos] == '"':
+                # Stopped by the chunk boundary, possibly inside a string.
+                if not self._fill():
+                    raise self._error("Unterminated value")
+                continue
+            ch = self.buf[self.pos]
+            self.pos += 1
+            if ch in "[{":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def objects(self, drop: str) -> Iterator[dict]:
+        """Yield each object of the array, without its *drop* key."""
+        self.take("[")
+        if self.peek() == "]":
+            return
+        while True:
+            self.take("{")
+            entry: dict = {}
+            if self.peek() != "}":
+                while True:
+                    key = self.value()
+                    self.take(":")
+                    if key == drop:
+                        self.skip()
+                    else:
+                        entry[key] = self.value()
+                    if self.take(",}") == "}":
+                        break
+            else:
+                self.pos += 1
+            yield entry
+            if self.take(",]") == "]":
+                return
+
+
+def iter_results(path: Path | str) -> Iterator[dict]:
+    """Yield result dicts from a JSON or NDJSON results file.
+
+    Both formats are read one result at a time, so memory does not grow
+    with the file. Inline trajectories are skipped without being decoded
+    and sidecar files are never opened; use load_result_trajectory for
+    those. The format is detected from the first character of the file.
+    """
+    with open(path) as f:
+        head = f.read(1)
+        while head and head.isspace():
+            head = f.read(1)
+        f.seek(0)
+        if head == "[":
+            yield from _ArrayReader(f).objects(drop="trajectory")
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            entry.pop("trajectory", None)
+            yield entry
+
+
+def load_result_trajectory(entry: dict, results_path: Path | str) -> Trajectory | None:
+    """Trajectory of one result read by iter_results, or None if not saved.
+
+    Reads the ``.npz`` sidecar referenced by the entry; inline
+    trajectories are dropped by iter_results and so come back as None.
+    """
+    filename = entry.get("trajectory_file")
+    if filename is None:
+        return None
+    return Trajectory.load_npz(Path(results_path).parent / filename)
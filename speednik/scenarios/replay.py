@@ -0,0 +1,317 @@
+"""speednik/scenarios/replay — Compact input-log replays and headless replayer.
+
+A run is fully determined by its stage, start override and action stream,
+so that is all a replay stores. Actions are the 8-bit codes from
+speednik.agents.actions, run-length encoded; a typical scenario replay is
+tens of bytes where its saved trajectory is megabytes.
+
+Binary layout::
+
+    b"SPKR"                 magic
+    u8                      format version
+    u32 (little-endian)     header length
+    header                  UTF-8 JSON: stage, start, max_frames, metadata
+    (u8 action, uleb128 n)  one pair per run, until end of data
+
+The replayer streams the decoded inputs through sim_step and can rebuild
+the exact trajectory and metrics of the original run.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from speednik.agents.actions import NUM_ACTIONS, action_to_input
+from speednik.scenarios.conditions import StartOverride
+from speednik.scenarios.loader import ScenarioDef
+from speednik.scenarios.runner import (
+    ScenarioOutcome,
+    _compute_reward,
+    compute_metrics,
+    start_sim,
+)
+from speednik.scenarios.trajectory import Trajectory
+from speednik.simulation import Event, SimState, sim_step
+
+REPLAY_MAGIC = b"SPKR"
+REPLAY_VERSION = 1
+
+_HEADER_LEN = struct.Struct("<I")
+
+
+# ---------------------------------------------------------------------------
+# Run-length encoding
+# ---------------------------------------------------------------------------
+
+
+def encode_runs(actions: Iterable[int]) -> list[tuple[int, int]]:
+    """Collapse an action stream into (action, count) runs.
+
+    Raises:
+        ValueError: If an action is outside 0..NUM_ACTIONS-1.
+    """
+    runs: list[tuple[int, int]] = []
+    current = -1
+    count = 0
+    for action in actions:
+        if action != current:
+            if not 0 <= action < NUM_ACTIONS:
+                raise ValueError(f"Invalid action code: {action!r}")
+            if count:
+                runs.append((current, count))
+            current = action
+            count = 0
+        count += 1
+    if count:
+        runs.append((current, count))
+    return runs
+
+
+def _write_uleb128(out: bytearray, value: int) -> None:
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_uleb128(data: bytes, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated replay data")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Replay:
+    """Stage, start position and run-length-encoded action stream of one run.
+
+    ``max_frames`` is the frame budget the run was recorded with; it only
+    affects the reconstructed reward (time bonus) and defaults to the
+    replay's length. ``metadata`` carries free-form JSON values such as the
+    scenario name and outcome.
+    """
+
+    stage: str
+    runs: list[tuple[int, int]]
+    start_override: StartOverride | None = None
+    max_frames: int | None = None
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_actions(
+        cls,
+        stage: str,
+        actions: Iterable[int],
+        *,
+        start_override: StartOverride | None = None,
+        max_frames: int | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> Replay:
+        return cls(
+            stage=stage,
+            runs=encode_runs(actions),
+            start_override=start_override,
+            max_frames=max_frames,
+            metadata=dict(metadata or {}),
+        )
+
+    @classmethod
+    def from_outcome(cls, scenario_def: ScenarioDef, outcome: ScenarioOutcome) -> Replay:
+        """Replay of a run_scenario result, keeping its name and verdict."""
+        trajectory = outcome.trajectory
+        if isinstance(trajectory, Trajectory):
+            actions = trajectory.column("action").tolist()
+        else:
+            actions = [r.action for r in trajectory]
+        return cls.from_actions(
+            scenario_def.stage,
+            actions,
+            start_override=scenario_def.start_override,
+            max_frames=scenario_def.max_frames,
+            metadata={
+                "name": outcome.name,
+                "agent": scenario_def.agent,
+                "success": outcome.success,
+                "reason": outcome.reason,
+            },
+        )
+
+    @property
+    def frames(self) -> int:
+        """Number of frames (actions) in the replay."""
+        return sum(count for _, count in self.runs)
+
+    def actions(self) -> bytes:
+        """The decoded action stream, one byte per frame."""
+        return b"".join(bytes((action,)) * count for action, count in self.runs)
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        header = {
+            "stage": self.stage,
+            "start": (
+                None if self.start_override is None
+                else [self.start_override.x, self.start_override.y]
+            ),
+            "max_frames": self.max_frames,
+            "metadata": self.metadata,
+        }
+        header_bytes = json.dumps(header, separators=(",", ":")).encode()
+        out = bytearray(REPLAY_MAGIC)
+        out.append(REPLAY_VERSION)
+        out += _HEADER_LEN.pack(len(header_bytes))
+        out += header_bytes
+        for action, count in self.runs:
+            out.append(action)
+            _write_uleb128(out, count)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Replay:
+        """Parse a replay produced by to_bytes.
+
+        Raises:
+            ValueError: On bad magic, unsupported version or corrupt data.
+        """
+        if data[:4] != REPLAY_MAGIC:
+            raise ValueError("Not a speednik replay (bad magic)")
+        if len(data) < 9:
+            raise ValueError("Truncated replay data")
+        version = data[4]
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {version}")
+        (header_len,) = _HEADER_LEN.unpack_from(data, 5)
+        pos = 9 + header_len
+        if pos > len(data):
+            raise ValueError("Truncated replay data")
+        header = json.loads(data[9:pos].decode())
+
+        runs: list[tuple[int, int]] = []
+        while pos < len(data):
+            action = data[pos]
+            if action >= NUM_ACTIONS:
+                raise ValueError(f"Invalid action code: {action}")
+            count, pos = _read_uleb128(data, pos + 1)
+            runs.append((action, count))
+
+        start = header.get("start")
+        return cls(
+            stage=header["stage"],
+            runs=runs,
+            start_override=None if start is None else StartOverride(x=start[0], y=start[1]),
+            max_frames=header.get("max_frames"),
+            metadata=header.get("metadata") or {},
+        )
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | Path) -> Replay:
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+# ---------------------------------------------------------------------------
+# Replayer
+# ---------------------------------------------------------------------------
+
+
+def replay_sim(replay: Replay) -> SimState:
+    """Fresh sim for *replay*'s stage with its start override applied."""
+    return start_sim(replay.stage, replay.start_override)
+
+
+def run_replay(replay: Replay, sim: SimState | None = None) -> SimState:
+    """Step the whole replay as fast as possible and return the final sim.
+
+    Inputs are built once per run rather than per frame: within a run only
+    the first frame can carry a jump_pressed edge.
+    """
+    if sim is None:
+        sim = replay_sim(replay)
+    step = sim_step
+    prev_jump_held = False
+    for action, count in replay.runs:
+        first, prev_jump_held = action_to_input(action, prev_jump_held)
+        step(sim, first)
+        if count > 1:
+            rest, _ = action_to_input(action, prev_jump_held)
+            for _ in range(count - 1):
+                step(sim, rest)
+    return sim
+
+
+def iter_replay(
+    replay: Replay, sim: SimState | None = None,
+) -> Iterator[tuple[int, int, list[Event]]]:
+    """Yield ``(frame, action, events)`` after each replayed frame.
+
+    Pass *sim* (e.g. from replay_sim) to inspect state between frames.
+    """
+    if sim is None:
+        sim = replay_sim(replay)
+    prev_jump_held = False
+    frame = 0
+    for action, count in replay.runs:
+        for _ in range(count):
+            inp, prev_jump_held = action_to_input(action, prev_jump_held)
+            yield frame, action, sim_step(sim, inp)
+            frame += 1
+
+
+def replay_trajectory(replay: Replay) -> tuple[Trajectory, SimState]:
+    """Rebuild the per-frame trajectory of the recorded run.
+
+    Identical to the trajectory run_scenario produced, rewards included,
+    as long as ``max_frames`` matches the original frame budget.
+    """
+    sim = replay_sim(replay)
+    max_frames = replay.max_frames if replay.max_frames is not None else replay.frames
+    p = sim.player.physics
+    trajectory = Trajectory(capacity=max(replay.frames, 1))
+    prev_max_x = sim.max_x_reached
+    for frame, action, events in iter_replay(replay, sim):
+        reward = _compute_reward(sim, events, prev_max_x, frame + 1, max_frames)
+        prev_max_x = sim.max_x_reached
+        trajectory.append(
+            frame, p.x, p.y, p.x_vel, p.y_vel, p.ground_speed, p.angle,
+            p.on_ground, sim.player.state.value, action, reward,
+            sim.player.rings, [type(e).__name__ for e in events] if events else (),
+        )
+    return trajectory, sim
+
+
+def replay_metrics(
+    replay: Replay, metrics: list[str], success: bool | None = None,
+) -> dict[str, Any]:
+    """Recompute scenario metrics from a replay.
+
+    *success* defaults to the verdict stored in the replay's metadata.
+    """
+    if success is None:
+        success = bool(replay.metadata.get("success", False))
+    trajectory, sim = replay_trajectory(replay)
+    return compute_metrics(metrics, trajectory, sim, success)
@@ -1,20 +1,25 @@
 """speednik/scenarios/runner — Scenario execution engine (Layer 4).
 
 Executes a ScenarioDef to completion, collecting trajectory and metrics.
+The trajectory is stored columnar (see trajectory.py) and metrics are
+NumPy reductions over its columns.
 """
 
 from __future__ import annotations
 
 import time
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Sequence
+
+import numpy as np
 
 from speednik.agents.actions import action_to_input
 from speednik.agents.registry import resolve_agent
 from speednik.constants import MAX_X_SPEED
-from speednik.observation import extract_observation
-from speednik.scenarios.conditions import check_conditions
+from speednik.observation import OBS_DIM, extract_observation, extract_observations
+from speednik.scenarios.conditions import ConditionEvaluator, StartOverride
 from speednik.scenarios.loader import ScenarioDef
+from speednik.scenarios.trajectory import FrameRecord, Trajectory
 from speednik.simulation import RingCollectedEvent, SimState, create_sim, sim_step
 
 
@@ -23,25 +28,6 @@ from speednik.simulation import RingCollectedEvent, SimState, create_sim, sim_st
 # ---------------------------------------------------------------------------
 
 
-@dataclass
-class FrameRecord:
-    """Per-frame snapshot of simulation state."""
-
-    frame: int
-    x: float
-    y: float
-    x_vel: float
-    y_vel: float
-    ground_speed: float
-    angle: int
-    on_ground: bool
-    state: str
-    action: int
-    reward: float
-    rings: int
-    events: list[str]
-
-
 @dataclass
 class ScenarioOutcome:
     """Result of executing a scenario to completion."""
@@ -51,7 +37,7 @@ class ScenarioOutcome:
     reason: str
     frames_elapsed: int
     metrics: dict[str, Any]
-    trajectory: list[FrameRecord]
+    trajectory: Trajectory
     wall_time_ms: float
 
 
@@ -103,81 +89,94 @@ def _compute_reward(
 # ---------------------------------------------------------------------------
 
 
+# Metrics accept a Trajectory or any sequence of FrameRecord-like objects.
+TrajectoryLike = Trajectory | Sequence[FrameRecord]
+
+
+def _column(trajectory: TrajectoryLike, name: str) -> np.ndarray:
+    if isinstance(trajectory, Trajectory):
+        return trajectory.column(name)
+    return np.array([getattr(r, name) for r in trajectory], dtype=np.float64)
+
+
 def _metric_completion_time(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> int | None:
     return len(trajectory) if success else None
 
 
 def _metric_max_x(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float:
-    if not trajectory:
+    if not len(trajectory):
         return 0.0
-    return max(r.x for r in trajectory)
+    return float(_column(trajectory, "x").max())
 
 
 def _metric_rings_collected(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> int:
     return sim.rings_collected
 
 
 def _metric_death_count(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> int:
     return sim.deaths
 
 
 def _metric_total_reward(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float:
-    return sum(r.reward for r in trajectory)
+    if not len(trajectory):
+        return 0.0
+    return float(_column(trajectory, "reward").sum())
 
 
 def _metric_average_speed(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float:
-    if not trajectory:
+    if not len(trajectory):
         return 0.0
-    return sum(abs(r.x_vel) for r in trajectory) / len(trajectory)
+    return float(np.abs(_column(trajectory, "x_vel")).mean())
 
 
 def _metric_peak_speed(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float:
-    if not trajectory:
+    if not len(trajectory):
         return 0.0
-    return max(abs(r.x_vel) for r in trajectory)
+    return float(np.abs(_column(trajectory, "x_vel")).max())
 
 
 def _metric_time_on_ground(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float:
-    if not trajectory:
+    if not len(trajectory):
         return 0.0
-    return sum(1 for r in trajectory if r.on_ground) / len(trajectory)
+    return float(np.count_nonzero(_column(trajectory, "on_ground")) / len(trajectory))
 
 
 def _metric_stuck_at(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> float | None:
-    if not trajectory:
+    if not len(trajectory):
         return None
     # Check last 120 frames for being stuck (spread < 2.0)
     window = min(120, len(trajectory))
-    recent = trajectory[-window:]
-    xs = [r.x for r in recent]
-    spread = max(xs) - min(xs)
-    if spread < 2.0:
-        return recent[-1].x
+    if isinstance(trajectory, Trajectory):
+        xs = trajectory.tail("x", window)
+    else:
+        xs = _column(trajectory[-window:], "x")
+    if np.ptp(xs) < 2.0:
+        return float(xs[-1])
     return None
 
 
 def _metric_velocity_profile(
-    trajectory: list[FrameRecord], sim: SimState, success: bool,
+    trajectory: TrajectoryLike, sim: SimState, success: bool,
 ) -> list[float]:
-    return [r.x_vel for r in trajectory]
+    return _column(trajectory, "x_vel").tolist()
 
 
 _METRIC_DISPATCH: dict[str, Any] = {
@@ -196,7 +195,7 @@ _METRIC_DISPATCH: dict[str, Any] = {
 
 def compute_metrics(
     requested: list[str],
-    trajectory: list[FrameRecord],
+    trajectory: TrajectoryLike,
     sim: SimState,
     success: bool,
 ) -> dict[str, Any]:
@@ -218,6 +217,51 @@ def compute_metrics(
 # ---------------------------------------------------------------------------
 
 
+def start_sim(stage: str, start_override: StartOverride | None = None) -> SimState:
+    """Fresh sim for *stage* with *start_override* applied.
+
+    The setup every scenario run and replay performs before the first frame.
+    """
+    sim = create_sim(stage)
+    if start_override is not None:
+        sim.player.physics.x = start_override.x
+        sim.player.physics.y = start_override.y
+    sim.max_x_reached = sim.player.physics.x
+    return sim
+
+
+def _advance(
+    sim: SimState,
+    action: int,
+    prev_jump_held: bool,
+    frame: int,
+    max_frames: int,
+    trajectory: Trajectory,
+    conditions: ConditionEvaluator,
+) -> tuple[bool, bool | None, str | None]:
+    """Step *sim* by one agent action, record the frame and check conditions.
+
+    The per-frame body shared by every scenario loop, so they all produce
+    identical trajectories.
+
+    Returns:
+        ``(prev_jump_held, success, reason)`` — the jump state to pass to
+        the next call, and the condition result for this frame.
+    """
+    inp, prev_jump_held = action_to_input(action, prev_jump_held)
+    prev_max_x = sim.max_x_reached
+    events = sim_step(sim, inp)
+    reward = _compute_reward(sim, events, prev_max_x, frame + 1, max_frames)
+    p = sim.player.physics
+    trajectory.append(
+        frame, p.x, p.y, p.x_vel, p.y_vel, p.ground_speed, p.angle,
+        p.on_ground, sim.player.state.value, action, reward,
+        sim.player.rings, [type(e).__name__ for e in events] if events else (),
+    )
+    success, reason = conditions.check(sim, frame, max_frames)
+    return prev_jump_held, success, reason
+
+
 def run_scenario(scenario_def: ScenarioDef) -> ScenarioOutcome:
     """Execute a single scenario to completion.
 
@@ -225,62 +269,29 @@ def run_scenario(scenario_def: ScenarioDef) -> ScenarioOutcome:
     condition checking, and returns a ScenarioOutcome with trajectory
     and metrics.
     """
-    sim = create_sim(scenario_def.stage)
-
-    # Apply start override
-    if scenario_def.start_override:
-        sim.player.physics.x = scenario_def.start_override.x
-        sim.player.physics.y = scenario_def.start_override.y
+    sim = start_sim(scenario_def.stage, scenario_def.start_override)
 
     # Resolve and reset agent
     agent = resolve_agent(scenario_def.agent, scenario_def.agent_params)
     agent.reset()
 
-    trajectory: list[FrameRecord] = []
+    conditions = scenario_def.condition_plan().evaluator()
+
+    trajectory = Trajectory(capacity=scenario_def.max_frames)
     prev_jump_held = False
-    prev_max_x = sim.player.physics.x
-    sim.max_x_reached = sim.player.physics.x
     success: bool | None = None
     reason: str | None = None
 
     start_time = time.perf_counter()
 
+    # Agents only read the observation during act(), so one buffer is reused.
+    obs = np.empty(OBS_DIM, dtype=np.float32)
     for frame in range(scenario_def.max_frames):
-        obs = extract_observation(sim)
+        extract_observation(sim, out=obs)
         action = agent.act(obs)
-        inp, prev_jump_held = action_to_input(action, prev_jump_held)
-
-        prev_max_x = sim.max_x_reached
-        events = sim_step(sim, inp)
-        reward = _compute_reward(
-            sim, events, prev_max_x, frame + 1, scenario_def.max_frames,
-        )
-
-        trajectory.append(
-            FrameRecord(
-                frame=frame,
-                x=sim.player.physics.x,
-                y=sim.player.physics.y,
-                x_vel=sim.player.physics.x_vel,
-                y_vel=sim.player.physics.y_vel,
-                ground_speed=sim.player.physics.ground_speed,
-                angle=sim.player.physics.angle,
-                on_ground=sim.player.physics.on_ground,
-                state=sim.player.state.value,
-                action=action,
-                reward=reward,
-                rings=sim.player.rings,
-                events=[type(e).__name__ for e in events],
-            )
-        )
-
-        success, reason = check_conditions(
-            scenario_def.success,
-            scenario_def.failure,
-            sim,
-            trajectory,
-            frame,
-            scenario_def.max_frames,
+        prev_jump_held, success, reason = _advance(
+            sim, action, prev_jump_held, frame, scenario_def.max_frames,
+            trajectory, conditions,
         )
         if success is not None:
             break
@@ -299,3 +310,100 @@ def run_scenario(scenario_def: ScenarioDef) -> ScenarioOutcome:
         trajectory=trajectory,
         wall_time_ms=wall_time,
     )
+
+
+# ---------------------------------------------------------------------------
+# Lockstep runner
+# ---------------------------------------------------------------------------
+
+
+def _resolve_lockstep_agents(scenario_defs: list[ScenarioDef]) -> list[Any]:
+    """One agent per scenario; batch-capable agents with the same name and
+    params are shared, since act_batch agents must be stateless."""
+    shared: dict[tuple[str, str], Any] = {}
+    agents = []
+    for scenario_def in scenario_defs:
+        key = (scenario_def.agent, repr(scenario_def.agent_params))
+        agent = shared.get(key)
+        if agent is None:
+            agent = resolve_agent(scenario_def.agent, scenario_def.agent_params)
+            agent.reset()
+            if hasattr(agent, "act_batch"):
+                shared[key] = agent
+        agents.append(agent)
+    return agents
+
+
+def run_scenarios_lockstep(
+    scenario_defs: list[ScenarioDef],
+) -> list[ScenarioOutcome]:
+    """Run scenarios side by side, one frame of every scenario at a time.
+
+    Observations for all running scenarios are extracted together and
+    every agent that has ``act_batch`` (e.g. PPOAgent, NumpyPolicyAgent)
+    gets one call per frame for all scenarios it drives, instead of one
+    forward pass per scenario per frame. Other agents act per scenario.
+    Outcomes match run_scenario; ``wall_time_ms`` is the time until each
+    scenario finished.
+    """
+    n = len(scenario_defs)
+    sims = [start_sim(d.stage, d.start_override) for d in scenario_defs]
+    agents = _resolve_lockstep_agents(scenario_defs)
+    conditions = [d.condition_plan().evaluator() for d in scenario_defs]
+    trajectories = [Trajectory(capacity=d.max_frames) for d in scenario_defs]
+    prev_jump_held = [False] * n
+    outcomes: list[ScenarioOutcome | None] = [None] * n
+
+    def finish(i: int, success: bool | None, reason: str | None) -> None:
+        trajectory = trajectories[i]
+        outcomes[i] = ScenarioOutcome(
+            name=scenario_defs[i].name,
+            success=success if success is not None else False,
+            reason=reason or "timed_out",
+            frames_elapsed=len(trajectory),
+            metrics=compute_metrics(
+                scenario_defs[i].metrics, trajectory, sims[i], success is True,
+            ),
+            trajectory=trajectory,
+            wall_time_ms=(time.perf_counter() - start_time) * 1000,
+        )
+
+    start_time = time.perf_counter()
+    for i, scenario_def in enumerate(scenario_defs):
+        if scenario_def.max_frames <= 0:
+            finish(i, None, None)
+    active = [i for i in range(n) if outcomes[i] is None]
+    obs_buf = np.empty((n, OBS_DIM), dtype=np.float32)
+    frame = 0
+    while active:
+        obs = extract_observations([sims[i] for i in active], out=obs_buf[:len(active)])
+
+        # One act_batch call per shared agent, act() for the rest.
+        actions = [0] * len(active)
+        batches: dict[int, list[int]] = {}
+        for j, i in enumerate(active):
+            agent = agents[i]
+            if hasattr(agent, "act_batch"):
+                batches.setdefault(id(agent), []).append(j)
+            else:
+                actions[j] = agent.act(obs[j])
+        for rows in batches.values():
+            agent = agents[active[rows[0]]]
+            for j, action in zip(rows, agent.act_batch(obs[rows]).tolist()):
+                actions[j] = action
+
+        still_active = []
+        for j, i in enumerate(active):
+            max_frames = scenario_defs[i].max_frames
+            prev_jump_held[i], success, reason = _advance(
+                sims[i], actions[j], prev_jump_held[i], frame, max_frames,
+                trajectories[i], conditions[i],
+            )
+            if success is not None or frame + 1 >= max_frames:
+                finish(i, success, reason)
+            else:
+                still_active.append(i)
+        active = still_active
+        frame += 1
+
+    return outcomes  # type: ignore[return-value]
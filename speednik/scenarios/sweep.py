@@ -0,0 +1,410 @@
+"""speednik/scenarios/sweep — Run parameter sweeps and tabulate their outcomes.
+
+A sweep (see loader.SweepDef) expands one scenario template into a matrix
+of ScenarioDefs. run_sweep executes them across worker processes and
+collects the outcomes into a SweepResult table.
+
+Points that share stage, start position, frame budget and conditions only
+differ through their agent, and two deterministic agents that pick the
+same actions see the same frames. PrefixCache exploits that: it keeps the
+observations, actions and periodic sim snapshots of earlier runs, replays
+a new agent against them without stepping the sim while its actions
+match, and resumes simulation from the nearest snapshot once they
+diverge. Outcomes are identical to run_scenario.
+
+Usage::
+
+    uv run python -m speednik.scenarios.sweep scenarios/sweeps/spindash_charge.yaml -j 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from speednik.agents.actions import ACTION_MAP, action_to_input
+from speednik.agents.registry import resolve_agent
+from speednik.observation import OBS_DIM, extract_observation
+from speednik.scenarios.loader import ScenarioDef, SweepDef, load_sweep
+from speednik.scenarios.output import save_results
+from speednik.scenarios.runner import (
+    ScenarioOutcome,
+    _advance,
+    compute_metrics,
+    start_sim,
+)
+from speednik.scenarios.trajectory import Trajectory
+from speednik.simulation import (
+    SimSnapshot,
+    SimState,
+    get_stage_template,
+    sim_restore,
+    sim_snapshot,
+    sim_step,
+)
+
+# Frames between the sim snapshots a cached run keeps. A divergent run
+# re-steps at most this many frames from the nearest snapshot.
+SNAPSHOT_INTERVAL = 60
+
+# Cached runs kept per prefix key before the oldest is dropped.
+MAX_CACHED_RUNS = 32
+
+
+# ---------------------------------------------------------------------------
+# Prefix cache
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _CachedRun:
+    """Everything needed to resume from any frame of an earlier run."""
+
+    obs: np.ndarray  # (frames, OBS_DIM) observation before each frame
+    actions: bytes
+    trajectory: Trajectory
+    snapshots: dict[int, SimSnapshot]  # taken before stepping frame k
+    final: SimSnapshot
+    success: bool | None
+    reason: str | None
+
+
+def _prefix_key(scenario_def: ScenarioDef) -> tuple:
+    so = scenario_def.start_override
+    return (
+        scenario_def.stage,
+        None if so is None else (so.x, so.y),
+        scenario_def.max_frames,
+        repr(scenario_def.success),
+        repr(scenario_def.failure),
+    )
+
+
+class PrefixCache:
+    """Shares simulated frames between runs whose agents act identically.
+
+    Runs are keyed by stage, start override, max_frames and conditions;
+    only runs with the same key can share frames. Not shared across
+    processes — run_sweep gives each worker its own cache.
+
+    Args:
+        interval: Frames between stored sim snapshots.
+        max_runs: Cached runs kept per key.
+    """
+
+    def __init__(
+        self, interval: int = SNAPSHOT_INTERVAL, max_runs: int = MAX_CACHED_RUNS,
+    ) -> None:
+        if interval < 1:
+            raise ValueError(f"interval must be positive, got {interval}")
+        self.interval = interval
+        self.max_runs = max_runs
+        self._runs: dict[tuple, list[_CachedRun]] = {}
+        self.frames_simulated = 0
+        self.frames_reused = 0
+
+    def run(self, scenario_def: ScenarioDef) -> ScenarioOutcome:
+        """Execute *scenario_def*; same outcome as run_scenario."""
+        key = _prefix_key(scenario_def)
+        cached = self._runs.setdefault(key, [])
+        max_frames = scenario_def.max_frames
+        interval = self.interval
+
+        agent = resolve_agent(scenario_def.agent, scenario_def.agent_params)
+        agent.reset()
+        conditions = scenario_def.condition_plan().evaluator()
+
+        start_time = time.perf_counter()
+
+        # --- Follow earlier runs while the agent picks the same actions ---
+        candidates = cached
+        frame = 0
+        pending: int | None = None
+        while candidates and frame < max_frames:
+            action = agent.act(candidates[0].obs[frame])
+            matching = [r for r in candidates if r.actions[frame] == action]
+            if not matching:
+                pending = action
+                break
+            candidates = matching
+            frame += 1
+            if frame == len(candidates[0].actions):
+                # Identical to a finished run, ending included.
+                return self._reuse(scenario_def, candidates[0], start_time)
+
+        obs_buf = np.empty((max_frames, OBS_DIM), dtype=np.float32)
+        snapshots: dict[int, SimSnapshot] = {}
+        actions = bytearray()
+        sim = start_sim(scenario_def.stage, scenario_def.start_override)
+        prev_jump_held = False
+        if frame:
+            base = candidates[0]
+            trajectory = base.trajectory.head(frame, capacity=max_frames)
+            obs_buf[:frame] = base.obs[:frame]
+            actions += base.actions[:frame]
+            snapshots = {k: s for k, s in base.snapshots.items() if k <= frame}
+            conditions.feed(base.trajectory.column("x")[:frame].tolist())
+            # Resume from the nearest snapshot and re-step up to *frame*.
+            k = frame - frame % interval
+            sim_restore(sim, base.snapshots[k])
+            if k:
+                prev_jump_held = ACTION_MAP[base.actions[k - 1]].jump_held
+            for action in base.actions[k:frame]:
+                inp, prev_jump_held = action_to_input(action, prev_jump_held)
+                sim_step(sim, inp)
+            self.frames_reused += k
+            self.frames_simulated += frame - k
+        else:
+            trajectory = Trajectory(capacity=max_frames)
+
+        # --- Simulate the rest, as run_scenario does ---
+        success: bool | None = None
+        reason: str | None = None
+        for frame in range(frame, max_frames):
+            if frame % interval == 0:
+                snapshots[frame] = sim_snapshot(sim)
+            obs = obs_buf[frame]
+            extract_observation(sim, out=obs)
+            if pending is not None:
+                action, pending = pending, None
+            else:
+                action = agent.act(obs)
+            actions.append(action)
+            prev_jump_held, success, reason = _advance(
+                sim, action, prev_jump_held, frame, max_frames,
+                trajectory, conditions,
+            )
+            self.frames_simulated += 1
+            if success is not None:
+                break
+
+        cached.append(_CachedRun(
+            obs=obs_buf[:len(actions)],
+            actions=bytes(actions),
+            trajectory=trajectory,
+            snapshots=snapshots,
+            final=sim_snapshot(sim),
+            success=success,
+            reason=reason,
+        ))
+        if len(cached) > self.max_runs:
+            del cached[0]
+        return self._outcome(scenario_def, trajectory, sim, success, reason, start_time)
+
+    def _reuse(
+        self, scenario_def: ScenarioDef, run: _CachedRun, start_time: float,
+    ) -> ScenarioOutcome:
+        sim = start_sim(scenario_def.stage, scenario_def.start_override)
+        sim_restore(sim, run.final)
+        self.frames_reused += len(run.actions)
+        trajectory = run.trajectory.head(len(run.actions))
+        return self._outcome(
+            scenario_def, trajectory, sim, run.success, run.reason, start_time,
+        )
+
+    @staticmethod
+    def _outcome(
+        scenario_def: ScenarioDef,
+        trajectory: Trajectory,
+        sim: SimState,
+        success: bool | None,
+        reason: str | None,
+        start_time: float,
+    ) -> ScenarioOutcome:
+        wall_time = (time.perf_counter() - start_time) * 1000
+        metrics = compute_metrics(scenario_def.metrics, trajectory, sim, success is True)
+        return ScenarioOutcome(
+            name=scenario_def.name,
+            success=success if success is not None else False,
+            reason=reason or "timed_out",
+            frames_elapsed=len(trajectory),
+            metrics=metrics,
+            trajectory=trajectory,
+            wall_time_ms=wall_time,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Sweep execution
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class SweepResult:
+    """Outcomes of a sweep, one per point, in expansion order."""
+
+    name: str
+    axes: list[str]
+    points: list[dict[str, Any]]
+    outcomes: list[ScenarioOutcome]
+
+    def rows(self) -> list[dict[str, Any]]:
+        """One flat dict per point: axis values, verdict and scalar metrics."""
+        rows = []
+        for point, outcome in zip(self.points, self.outcomes):
+            row = dict(point)
+            row["success"] = outcome.success
+            row["reason"] = outcome.reason
+            row["frames"] = outcome.frames_elapsed
+            for name, value in outcome.metrics.items():
+                if not isinstance(value, list):
+                    row[name] = value
+            rows.append(row)
+        return rows
+
+    def format_table(self) -> str:
+        """The rows as an aligned plain-text table."""
+        rows = self.rows()
+        if not rows:
+            return ""
+        columns = list(dict.fromkeys(c for row in rows for c in row))
+
+        axes = set(self.axes)
+
+        def cell(column: str, value: Any) -> str:
+            if column in axes:
+                return str(value)
+            if isinstance(value, bool):
+                return "PASS" if value else "FAIL"
+            if isinstance(value, float):
+                return f"{value:.2f}"
+            return "-" if value is None else str(value)
+
+        cells = [[cell(c, row.get(c)) for c in columns] for row in rows]
+        widths = [
+            max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)
+        ]
+        lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths)).rstrip()]
+        lines.append("  ".join("-" * w for w in widths))
+        for r in cells:
+            lines.append("  ".join(v.ljust(w) for v, w in zip(r, widths)).rstrip())
+        return "\n".join(lines)
+
+
+def _run_chunk(
+    scenario_defs: list[ScenarioDef], keep_trajectory: bool,
+) -> list[ScenarioOutcome]:
+    cache = PrefixCache()
+    outcomes = []
+    for scenario_def in scenario_defs:
+        outcome = cache.run(scenario_def)
+        if not keep_trajectory:
+            outcome.trajectory = Trajectory(capacity=1)
+        outcomes.append(outcome)
+    return outcomes
+
+
+def _chunks(scenario_defs: list[ScenarioDef], jobs: int) -> list[list[int]]:
+    """Split point indices into at least *jobs* chunks (when there are
+    enough points), keeping points with the same prefix key together."""
+    groups: OrderedDict[tuple, list[int]] = OrderedDict()
+    for i, scenario_def in enumerate(scenario_defs):
+        groups.setdefault(_prefix_key(scenario_def), []).append(i)
+    chunks = list(groups.values())
+    while len(chunks) < jobs:
+        largest = max(chunks, key=len)
+        if len(largest) < 2:
+            break
+        chunks.remove(largest)
+        half = len(largest) // 2
+        chunks += [largest[:half], largest[half:]]
+    return chunks
+
+
+def run_sweep(
+    sweep: SweepDef, jobs: int = 1, *, keep_trajectory: bool = False,
+) -> SweepResult:
+    """Run every point of *sweep* and collect the outcomes.
+
+    Points with the same prefix key run in the same process through one
+    PrefixCache; with *jobs* > 1 those groups (split further if there are
+    fewer groups than jobs) go to a process pool. Trajectories are
+    dropped unless *keep_trajectory* is set.
+
+    Raises:
+        ValueError: If jobs is less than 1.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be at least 1, got {jobs}")
+    points = sweep.points()
+    scenario_defs = sweep.expand()
+    outcomes: list[ScenarioOutcome | None] = [None] * len(scenario_defs)
+    chunks = _chunks(scenario_defs, jobs)
+    if jobs == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            for i, outcome in zip(
+                chunk, _run_chunk([scenario_defs[i] for i in chunk], keep_trajectory),
+            ):
+                outcomes[i] = outcome
+    else:
+        for stage in dict.fromkeys(d.stage for d in scenario_defs):
+            get_stage_template(stage)
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            futures = [
+                (chunk, pool.submit(
+                    _run_chunk, [scenario_defs[i] for i in chunk], keep_trajectory,
+                ))
+                for chunk in chunks
+            ]
+            for chunk, future in futures:
+                for i, outcome in zip(chunk, future.result()):
+                    outcomes[i] = outcome
+    return SweepResult(
+        name=sweep.name,
+        axes=[path for path, _ in sweep.axes],
+        points=points,
+        outcomes=outcomes,  # type: ignore[arg-type]
+    )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run a sweep file and print its outcome table.
+
+    Exits 0 if every point passed and 1 if any failed, like the scenario
+    CLI.
+    """
+    parser = argparse.ArgumentParser(
+        description="Run a Speednik scenario sweep",
+        epilog="Exit status is 1 if any sweep point fails, 0 otherwise.",
+    )
+    parser.add_argument("sweep", help="Scenario YAML file with a sweep section")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1,
+        help="Run sweep points in N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--output", "-o", help="Also save every outcome (.json or .ndjson)",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    try:
+        sweep = load_sweep(Path(args.sweep))
+    except ValueError as exc:
+        parser.error(str(exc))
+    result = run_sweep(sweep, args.jobs)
+    print(result.format_table())
+    passed = sum(1 for o in result.outcomes if o.success)
+    print(f"\n{len(result.outcomes)} points: {passed} passed, "
+          f"{len(result.outcomes) - passed} failed")
+    if args.output:
+        save_results(result.outcomes, args.output)
+    sys.exit(0 if passed == len(result.outcomes) else 1)
+
+
+if __name__ == "__main__":
+    main()
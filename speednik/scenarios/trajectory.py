@@ -0,0 +1,314 @@
+"""speednik/scenarios/trajectory — Columnar per-frame trajectory storage.
+
+A Trajectory keeps one row per frame in preallocated float64 chunks (one
+column per FrameRecord field) plus a small event table, instead of one
+FrameRecord object and events list per frame. Metrics read whole columns
+as NumPy arrays; indexing or iterating still yields FrameRecords for code
+that wants per-frame objects. save_npz/load_npz store the columns as a
+compact binary sidecar file.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+import numpy as np
+
+
+@dataclass
+class FrameRecord:
+    """Per-frame snapshot of simulation state."""
+
+    frame: int
+    x: float
+    y: float
+    x_vel: float
+    y_vel: float
+    ground_speed: float
+    angle: int
+    on_ground: bool
+    state: str
+    action: int
+    reward: float
+    rings: int
+    events: list[str]
+
+
+# Column order of the row buffer. ``state`` is stored as a code into the
+# trajectory's state table; everything else is stored exactly in float64.
+FIELDS = (
+    "frame", "x", "y", "x_vel", "y_vel", "ground_speed", "angle",
+    "on_ground", "state", "action", "reward", "rings",
+)
+_COL = {name: i for i, name in enumerate(FIELDS)}
+_INT_FIELDS = frozenset({"frame", "angle", "action", "rings"})
+
+DEFAULT_CHUNK_ROWS = 1024
+
+
+class Trajectory:
+    """Growable columnar buffer of per-frame records.
+
+    Args:
+        capacity: Rows to preallocate (e.g. the scenario's max_frames).
+            Appending past it adds further chunks of the same size.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CHUNK_ROWS) -> None:
+        self._chunk_rows = max(int(capacity), 1)
+        self._chunks: list[np.ndarray] = []
+        self._current = np.empty((self._chunk_rows, len(FIELDS)), dtype=np.float64)
+        self._used = 0  # rows used in _current
+        self._len = 0
+        self._states: list[str] = []
+        self._state_codes: dict[str, int] = {}
+        # Event table: row index and event type code, in row order.
+        self._event_rows: list[int] = []
+        self._event_codes: list[int] = []
+        self._event_types: list[str] = []
+        self._event_type_codes: dict[str, int] = {}
+        self._cache: np.ndarray | None = None
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def append(
+        self,
+        frame: int,
+        x: float,
+        y: float,
+        x_vel: float,
+        y_vel: float,
+        ground_speed: float,
+        angle: int,
+        on_ground: bool,
+        state: str,
+        action: int,
+        reward: float,
+        rings: int,
+        events: Sequence[str] = (),
+    ) -> None:
+        """Append one frame. Arguments mirror the FrameRecord fields."""
+        code = self._state_codes.get(state)
+        if code is None:
+            code = self._state_codes[state] = len(self._states)
+            self._states.append(state)
+        if self._used == self._chunk_rows:
+            self._chunks.append(self._current)
+            self._current = np.empty_like(self._current)
+            self._used = 0
+        self._current[self._used] = (
+            frame, x, y, x_vel, y_vel, ground_speed, angle,
+            on_ground, code, action, reward, rings,
+        )
+        if events:
+            for name in events:
+                etype = self._event_type_codes.get(name)
+                if etype is None:
+                    etype = self._event_type_codes[name] = len(self._event_types)
+                    self._event_types.append(name)
+                self._event_rows.append(self._len)
+                self._event_codes.append(etype)
+        self._used += 1
+        self._len += 1
+        self._cache = None
+
+    def append_record(self, record: FrameRecord) -> None:
+        self.append(
+            record.frame, record.x, record.y, record.x_vel, record.y_vel,
+            record.ground_speed, record.angle, record.on_ground, record.state,
+            record.action, record.reward, record.rings, record.events,
+        )
+
+    @classmethod
+    def from_records(cls, records: Iterable[FrameRecord]) -> Trajectory:
+        records = list(records)
+        traj = cls(capacity=len(records))
+        for record in records:
+            traj.append_record(record)
+        return traj
+
+    def head(self, count: int, capacity: int | None = None) -> Trajectory:
+        """New trajectory holding a copy of the first *count* rows.
+
+        *capacity* preallocates room for further appends (default *count*).
+        """
+        count = min(count, self._len)
+        traj = Trajectory(capacity=max(capacity or 0, count, 1))
+        traj._current[:count] = self._rows()[:count]
+        traj._used = traj._len = count
+        traj._states = list(self._states)
+        traj._state_codes = dict(self._state_codes)
+        n_events = bisect.bisect_left(self._event_rows, count)
+        traj._event_rows = self._event_rows[:n_events]
+        traj._event_codes = self._event_codes[:n_events]
+        traj._event_types = list(self._event_types)
+        traj._event_type_codes = dict(self._event_type_codes)
+        return traj
+
+    # ------------------------------------------------------------------
+    # Columnar access
+    # ------------------------------------------------------------------
+
+    def _rows(self) -> np.ndarray:
+        """All used rows as one (len, n_fields) array (no copy if one chunk)."""
+        if not self._chunks:
+            return self._current[:self._used]
+        if self._cache is None:
+            self._cache = np.concatenate(self._chunks + [self._current[:self._used]])
+        return self._cache
+
+    def column(self, name: str) -> np.ndarray:
+        """One field for every frame, as a NumPy array.
+
+        Integer fields come back as int64, ``on_ground`` as bool and
+        ``state`` as an object array of strings.
+
+        Raises:
+            ValueError: If *name* is not a FrameRecord column.
+        """
+        col = _COL.get(name)
+        if col is None:
+            raise ValueError(f"Unknown trajectory column: {name!r}")
+        values = self._rows()[:, col]
+        if name in _INT_FIELDS:
+            return values.astype(np.int64)
+        if name == "on_ground":
+            return values.astype(np.bool_)
+        if name == "state":
+            return np.array(self._states, dtype=object)[values.astype(np.int64)]
+        return values
+
+    def tail(self, name: str, count: int) -> np.ndarray:
+        """The last *count* values of a float column, without concatenating
+        older chunks."""
+        col = _COL[name]
+        if count <= self._used or not self._chunks:
+            return self._current[max(self._used - count, 0):self._used, col]
+        return self._rows()[-count:, col]
+
+    def event_table(self) -> tuple[np.ndarray, list[str]]:
+        """(row index per event, event type name per event), in row order."""
+        types = self._event_types
+        return (
+            np.asarray(self._event_rows, dtype=np.int64),
+            [types[c] for c in self._event_codes],
+        )
+
+    def _events_at(self, i: int) -> list[str]:
+        rows = self._event_rows
+        lo = bisect.bisect_left(rows, i)
+        hi = bisect.bisect_right(rows, i, lo)
+        types = self._event_types
+        return [types[c] for c in self._event_codes[lo:hi]]
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Plain per-frame dicts (FrameRecord field names), for JSON output."""
+        columns = {name: self.column(name).tolist() for name in FIELDS}
+        events: list[list[str]] = [[] for _ in range(self._len)]
+        types = self._event_types
+        for row, code in zip(self._event_rows, self._event_codes):
+            events[row].append(types[code])
+        columns["events"] = events
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    # ------------------------------------------------------------------
+    # Binary sidecar
+    # ------------------------------------------------------------------
+
+    def save_npz(self, path: str | Path) -> None:
+        """Write the trajectory to a compressed ``.npz`` file.
+
+        Each FrameRecord field is one array (``state`` as codes into
+        ``state_names``), plus ``event_rows``/``event_codes``/``event_names``
+        for the event table, so other tools can load single columns.
+        """
+        rows = self._rows()
+        arrays: dict[str, np.ndarray] = {}
+        for name in FIELDS:
+            values = rows[:, _COL[name]]
+            if name in _INT_FIELDS or name == "state":
+                values = values.astype(np.int64)
+            elif name == "on_ground":
+                values = values.astype(np.bool_)
+            arrays[name] = values
+        np.savez_compressed(
+            path,
+            state_names=np.array(self._states, dtype=str),
+            event_rows=np.asarray(self._event_rows, dtype=np.int64),
+            event_codes=np.asarray(self._event_codes, dtype=np.int64),
+            event_names=np.array(self._event_types, dtype=str),
+            **arrays,
+        )
+
+    @classmethod
+    def load_npz(cls, path: str | Path) -> Trajectory:
+        """Read a trajectory written by save_npz."""
+        with np.load(path) as data:
+            rows = np.column_stack([data[name].astype(np.float64) for name in FIELDS])
+            traj = cls(capacity=len(rows))
+            traj._current[:len(rows)] = rows
+            traj._used = traj._len = len(rows)
+            traj._states = data["state_names"].tolist()
+            traj._event_rows = data["event_rows"].tolist()
+            traj._event_codes = data["event_codes"].tolist()
+            traj._event_types = data["event_names"].tolist()
+        traj._state_codes = {name: i for i, name in enumerate(traj._states)}
+        traj._event_type_codes = {name: i for i, name in enumerate(traj._event_types)}
+        return traj
+
+    # ------------------------------------------------------------------
+    # Sequence protocol (FrameRecord views)
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return self._len
+
+    def _record(self, i: int) -> FrameRecord:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("trajectory index out of range")
+        chunk, row = divmod(i, self._chunk_rows)
+        data = self._chunks[chunk] if chunk < len(self._chunks) else self._current
+        (frame, x, y, x_vel, y_vel, ground_speed, angle,
+         on_ground, state, action, reward, rings) = data[row].tolist()
+        return FrameRecord(
+            frame=int(frame), x=x, y=y, x_vel=x_vel, y_vel=y_vel,
+            ground_speed=ground_speed, angle=int(angle),
+            on_ground=bool(on_ground), state=self._states[int(state)],
+            action=int(action), reward=reward, rings=int(rings),
+            events=self._events_at(i),
+        )
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(self._len))]
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[FrameRecord]:
+        for i in range(self._len):
+            yield self._record(i)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Trajectory, list, tuple)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Trajectory(len={self._len})"
+
+    def __getstate__(self) -> dict:
+        # Pickle only the used rows (e.g. when results cross process pools).
+        state = self.__dict__.copy()
+        rows = self._rows()
+        state["_chunks"] = []
+        state["_current"] = rows.copy() if len(rows) else np.empty((1, len(FIELDS)))
+        state["_used"] = state["_len"] = len(rows)
+        state["_chunk_rows"] = len(state["_current"])
+        state["_cache"] = None
+        return state
@@ -0,0 +1,307 @@
+"""speednik/shm_vector_env.py — Multiprocess vector env over shared memory (Layer 5).
+
+Each worker process owns a contiguous slice of environments (a
+SpeednikVectorEnv stepping sim_step) and writes observations, rewards,
+done flags and info values straight into one multiprocessing.shared_memory
+block. Actions and reset masks travel the other way through the same
+block, so the only thing sent over a pipe per step is a one-byte command
+token and a one-byte acknowledgement.
+
+Only NEXT_STEP autoreset is supported: SAME_STEP would have to ship final
+observations and infos back per episode.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from speednik.agents.actions import NUM_ACTIONS
+from speednik.observation import OBS_DIM, OBS_DIM_BASE
+from speednik.vector_env import _INFO_DTYPES, INFO_KEYS, SpeednikVectorEnv
+
+# Command / acknowledgement tokens exchanged over the worker pipes.
+_CMD_STEP = b"s"
+_CMD_RESET = b"r"
+_CMD_CLOSE = b"c"
+_ACK = b"k"
+_ERR = b"e"
+
+
+# ---------------------------------------------------------------------------
+# Shared buffer layout
+# ---------------------------------------------------------------------------
+
+def _buffer_specs(num_envs: int, obs_dim: int) -> list[tuple[str, tuple, np.dtype]]:
+    """(name, shape, dtype) for every array stored in the shared block."""
+    specs = [
+        ("obs", (num_envs, obs_dim), np.dtype(np.float32)),
+        ("rewards", (num_envs,), np.dtype(np.float64)),
+        ("terminations", (num_envs,), np.dtype(np.bool_)),
+        ("truncations", (num_envs,), np.dtype(np.bool_)),
+        ("actions", (num_envs,), np.dtype(np.int64)),
+        ("reset_mask", (num_envs,), np.dtype(np.bool_)),
+    ]
+    specs += [(f"info_{key}", (num_envs,), np.dtype(_INFO_DTYPES[key])) for key in INFO_KEYS]
+    return specs
+
+
+def _buffer_size(specs: list[tuple[str, tuple, np.dtype]]) -> int:
+    size = 0
+    for _, shape, dtype in specs:
+        size = _align(size) + int(np.prod(shape)) * dtype.itemsize
+    return max(size, 1)
+
+
+def _align(offset: int, alignment: int = 64) -> int:
+    return -(-offset // alignment) * alignment
+
+
+def _map_buffers(buf: memoryview, specs: list[tuple[str, tuple, np.dtype]]) -> dict[str, np.ndarray]:
+    """Create numpy views over *buf* following *specs*."""
+    views = {}
+    offset = 0
+    for name, shape, dtype in specs:
+        offset = _align(offset)
+        views[name] = np.ndarray(shape, dtype=dtype, buffer=buf, offset=offset)
+        offset += int(np.prod(shape)) * dtype.itemsize
+    return views
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _worker(
+    pipe,
+    shm_name: str,
+    specs: list[tuple[str, tuple, np.dtype]],
+    lo: int,
+    hi: int,
+    env_kwargs: dict[str, Any],
+) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        views = _map_buffers(shm.buf, specs)
+        env = SpeednikVectorEnv(num_envs=hi - lo, copy=False, **env_kwargs)
+        # Point the sub-env's output buffers at this worker's shared slice.
+        env._observations = views["obs"][lo:hi]
+        env._rewards = views["rewards"][lo:hi]
+        env._terminations = views["terminations"][lo:hi]
+        env._truncations = views["truncations"][lo:hi]
+        info = {key: views[f"info_{key}"][lo:hi] for key in INFO_KEYS}
+        actions = views["actions"][lo:hi]
+        reset_mask = views["reset_mask"][lo:hi]
+
+        while True:
+            cmd = pipe.recv_bytes()
+            try:
+                if cmd == _CMD_STEP:
+                    env._step_sims(actions)
+                    env._autoreset_envs[:] = env._terminations | env._truncations
+                elif cmd == _CMD_RESET:
+                    for i in np.flatnonzero(reset_mask).tolist():
+                        env._reset_env(i)
+                        env._autoreset_envs[i] = False
+                elif cmd == _CMD_CLOSE:
+                    break
+                else:
+                    raise ValueError(f"Unknown command {cmd!r}")
+                env._fill_info(info)
+            except Exception:
+                pipe.send_bytes(_ERR + traceback.format_exc().encode())
+                continue
+            pipe.send_bytes(_ACK)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Drop the array views before closing, otherwise the mapping is busy.
+        views = env = info = actions = reset_mask = None
+        shm.close()
+
+
+# ---------------------------------------------------------------------------
+# Vector env
+# ---------------------------------------------------------------------------
+
+class SharedMemoryVectorEnv(VectorEnv):
+    """Speednik vector env stepped by worker processes over shared memory.
+
+    Envs are split into ``num_workers`` contiguous slices; every step the
+    parent writes actions into shared memory, signals all workers, and
+    waits for one acknowledgement byte from each. Results match
+    SpeednikVectorEnv exactly.
+    """
+
+    metadata = {
+        "render_modes": [],
+        "render_fps": 60,
+        "autoreset_mode": AutoresetMode.NEXT_STEP,
+    }
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        stage: str = "hillside",
+        max_steps: int = 3600,
+        *,
+        num_workers: int | None = None,
+        max_episode_steps: int | None = None,
+        use_raycasts: bool = True,
+        frame_skip: int = 1,
+        context: str | None = None,
+        copy: bool = True,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be positive, got {num_workers}")
+        num_workers = min(num_workers, num_envs)
+
+        self.num_envs = num_envs
+        self.num_workers = num_workers
+        self.stage_name = stage
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be positive, got {frame_skip}")
+        if max_episode_steps is not None:
+            max_steps = min(max_steps, max_episode_steps * frame_skip)
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.use_raycasts = use_raycasts
+        self.copy = copy
+        self.closed = True  # until the workers are up
+
+        obs_dim = OBS_DIM if use_raycasts else OBS_DIM_BASE
+        self.single_observation_space = spaces.Box(
+            low=-np.inf, high=np.inf, shape=(obs_dim,), dtype=np.float32,
+        )
+        self.single_action_space = spaces.Discrete(NUM_ACTIONS)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        specs = _buffer_specs(num_envs, obs_dim)
+        self._shm = shared_memory.SharedMemory(create=True, size=_buffer_size(specs))
+        self._views = _map_buffers(self._shm.buf, specs)
+
+        env_kwargs = {
+            "stage": stage,
+            "max_steps": max_steps,
+            "use_raycasts": use_raycasts,
+            "frame_skip": frame_skip,
+        }
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        ctx = mp.get_context(context)
+        self._pipes = []
+        self._processes = []
+        for w in range(num_workers):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(
+                target=_worker,
+                name=f"speednik-shm-worker-{w}",
+                args=(child, self._shm.name, specs, int(bounds[w]), int(bounds[w + 1]), env_kwargs),
+                daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(proc)
+        self.closed = False
+
+    # ------------------------------------------------------------------
+    # Gymnasium API
+    # ------------------------------------------------------------------
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int | None] | None = None,
+        options: dict | None = None,
+    ) -> tuple[np.ndarray, dict]:
+        """Reset all envs, or only those selected by ``options["reset_mask"]``."""
+        if isinstance(seed, list):
+            seed = seed[0]
+        super().reset(seed=seed)
+
+        mask = None if options is None else options.get("reset_mask")
+        if mask is None:
+            self._views["reset_mask"][:] = True
+        else:
+            mask = np.asarray(mask, dtype=np.bool_)
+            if mask.shape != (self.num_envs,):
+                raise ValueError(
+                    f"reset_mask must have shape ({self.num_envs},), got {mask.shape}"
+                )
+            self._views["reset_mask"][:] = mask
+        self._broadcast(_CMD_RESET)
+        return self._obs_out(), self._info_out()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._views["actions"][:] = actions
+        self._broadcast(_CMD_STEP)
+        views = self._views
+        return (
+            self._obs_out(),
+            views["rewards"].copy(),
+            views["terminations"].copy(),
+            views["truncations"].copy(),
+            self._info_out(),
+        )
+
+    def close_extras(self, **kwargs: Any) -> None:
+        for pipe in self._pipes:
+            try:
+                pipe.send_bytes(_CMD_CLOSE)
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._processes:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+        self._views = {}
+        self._shm.close()
+        self._shm.unlink()
+
+    def __del__(self) -> None:
+        if not getattr(self, "closed", True):
+            self.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _broadcast(self, cmd: bytes) -> None:
+        """Send *cmd* to every worker, then wait for every acknowledgement."""
+        for pipe in self._pipes:
+            pipe.send_bytes(cmd)
+        errors = []
+        for w, pipe in enumerate(self._pipes):
+            reply = pipe.recv_bytes()
+            if reply != _ACK:
+                errors.append(f"worker {w}:\n{reply[1:].decode()}")
+        if errors:
+            raise RuntimeError("Worker failure\n" + "\n".join(errors))
+
+    def _obs_out(self) -> np.ndarray:
+        obs = self._views["obs"]
+        return obs.copy() if self.copy else obs
+
+    def _info_out(self) -> dict:
+        info: dict = {key: self._views[f"info_{key}"].copy() for key in INFO_KEYS}
+        mask = np.ones(self.num_envs, dtype=np.bool_)
+        for key in INFO_KEYS:
+            info[f"_{key}"] = mask
+        return info
@@ -1,12 +1,13 @@
 """speednik/simulation.py — Headless game simulation (Layer 2).
 
 Provides SimState (complete headless game state) and create_sim() factory
-for loading a real stage into a simulation-ready state. No Pyxel imports.
+for loading a real stage into a simulation-ready state, plus
+sim_snapshot()/sim_restore() for cheap branching. No Pyxel imports.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from speednik.constants import BOSS_SPAWN_X, BOSS_SPAWN_Y, PIT_DEATH_MARGIN
 from speednik.enemies import (
@@ -16,7 +17,7 @@ from speednik.enemies import (
     load_enemies,
     update_enemies,
 )
-from speednik.level import load_stage
+from speednik.level import StageData, load_stage
 from speednik.objects import (
     Checkpoint,
     CheckpointEvent as ObjCheckpointEvent,
@@ -41,9 +42,17 @@ from speednik.objects import (
     update_spring_cooldowns,
     update_liquid_zones,
 )
+from speednik.packed import PackedStore
 from speednik.physics import InputState
-from speednik.player import Player, PlayerState, create_player, player_update
-from speednik.terrain import TileLookup
+from speednik.player import (
+    Player,
+    PlayerState,
+    ScatteredRing,
+    create_player,
+    player_update,
+)
+from speednik.spatial import EntityIndex
+from speednik.terrain import TileGrid, TileLookup
 
 
 # ---------------------------------------------------------------------------
@@ -117,33 +126,68 @@ class SimState:
     deaths: int = 0
     goal_reached: bool = False
     player_dead: bool = False
+    # Dense form of tile_lookup when available (used by batched raycasts).
+    tile_grid: TileGrid | None = None
+    # Broad-phase index over the entity lists; sim_step falls back to full
+    # scans when None (e.g. sims built by create_sim_from_lookup).
+    entity_index: EntityIndex | None = None
+    # Packed mutable fields of each entity list, keyed by SimState attribute
+    # name; sim_snapshot repacks a list that was replaced or resized.
+    entity_stores: dict[str, PackedStore] = field(default_factory=dict)
 
 
 # ---------------------------------------------------------------------------
-# Factory
+# Stage cache
 # ---------------------------------------------------------------------------
 
-def create_sim(stage_name: str) -> SimState:
-    """Load a stage and initialize all game state. No Pyxel.
+@dataclass(frozen=True)
+class StageTemplate:
+    """Parsed stage plus pristine entity templates, shared process-wide.
+
+    Treat as read-only: create_sim copies the mutable entities out of it and
+    shares the terrain and launch pipes (which never change) between sims.
+    """
+
+    stage: StageData
+    rings: tuple[Ring, ...]
+    springs: tuple[Spring, ...]
+    checkpoints: tuple[Checkpoint, ...]
+    pipes: tuple[LaunchPipe, ...]
+    liquid_zones: tuple[LiquidZone, ...]
+    enemies: tuple[Enemy, ...]
+    goal_x: float
+    goal_y: float
+    entity_index: EntityIndex
+    entity_stores: dict[str, PackedStore]
+
+
+_stage_cache: dict[str, StageTemplate] = {}
+
+
+def get_stage_template(stage_name: str) -> StageTemplate:
+    """Return the cached template for a stage, loading it on first use.
 
     Args:
         stage_name: One of "hillside", "pipeworks", "skybridge".
 
-    Returns:
-        Fully populated SimState ready for sim_step.
+    Raises:
+        ValueError: If stage_name is not recognized.
     """
-    stage = load_stage(stage_name)
+    template = _stage_cache.get(stage_name)
+    if template is None:
+        template = _build_stage_template(stage_name)
+        _stage_cache[stage_name] = template
+    return template
+
+
+def clear_stage_cache() -> None:
+    """Drop all cached stage templates (e.g. after regenerating stage data)."""
+    _stage_cache.clear()
 
-    # Player
-    sx, sy = stage.player_start
-    player = create_player(float(sx), float(sy))
 
-    # Entities
-    rings = load_rings(stage.entities)
-    springs = load_springs(stage.entities)
-    checkpoints = load_checkpoints(stage.entities)
-    pipes = load_pipes(stage.entities)
-    liquid_zones = load_liquid_zones(stage.entities)
+def _build_stage_template(stage_name: str) -> StageTemplate:
+    stage = load_stage(stage_name)
+
     enemies = load_enemies(stage.entities)
 
     # Goal position
@@ -162,9 +206,14 @@ def create_sim(stage_name: str) -> SimState:
         ]
         enemies.extend(load_enemies(boss_entities))
 
-    return SimState(
-        player=player,
-        tile_lookup=stage.tile_lookup,
+    rings = tuple(load_rings(stage.entities))
+    springs = tuple(load_springs(stage.entities))
+    checkpoints = tuple(load_checkpoints(stage.entities))
+    pipes = tuple(load_pipes(stage.entities))
+    liquid_zones = tuple(load_liquid_zones(stage.entities))
+    enemies = tuple(enemies)
+    return StageTemplate(
+        stage=stage,
         rings=rings,
         springs=springs,
         checkpoints=checkpoints,
@@ -173,8 +222,68 @@ def create_sim(stage_name: str) -> SimState:
         enemies=enemies,
         goal_x=goal_x,
         goal_y=goal_y,
+        entity_index=EntityIndex.build(rings, springs, checkpoints, pipes, enemies),
+        entity_stores={
+            "rings": PackedStore(rings),
+            "springs": PackedStore(springs),
+            "checkpoints": PackedStore(checkpoints),
+            "liquid_zones": PackedStore(liquid_zones),
+            "enemies": PackedStore(enemies),
+        },
+    )
+
+
+# ---------------------------------------------------------------------------
+# Factory
+# ---------------------------------------------------------------------------
+
+def create_sim(stage_name: str) -> SimState:
+    """Initialize all game state for a stage. No Pyxel.
+
+    Stage files are parsed once per process (see get_stage_template); each
+    call only copies the mutable entities and creates a fresh player.
+
+    Args:
+        stage_name: One of "hillside", "pipeworks", "skybridge".
+
+    Returns:
+        Fully populated SimState ready for sim_step.
+    """
+    template = get_stage_template(stage_name)
+    stage = template.stage
+
+    # Player
+    sx, sy = stage.player_start
+    player = create_player(float(sx), float(sy))
+
+    stores = {
+        name: store.copy() for name, store in template.entity_stores.items()
+    }
+    rings = stores["rings"].entities
+    springs = stores["springs"].entities
+    checkpoints = stores["checkpoints"].entities
+    pipes = list(template.pipes)
+    enemies = stores["enemies"].entities
+    return SimState(
+        player=player,
+        tile_lookup=stage.tile_lookup,
+        rings=rings,
+        springs=springs,
+        checkpoints=checkpoints,
+        pipes=pipes,
+        liquid_zones=stores["liquid_zones"].entities,
+        enemies=enemies,
+        goal_x=template.goal_x,
+        goal_y=template.goal_y,
         level_width=stage.level_width,
         level_height=stage.level_height,
+        tile_grid=stage.tile_grid,
+        # Same-order copies of the template lists, so the bucket layout
+        # can be reused instead of recomputed.
+        entity_index=template.entity_index.rebind(
+            rings, springs, checkpoints, pipes, enemies,
+        ),
+        entity_stores=stores,
     )
 
 
@@ -204,6 +313,7 @@ def create_sim_from_lookup(
         goal_y=0.0,
         level_width=level_width,
         level_height=level_height,
+        tile_grid=tile_lookup if isinstance(tile_lookup, TileGrid) else None,
     )
 
 
@@ -254,24 +364,30 @@ def sim_step(sim: SimState, inp: InputState) -> list[Event]:
     # Track progress
     sim.max_x_reached = max(sim.max_x_reached, p.x)
 
+    index = sim.entity_index
+
     # Ring collection
-    for ring_evt in check_ring_collection(sim.player, sim.rings):
+    ring_index = index.rings(sim.rings) if index is not None else None
+    for ring_evt in check_ring_collection(sim.player, sim.rings, ring_index):
         if isinstance(ring_evt, ObjRingEvent):
             sim.rings_collected += 1
             events.append(RingCollectedEvent())
 
     # Spring collision
-    for spring_evt in check_spring_collision(sim.player, sim.springs):
+    spring_index = index.springs(sim.springs) if index is not None else None
+    for spring_evt in check_spring_collision(sim.player, sim.springs, spring_index):
         if isinstance(spring_evt, ObjSpringEvent):
             events.append(SpringEvent())
 
     # Checkpoint collision
-    for cp_evt in check_checkpoint_collision(sim.player, sim.checkpoints):
+    cp_index = index.checkpoints(sim.checkpoints) if index is not None else None
+    for cp_evt in check_checkpoint_collision(sim.player, sim.checkpoints, cp_index):
         if isinstance(cp_evt, ObjCheckpointEvent):
             events.append(CheckpointEvent())
 
     # Pipe travel
-    update_pipe_travel(sim.player, sim.pipes)
+    pipe_index = index.pipes(sim.pipes) if index is not None else None
+    update_pipe_travel(sim.player, sim.pipes, pipe_index)
 
     # Liquid zones
     liq_events = update_liquid_zones(sim.player, sim.liquid_zones)
@@ -284,7 +400,8 @@ def sim_step(sim: SimState, inp: InputState) -> list[Event]:
 
     # Enemy updates
     update_enemies(sim.enemies)
-    enemy_events = check_enemy_collision(sim.player, sim.enemies)
+    enemy_index = index.enemies(sim.enemies) if index is not None else None
+    enemy_events = check_enemy_collision(sim.player, sim.enemies, enemy_index)
     for enemy_evt in enemy_events:
         if enemy_evt == EnemyEvent.PLAYER_DAMAGED:
             events.append(DamageEvent())
@@ -297,3 +414,126 @@ def sim_step(sim: SimState, inp: InputState) -> list[Event]:
 
     sim.frame += 1
     return events
+
+
+# ---------------------------------------------------------------------------
+# Snapshot / restore
+# ---------------------------------------------------------------------------
+
+# SimState entity lists whose mutable fields are packed (see speednik.packed).
+_PACKED_LISTS = ("rings", "springs", "checkpoints", "liquid_zones", "enemies")
+
+
+@dataclass(frozen=True)
+class SimSnapshot:
+    """Mutable state of a SimState at one frame, packed for cheap branching.
+
+    Holds only plain values: terrain, launch pipes and entity positions that
+    never change are left on the sim. Each entity list is captured as the
+    flat values of its PackedStore (``packed_fields`` of its class, row
+    after row), so taking or restoring a snapshot is a few list copies
+    however many entities the stage has.
+    """
+
+    counters: tuple
+    physics: dict
+    player: dict
+    scattered_rings: tuple[tuple, ...]
+    rings: tuple
+    springs: tuple
+    checkpoints: tuple
+    liquid_zones: tuple
+    enemies: tuple
+    # Ring and enemy positions dropped from the broad-phase index, or None
+    # if the sim had no index.
+    index_removed: tuple[frozenset[int], frozenset[int]] | None
+
+
+def _entity_store(sim: SimState, name: str) -> PackedStore:
+    entities = getattr(sim, name)
+    store = sim.entity_stores.get(name)
+    if store is None or not store.holds(entities):
+        store = sim.entity_stores[name] = PackedStore(entities)
+    return store
+
+
+def sim_snapshot(sim: SimState) -> SimSnapshot:
+    """Capture the mutable state of *sim* for a later sim_restore.
+
+    Much cheaper than ``copy.deepcopy(sim)``: entity objects, terrain and
+    the spatial index are not copied. A snapshot can be restored any
+    number of times, into the sim it came from or any sim created from the
+    same stage.
+    """
+    player = sim.player
+    player_state = player.__dict__.copy()
+    del player_state["physics"]
+    del player_state["scattered_rings"]
+    rings, springs, checkpoints, liquid_zones, enemies = (
+        _entity_store(sim, name).dump() for name in _PACKED_LISTS
+    )
+    index = sim.entity_index
+    return SimSnapshot(
+        counters=(
+            sim.frame, sim.max_x_reached, sim.rings_collected,
+            sim.deaths, sim.goal_reached, sim.player_dead,
+        ),
+        physics=player.physics.__dict__.copy(),
+        player=player_state,
+        scattered_rings=tuple(
+            (r.x, r.y, r.vx, r.vy, r.timer) for r in player.scattered_rings
+        ),
+        rings=rings,
+        springs=springs,
+        checkpoints=checkpoints,
+        liquid_zones=liquid_zones,
+        enemies=enemies,
+        index_removed=None if index is None else (
+            index.rings(sim.rings).removed,
+            index.enemies(sim.enemies).removed,
+        ),
+    )
+
+
+def sim_restore(sim: SimState, snap: SimSnapshot) -> None:
+    """Rewind *sim* in place to the state captured by *snap*.
+
+    Entity objects keep their identity — only the values in their packed
+    stores are overwritten — so references held by callers and the spatial
+    index stay valid. The index is synced to the snapshot's removed sets,
+    touching only rings and enemies whose membership differs.
+
+    Raises:
+        ValueError: If *sim*'s entity lists don't match the snapshot's sizes.
+    """
+    stores = [_entity_store(sim, name) for name in _PACKED_LISTS]
+    packed = (
+        snap.rings, snap.springs, snap.checkpoints,
+        snap.liquid_zones, snap.enemies,
+    )
+    for store, values in zip(stores, packed):
+        if len(store.values) != len(values):
+            raise ValueError("Snapshot does not match this simulation's entities")
+
+    (
+        sim.frame, sim.max_x_reached, sim.rings_collected,
+        sim.deaths, sim.goal_reached, sim.player_dead,
+    ) = snap.counters
+
+    player = sim.player
+    player.physics.__dict__.update(snap.physics)
+    player.__dict__.update(snap.player)
+    player.scattered_rings[:] = [ScatteredRing(*r) for r in snap.scattered_rings]
+
+    for store, values in zip(stores, packed):
+        store.load(values)
+
+    if sim.entity_index is not None:
+        if snap.index_removed is None:
+            sim.entity_index = EntityIndex.build(
+                sim.rings, sim.springs, sim.checkpoints, sim.pipes, sim.enemies,
+            )
+        else:
+            rings_removed, enemies_removed = snap.index_removed
+            sim.entity_index.rings(sim.rings).set_removed(rings_removed)
+            sim.entity_index.enemies(sim.enemies).set_removed(enemies_removed)
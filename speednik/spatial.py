@@ -0,0 +1,313 @@
+"""speednik/spatial.py — Broad-phase spatial index for world entities.
+
+Rings, springs, checkpoints, launch pipes and enemies are bucketed by x
+into fixed-width cells so per-frame collision checks only visit entities
+near the player instead of scanning every list. Levels are long and
+shallow, so a 1D index over x prunes almost everything.
+
+Queries return candidates in original list order, so callers iterating
+the result see entities in the same order as a full scan and produce
+identical events. Pyxel-free.
+"""
+
+from __future__ import annotations
+
+import bisect
+import copy
+import math
+from typing import Callable, Generic, Sequence, TypeVar
+
+from speednik.constants import (
+    CHECKPOINT_ACTIVATION_RADIUS,
+    PIPE_ENTRY_HITBOX_W,
+    RING_COLLECTION_RADIUS,
+    SPRING_HITBOX_W,
+)
+from speednik.enemies import Enemy, enemy_x_extent
+from speednik.objects import Checkpoint, LaunchPipe, Ring, Spring
+
+T = TypeVar("T")
+
+# Bucket width in pixels (four tiles). Larger than every entity hitbox and
+# the player rect, so most queries touch one or two buckets.
+INDEX_CELL_SIZE = 64
+
+
+# ---------------------------------------------------------------------------
+# Generic x-bucket index
+# ---------------------------------------------------------------------------
+
+class SpatialIndex(Generic[T]):
+    """Uniform-grid index over the x extents of a list of items.
+
+    Each item is stored in every cell its extent ``[x_lo, x_hi]`` touches.
+    The extent must cover every x the item can occupy while it stays in the
+    index (e.g. a crab's whole patrol range).
+
+    Args:
+        items: The list being indexed. Kept by reference; see indexes().
+        extent: Function returning an item's inclusive (x_lo, x_hi) span.
+        cell_size: Bucket width in pixels.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[T],
+        extent: Callable[[T], tuple[float, float]],
+        cell_size: int = INDEX_CELL_SIZE,
+    ) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be positive, got {cell_size}")
+        self.cell_size = cell_size
+        self._items = items
+        self._size = len(items)
+        self._buckets: dict[int, list[int]] = {}
+        self._cells: list[tuple[int, int]] = []
+        self._removed: set[int] = set()
+        self._positions: dict[int, int] | None = None
+        for i, item in enumerate(items):
+            lo, hi = extent(item)
+            c0 = math.floor(lo / cell_size)
+            c1 = math.floor(hi / cell_size)
+            self._cells.append((c0, c1))
+            for c in range(c0, c1 + 1):
+                self._buckets.setdefault(c, []).append(i)
+
+    def __getstate__(self) -> dict:
+        # The id()-keyed position map doesn't survive copying or pickling.
+        state = self.__dict__.copy()
+        state["_positions"] = None
+        return state
+
+    def __len__(self) -> int:
+        """Number of items still in the index."""
+        return self._size - len(self._removed)
+
+    def indexes(self, items: Sequence[T]) -> bool:
+        """True if this index was built over *items* and it hasn't grown or shrunk."""
+        return items is self._items and len(items) == self._size
+
+    def query(self, x_min: float, x_max: float) -> list[T]:
+        """Items whose extent may overlap ``[x_min, x_max]``, in list order."""
+        cs = self.cell_size
+        c0 = math.floor(x_min / cs)
+        c1 = math.floor(x_max / cs)
+        items = self._items
+        buckets = self._buckets
+        if c0 == c1:
+            bucket = buckets.get(c0)
+            return [items[i] for i in bucket] if bucket else []
+        hits: set[int] = set()
+        for c in range(c0, c1 + 1):
+            bucket = buckets.get(c)
+            if bucket:
+                hits.update(bucket)
+        return [items[i] for i in sorted(hits)]
+
+    def remove(self, item: T) -> None:
+        """Drop *item* from every bucket (no-op if it was already removed)."""
+        i = self._position(item)
+        if i not in self._removed:
+            self._remove_at(i)
+
+    def add(self, item: T) -> None:
+        """Put a removed *item* back (no-op if it is still indexed).
+
+        Raises:
+            ValueError: If *item* is not in the indexed list.
+        """
+        i = self._position(item)
+        if i in self._removed:
+            self._add_at(i)
+
+    @property
+    def removed(self) -> frozenset[int]:
+        """List positions of the items currently dropped from the index."""
+        return frozenset(self._removed)
+
+    def set_removed(self, removed: frozenset[int]) -> None:
+        """Drop exactly the items at the *removed* positions, restoring the rest.
+
+        Only positions whose membership changes are touched, so syncing the
+        index to a saved ``removed`` set costs O(changes), not O(items).
+
+        Raises:
+            ValueError: If a position is outside the indexed list.
+        """
+        if removed and not (0 <= min(removed) and max(removed) < self._size):
+            raise ValueError("removed position outside the indexed list")
+        for i in self._removed - removed:
+            self._add_at(i)
+        for i in removed - self._removed:
+            self._remove_at(i)
+
+    def _remove_at(self, i: int) -> None:
+        self._removed.add(i)
+        c0, c1 = self._cells[i]
+        for c in range(c0, c1 + 1):
+            bucket = self._buckets[c]
+            bucket.remove(i)
+            if not bucket:
+                del self._buckets[c]
+
+    def _add_at(self, i: int) -> None:
+        self._removed.discard(i)
+        c0, c1 = self._cells[i]
+        for c in range(c0, c1 + 1):
+            bisect.insort(self._buckets.setdefault(c, []), i)
+
+    def _position(self, item: T) -> int:
+        if self._positions is None:
+            self._positions = {id(it): i for i, it in enumerate(self._items)}
+        i = self._positions.get(id(item))
+        if i is None:
+            raise ValueError("item is not in the indexed list")
+        return i
+
+    def rebind(self, items: Sequence[T]) -> SpatialIndex[T]:
+        """Copy of this index over *items*, a same-order copy of the indexed list.
+
+        Reuses the bucket layout instead of recomputing extents, which is how
+        create_sim gives every sim its own index over freshly copied entities.
+        """
+        if len(items) != self._size:
+            raise ValueError(
+                f"rebind expects {self._size} items, got {len(items)}"
+            )
+        clone = copy.copy(self)
+        clone._items = items
+        clone._buckets = {c: list(b) for c, b in self._buckets.items()}
+        clone._removed = set(self._removed)
+        clone._positions = None
+        return clone
+
+
+# ---------------------------------------------------------------------------
+# Per-kind entity extents
+# ---------------------------------------------------------------------------
+
+def ring_extent(ring: Ring) -> tuple[float, float]:
+    return (ring.x - RING_COLLECTION_RADIUS, ring.x + RING_COLLECTION_RADIUS)
+
+
+def spring_extent(spring: Spring) -> tuple[float, float]:
+    return (spring.x - SPRING_HITBOX_W / 2, spring.x + SPRING_HITBOX_W / 2)
+
+
+def checkpoint_extent(cp: Checkpoint) -> tuple[float, float]:
+    return (cp.x - CHECKPOINT_ACTIVATION_RADIUS, cp.x + CHECKPOINT_ACTIVATION_RADIUS)
+
+
+def pipe_extent(pipe: LaunchPipe) -> tuple[float, float]:
+    return (pipe.x - PIPE_ENTRY_HITBOX_W / 2, pipe.x + PIPE_ENTRY_HITBOX_W / 2)
+
+
+# ---------------------------------------------------------------------------
+# Entity index
+# ---------------------------------------------------------------------------
+
+class EntityIndex:
+    """Spatial indexes for every entity list the gameplay loop collides with.
+
+    Each accessor takes the current list and returns its index, rebuilding
+    it first if the list was replaced or resized since the last call (tests
+    and tools append entities to a live sim). Collected rings and dead
+    enemies are removed by the collision checks as they happen.
+    """
+
+    def __init__(
+        self,
+        rings: SpatialIndex[Ring],
+        springs: SpatialIndex[Spring],
+        checkpoints: SpatialIndex[Checkpoint],
+        pipes: SpatialIndex[LaunchPipe],
+        enemies: SpatialIndex[Enemy],
+    ) -> None:
+        self._rings = rings
+        self._springs = springs
+        self._checkpoints = checkpoints
+        self._pipes = pipes
+        self._enemies = enemies
+
+    @classmethod
+    def build(
+        cls,
+        rings: Sequence[Ring],
+        springs: Sequence[Spring],
+        checkpoints: Sequence[Checkpoint],
+        pipes: Sequence[LaunchPipe],
+        enemies: Sequence[Enemy],
+    ) -> EntityIndex:
+        """Index the given entity lists, skipping already collected rings
+        and dead enemies."""
+        index = cls(
+            SpatialIndex(rings, ring_extent),
+            SpatialIndex(springs, spring_extent),
+            SpatialIndex(checkpoints, checkpoint_extent),
+            SpatialIndex(pipes, pipe_extent),
+            SpatialIndex(enemies, enemy_x_extent),
+        )
+        index._prune()
+        return index
+
+    def rebind(
+        self,
+        rings: Sequence[Ring],
+        springs: Sequence[Spring],
+        checkpoints: Sequence[Checkpoint],
+        pipes: Sequence[LaunchPipe],
+        enemies: Sequence[Enemy],
+    ) -> EntityIndex:
+        """Copy of this index over same-order copies of the indexed lists."""
+        index = EntityIndex(
+            self._rings.rebind(rings),
+            self._springs.rebind(springs),
+            self._checkpoints.rebind(checkpoints),
+            self._pipes.rebind(pipes),
+            self._enemies.rebind(enemies),
+        )
+        index._prune()
+        return index
+
+    def rings(self, rings: Sequence[Ring]) -> SpatialIndex[Ring]:
+        if not self._rings.indexes(rings):
+            self._rings = SpatialIndex(rings, ring_extent)
+            self._prune_rings()
+        return self._rings
+
+    def springs(self, springs: Sequence[Spring]) -> SpatialIndex[Spring]:
+        if not self._springs.indexes(springs):
+            self._springs = SpatialIndex(springs, spring_extent)
+        return self._springs
+
+    def checkpoints(self, checkpoints: Sequence[Checkpoint]) -> SpatialIndex[Checkpoint]:
+        if not self._checkpoints.indexes(checkpoints):
+            self._checkpoints = SpatialIndex(checkpoints, checkpoint_extent)
+        return self._checkpoints
+
+    def pipes(self, pipes: Sequence[LaunchPipe]) -> SpatialIndex[LaunchPipe]:
+        if not self._pipes.indexes(pipes):
+            self._pipes = SpatialIndex(pipes, pipe_extent)
+        return self._pipes
+
+    def enemies(self, enemies: Sequence[Enemy]) -> SpatialIndex[Enemy]:
+        if not self._enemies.indexes(enemies):
+            self._enemies = SpatialIndex(enemies, enemy_x_extent)
+            self._prune_enemies()
+        return self._enemies
+
+    def _prune(self) -> None:
+        self._prune_rings()
+        self._prune_enemies()
+
+    def _prune_rings(self) -> None:
+        index = self._rings
+        for ring in index._items:
+            if ring.collected:
+                index.remove(ring)
+
+    def _prune_enemies(self) -> None:
+        index = self._enemies
+        for enemy in index._items:
+            if not enemy.alive:
+                index.remove(enemy)
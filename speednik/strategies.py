@@ -12,6 +12,7 @@ from typing import Callable
 from speednik.level import load_stage
 from speednik.physics import InputState
 from speednik.player import Player, PlayerState, create_player, player_update
+from speednik.scenarios.conditions import StuckDetector
 from speednik.terrain import TileLookup, get_quadrant
 
 
@@ -61,13 +62,15 @@ class ScenarioResult:
         """Return X where player was stuck, or None if they kept moving.
 
         Scans with a sliding window. If max(x) - min(x) < tolerance within any
-        window of frames, returns the average X of that window.
+        window of frames, returns the average X of that window. Runs in
+        O(len(snapshots)) using a running min/max.
         """
         if len(self.snapshots) < window:
             return None
-        for i in range(len(self.snapshots) - window + 1):
-            xs = [s.x for s in self.snapshots[i : i + window]]
-            if max(xs) - min(xs) < tolerance:
+        detector = StuckDetector(window, tolerance)
+        for i, s in enumerate(self.snapshots):
+            if detector.update(s.x):
+                xs = [s.x for s in self.snapshots[i - window + 1 : i + 1]]
                 return sum(xs) / len(xs)
         return None
 
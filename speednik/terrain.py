@@ -7,8 +7,11 @@ floor/ceiling/wall resolution, and quadrant-based mode switching.
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass
-from typing import Callable, Optional
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
 
 from speednik.constants import (
     ANGLE_STEPS,
@@ -65,6 +68,13 @@ class Tile:
     solidity: int  # NOT_SOLID / TOP_ONLY / FULL / LRB_ONLY
     tile_type: int = 0  # surface type from tile_map.json (0=unknown, 5=loop)
 
+    # Per-row edge tables derived from height_array, built on first use by
+    # build_edge_tables(). Tiles are finished (stage builders edit
+    # height_array in place) before any sensor reads them.
+    _widths: Optional[list[int]] = field(default=None, init=False, repr=False, compare=False)
+    _left_edges: Optional[list[int]] = field(default=None, init=False, repr=False, compare=False)
+    _right_edges: Optional[list[int]] = field(default=None, init=False, repr=False, compare=False)
+
     def width_array(self) -> list[int]:
         """Compute the width array (height_array rotated 90° for wall detection).
 
@@ -72,16 +82,55 @@ class Tile:
         from the left are solid at that row. A column is solid at row r if
         height_array[col] > r.
         """
-        result = [0] * TILE_SIZE
-        for row in range(TILE_SIZE):
-            count = 0
-            for col in range(TILE_SIZE):
-                if self.height_array[col] > row:
-                    count += 1
-                else:
-                    break
-            result[row] = count
-        return result
+        widths = self._widths
+        if widths is None:
+            widths = self.build_edge_tables()[0]
+        return list(widths)
+
+    def build_edge_tables(self) -> tuple[list[int], list[int], list[int]]:
+        """(Re)build and cache the per-row width, left-edge and right-edge tables.
+
+        Rows are indexed 0 = bottom, 15 = top. Edges are the first/last solid
+        column at that row, or -1 if the row is empty. Call again after
+        editing height_array on a tile that sensors have already read.
+        """
+        tables = _edge_tables_for(tuple(self.height_array))
+        self._widths, self._left_edges, self._right_edges = tables
+        return tables
+
+
+# Edge tables keyed by height profile. Stages reuse a few hundred profiles
+# across thousands of tiles; the lists are shared and must not be mutated.
+_EDGE_TABLES: dict[tuple[int, ...], tuple[list[int], list[int], list[int]]] = {}
+
+
+def _edge_tables_for(heights: tuple[int, ...]) -> tuple[list[int], list[int], list[int]]:
+    """Return (widths, left_edges, right_edges) for a height profile."""
+    tables = _EDGE_TABLES.get(heights)
+    if tables is not None:
+        return tables
+    widths = [0] * TILE_SIZE
+    left_edges = [-1] * TILE_SIZE
+    right_edges = [-1] * TILE_SIZE
+    for row in range(TILE_SIZE):
+        count = 0
+        for col in range(TILE_SIZE):
+            if heights[col] > row:
+                count += 1
+            else:
+                break
+        widths[row] = count
+        for col in range(TILE_SIZE):
+            if heights[col] > row:
+                left_edges[row] = col
+                break
+        for col in range(TILE_SIZE - 1, -1, -1):
+            if heights[col] > row:
+                right_edges[row] = col
+                break
+    tables = (widths, left_edges, right_edges)
+    _EDGE_TABLES[heights] = tables
+    return tables
 
 
 @dataclass
@@ -94,6 +143,486 @@ class SensorResult:
     tile_type: int = 0  # surface type of the hit tile (0=unknown, 5=loop)
 
 
+# ---------------------------------------------------------------------------
+# Dense tile grid
+# ---------------------------------------------------------------------------
+
+class GridTables(NamedTuple):
+    """Every per-cell array a TileGrid reads, flat in C (row-major) order.
+
+    Each array covers rows * cols cells plus one trailing empty cell (zero
+    heights, NOT_SOLID, -1 edges), so vectorized reads can redirect
+    out-of-bounds coordinates to it without masking. Compiled stages store
+    exactly these arrays, so a grid can sit directly on memory-mapped views.
+    """
+
+    heights: np.ndarray      # (n + 1, TILE_SIZE) uint8
+    angles: np.ndarray       # (n + 1,) uint8
+    solidity: np.ndarray     # (n + 1,) uint8, NOT_SOLID where unoccupied
+    tile_type: np.ndarray    # (n + 1,) uint8
+    occupied: np.ndarray     # (n + 1,) uint8
+    widths: np.ndarray       # (n + 1, TILE_SIZE) int8, indexed by row (0 = bottom)
+    left_edges: np.ndarray   # (n + 1, TILE_SIZE) int8, -1 where the row is empty
+    right_edges: np.ndarray  # (n + 1, TILE_SIZE) int8, -1 where the row is empty
+
+
+def grid_tables(
+    heights: np.ndarray,
+    angles: np.ndarray,
+    solidity: np.ndarray,
+    tile_type: np.ndarray,
+    occupied: np.ndarray,
+) -> GridTables:
+    """Flatten dense (rows, cols) terrain arrays into padded GridTables.
+
+    Raises:
+        ValueError: If heights is not shaped (rows, cols, TILE_SIZE).
+    """
+    rows, cols = occupied.shape
+    if heights.shape != (rows, cols, TILE_SIZE):
+        raise ValueError(
+            f"heights shape {heights.shape} != {(rows, cols, TILE_SIZE)}"
+        )
+    n = rows * cols
+
+    def flat(values: np.ndarray, fill: int, dtype: type, width: int = 0) -> np.ndarray:
+        shape = (n + 1, width) if width else (n + 1,)
+        out = np.full(shape, fill, dtype=dtype)
+        out[:n] = values.reshape((n,) + shape[1:])
+        return out
+
+    widths, left_edges, right_edges = _grid_edge_tables(heights)
+    return GridTables(
+        heights=flat(heights, 0, np.uint8, TILE_SIZE),
+        angles=flat(angles, 0, np.uint8),
+        solidity=flat(np.where(occupied, solidity, NOT_SOLID), NOT_SOLID, np.uint8),
+        tile_type=flat(tile_type, 0, np.uint8),
+        occupied=flat(occupied != 0, 0, np.uint8),
+        widths=flat(widths, 0, np.int8, TILE_SIZE),
+        left_edges=flat(left_edges, -1, np.int8, TILE_SIZE),
+        right_edges=flat(right_edges, -1, np.int8, TILE_SIZE),
+    )
+
+
+class TileGridLookup:
+    """The TileLookup of a TileGrid.
+
+    Tile objects are built from the grid's arrays the first time a cell is
+    looked up and cached, so loading a stage does not create one per cell.
+    Holds only what lookups need, with no reference back to the grid, plus
+    the grid's ``pyramid`` so code handed just the lookup can still skip
+    empty terrain (see terrain_pyramid).
+    """
+
+    __slots__ = ("rows", "cols", "pyramid", "_tables", "_occupied", "_cells")
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        tables: GridTables,
+        pyramid: TerrainPyramid,
+        tiles: Optional[Mapping[tuple[int, int], Tile]] = None,
+    ) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.pyramid = pyramid
+        self._tables = tables
+        self._occupied = memoryview(tables.occupied)
+        cells: list[Optional[Tile]] = [None] * (rows * cols)
+        if tiles is not None:
+            for (tx, ty), tile in tiles.items():
+                if 0 <= tx < cols and 0 <= ty < rows:
+                    cells[ty * cols + tx] = tile
+        self._cells = cells
+
+    def __call__(self, tx: int, ty: int) -> Optional[Tile]:
+        if 0 <= tx < self.cols and 0 <= ty < self.rows:
+            i = ty * self.cols + tx
+            tile = self._cells[i]
+            if tile is None and self._occupied[i]:
+                tile = self._build(i)
+            return tile
+        return None
+
+    def _build(self, i: int) -> Tile:
+        """Create and cache the Tile of occupied flat cell *i*."""
+        t = self._tables
+        tile = self._cells[i] = Tile(
+            height_array=t.heights[i].tolist(),
+            angle=int(t.angles[i]),
+            solidity=int(t.solidity[i]),
+            tile_type=int(t.tile_type[i]),
+        )
+        return tile
+
+
+class GridTiles(Mapping):
+    """Read-only (tx, ty) -> Tile mapping over a grid's occupied cells.
+
+    Iterates in row-major order; Tiles come from the grid's lookup, so
+    they are built on first access and shared with the sensors.
+    """
+
+    def __init__(self, lookup: TileGridLookup, occupied: np.ndarray) -> None:
+        self._lookup = lookup
+        self._occupied = occupied
+        self._len: Optional[int] = None
+
+    def __getitem__(self, key: tuple[int, int]) -> Tile:
+        try:
+            tx, ty = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        tile = self._lookup(tx, ty)
+        if tile is None:
+            raise KeyError(key)
+        return tile
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        cols = self._lookup.cols
+        for i in np.flatnonzero(self._occupied).tolist():
+            yield i % cols, i // cols
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = int(np.count_nonzero(self._occupied))
+        return self._len
+
+    def heights(self) -> np.ndarray:
+        """(rows, cols, TILE_SIZE) profiles of the mapped tiles, zero elsewhere.
+
+        Read straight from the grid's arrays, without building Tiles.
+        """
+        lookup = self._lookup
+        n = lookup.rows * lookup.cols
+        tables = lookup._tables
+        occupied = tables.occupied[:n, None] != 0
+        heights = np.where(occupied, tables.heights[:n], 0).astype(np.uint8)
+        return heights.reshape(lookup.rows, lookup.cols, TILE_SIZE)
+
+
+class TileGrid:
+    """Dense NumPy terrain store implementing the TileLookup contract.
+
+    Holds a (rows, cols, 16) uint8 height array plus parallel (rows, cols)
+    angle, solidity, tile_type and occupied arrays. Calling the grid returns
+    the Tile at (tx, ty) or None, like any TileLookup; ``lookup`` is the
+    same lookup as a TileGridLookup with less call overhead for the scalar
+    sensor casts. ``tiles`` maps (tx, ty) to Tile for every occupied cell.
+    Tile objects are created on first access, not at construction.
+
+    Width and left/right edge tables (see Tile.build_edge_tables) are
+    precomputed once per distinct height profile, as (rows, cols, 16) int8
+    arrays for vectorized code.
+
+    ``pyramid`` is a TerrainPyramid of coarse empty/full flags built from the
+    same arrays, so queries can skip open air a block at a time.
+
+    All of these arrays are views of one GridTables; from_tables builds a
+    grid on existing tables (such as a memory-mapped compiled stage) without
+    copying them. Solidity reads NOT_SOLID on unoccupied cells.
+
+    The arrays are a snapshot taken at construction: code that edits a Tile's
+    height_array afterwards must build a new grid.
+
+    The vectorized accessors take integer arrays of tile coordinates and
+    treat out-of-bounds and empty cells as non-solid with zero height.
+    """
+
+    def __init__(
+        self,
+        heights: np.ndarray,
+        angles: np.ndarray,
+        solidity: np.ndarray,
+        tile_type: np.ndarray,
+        occupied: np.ndarray,
+        tiles: Optional[dict[tuple[int, int], Tile]] = None,
+    ) -> None:
+        rows, cols = occupied.shape
+        tables = grid_tables(heights, angles, solidity, tile_type, occupied)
+        self._attach(rows, cols, tables, tiles)
+
+    @classmethod
+    def from_tables(
+        cls,
+        rows: int,
+        cols: int,
+        tables: GridTables,
+        pyramid: Optional[TerrainPyramid] = None,
+    ) -> "TileGrid":
+        """Build a grid on existing GridTables, sharing their memory.
+
+        *pyramid*, if given (e.g. stored with a compiled stage), is used
+        instead of rebuilding it from the tables.
+
+        Raises:
+            ValueError: If an array does not cover rows * cols + 1 cells,
+                or the pyramid was built for a different grid size.
+        """
+        cells = rows * cols + 1
+        for name, array in zip(GridTables._fields, tables):
+            if len(array) != cells:
+                raise ValueError(f"{name} has {len(array)} cells, expected {cells}")
+        if pyramid is not None and (pyramid.rows, pyramid.cols) != (rows, cols):
+            raise ValueError(
+                f"pyramid is {pyramid.rows}x{pyramid.cols}, grid is {rows}x{cols}"
+            )
+        grid = cls.__new__(cls)
+        grid._attach(rows, cols, tables, None, pyramid)
+        return grid
+
+    def _attach(
+        self,
+        rows: int,
+        cols: int,
+        tables: GridTables,
+        tiles: Optional[dict[tuple[int, int], Tile]],
+        pyramid: Optional[TerrainPyramid] = None,
+    ) -> None:
+        n = rows * cols
+        self.rows = rows
+        self.cols = cols
+        self.tables = tables
+        self.heights = tables.heights[:n].reshape(rows, cols, TILE_SIZE)
+        self.angles = tables.angles[:n].reshape(rows, cols)
+        self.solidity = tables.solidity[:n].reshape(rows, cols)
+        self.tile_type = tables.tile_type[:n].reshape(rows, cols)
+        self.occupied = tables.occupied[:n].reshape(rows, cols)
+        self.widths = tables.widths[:n].reshape(rows, cols, TILE_SIZE)
+        self.left_edges = tables.left_edges[:n].reshape(rows, cols, TILE_SIZE)
+        self.right_edges = tables.right_edges[:n].reshape(rows, cols, TILE_SIZE)
+
+        if pyramid is None:
+            pyramid = TerrainPyramid.from_cells(self.heights, self.solidity, self.occupied)
+        self.pyramid = pyramid
+        self.lookup = TileGridLookup(rows, cols, tables, self.pyramid, tiles)
+        self.tiles: Mapping[tuple[int, int], Tile] = (
+            tiles if tiles is not None else GridTiles(self.lookup, tables.occupied)
+        )
+
+        # Padded flat arrays: out-of-bounds coordinates are redirected to
+        # the trailing empty cell without masking every read.
+        self._flat_heights = tables.heights
+        self._flat_angles = tables.angles
+        self._flat_solidity = tables.solidity
+        self._flat_tile_type = tables.tile_type
+        self._flat_left_edges = tables.left_edges
+        self._flat_right_edges = tables.right_edges
+
+    @classmethod
+    def from_tiles(
+        cls,
+        tiles: dict[tuple[int, int], Tile],
+        cols: Optional[int] = None,
+        rows: Optional[int] = None,
+    ) -> "TileGrid":
+        """Build a grid from a (tx, ty) -> Tile dict, reusing the Tile objects.
+
+        Grid size defaults to the bounding box of the non-negative keys.
+        """
+        if cols is None:
+            cols = max((tx for tx, _ in tiles), default=-1) + 1
+        if rows is None:
+            rows = max((ty for _, ty in tiles), default=-1) + 1
+        heights = np.zeros((rows, cols, TILE_SIZE), dtype=np.uint8)
+        angles = np.zeros((rows, cols), dtype=np.uint8)
+        solidity = np.zeros((rows, cols), dtype=np.uint8)
+        tile_type = np.zeros((rows, cols), dtype=np.uint8)
+        occupied = np.zeros((rows, cols), dtype=np.uint8)
+        keys = [(tx, ty) for tx, ty in tiles if 0 <= tx < cols and 0 <= ty < rows]
+        if keys:
+            txs = np.array([tx for tx, _ in keys])
+            tys = np.array([ty for _, ty in keys])
+            in_grid = [tiles[key] for key in keys]
+            heights[tys, txs] = np.array([t.height_array for t in in_grid], dtype=np.uint8)
+            angles[tys, txs] = [t.angle for t in in_grid]
+            solidity[tys, txs] = [t.solidity for t in in_grid]
+            tile_type[tys, txs] = [t.tile_type for t in in_grid]
+            occupied[tys, txs] = 1
+        return cls(heights, angles, solidity, tile_type, occupied, tiles=tiles)
+
+    def __call__(self, tx: int, ty: int) -> Optional[Tile]:
+        return self.lookup(tx, ty)
+
+    # -- vectorized accessors ------------------------------------------------
+
+    def cell_index(self, tx: np.ndarray, ty: np.ndarray) -> np.ndarray:
+        """Flat cell index for each (tx, ty); out-of-bounds maps to the empty cell."""
+        tx = np.asarray(tx, dtype=np.int64)
+        ty = np.asarray(ty, dtype=np.int64)
+        inside = (tx >= 0) & (tx < self.cols) & (ty >= 0) & (ty < self.rows)
+        return np.where(inside, ty * self.cols + tx, self.rows * self.cols)
+
+    def column_heights(self, idx: np.ndarray, col: np.ndarray) -> np.ndarray:
+        """height_array[col] of the cells at flat indices idx."""
+        return self._flat_heights[idx, col]
+
+    def row_left_edges(self, idx: np.ndarray, width_row: np.ndarray) -> np.ndarray:
+        """First solid column at width_row (0 = bottom) of cells idx, or -1."""
+        return self._flat_left_edges[idx, width_row]
+
+    def row_right_edges(self, idx: np.ndarray, width_row: np.ndarray) -> np.ndarray:
+        """Last solid column at width_row (0 = bottom) of cells idx, or -1."""
+        return self._flat_right_edges[idx, width_row]
+
+    def cell_angles(self, idx: np.ndarray) -> np.ndarray:
+        """Byte angle of the cells at flat indices idx."""
+        return self._flat_angles[idx]
+
+    def cell_solidity(self, idx: np.ndarray) -> np.ndarray:
+        """Solidity of the cells at flat indices idx (NOT_SOLID when empty)."""
+        return self._flat_solidity[idx]
+
+    def cell_tile_type(self, idx: np.ndarray) -> np.ndarray:
+        """Surface type of the cells at flat indices idx."""
+        return self._flat_tile_type[idx]
+
+
+def _grid_edge_tables(heights: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Edge tables for every cell of a (rows, cols, 16) height array.
+
+    Computes each distinct profile once with _edge_tables_for (which also
+    warms the Tile cache) and scatters the results back over the grid.
+    Returns (widths, left_edges, right_edges) shaped like heights, with the
+    last axis indexed by row (0 = bottom) instead of column.
+    """
+    flat = np.ascontiguousarray(heights, dtype=np.uint8).reshape(-1, TILE_SIZE)
+    profiles, inverse = np.unique(flat.view(f"V{TILE_SIZE}").ravel(), return_inverse=True)
+    profiles = profiles.view(np.uint8).reshape(-1, TILE_SIZE)
+    tables = np.array(
+        [_edge_tables_for(tuple(p)) for p in profiles.tolist()], dtype=np.int8,
+    ).reshape(-1, 3, TILE_SIZE)
+    per_cell = tables[inverse.ravel()].reshape(heights.shape[:-1] + (3, TILE_SIZE))
+    return per_cell[..., 0, :], per_cell[..., 1, :], per_cell[..., 2, :]
+
+
+# ---------------------------------------------------------------------------
+# Occupancy pyramid
+# ---------------------------------------------------------------------------
+
+# Block edge, in tiles, of each pyramid level (finest first).
+PYRAMID_BLOCKS = (1, 4, 16)
+
+
+class TerrainPyramid:
+    """Multi-level occupancy flags over a TileGrid.
+
+    Level i groups the grid into PYRAMID_BLOCKS[i]-tile square blocks.
+    ``empty[i]`` marks blocks with no tile of any solidity (every cell
+    unoccupied or NOT_SOLID), so every lookup there is a sensor miss;
+    ``full[i]`` marks blocks whose every cell is a FULL tile with all 16
+    columns at height 16. Cells past the grid edge count as empty and
+    never as full, so blocks straddling the edge are padded accordingly.
+
+    Everything derives from two (rows + 1, cols + 1) int32 prefix-count
+    tables of solid and full cells, ``live_sums`` and ``full_sums``, which
+    compiled stages store alongside the grid. Arbitrary tile rectangles
+    are answered from them in constant time (region_empty / region_full).
+
+    A read-only snapshot; build one from cell arrays with from_cells.
+    """
+
+    def __init__(self, live_sums: np.ndarray, full_sums: np.ndarray) -> None:
+        rows, cols = live_sums.shape[0] - 1, live_sums.shape[1] - 1
+        if full_sums.shape != live_sums.shape:
+            raise ValueError(f"full_sums shape {full_sums.shape} != {live_sums.shape}")
+        self.rows = rows
+        self.cols = cols
+        self.live_sums = live_sums
+        self.full_sums = full_sums
+        self.empty: list[np.ndarray] = []
+        self.full: list[np.ndarray] = []
+        for block in PYRAMID_BLOCKS:
+            ys = np.minimum(np.arange(-(-rows // block) + 1) * block, rows)
+            xs = np.minimum(np.arange(-(-cols // block) + 1) * block, cols)
+            self.empty.append(_block_counts(live_sums, ys, xs) == 0)
+            self.full.append(_block_counts(full_sums, ys, xs) == block * block)
+        # Memoryviews index like nested lists without copying the tables:
+        # empty flags coarsest level first, then the prefix counts.
+        self._levels = [
+            (block, memoryview(empty))
+            for block, empty in reversed(list(zip(PYRAMID_BLOCKS, self.empty)))
+        ]
+        self._live = memoryview(live_sums)
+        self._full = memoryview(full_sums)
+
+    @classmethod
+    def from_cells(
+        cls, heights: np.ndarray, solidity: np.ndarray, occupied: np.ndarray,
+    ) -> "TerrainPyramid":
+        """Build the pyramid of dense (rows, cols) terrain arrays."""
+        live = (occupied != 0) & (solidity != NOT_SOLID)
+        full = live & (solidity == FULL) & (heights.min(axis=2, initial=TILE_SIZE) == TILE_SIZE)
+        return cls(_prefix_sums(live), _prefix_sums(full))
+
+    def empty_span(self, tx: int, ty: int) -> int:
+        """Edge in tiles of the largest empty block containing (tx, ty).
+
+        Returns 0 if the cell holds a solid tile or lies outside the grid.
+        """
+        if not (0 <= tx < self.cols and 0 <= ty < self.rows):
+            return 0
+        for block, empty in self._levels:
+            if empty[ty // block, tx // block]:
+                return block
+        return 0
+
+    def empty_spans(self, tx: np.ndarray, ty: np.ndarray) -> np.ndarray:
+        """Vectorized empty_span over integer arrays of tile coordinates."""
+        tx = np.asarray(tx, dtype=np.int64)
+        ty = np.asarray(ty, dtype=np.int64)
+        spans = np.zeros(np.broadcast(tx, ty).shape, dtype=np.int64)
+        if self.rows == 0 or self.cols == 0:
+            return spans
+        inside = (tx >= 0) & (tx < self.cols) & (ty >= 0) & (ty < self.rows)
+        cx, cy = np.where(inside, tx, 0), np.where(inside, ty, 0)
+        for block, empty in zip(PYRAMID_BLOCKS, self.empty):
+            spans = np.where(inside & empty[cy // block, cx // block], block, spans)
+        return spans
+
+    def region_empty(self, tx0: int, ty0: int, tx1: int, ty1: int) -> bool:
+        """True if no cell in the inclusive tile rectangle holds a solid tile."""
+        tx0, ty0 = max(tx0, 0), max(ty0, 0)
+        tx1, ty1 = min(tx1, self.cols - 1), min(ty1, self.rows - 1)
+        if tx0 > tx1 or ty0 > ty1:
+            return True
+        sums = self._live
+        return (
+            sums[ty1 + 1, tx1 + 1] - sums[ty0, tx1 + 1] - sums[ty1 + 1, tx0] + sums[ty0, tx0]
+        ) == 0
+
+    def region_full(self, tx0: int, ty0: int, tx1: int, ty1: int) -> bool:
+        """True if every cell in the inclusive tile rectangle is a full block."""
+        if tx0 > tx1 or ty0 > ty1:
+            return True
+        if tx0 < 0 or ty0 < 0 or tx1 >= self.cols or ty1 >= self.rows:
+            return False
+        sums = self._full
+        count = sums[ty1 + 1, tx1 + 1] - sums[ty0, tx1 + 1] - sums[ty1 + 1, tx0] + sums[ty0, tx0]
+        return count == (tx1 - tx0 + 1) * (ty1 - ty0 + 1)
+
+
+def _prefix_sums(flags: np.ndarray) -> np.ndarray:
+    """2-D inclusive prefix counts of a bool grid, padded with a zero row/column."""
+    sums = np.zeros((flags.shape[0] + 1, flags.shape[1] + 1), dtype=np.int32)
+    sums[1:, 1:] = flags.cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+    return sums
+
+
+def _block_counts(sums: np.ndarray, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+    """Cell counts of the blocks between consecutive row edges ys and column edges xs."""
+    corners = sums[ys][:, xs]
+    return corners[1:, 1:] - corners[:-1, 1:] - corners[1:, :-1] + corners[:-1, :-1]
+
+
+def terrain_pyramid(tile_lookup: TileLookup) -> Optional[TerrainPyramid]:
+    """The pyramid behind a TileGrid or its ``lookup``, else None."""
+    if isinstance(tile_lookup, (TileGrid, TileGridLookup)):
+        return tile_lookup.pyramid
+    return None
+
+
 # ---------------------------------------------------------------------------
 # Quadrant mapping
 # ---------------------------------------------------------------------------
@@ -349,10 +878,10 @@ def _find_left_edge(tile: "Tile", width_row: int) -> int:
     Returns the column index (0-15) of the first solid pixel, or -1 if none.
     A pixel at (col, row) is solid when height_array[col] > row.
     """
-    for col in range(TILE_SIZE):
-        if tile.height_array[col] > width_row:
-            return col
-    return -1
+    edges = tile._left_edges
+    if edges is None:
+        edges = tile.build_edge_tables()[1]
+    return edges[width_row]
 
 
 def _find_right_edge(tile: "Tile", width_row: int) -> int:
@@ -360,10 +889,10 @@ def _find_right_edge(tile: "Tile", width_row: int) -> int:
 
     Returns the column index (0-15) of the last solid pixel, or -1 if none.
     """
-    for col in range(TILE_SIZE - 1, -1, -1):
-        if tile.height_array[col] > width_row:
-            return col
-    return -1
+    edges = tile._right_edges
+    if edges is None:
+        edges = tile.build_edge_tables()[2]
+    return edges[width_row]
 
 
 def _sensor_cast_right(
@@ -716,6 +1245,347 @@ def find_wall_push(
     return result
 
 
+# ---------------------------------------------------------------------------
+# Directional terrain raycast (observation)
+# ---------------------------------------------------------------------------
+
+def cast_terrain_ray(
+    tile_lookup: TileLookup,
+    origin_x: float,
+    origin_y: float,
+    angle_deg: float,
+    max_range: float = 128.0,
+    pyramid: Optional[TerrainPyramid] = None,
+) -> tuple[float, int]:
+    """Cast a ray at an arbitrary angle and return the first solid surface.
+
+    Walks the tile grid with a DDA traversal, so empty tiles cost one lookup
+    each; with a TerrainPyramid (taken from *tile_lookup* when it is a
+    TileGrid or its lookup) a whole empty block is crossed in one step,
+    landing on exactly the cell the tile-by-tile walk would reach. Inside
+    a non-empty tile the ray is intersected analytically with the solid
+    span of every pixel column it crosses (rows ``[16 - height, 16)`` of
+    the tile). All solidities other than NOT_SOLID count as solid: the
+    observation sees one-way platforms too.
+
+    Args:
+        tile_lookup: Callable returning Tile at grid (tx, ty) or None.
+        origin_x: Ray origin X in pixel coordinates.
+        origin_y: Ray origin Y in pixel coordinates.
+        angle_deg: Ray angle in degrees. 0=right, 90=down, 180=left, 270=up.
+        max_range: Maximum ray distance in pixels.
+        pyramid: Occupancy pyramid of the terrain behind *tile_lookup*.
+
+    Returns:
+        (distance, surface_angle) where:
+        - distance: pixels from origin to first solid surface [0, max_range]
+        - surface_angle: byte angle (0–255) of the hit tile, or 0 if none found
+    """
+    rad = math.radians(angle_deg)
+    dx = math.cos(rad)
+    dy = math.sin(rad)
+    tx = math.floor(origin_x) // TILE_SIZE
+    ty = math.floor(origin_y) // TILE_SIZE
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    if pyramid is None:
+        pyramid = terrain_pyramid(tile_lookup)
+
+    t_enter = 0.0
+    while t_enter <= max_range:
+        t_max_x = _ray_boundary(tx, dx, origin_x)
+        t_max_y = _ray_boundary(ty, dy, origin_y)
+        t_exit = min(t_max_x, t_max_y)
+
+        tile = tile_lookup(tx, ty)
+        if tile is not None and tile.solidity != NOT_SOLID:
+            t = _ray_tile_entry(
+                tile.height_array, tx, ty, origin_x, origin_y, dx, dy, t_enter, t_exit,
+            )
+            if t is not None:
+                if t <= max_range:
+                    return t, tile.angle
+                break
+        elif pyramid is not None:
+            block = pyramid.empty_span(tx, ty)
+            if block > 1:
+                tx, ty, t_enter = _ray_skip_block(
+                    tx, ty, block, origin_x, origin_y, dx, dy, step_x, step_y,
+                )
+                continue
+
+        if t_max_x <= t_max_y:
+            tx += step_x
+        else:
+            ty += step_y
+        t_enter = t_exit
+    return max_range, 0
+
+
+def _ray_boundary(cell: int, d: float, origin: float) -> float:
+    """Ray parameter at which it leaves tile *cell* along one axis."""
+    if d > 0:
+        return ((cell + 1) * TILE_SIZE - origin) / d
+    if d < 0:
+        return (cell * TILE_SIZE - origin) / d
+    return math.inf
+
+
+def _ray_skip_block(
+    tx: int,
+    ty: int,
+    block: int,
+    ox: float,
+    oy: float,
+    dx: float,
+    dy: float,
+    step_x: int,
+    step_y: int,
+) -> tuple[int, int, float]:
+    """Cell and ray parameter at which the DDA walk leaves an empty block.
+
+    The walk crosses cell boundaries in order of their ray parameter,
+    taking the x crossing on ties, so it leaves through the block's far x
+    edge iff that edge is not beyond the far y edge. The cell on the
+    other axis is found by stepping the same boundary comparisons the walk
+    would make, which keeps the result bit-identical to it.
+    """
+    ex = tx // block * block + (block - 1 if step_x > 0 else 0)
+    ey = ty // block * block + (block - 1 if step_y > 0 else 0)
+    t_bx = _ray_boundary(ex, dx, ox)
+    t_by = _ray_boundary(ey, dy, oy)
+    if t_bx <= t_by:
+        while _ray_boundary(ty, dy, oy) < t_bx:
+            ty += step_y
+        return ex + step_x, ty, t_bx
+    while _ray_boundary(tx, dx, ox) <= t_by:
+        tx += step_x
+    return tx, ey + step_y, t_by
+
+
+def _ray_tile_entry(
+    heights: list[int],
+    tx: int,
+    ty: int,
+    ox: float,
+    oy: float,
+    dx: float,
+    dy: float,
+    t0: float,
+    t1: float,
+) -> Optional[float]:
+    """First ray parameter in [t0, t1] inside the tile's solid columns, or None."""
+    base_x = tx * TILE_SIZE
+    bottom = (ty + 1) * TILE_SIZE
+    if dx == 0:
+        c_first = c_last = math.floor(ox) - base_x
+    else:
+        c_first = math.floor(ox + t0 * dx) - base_x
+        c_last = math.floor(ox + t1 * dx) - base_x
+    c_first = min(max(c_first, 0), TILE_SIZE - 1)
+    c_last = min(max(c_last, 0), TILE_SIZE - 1)
+    c_step = 1 if c_last >= c_first else -1
+
+    for c in range(c_first, c_last + c_step, c_step):
+        h = heights[c]
+        if h == 0:
+            continue
+        top = bottom - h
+        if dx > 0:
+            cs0 = (base_x + c - ox) / dx
+            cs1 = (base_x + c + 1 - ox) / dx
+        elif dx < 0:
+            cs0 = (base_x + c + 1 - ox) / dx
+            cs1 = (base_x + c - ox) / dx
+        else:
+            cs0, cs1 = -math.inf, math.inf
+        if dy > 0:
+            ys0 = (top - oy) / dy
+            ys1 = (bottom - oy) / dy
+        elif dy < 0:
+            ys0 = (bottom - oy) / dy
+            ys1 = (top - oy) / dy
+        elif top <= oy < bottom:
+            ys0, ys1 = -math.inf, math.inf
+        else:
+            continue
+        enter = max(t0, cs0, ys0)
+        if enter < min(t1, cs1, ys1):
+            return enter
+    return None
+
+
+def cast_terrain_rays(
+    grid: TileGrid,
+    origin_x: np.ndarray,
+    origin_y: np.ndarray,
+    angle_deg: np.ndarray,
+    max_range: float = 128.0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batched cast_terrain_ray over a TileGrid.
+
+    All rays advance through the grid together, one tile crossing per
+    iteration, and each crossing tests all 16 columns of the current tile
+    at once; rays in an empty block of the grid's pyramid cross it in one
+    iteration. Arguments broadcast against each other; results match
+    cast_terrain_ray ray for ray.
+
+    Returns:
+        (distance, surface_angle) float64 and int64 arrays of the broadcast shape.
+    """
+    ox, oy, ang = np.broadcast_arrays(
+        np.asarray(origin_x, dtype=np.float64),
+        np.asarray(origin_y, dtype=np.float64),
+        np.asarray(angle_deg, dtype=np.float64),
+    )
+    shape = ox.shape
+    ox, oy = ox.ravel(), oy.ravel()
+    rad = np.radians(ang.ravel())
+    dx, dy = np.cos(rad), np.sin(rad)
+    n = ox.size
+
+    dist = np.full(n, float(max_range))
+    surface = np.zeros(n, dtype=np.int64)
+    tx = np.floor(ox).astype(np.int64) // TILE_SIZE
+    ty = np.floor(oy).astype(np.int64) // TILE_SIZE
+    step_x = np.where(dx > 0, 1, -1)
+    step_y = np.where(dy > 0, 1, -1)
+    t_enter = np.zeros(n)
+    cols = np.arange(TILE_SIZE)
+
+    act = np.flatnonzero(t_enter <= max_range)
+    while act.size:
+        a_ox, a_oy, a_dx, a_dy = ox[act], oy[act], dx[act], dy[act]
+        a_tx, a_ty, t0 = tx[act], ty[act], t_enter[act]
+        t_max_x = _ray_boundaries(a_tx, a_dx, a_ox)
+        t_max_y = _ray_boundaries(a_ty, a_dy, a_oy)
+        t1 = np.minimum(t_max_x, t_max_y)
+
+        idx = grid.cell_index(a_tx, a_ty)
+        solid = grid.cell_solidity(idx) != NOT_SOLID
+        hit_t = np.full(act.size, np.inf)
+        if solid.any():
+            s = np.flatnonzero(solid)
+            hit_t[s] = _ray_tile_entries(
+                grid._flat_heights[idx[s]], a_tx[s], a_ty[s], a_ox[s], a_oy[s],
+                a_dx[s], a_dy[s], t0[s], t1[s], cols,
+            )
+        hit = hit_t <= max_range
+        dist[act[hit]] = hit_t[hit]
+        surface[act[hit]] = grid.cell_angles(idx[hit])
+
+        step_on_x = t_max_x <= t_max_y
+        next_tx = np.where(step_on_x, a_tx + step_x[act], a_tx)
+        next_ty = np.where(step_on_x, a_ty, a_ty + step_y[act])
+        block = grid.pyramid.empty_spans(a_tx, a_ty)
+        skip = np.flatnonzero(block > 1)
+        if skip.size:
+            k = act[skip]
+            next_tx[skip], next_ty[skip], t1[skip] = _ray_skip_blocks(
+                a_tx[skip], a_ty[skip], block[skip], a_ox[skip], a_oy[skip],
+                a_dx[skip], a_dy[skip], step_x[k], step_y[k],
+            )
+        tx[act] = next_tx
+        ty[act] = next_ty
+        t_enter[act] = t1
+        # Any hit ends the ray, even one beyond max_range.
+        act = act[~np.isfinite(hit_t) & (t1 <= max_range)]
+
+    return dist.reshape(shape), surface.reshape(shape)
+
+
+def _ray_boundaries(cell: np.ndarray, d: np.ndarray, origin: np.ndarray) -> np.ndarray:
+    """Vectorized _ray_boundary."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        edge = np.where(d > 0, cell + 1, cell) * TILE_SIZE
+        t = (edge - origin) / d
+    return np.where(d == 0, np.inf, t)
+
+
+def _ray_skip_blocks(
+    tx: np.ndarray,
+    ty: np.ndarray,
+    block: np.ndarray,
+    ox: np.ndarray,
+    oy: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    step_x: np.ndarray,
+    step_y: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized _ray_skip_block."""
+    ex = tx // block * block + np.where(step_x > 0, block - 1, 0)
+    ey = ty // block * block + np.where(step_y > 0, block - 1, 0)
+    t_bx = _ray_boundaries(ex, dx, ox)
+    t_by = _ray_boundaries(ey, dy, oy)
+    on_x = t_bx <= t_by
+    tx, ty = tx.copy(), ty.copy()
+    walk = on_x & (_ray_boundaries(ty, dy, oy) < t_bx)
+    while walk.any():
+        ty[walk] += step_y[walk]
+        walk &= _ray_boundaries(ty, dy, oy) < t_bx
+    walk = ~on_x & (_ray_boundaries(tx, dx, ox) <= t_by)
+    while walk.any():
+        tx[walk] += step_x[walk]
+        walk &= _ray_boundaries(tx, dx, ox) <= t_by
+    return (
+        np.where(on_x, ex + step_x, tx),
+        np.where(on_x, ty, ey + step_y),
+        np.where(on_x, t_bx, t_by),
+    )
+
+
+def _ray_tile_entries(
+    heights: np.ndarray,
+    tx: np.ndarray,
+    ty: np.ndarray,
+    ox: np.ndarray,
+    oy: np.ndarray,
+    dx: np.ndarray,
+    dy: np.ndarray,
+    t0: np.ndarray,
+    t1: np.ndarray,
+    cols: np.ndarray,
+) -> np.ndarray:
+    """Vectorized _ray_tile_entry over (rays, 16 columns); inf where no hit."""
+    base_x = tx * TILE_SIZE
+    bottom = (ty + 1) * TILE_SIZE
+    vertical = dx == 0
+    with np.errstate(invalid="ignore"):
+        c_a = np.where(vertical, np.floor(ox), np.floor(ox + t0 * dx)).astype(np.int64) - base_x
+        c_b = np.where(vertical, np.floor(ox), np.floor(ox + t1 * dx)).astype(np.int64) - base_x
+    c_a = np.clip(c_a, 0, TILE_SIZE - 1)
+    c_b = np.clip(c_b, 0, TILE_SIZE - 1)
+    in_span = (cols >= np.minimum(c_a, c_b)[:, None]) & (cols <= np.maximum(c_a, c_b)[:, None])
+
+    h = heights.astype(np.int64)
+    top = bottom[:, None] - h
+    left = base_x[:, None] + cols
+    dxc, dyc = dx[:, None], dy[:, None]
+    oxc, oyc = ox[:, None], oy[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        near_x = (left - oxc) / dxc
+        far_x = (left + 1 - oxc) / dxc
+        near_y = (top - oyc) / dyc
+        far_y = (bottom[:, None] - oyc) / dyc
+    cs0 = np.where(dxc > 0, near_x, far_x)
+    cs1 = np.where(dxc > 0, far_x, near_x)
+    cs0 = np.where(vertical[:, None], -np.inf, cs0)
+    cs1 = np.where(vertical[:, None], np.inf, cs1)
+
+    level = dyc == 0
+    inside_row = (top <= oyc) & (oyc < bottom[:, None])
+    ys0 = np.where(dyc > 0, near_y, far_y)
+    ys1 = np.where(dyc > 0, far_y, near_y)
+    ys0 = np.where(level, np.where(inside_row, -np.inf, np.inf), ys0)
+    ys1 = np.where(level, np.where(inside_row, np.inf, -np.inf), ys1)
+
+    enter = np.maximum(np.maximum(t0[:, None], cs0), ys0)
+    leave = np.minimum(np.minimum(t1[:, None], cs1), ys1)
+    ok = in_span & (h > 0) & (enter < leave)
+    return np.where(ok, enter, np.inf).min(axis=1)
+
+
 # ---------------------------------------------------------------------------
 # Top-level collision resolution
 # ---------------------------------------------------------------------------
@@ -726,6 +1596,8 @@ _GROUND_SNAP_DISTANCE = 14.0
 _AIR_LAND_DISTANCE = 16.0
 # Max tiles to scan in each direction for solid ejection
 _EJECT_SCAN_TILES = 3
+# Farthest any sensor of resolve_collision sits from the player centre
+_SENSOR_REACH = max(STANDING_HEIGHT_RADIUS, STANDING_WIDTH_RADIUS, WALL_SENSOR_EXTENT)
 
 
 def _is_inside_solid(state: PhysicsState, tile_lookup: TileLookup) -> bool:
@@ -807,11 +1679,91 @@ def _reset_to_airborne(state: PhysicsState) -> None:
     state.ground_speed = 0.0
 
 
+def _resolve_fast(
+    state: PhysicsState, tile_lookup: TileLookup, pyramid: TerrainPyramid,
+) -> bool:
+    """Resolve open-air and flat-ground frames without running the sensors.
+
+    Conservative: returns False, leaving state untouched, unless the
+    pyramid proves what every sensor of resolve_collision would report.
+
+    - Open air: no solid tile within sensor reach (plus the one-tile
+      extension/regression lookups), so every sensor misses and only the
+      grounded miss handling applies.
+    - Flat ground: grounded in quadrant 0 with both floor sensors inside
+      one row of full tiles. Both report the top of that row (A wins the
+      tie); if the snap is in range, keeps quadrant 0 and leaves no solid
+      tile above the row within reach, the wall sensors and the ejection
+      check all miss too.
+    """
+    col0 = int(state.x - _SENSOR_REACH) // TILE_SIZE - 1
+    col1 = int(state.x + _SENSOR_REACH) // TILE_SIZE + 1
+    if pyramid.region_empty(
+        col0, int(state.y - _SENSOR_REACH) // TILE_SIZE - 1,
+        col1, int(state.y + _SENSOR_REACH) // TILE_SIZE + 1,
+    ):
+        if state.on_ground:
+            _floor_miss(state, get_quadrant(state.angle), floor_found=False)
+        return True
+
+    if not state.on_ground or get_quadrant(state.angle) != 0:
+        return False
+    w_rad, h_rad = _get_radii(state)
+    sensor_y = state.y + h_rad
+    row = int(sensor_y) // TILE_SIZE
+    a_col = int(state.x - w_rad) // TILE_SIZE
+    if not pyramid.region_full(a_col, row, int(state.x + w_rad) // TILE_SIZE, row):
+        return False
+    dist = row * TILE_SIZE - sensor_y
+    if abs(dist) > _GROUND_SNAP_DISTANCE:
+        return False
+    tile = tile_lookup(a_col, row)
+    snapped_y = state.y + dist
+    if get_quadrant(tile.angle) != 0 or not pyramid.region_empty(
+        col0, int(snapped_y) // TILE_SIZE, col1, row - 1,
+    ):
+        return False
+    state.y = snapped_y
+    state.angle = tile.angle
+    state.adhesion_miss_count = 0
+    return True
+
+
+def _floor_miss(state: PhysicsState, quadrant: int, floor_found: bool) -> None:
+    """Grounded frame with no floor within snap range: adhere or detach.
+
+    Speed-based adhesion (Sonic 2 §2.3): at high speed on steep surfaces
+    (quadrants 1-3), the player stays attached through brief sensor gaps
+    at quadrant transitions (e.g. Q1→Q2 inside loops). Allow up to 2
+    consecutive frames of sensor miss, then force detachment to prevent
+    infinite orbiting.
+    """
+    if (
+        quadrant != 0
+        and abs(state.ground_speed) >= FALL_SPEED_THRESHOLD
+        and not floor_found
+        and state.adhesion_miss_count < 2
+    ):
+        state.adhesion_miss_count += 1
+    else:
+        state.on_ground = False
+        state.angle = 0
+        state.adhesion_miss_count = 0
+
+
 def resolve_collision(state: PhysicsState, tile_lookup: TileLookup) -> None:
     """Run all sensors and resolve collision. Steps 5–7 of the frame update.
 
     Modifies state in place: x, y, angle, on_ground, x_vel, y_vel.
+
+    When *tile_lookup* is a TileGrid (or its lookup), open-air and
+    flat-ground frames are first tried against the grid's TerrainPyramid
+    (see _resolve_fast), with results identical to the full sensor pass.
     """
+    pyramid = terrain_pyramid(tile_lookup)
+    if pyramid is not None and _resolve_fast(state, tile_lookup, pyramid):
+        return
+
     quadrant = get_quadrant(state.angle)
 
     # --- Floor sensors ---
@@ -832,22 +1784,7 @@ def resolve_collision(state: PhysicsState, tile_lookup: TileLookup) -> None:
                     _snap_to_floor(state, floor_result2, new_quadrant)
         else:
             # No floor within normal snap range.
-            # Speed-based adhesion (Sonic 2 §2.3): at high speed on steep
-            # surfaces (quadrants 1-3), the player stays attached through
-            # brief sensor gaps at quadrant transitions (e.g. Q1→Q2 inside
-            # loops).  Allow up to 2 consecutive frames of sensor miss,
-            # then force detachment to prevent infinite orbiting.
-            if (
-                quadrant != 0
-                and abs(state.ground_speed) >= FALL_SPEED_THRESHOLD
-                and not floor_result.found
-                and state.adhesion_miss_count < 2
-            ):
-                state.adhesion_miss_count += 1
-            else:
-                state.on_ground = False
-                state.angle = 0
-                state.adhesion_miss_count = 0
+            _floor_miss(state, quadrant, floor_result.found)
     else:
         # Airborne: check for landing
         if floor_result.found and state.y_vel >= 0:
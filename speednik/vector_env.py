@@ -0,0 +1,281 @@
+"""speednik/vector_env.py — Native Gymnasium vector environment (Layer 5).
+
+SpeednikVectorEnv owns N simulations directly instead of wrapping N
+SpeednikEnv instances in SyncVectorEnv. Observations are written into one
+preallocated (num_envs, *obs_shape) float32 buffer, info is returned as a
+single dict of arrays, and autoreset is handled internally.
+
+Per-env dynamics, observations and termination are identical to
+SpeednikEnv; only the batching differs.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode, VectorEnv
+from gymnasium.vector.utils import batch_space
+
+from speednik.agents.actions import NUM_ACTIONS, action_to_input
+from speednik.observation import (
+    OBS_DIM,
+    OBS_DIM_BASE,
+    OBS_MODES,
+    extract_grid_observation,
+    extract_observation,
+    extract_observations,
+    grid_observation_space,
+)
+from speednik.simulation import SimState, create_sim, sim_step
+
+# Keys reported in the info dict, matching SpeednikEnv._get_info.
+INFO_KEYS = ("frame", "x", "y", "max_x", "rings", "deaths", "goal_reached")
+
+_INFO_DTYPES = {
+    "frame": np.int64,
+    "x": np.float64,
+    "y": np.float64,
+    "max_x": np.float64,
+    "rings": np.int64,
+    "deaths": np.int64,
+    "goal_reached": np.bool_,
+}
+
+
+class SpeednikVectorEnv(VectorEnv):
+    """Vectorized Speednik environment with internal autoreset.
+
+    ``frame_skip`` repeats each action for that many frames per step, as
+    in SpeednikEnv. Supports the NEXT_STEP (Gymnasium default) and
+    SAME_STEP autoreset modes. In SAME_STEP mode the terminal observation and info of finished
+    envs are reported under ``info["final_obs"]`` / ``info["final_info"]``.
+    """
+
+    metadata = {
+        "render_modes": [],
+        "render_fps": 60,
+        "autoreset_mode": AutoresetMode.NEXT_STEP,
+    }
+
+    def __init__(
+        self,
+        num_envs: int = 1,
+        stage: str = "hillside",
+        max_steps: int = 3600,
+        *,
+        max_episode_steps: int | None = None,
+        use_raycasts: bool = True,
+        obs_mode: str = "vector",
+        grid_scale: int = 8,
+        frame_skip: int = 1,
+        render_mode: str | None = None,
+        autoreset_mode: str | AutoresetMode = AutoresetMode.NEXT_STEP,
+        copy: bool = True,
+    ) -> None:
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be positive, got {frame_skip}")
+        if obs_mode not in OBS_MODES:
+            raise ValueError(f"obs_mode must be one of {OBS_MODES}, got {obs_mode!r}")
+        self.autoreset_mode = AutoresetMode(autoreset_mode)
+        if self.autoreset_mode not in (AutoresetMode.NEXT_STEP, AutoresetMode.SAME_STEP):
+            raise ValueError(f"Unsupported autoreset mode: {self.autoreset_mode}")
+
+        self.num_envs = num_envs
+        self.stage_name = stage
+        self.render_mode = render_mode
+        # gym.make_vec forwards the spec's max_episode_steps; honour the
+        # tighter of the two limits like SpeednikEnv + TimeLimit would.
+        # TimeLimit counts agent steps, max_steps counts frames.
+        if max_episode_steps is not None:
+            max_steps = min(max_steps, max_episode_steps * frame_skip)
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.use_raycasts = use_raycasts
+        self.obs_mode = obs_mode
+        self.grid_scale = grid_scale
+        self.copy = copy
+        self.metadata = {**self.metadata, "autoreset_mode": self.autoreset_mode}
+
+        if obs_mode == "grid":
+            self.single_observation_space = grid_observation_space(grid_scale)
+        else:
+            obs_dim = OBS_DIM if use_raycasts else OBS_DIM_BASE
+            self.single_observation_space = spaces.Box(
+                low=-np.inf, high=np.inf, shape=(obs_dim,), dtype=np.float32,
+            )
+        self.single_action_space = spaces.Discrete(NUM_ACTIONS)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+
+        self.sims: list[SimState] = [create_sim(stage) for _ in range(num_envs)]
+        self._observations = np.zeros(
+            (num_envs, *self.single_observation_space.shape), dtype=np.float32,
+        )
+        self._rewards = np.zeros(num_envs, dtype=np.float64)
+        self._terminations = np.zeros(num_envs, dtype=np.bool_)
+        self._truncations = np.zeros(num_envs, dtype=np.bool_)
+        self._step_counts = np.zeros(num_envs, dtype=np.int64)
+        self._prev_jump_held = [False] * num_envs
+        self._autoreset_envs = np.zeros(num_envs, dtype=np.bool_)
+
+    # ------------------------------------------------------------------
+    # Gymnasium API
+    # ------------------------------------------------------------------
+
+    def reset(
+        self,
+        *,
+        seed: int | list[int | None] | None = None,
+        options: dict | None = None,
+    ) -> tuple[np.ndarray, dict]:
+        """Reset all envs, or only those selected by ``options["reset_mask"]``."""
+        if isinstance(seed, list):
+            seed = seed[0]
+        super().reset(seed=seed)
+
+        mask = None if options is None else options.get("reset_mask")
+        if mask is None:
+            indices = range(self.num_envs)
+        else:
+            mask = np.asarray(mask, dtype=np.bool_)
+            if mask.shape != (self.num_envs,):
+                raise ValueError(
+                    f"reset_mask must have shape ({self.num_envs},), got {mask.shape}"
+                )
+            indices = np.flatnonzero(mask).tolist()
+
+        for i in indices:
+            self._reset_env(i)
+            self._autoreset_envs[i] = False
+        return self._obs_out(), self._collect_info()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._step_sims(np.asarray(actions))
+        done = self._terminations | self._truncations
+
+        if self.autoreset_mode == AutoresetMode.NEXT_STEP:
+            info = self._collect_info()
+            self._autoreset_envs[:] = done
+        else:
+            final_obs = None
+            if done.any():
+                final_obs = self._observations.copy()
+                final_info = self._collect_info()
+                for i in np.flatnonzero(done).tolist():
+                    self._reset_env(i)
+            info = self._collect_info()
+            if final_obs is not None:
+                info["final_obs"] = final_obs
+                info["_final_obs"] = done.copy()
+                info["final_info"] = final_info
+                info["_final_info"] = done.copy()
+
+        return (
+            self._obs_out(),
+            self._rewards.copy(),
+            self._terminations.copy(),
+            self._truncations.copy(),
+            info,
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _step_sims(self, actions: np.ndarray) -> None:
+        """Advance every env one step (frame_skip frames), writing
+        obs/reward/done buffers in place.
+
+        Observations for all envs are extracted in one batched pass afterwards.
+        """
+        rewards = self._rewards
+        terminations = self._terminations
+        truncations = self._truncations
+        frame_skip = self.frame_skip
+        max_steps = self.max_steps
+        for i, sim in enumerate(self.sims):
+            if self._autoreset_envs[i]:
+                # NEXT_STEP: the action for a finished env is consumed by reset.
+                self._reset_env(i, write_obs=False)
+                rewards[i] = 0.0
+                terminations[i] = False
+                truncations[i] = False
+                continue
+
+            action = int(actions[i])
+            jump_held = self._prev_jump_held[i]
+            steps = int(self._step_counts[i])
+            reward = 0.0
+            for _ in range(frame_skip):
+                inp, jump_held = action_to_input(action, jump_held)
+                events = sim_step(sim, inp)
+                steps += 1
+                reward += self._compute_reward(events)
+                terminated = sim.goal_reached or sim.player_dead
+                if terminated or steps >= max_steps:
+                    break
+            self._prev_jump_held[i] = jump_held
+            self._step_counts[i] = steps
+
+            rewards[i] = reward
+            terminations[i] = terminated
+            truncations[i] = steps >= max_steps
+
+        if self.obs_mode == "grid":
+            for i, sim in enumerate(self.sims):
+                extract_grid_observation(
+                    sim, scale=self.grid_scale, out=self._observations[i]
+                )
+        else:
+            extract_observations(
+                self.sims, use_raycasts=self.use_raycasts, out=self._observations
+            )
+
+    def _reset_env(self, i: int, write_obs: bool = True) -> None:
+        self.sims[i] = create_sim(self.stage_name)
+        self._step_counts[i] = 0
+        self._prev_jump_held[i] = False
+        if not write_obs:
+            return
+        if self.obs_mode == "grid":
+            extract_grid_observation(
+                self.sims[i], scale=self.grid_scale, out=self._observations[i]
+            )
+        else:
+            extract_observation(
+                self.sims[i], use_raycasts=self.use_raycasts, out=self._observations[i]
+            )
+
+    def _obs_out(self) -> np.ndarray:
+        return self._observations.copy() if self.copy else self._observations
+
+    def _compute_reward(self, events: list) -> float:
+        # Mirrors SpeednikEnv._compute_reward (placeholder).
+        return 0.0
+
+    def _collect_info(self) -> dict:
+        info: dict = {key: np.empty(self.num_envs, dtype=_INFO_DTYPES[key]) for key in INFO_KEYS}
+        self._fill_info(info)
+        mask = np.ones(self.num_envs, dtype=np.bool_)
+        for key in INFO_KEYS:
+            info[f"_{key}"] = mask
+        return info
+
+    def _fill_info(self, info: dict) -> None:
+        """Write per-env info values into the preallocated arrays of *info*."""
+        frame, x, y = info["frame"], info["x"], info["y"]
+        max_x, rings = info["max_x"], info["rings"]
+        deaths, goal = info["deaths"], info["goal_reached"]
+        for i, sim in enumerate(self.sims):
+            p = sim.player.physics
+            frame[i] = sim.frame
+            x[i] = p.x
+            y[i] = p.y
+            max_x[i] = sim.max_x_reached
+            rings[i] = sim.rings_collected
+            deaths[i] = sim.deaths
+            goal[i] = sim.goal_reached
@@ -23,6 +23,7 @@ from speednik.agents import (
     HoldRightAgent,
     IdleAgent,
     JumpRunnerAgent,
+    NumpyPolicyAgent,
     ScriptedAgent,
     SpindashAgent,
     action_to_input,
@@ -414,7 +415,7 @@ def test_scripted_agent_empty_timeline():
 # ---------------------------------------------------------------------------
 
 def test_registry_contains_all_agents():
-    expected = {"idle", "hold_right", "jump_runner", "spindash", "scripted"}
+    expected = {"idle", "hold_right", "jump_runner", "spindash", "scripted", "ppo_numpy"}
     actual = set(AGENT_REGISTRY.keys())
     # "ppo" is present only when torch is installed
     assert actual - {"ppo"} == expected
@@ -618,6 +619,22 @@ class TestPPOAgent:
     def test_registry_has_ppo(self):
         assert "ppo" in AGENT_REGISTRY
 
+    def test_act_batch_matches_act(self, tmp_path):
+        from speednik.agents.ppo_agent import PPOAgent
+
+        agent = PPOAgent(model_path=_make_ppo_checkpoint(tmp_path))
+        obs = np.random.default_rng(3).standard_normal((16, 26)).astype(np.float32)
+        assert agent.act_batch(obs).tolist() == [agent.act(o) for o in obs]
+
+    def test_export_numpy_matches_torch(self, tmp_path):
+        from speednik.agents.ppo_agent import PPOAgent
+
+        agent = PPOAgent(model_path=_make_ppo_checkpoint(tmp_path))
+        agent.export_numpy(tmp_path / "actor.npz")
+        numpy_agent = NumpyPolicyAgent(str(tmp_path / "actor.npz"))
+        obs = np.random.default_rng(4).standard_normal((64, 26)).astype(np.float32)
+        assert numpy_agent.act_batch(obs).tolist() == agent.act_batch(obs).tolist()
+
     def test_resolve_agent_ppo(self, tmp_path):
         path = _make_ppo_checkpoint(tmp_path)
         agent = resolve_agent("ppo", {"model_path": path})
@@ -632,3 +649,53 @@ class TestPPOAgent:
 
         with pytest.raises(FileNotFoundError):
             PPOAgent(model_path=str(tmp_path / "nonexistent.pt"))
+
+
+# ===========================================================================
+# NumpyPolicyAgent (no torch needed)
+# ===========================================================================
+
+def _make_numpy_weights(tmp_path, obs_dim=26, num_actions=8, seed=0):
+    from speednik.agents.numpy_policy import save_policy_weights
+
+    rng = np.random.default_rng(seed)
+    sizes = [obs_dim, 64, 64, num_actions]
+    layers = [
+        (rng.standard_normal((a, b)) / np.sqrt(a), rng.standard_normal(b) * 0.1)
+        for a, b in zip(sizes, sizes[1:])
+    ]
+    path = tmp_path / "actor.npz"
+    save_policy_weights(path, layers)
+    return str(path)
+
+
+class TestNumpyPolicyAgent:
+    def test_protocol_and_registry(self, tmp_path):
+        agent = resolve_agent("ppo_numpy", {"weights_path": _make_numpy_weights(tmp_path)})
+        assert isinstance(agent, NumpyPolicyAgent)
+        assert isinstance(agent, Agent)
+        assert (agent.obs_dim, agent.num_actions) == (26, 8)
+
+    def test_act_batch_matches_act(self, tmp_path):
+        agent = NumpyPolicyAgent(_make_numpy_weights(tmp_path))
+        obs = np.random.default_rng(1).standard_normal((32, 26)).astype(np.float32)
+        actions = agent.act_batch(obs)
+        assert actions.shape == (32,)
+        assert actions.tolist() == [agent.act(o) for o in obs]
+        assert all(isinstance(agent.act(o), int) for o in obs[:3])
+
+    def test_custom_dims(self, tmp_path):
+        agent = NumpyPolicyAgent(_make_numpy_weights(tmp_path, obs_dim=12, num_actions=4))
+        assert 0 <= agent.act(np.zeros(12, dtype=np.float32)) < 4
+
+    def test_missing_weights(self, tmp_path):
+        import pytest
+
+        np.savez(tmp_path / "bad.npz", w0=np.zeros((26, 64)))
+        with pytest.raises(ValueError):
+            NumpyPolicyAgent(str(tmp_path / "bad.npz"))
+
+    def test_no_pyxel_or_torch_import(self):
+        source = Path("speednik/agents/numpy_policy.py").read_text()
+        assert "import torch" not in source
+        _assert_no_pyxel("numpy_policy")
@@ -0,0 +1,247 @@
+"""Tests for speednik/batch.py — vectorized batch simulation.
+
+The batch engine must stay bit-identical to sim_step, so every test steps
+scalar sims alongside the batch and compares state exactly.
+"""
+
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pytest
+
+from speednik.agents.actions import NUM_ACTIONS, action_to_input
+from speednik.batch import (
+    ANIM_NAMES,
+    BatchInput,
+    batch_step,
+    create_batch_sim,
+    create_batch_sim_from_grid,
+    reset_batch,
+)
+from speednik.enemies import load_enemies
+from speednik.grids import build_flat, build_loop, build_slope
+from speednik.objects import (
+    load_checkpoints,
+    load_liquid_zones,
+    load_pipes,
+    load_rings,
+    load_springs,
+)
+from speednik.player import PlayerState
+from speednik.simulation import (
+    DamageEvent,
+    create_sim,
+    create_sim_from_lookup,
+    sim_step,
+)
+from speednik.terrain import TileGrid
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_GROUND = 20 * 16  # top of build_flat(..., ground_row=20)
+_RING_ROW = [{"type": "ring", "x": x, "y": _GROUND - 20} for x in range(120, 2400, 40)]
+
+def _action(rng: random.Random, env: int, frame: int) -> int:
+    """Mix of spindash cycles, jump-running and random mashing."""
+    kind = env % 3
+    if kind == 0:
+        phase = frame % 60
+        if phase < 10:
+            return 6  # down: crouch into spindash
+        if phase < 20:
+            return 7 if phase % 2 else 6  # charge
+        return 6 if phase < 30 else 2
+    if kind == 1:
+        return 5 if rng.random() < 0.3 else 2
+    return rng.randrange(NUM_ACTIONS)
+
+
+def _assert_lockstep(sims, batch, frames: int, seed: int = 0, policy=None) -> None:
+    """Step both engines with the same actions and compare every frame.
+
+    *policy(sim, env, frame)* picks actions from the scalar sims' state;
+    the default is _action.
+    """
+    rng = random.Random(seed)
+    prev = [False] * len(sims)
+    for frame in range(frames):
+        if policy is None:
+            actions = np.array([_action(rng, i, frame) for i in range(len(sims))])
+        else:
+            actions = np.array([policy(sim, i, frame) for i, sim in enumerate(sims)])
+        batch_inp = BatchInput.from_actions(actions, batch.prev_jump_held)
+        damaged = []
+        for i, sim in enumerate(sims):
+            inp, prev[i] = action_to_input(int(actions[i]), prev[i])
+            events = sim_step(sim, inp)
+            damaged.append(any(isinstance(e, DamageEvent) for e in events))
+        batch_events = batch_step(batch, batch_inp)
+        assert batch_events.damaged.tolist() == damaged, f"frame {frame}"
+        for i, sim in enumerate(sims):
+            ctx = f"env {i} frame {frame}"
+            assert batch.physics_state(i) == sim.player.physics, ctx
+            assert batch.player_state(i) == sim.player.state, ctx
+            assert batch.rings[i] == sim.player.rings, ctx
+            assert ANIM_NAMES[batch.anim[i]] == sim.player.anim_name, ctx
+            assert batch.anim_frame[i] == sim.player.anim_frame, ctx
+            assert batch.max_x_reached[i] == sim.max_x_reached, ctx
+            assert batch.rings_collected[i] == sim.rings_collected, ctx
+            assert batch.deaths[i] == sim.deaths, ctx
+            assert bool(batch.goal_reached[i]) == sim.goal_reached, ctx
+            assert batch.invulnerability_timer[i] == sim.player.invulnerability_timer, ctx
+            assert bool(batch.in_pipe[i]) == sim.player.in_pipe, ctx
+            assert batch.scattered_rings(i) == sim.player.scattered_rings, ctx
+            assert batch.enemy_alive[i].tolist() == [e.alive for e in sim.enemies], ctx
+            assert batch.enemy_x[i].tolist() == [e.x for e in sim.enemies], ctx
+            assert batch.enemy_y[i].tolist() == [e.y for e in sim.enemies], ctx
+            assert batch.spring_cooldown[i].tolist() == [sp.cooldown for sp in sim.springs], ctx
+            assert batch.liquid_current_y[i].tolist() == [z.current_y for z in sim.liquid_zones], ctx
+            assert batch.enemy_boss_hp[i].tolist() == [e.boss_hp for e in sim.enemies], ctx
+            assert batch.checkpoint_activated[i].tolist() == [
+                cp.activated for cp in sim.checkpoints
+            ], ctx
+            assert batch.respawn_x[i] == sim.player.respawn_x, ctx
+
+
+def _entity_course(entities: list[dict], num_envs: int, level_width: int = 3200):
+    """Scalar sims and a batch on flat ground holding *entities*."""
+    tiles, lookup = build_flat(200, 20)
+    grid = TileGrid.from_tiles(tiles)
+    start = (48.0, _GROUND - 20.0)
+    sims = []
+    for _ in range(num_envs):
+        sim = create_sim_from_lookup(lookup, *start, level_width=level_width, level_height=600)
+        sim.rings = load_rings(entities)
+        sim.springs = load_springs(entities)
+        sim.checkpoints = load_checkpoints(entities)
+        sim.pipes = load_pipes(entities)
+        sim.liquid_zones = load_liquid_zones(entities)
+        sim.enemies = load_enemies(entities)
+        sims.append(sim)
+    batch = create_batch_sim_from_grid(
+        grid, *start, num_envs,
+        level_width=level_width,
+        level_height=600,
+        rings=[(r.x, r.y) for r in load_rings(entities)],
+        springs=load_springs(entities),
+        checkpoints=load_checkpoints(entities),
+        pipes=load_pipes(entities),
+        liquid_zones=load_liquid_zones(entities),
+        enemies=load_enemies(entities),
+    )
+    return sims, batch
+
+
+
+# ---------------------------------------------------------------------------
+# Bit-exact lockstep against sim_step
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("stage", ["hillside", "pipeworks", "skybridge"])
+def test_matches_sim_step_on_stage(stage):
+    n = 6
+    sims = [create_sim(stage) for _ in range(n)]
+    batch = create_batch_sim(stage, n)
+    _assert_lockstep(sims, batch, frames=600)
+
+
+def test_matches_sim_step_with_every_entity_kind():
+    entities = _RING_ROW + [
+        {"type": "enemy_crab", "x": 260, "y": _GROUND - 7},
+        {"type": "enemy_buzzer", "x": 420, "y": _GROUND - 30},
+        {"type": "enemy_chopper", "x": 560, "y": _GROUND - 8},
+        {"type": "enemy_guardian", "x": 760, "y": _GROUND - 14},
+        {"type": "spring_up", "x": 900, "y": _GROUND - 8},
+        {"type": "checkpoint", "x": 1000, "y": _GROUND - 20},
+        {"type": "enemy_egg_piston", "x": 1250, "y": _GROUND - 16},
+        {"type": "spring_right", "x": 1450, "y": _GROUND - 8},
+        {"type": "pipe_h", "x": 1650, "y": _GROUND - 12, "exit_x": 1900,
+         "exit_y": _GROUND - 60, "vel_x": 6, "vel_y": -1},
+        {"type": "liquid_trigger", "x": 2000, "exit_x": 2600,
+         "floor_y": _GROUND + 10, "ceiling_y": _GROUND - 40},
+        {"type": "enemy_crab", "x": 2200, "y": _GROUND - 7},
+    ]
+    sims, batch = _entity_course(entities, 12)
+    _assert_lockstep(sims, batch, frames=1500, seed=3)
+    assert any(sim.player.in_pipe or sim.max_x_reached > 1900 for sim in sims)
+    assert any(not e.alive for sim in sims for e in sim.enemies)
+
+
+def test_matches_sim_step_against_boss():
+    entities = [{"type": "enemy_egg_piston", "x": 200, "y": _GROUND - 16}]
+    entities += [{"type": "ring", "x": x, "y": _GROUND - 20} for x in range(60, 400, 12)]
+    sims, batch = _entity_course(entities, 12, level_width=400)
+
+    def spindash_at_boss(sim, env: int, frame: int) -> int:
+        phase = (frame + env * 7) % 40
+        if phase < 3:
+            return 2 if sim.enemies[0].x > sim.player.physics.x else 1
+        if phase < 12 or 22 <= phase < 24:
+            return 6
+        if phase < 22:
+            return 7 if phase % 2 else 6
+        return 0
+
+    _assert_lockstep(sims, batch, frames=2000, policy=spindash_at_boss)
+    assert any(sim.enemies[0].boss_escalated for sim in sims)
+
+
+def test_matches_sim_step_on_loop():
+    tiles, lookup = build_loop(approach_tiles=20, radius=64, ground_row=20)
+    grid = TileGrid.from_tiles(tiles)
+    start = (48.0, 20 * 16 - 20.0)
+    sims = [create_sim_from_lookup(lookup, *start) for _ in range(6)]
+    batch = create_batch_sim_from_grid(grid, *start, 6)
+    _assert_lockstep(sims, batch, frames=600, seed=1)
+
+
+def test_matches_sim_step_on_slope():
+    tiles, lookup = build_slope(approach_tiles=10, slope_tiles=20, angle=30, ground_row=20)
+    grid = TileGrid.from_tiles(tiles)
+    start = (48.0, 20 * 16 - 20.0)
+    sims = [create_sim_from_lookup(lookup, *start) for _ in range(6)]
+    batch = create_batch_sim_from_grid(grid, *start, 6)
+    _assert_lockstep(sims, batch, frames=400, seed=2)
+
+
+# ---------------------------------------------------------------------------
+# Inputs and reset
+# ---------------------------------------------------------------------------
+
+def test_from_actions_matches_action_to_input():
+    for prev in (False, True):
+        for action in range(NUM_ACTIONS):
+            expected, _ = action_to_input(action, prev)
+            batch_inp = BatchInput.from_actions(np.array([action]), np.array([prev]))
+            got = BatchInput.from_inputs([expected])
+            for name in ("left", "right", "jump_pressed", "jump_held", "down_held", "up_held"):
+                assert getattr(batch_inp, name)[0] == getattr(got, name)[0], (action, prev, name)
+
+
+def test_initial_state_matches_create_sim():
+    sim = create_sim("hillside")
+    batch = create_batch_sim("hillside", 3)
+    for i in range(3):
+        assert batch.physics_state(i) == sim.player.physics
+        assert batch.player_state(i) == PlayerState.STANDING
+    assert batch.lives.tolist() == [3, 3, 3]
+    assert batch.ring_collected.shape == (3, len(sim.rings))
+
+
+def test_reset_selected_envs():
+    batch = create_batch_sim("hillside", 4)
+    inp = BatchInput.from_actions(np.full(4, 2), batch.prev_jump_held)
+    for _ in range(120):
+        batch_step(batch, inp)
+    moved_x = batch.x.copy()
+    mask = np.array([True, False, True, False])
+    reset_batch(batch, mask)
+    assert batch.x[0] == batch.start_x and batch.x[2] == batch.start_x
+    assert batch.x[1] == moved_x[1] and batch.x[3] == moved_x[3]
+    assert batch.frame.tolist() == [0, 120, 0, 120]
+    assert not batch.ring_collected[0].any()
@@ -0,0 +1,97 @@
+"""Tests for the compiled binary stage format (speednik/level.py)."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from speednik import level
+from speednik.level import COMPILED_FILENAME, compile_stage, load_stage
+from speednik.terrain import TerrainPyramid
+
+
+@pytest.fixture
+def stage_copy(tmp_path, monkeypatch):
+    """Copy hillside's data into tmp_path and point the loader at it."""
+    src = level._DATA_DIRS["hillside"]
+    dst = tmp_path / "hillside"
+    shutil.copytree(src, dst, ignore=shutil.ignore_patterns(COMPILED_FILENAME))
+    monkeypatch.setitem(level._DATA_DIRS, "hillside", dst)
+    return dst
+
+
+def _json_tiles(data_dir):
+    tile_map = level._read_json(data_dir / "tile_map.json")
+    collision = level._read_json(data_dir / "collision.json")
+    return level._build_tiles(tile_map, collision)
+
+
+class TestCompiledStage:
+    def test_compile_writes_default_path(self, stage_copy):
+        path = compile_stage("hillside")
+        assert path == stage_copy / COMPILED_FILENAME
+        assert path.exists()
+
+    def test_compiled_tiles_match_json(self, stage_copy):
+        expected = _json_tiles(stage_copy)
+        compile_stage("hillside")
+        assert level._compiled_path_if_fresh(stage_copy) is not None
+        stage = load_stage("hillside")
+        assert stage.tiles_dict.keys() == expected.keys()
+        for key, tile in expected.items():
+            assert stage.tiles_dict[key] == tile
+        assert stage.tile_lookup(*next(iter(expected))) is not None
+
+    def test_grid_shares_mapped_pages(self, stage_copy):
+        compile_stage("hillside")
+        grid = load_stage("hillside").tile_grid
+        assert all(isinstance(array, np.memmap) for array in grid.tables)
+        assert not grid.heights.flags.writeable
+        assert np.shares_memory(grid.heights, grid.tables.heights)
+        assert all(cell is None for cell in grid.lookup._cells)
+        assert isinstance(grid.pyramid.live_sums, np.memmap)
+        rebuilt = TerrainPyramid.from_cells(grid.heights, grid.solidity, grid.occupied)
+        assert np.array_equal(grid.pyramid.live_sums, rebuilt.live_sums)
+        assert np.array_equal(grid.pyramid.full_sums, rebuilt.full_sums)
+        for mapped, built in zip(grid.pyramid.empty + grid.pyramid.full, rebuilt.empty + rebuilt.full):
+            assert np.array_equal(mapped, built)
+
+    def test_old_format_version_ignored(self, stage_copy):
+        path = compile_stage("hillside")
+        data = bytearray(path.read_bytes())
+        data[4] = 2
+        path.write_bytes(bytes(data))
+        assert level._compiled_path_if_fresh(stage_copy) is None
+        assert load_stage("hillside").tiles_dict == _json_tiles(stage_copy)
+
+    def test_height_arrays_are_plain_lists(self, stage_copy):
+        compile_stage("hillside")
+        tile = next(iter(load_stage("hillside").tiles_dict.values()))
+        assert type(tile.height_array) is list
+        assert all(type(h) is int for h in tile.height_array)
+
+    def test_stale_compiled_file_ignored(self, stage_copy):
+        path = compile_stage("hillside")
+        stamp = path.stat().st_mtime_ns
+        os.utime(stage_copy / "tile_map.json", ns=(stamp + 10**9, stamp + 10**9))
+        assert level._compiled_path_if_fresh(stage_copy) is None
+
+    def test_missing_compiled_file_uses_json(self, stage_copy):
+        assert level._compiled_path_if_fresh(stage_copy) is None
+        stage = load_stage("hillside")
+        assert stage.tiles_dict == _json_tiles(stage_copy)
+
+    def test_bad_magic_rejected(self, stage_copy):
+        path = compile_stage("hillside")
+        data = bytearray(path.read_bytes())
+        data[:4] = b"XXXX"
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError):
+            level._read_compiled(path)
+
+    def test_unknown_stage(self):
+        with pytest.raises(ValueError):
+            compile_stage("nonexistent")
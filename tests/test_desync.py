@@ -0,0 +1,83 @@
+"""Tests for speednik/desync.py — state hashing and desync detection."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from speednik.desync import (
+    DesyncReason,
+    HashTrace,
+    check_trace,
+    record_trace,
+    sim_hash,
+    state_fields,
+)
+from speednik.physics import InputState
+from speednik.simulation import create_sim, sim_restore, sim_snapshot, sim_step
+
+INPUTS = [InputState(right=True, jump_pressed=(i % 50 == 0), jump_held=(i % 50 < 10))
+          for i in range(300)]
+
+
+def test_hash_equal_for_identical_runs():
+    a = create_sim("hillside")
+    b = create_sim("hillside")
+    for inp in INPUTS[:100]:
+        sim_step(a, inp)
+        sim_step(b, inp)
+    assert sim_hash(a) == sim_hash(b)
+    sim_step(a, INPUTS[100])
+    assert sim_hash(a) != sim_hash(b)
+
+
+def test_hash_round_trips_through_restore():
+    sim = create_sim("skybridge")
+    for inp in INPUTS[:50]:
+        sim_step(sim, inp)
+    snap, h = sim_snapshot(sim), sim_hash(sim)
+    for inp in INPUTS[50:]:
+        sim_step(sim, inp)
+    sim_restore(sim, snap)
+    assert sim_hash(sim) == h
+
+
+def test_fields_cover_entities():
+    fields = state_fields(create_sim("skybridge"))
+    assert "player.physics.x" in fields and "player.state" in fields
+    assert "rings" in fields and "enemies[0]" in fields
+
+
+def test_check_trace_matches_own_recording():
+    trace = record_trace(create_sim("hillside"), INPUTS, interval=64)
+    assert [cp.frame for cp in trace.checkpoints] == [0, 64, 128, 192, 256, 300]
+    restored = HashTrace.from_dict(json.loads(json.dumps(trace.to_dict())))
+    assert check_trace(create_sim("hillside"), INPUTS, restored) is None
+
+
+def test_check_trace_reports_first_divergence():
+    trace = record_trace(create_sim("hillside"), INPUTS, interval=10)
+    bad = list(INPUTS)
+    bad[42] = InputState(left=True)
+    desync = check_trace(create_sim("hillside"), bad, trace)
+    assert desync is not None
+    assert desync.frame == 50
+    assert "player.physics.x" in desync.fields
+    assert "frame" not in desync.fields
+
+
+@pytest.mark.parametrize("count, frame", [(100, 100), (0, 0), (600, 360), (310, 310)])
+def test_check_trace_reports_length_mismatch(count, frame):
+    trace = record_trace(create_sim("hillside"), INPUTS, interval=60)
+    inputs = (INPUTS * 2)[:count]
+    desync = check_trace(create_sim("hillside"), inputs, trace)
+    assert desync is not None
+    assert desync.reason is DesyncReason.LENGTH
+    assert desync.frame == frame
+    assert "length mismatch" in str(desync)
+
+
+def test_record_trace_rejects_bad_interval():
+    with pytest.raises(ValueError):
+        record_trace(create_sim("hillside"), [], interval=0)
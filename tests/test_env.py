@@ -239,6 +239,63 @@ def test_not_truncated_before_max_steps():
     assert truncated is False
 
 
+# ---------------------------------------------------------------------------
+# Frame skip
+# ---------------------------------------------------------------------------
+
+def test_frame_skip_matches_repeated_single_steps():
+    skip = SpeednikEnv(frame_skip=4)
+    single = SpeednikEnv()
+    skip.reset()
+    single.reset()
+    for action in [ACTION_RIGHT, ACTION_RIGHT_JUMP, ACTION_RIGHT_JUMP, ACTION_NOOP] * 5:
+        obs, reward, _, _, info = skip.step(action)
+        total = 0.0
+        for _ in range(4):
+            s_obs, s_reward, _, _, s_info = single.step(action)
+            total += s_reward
+        np.testing.assert_array_equal(obs, s_obs)
+        assert reward == total
+        assert info == s_info
+    assert skip.sim.frame == 80
+
+
+def test_frame_skip_stops_at_max_steps():
+    env = SpeednikEnv(max_steps=10, frame_skip=4)
+    env.reset()
+    truncs = [env.step(ACTION_NOOP)[3] for _ in range(3)]
+    assert truncs == [False, False, True]
+    assert env.sim.frame == 10
+
+
+def test_frame_skip_stops_on_termination():
+    env = SpeednikEnv(frame_skip=600)
+    env.reset()
+    env.sim.goal_x = env.sim.player.physics.x + 1.0
+    env.sim.goal_y = env.sim.player.physics.y
+    _, _, terminated, _, info = env.step(ACTION_RIGHT)
+    assert terminated is True
+    assert info["goal_reached"] is True
+    assert info["frame"] < 60
+
+
+def test_frame_skip_invalid():
+    import pytest
+
+    with pytest.raises(ValueError):
+        SpeednikEnv(frame_skip=0)
+
+
+def test_frame_skip_registered_variant():
+    import gymnasium as gym
+
+    import speednik.env_registration  # noqa: F401
+
+    env = gym.make("speednik/Hillside-FrameSkip4-v0")
+    assert env.unwrapped.frame_skip == 4
+    assert env.spec.max_episode_steps * 4 == env.unwrapped.max_steps
+
+
 # ---------------------------------------------------------------------------
 # Info dict
 # ---------------------------------------------------------------------------
@@ -342,3 +399,47 @@ def test_no_pyxel_import_env():
     source = Path(inspect.getfile(mod)).read_text()
     assert "import pyxel" not in source
     assert "from pyxel" not in source
+
+
+# ---------------------------------------------------------------------------
+# rgb_array rendering
+# ---------------------------------------------------------------------------
+
+def test_render_none_without_render_mode():
+    env = SpeednikEnv()
+    env.reset()
+    assert env.render() is None
+
+
+def test_render_rgb_array_follows_camera():
+    env = SpeednikEnv(render_mode="rgb_array")
+    env.reset()
+    first = env.render()
+    assert first.shape == (224, 256, 3)
+    assert first.dtype == np.uint8
+    for _ in range(120):
+        env.step(ACTION_RIGHT)
+    assert env._camera.x > 0
+    assert (env.render() != first).any()
+
+
+# ---------------------------------------------------------------------------
+# Grid observation mode
+# ---------------------------------------------------------------------------
+
+def test_grid_obs_mode():
+    from gymnasium.utils.env_checker import check_env
+
+    env = SpeednikEnv(obs_mode="grid", grid_scale=4)
+    obs, _ = env.reset()
+    assert obs.shape == env.observation_space.shape == (5, 56, 64)
+    obs, *_ = env.step(ACTION_RIGHT)
+    assert env.observation_space.contains(obs)
+    check_env(env.unwrapped)
+
+
+def test_grid_obs_mode_invalid():
+    import pytest
+
+    with pytest.raises(ValueError):
+        SpeednikEnv(obs_mode="pixels")
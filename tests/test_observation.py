@@ -6,17 +6,26 @@ import inspect
 from pathlib import Path
 
 import numpy as np
+import pytest
 
+import speednik.observation as observation
 from speednik.constants import MAX_X_SPEED
 from speednik.observation import (
+    GRID_CHANNELS,
+    GRID_SCALES,
     MAX_RAY_RANGE,
     OBS_DIM,
     OBS_DIM_BASE,
     RAY_ANGLES,
+    extract_grid_observation,
     extract_observation,
+    extract_observations,
+    grid_observation_space,
+    grid_shape,
+    terrain_mip,
 )
 from speednik.physics import InputState
-from speednik.simulation import SimState, create_sim, sim_step
+from speednik.simulation import SimState, create_sim, create_sim_from_lookup, sim_step
 
 
 # ---------------------------------------------------------------------------
@@ -292,6 +301,146 @@ def test_raycast_grounded_has_short_downward_ray():
     )
 
 
+# ---------------------------------------------------------------------------
+# Preallocated buffers and batched extraction
+# ---------------------------------------------------------------------------
+
+def _varied_sims(n: int) -> list[SimState]:
+    sims = []
+    for i in range(n):
+        sim = create_sim("hillside")
+        for _ in range(i * 7):
+            sim_step(sim, InputState(right=True, jump_pressed=i % 3 == 0, jump_held=True))
+        sim.player.physics.facing_right = i % 4 != 1
+        sims.append(sim)
+    return sims
+
+
+def test_out_buffer_filled_in_place():
+    sim = create_sim("hillside")
+    for _ in range(30):
+        sim_step(sim, InputState(right=True))
+    buf = np.full(OBS_DIM, np.nan, dtype=np.float32)
+    result = extract_observation(sim, out=buf)
+    assert result is buf
+    np.testing.assert_array_equal(buf, extract_observation(sim))
+
+
+def test_out_buffer_wrong_shape_raises():
+    sim = create_sim("hillside")
+    with pytest.raises(ValueError):
+        extract_observation(sim, out=np.empty(OBS_DIM, dtype=np.float32), use_raycasts=False)
+
+
+@pytest.mark.parametrize("min_batched_rays", [0, 10**9])
+def test_extract_observations_matches_single(monkeypatch, min_batched_rays):
+    """Both the vectorized and the per-sim ray paths match extract_observation."""
+    monkeypatch.setattr(observation, "_MIN_BATCHED_RAYS", min_batched_rays)
+    sims = _varied_sims(6)
+    out = np.empty((6, OBS_DIM), dtype=np.float32)
+    result = extract_observations(sims, out=out)
+    assert result is out
+    for i, sim in enumerate(sims):
+        np.testing.assert_array_equal(out[i], extract_observation(sim))
+
+
+def test_extract_observations_without_raycasts():
+    sims = _varied_sims(3)
+    obs = extract_observations(sims, use_raycasts=False)
+    assert obs.shape == (3, OBS_DIM_BASE)
+    for i, sim in enumerate(sims):
+        np.testing.assert_array_equal(obs[i], extract_observation(sim, use_raycasts=False))
+
+
+def test_extract_observations_lookup_without_grid(monkeypatch):
+    """Sims built from a plain lookup fall back to the scalar raycaster."""
+    monkeypatch.setattr(observation, "_MIN_BATCHED_RAYS", 0)
+    stage_sim = create_sim("hillside")
+    tiles = dict(stage_sim.tile_grid.tiles)
+    plain = create_sim_from_lookup(lambda tx, ty: tiles.get((tx, ty)), 100.0, 600.0)
+    assert plain.tile_grid is None
+    obs = extract_observations([stage_sim, plain])
+    np.testing.assert_array_equal(obs[0], extract_observation(stage_sim))
+    np.testing.assert_array_equal(obs[1], extract_observation(plain))
+
+
+# ---------------------------------------------------------------------------
+# Occupancy grid
+# ---------------------------------------------------------------------------
+
+def _full_res_solid(grid) -> np.ndarray:
+    rows, cols, size = grid.heights.shape
+    solid = (grid.occupied != 0) & (grid.solidity != 0)
+    py = np.arange(size)[None, None, :, None]
+    mask = (py >= size - grid.heights[:, :, None, :]) & solid[:, :, None, None]
+    return mask.transpose(0, 2, 1, 3).reshape(rows * size, cols * size)
+
+
+@pytest.mark.parametrize("scale", GRID_SCALES)
+def test_terrain_mip_matches_pixel_coverage(scale):
+    grid = create_sim("pipeworks").tile_grid
+    full = _full_res_solid(grid)
+    h, w = full.shape
+    expected = full.reshape(h // scale, scale, w // scale, scale).mean(axis=(1, 3))
+    mip = terrain_mip(grid, scale)
+    _, win_rows, win_cols = grid_shape(scale)
+    inner = mip[0, win_rows:win_rows + h // scale, win_cols:win_cols + w // scale]
+    np.testing.assert_allclose(inner, expected)
+    assert terrain_mip(grid, scale) is mip
+
+
+@pytest.mark.parametrize("scale", GRID_SCALES)
+def test_grid_observation_is_a_window_of_the_mip(scale):
+    sim = create_sim("hillside")
+    obs = extract_grid_observation(sim, scale=scale)
+    channels, rows, cols = grid_shape(scale)
+    assert obs.shape == (channels, rows, cols) == (len(GRID_CHANNELS), 224 // scale, 256 // scale)
+    assert obs.dtype == np.float32
+    assert grid_observation_space(scale).contains(obs)
+
+    p = sim.player.physics
+    col0 = int(p.x // scale) - cols // 2
+    row0 = int(p.y // scale) - rows // 2
+    full = _full_res_solid(sim.tile_grid)
+    ys = np.arange(row0 * scale, (row0 + rows) * scale)
+    xs = np.arange(col0 * scale, (col0 + cols) * scale)
+    inside = (ys[:, None] >= 0) & (ys[:, None] < full.shape[0]) & (xs >= 0) & (xs < full.shape[1])
+    window = np.where(inside, full[ys.clip(0, full.shape[0] - 1)][:, xs.clip(0, full.shape[1] - 1)], False)
+    expected = window.reshape(rows, scale, cols, scale).mean(axis=(1, 3))
+    np.testing.assert_allclose(obs[0], expected)
+
+
+def test_grid_entity_channels():
+    sim = create_sim("hillside")
+    p = sim.player.physics
+    ring = sim.rings[0]
+    ring.x, ring.y = p.x + 40, p.y
+    ring.collected = False
+    obs = extract_grid_observation(sim, scale=8)
+    _, rows, cols = obs.shape
+    assert obs[2, rows // 2, cols // 2 + 5] == 1.0
+    ring.collected = True
+    assert extract_grid_observation(sim, scale=8)[2, rows // 2, cols // 2 + 5] == 0.0
+
+
+def test_grid_far_outside_level_is_empty():
+    sim = create_sim("hillside")
+    sim.player.physics.y = 10_000.0
+    assert not extract_grid_observation(sim)[:2].any()
+
+
+def test_grid_invalid_arguments():
+    sim = create_sim("hillside")
+    with pytest.raises(ValueError):
+        extract_grid_observation(sim, scale=2)
+    with pytest.raises(ValueError):
+        extract_grid_observation(sim, out=np.empty((5, 1, 1), dtype=np.float32))
+    tiles = dict(sim.tile_grid.tiles)
+    plain = create_sim_from_lookup(lambda tx, ty: tiles.get((tx, ty)), 100.0, 600.0)
+    with pytest.raises(ValueError):
+        extract_grid_observation(plain)
+
+
 # ---------------------------------------------------------------------------
 # No Pyxel import
 # ---------------------------------------------------------------------------
@@ -0,0 +1,57 @@
+"""Tests for speednik/packed.py — fixed-layout entity field storage."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from speednik.enemies import Enemy
+from speednik.objects import LiquidZone, Ring
+from speednik.packed import PackedStore
+
+
+def test_standalone_entity_behaves_like_dataclass():
+    ring = Ring(x=1.0, y=2.0)
+    assert ring.collected is False
+    ring.collected = True
+    assert ring == Ring(x=1.0, y=2.0, collected=True)
+    assert "collected=True" in repr(ring)
+
+
+def test_store_shares_one_flat_list():
+    zones = [
+        LiquidZone(trigger_x=0.0, exit_x=10.0, floor_y=5.0, ceiling_y=0.0, current_y=5.0),
+        LiquidZone(trigger_x=20.0, exit_x=30.0, floor_y=8.0, ceiling_y=0.0, current_y=8.0),
+    ]
+    store = PackedStore(zones)
+    assert store.values == [5.0, False, 8.0, False]
+    zones[1].active = True
+    assert store.dump() == (5.0, False, 8.0, True)
+    store.load((4.0, True, 8.0, False))
+    assert zones[0].current_y == 4.0 and zones[0].active and not zones[1].active
+    with pytest.raises(ValueError):
+        store.load((1.0,))
+
+
+def test_holds_detects_replaced_or_resized_list():
+    rings = [Ring(x=0.0, y=0.0)]
+    store = PackedStore(rings)
+    assert store.holds(rings)
+    assert not store.holds(list(rings))
+    rings.append(Ring(x=1.0, y=0.0))
+    assert not store.holds(rings)
+
+
+def test_copies_are_independent():
+    enemies = [Enemy(x=0.0, y=0.0, enemy_type="enemy_crab")]
+    store = PackedStore(enemies)
+    clone = store.copy()
+    clone.entities[0].alive = False
+    single = copy.copy(enemies[0])
+    single.x = 5.0
+    assert enemies[0].alive and enemies[0].x == 0.0
+    assert not clone.entities[0].alive and clone.entities[0].enemy_type == "enemy_crab"
+    deep = copy.deepcopy(enemies)
+    deep[0].y = 3.0
+    assert enemies[0].y == 0.0
@@ -0,0 +1,174 @@
+"""Tests for speednik/raster.py — headless NumPy rasterizer."""
+
+from __future__ import annotations
+
+import inspect
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from speednik.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from speednik import renderer
+from speednik.palette import palette_rgb
+from speednik.player import create_player
+from speednik.raster import Canvas, SimRasterizer, TerrainRaster, _raster_profile
+from speednik.simulation import create_sim
+from speednik.terrain import TILE_SIZE
+
+
+# ---------------------------------------------------------------------------
+# Canvas primitives
+# ---------------------------------------------------------------------------
+
+class TestCanvas:
+    def test_line_endpoints_and_clipping(self):
+        c = Canvas(8, 8)
+        c.line(-4, 2, 20, 2, 3)
+        assert c.pixels[2].tolist() == [3] * 8
+        c.line(1, 4, 5, 6, 5)
+        assert c.pixels[4, 1] == 5 and c.pixels[6, 5] == 5
+        assert (c.pixels[4:7] == 5).sum() == 5
+
+    def test_camera_offsets_drawing(self):
+        c = Canvas(8, 8)
+        c.camera(100, 50)
+        c.pset(101, 52, 7)
+        c.rect(104, 54, 10, 10, 2)
+        assert c.pixels[2, 1] == 7
+        assert (c.pixels[4:, 4:] == 2).all()
+        assert (c.pixels == 2).sum() == 16
+
+    def test_circ_is_symmetric(self):
+        c = Canvas(17, 17)
+        c.circ(8, 8, 3, 1)
+        mask = c.pixels == 1
+        assert mask[8, 5] and mask[8, 11] and not mask[5, 5]
+        assert (mask == mask[::-1]).all() and (mask == mask.T).all()
+
+    def test_text_draws_glyphs(self):
+        c = Canvas(16, 8)
+        c.text(0, 0, "1", 11)
+        assert c.pixels[:, 0:3].any() and not c.pixels[:, 4:].any()
+        c.text(4, 0, "\x00", 11)  # unknown characters are skipped
+        assert not c.pixels[:, 4:].any()
+
+    def test_blit_colkey(self):
+        c = Canvas(4, 4)
+        c.cls(9)
+        src = np.array([[0, 1], [2, 0]], dtype=np.uint8)
+        c.blit(1, 1, src, 0)
+        assert c.pixels[1:3, 1:3].tolist() == [[9, 1], [2, 9]]
+        c.blit(3, 3, src)
+        assert c.pixels[3, 3] == 0
+
+
+# ---------------------------------------------------------------------------
+# Terrain
+# ---------------------------------------------------------------------------
+
+class TestTerrainRaster:
+    def _heights(self):
+        heights = np.zeros((4, 40, TILE_SIZE), dtype=np.uint8)
+        heights[3, :] = TILE_SIZE
+        heights[2, 5] = np.arange(TILE_SIZE)
+        return heights
+
+    def test_profile_raster(self):
+        raster = _raster_profile(np.full(TILE_SIZE, 4))
+        assert (raster[:12] == 0).all()
+        assert (raster[12] == 2).all()  # surface line over the highlight
+        assert (raster[13:] == 1).all()
+
+    def test_unique_profiles_and_chunk_layout(self):
+        terrain = TerrainRaster(self._heights())
+        assert terrain.profile_count == 2  # full, slope; empty cells are blank
+        chunk = terrain.chunk(0, 0)
+        assert chunk.shape == (SCREEN_HEIGHT, SCREEN_WIDTH)
+        full = _raster_profile(np.full(TILE_SIZE, TILE_SIZE))
+        assert (chunk[48:64, 32:48] == full).all()
+        slope = _raster_profile(np.arange(TILE_SIZE))
+        assert (chunk[32:48, 80:96] == slope).all()
+        assert terrain.chunk(0, 0) is chunk
+
+    def test_chunks_past_the_grid_are_blank(self):
+        terrain = TerrainRaster(self._heights())
+        tail = terrain.chunk(2, 0)  # tiles 32..47, grid ends at 40
+        assert tail[48:64, :128].any() and not tail[:, 128:].any()
+
+    def test_draw_matches_chunks(self):
+        terrain = TerrainRaster(self._heights(), chunk_width=64, chunk_height=32)
+        canvas = Canvas(100, 40)
+        canvas.camera(30, 20)
+        terrain.draw(canvas, 30, 20)
+        expected = np.vstack([
+            np.hstack([terrain.chunk(cx, cy) for cx in range(3)])
+            for cy in range(2)
+        ])[20:60, 30:130]
+        assert (canvas.pixels == expected).all()
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            TerrainRaster(self._heights(), chunk_width=100)
+
+
+# ---------------------------------------------------------------------------
+# Frames
+# ---------------------------------------------------------------------------
+
+class TestSimRasterizer:
+    def test_frame_shape_and_palette(self):
+        sim = create_sim("hillside")
+        raster = SimRasterizer("hillside")
+        p = sim.player.physics
+        frame = raster.render(sim, int(p.x) - 128, int(p.y) - 112)
+        assert frame.shape == (SCREEN_HEIGHT, SCREEN_WIDTH, 3)
+        assert frame.dtype == np.uint8
+        colors = {tuple(c) for c in frame.reshape(-1, 3)}
+        palette = palette_rgb("hillside")
+        assert tuple(palette[0]) in colors  # sky
+        assert tuple(palette[1]) in colors  # terrain fill
+        assert tuple(palette[4]) in colors  # player body
+        assert tuple(palette[11]) in colors  # HUD text
+
+    def test_render_is_deterministic_and_hud_optional(self):
+        sim = create_sim("pipeworks")
+        a = SimRasterizer("pipeworks").render(sim, 0, 0)
+        b = SimRasterizer("pipeworks").render(sim, 0, 0)
+        c = SimRasterizer("pipeworks", hud=False).render(sim, 0, 0)
+        assert (a == b).all()
+        assert (a[:12] != c[:12]).any() and (a[12:] == c[12:]).all()
+
+    def test_palettes_differ_per_stage(self):
+        assert (palette_rgb("hillside")[1] != palette_rgb("skybridge")[1]).any()
+        assert (palette_rgb("hillside") == palette_rgb("unknown")).all()
+
+
+# ---------------------------------------------------------------------------
+# Sprites
+# ---------------------------------------------------------------------------
+
+class TestSprites:
+    def test_renderer_sprites_draw_on_canvas(self):
+        c = Canvas(200, 120)
+        player = create_player(100.0, 80.0)
+        renderer.draw_player(player, 0, c)
+        renderer._draw_ring(40, 40, 0, c)
+        renderer._draw_enemy_crab(150, 80, 0, c)
+        px = c.pixels
+        assert px[70, 101] == px[70, 102] == 11  # eyes, facing right
+        assert px[71, 100] == 4  # head
+        assert px[40, 37] == 7  # ring outline
+        assert px[80, 150] == 6  # crab body
+        assert px[76, 147] == 11  # crab eye
+        assert (px[:, :30] == 0).all()
+
+
+def test_no_pyxel_import_raster():
+    import speednik.palette
+    import speednik.raster
+
+    for mod in (speednik.raster, speednik.palette):
+        source = Path(inspect.getfile(mod)).read_text()
+        assert "import pyxel" not in source
+        assert "from pyxel" not in source
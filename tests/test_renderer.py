@@ -153,6 +153,64 @@ class TestTerrainCulling:
         assert mock_pyxel.line.called
 
 
+# ---------------------------------------------------------------------------
+# Chunked terrain
+# ---------------------------------------------------------------------------
+
+class TestTerrainRenderer:
+    def _make_tiles(self):
+        """A flat floor spanning three screens, plus one slope tile."""
+        tiles = {
+            (tx, 10): Tile(height_array=[TILE_SIZE] * TILE_SIZE, angle=0, solidity=FULL)
+            for tx in range(48)
+        }
+        tiles[(3, 9)] = Tile(height_array=list(range(TILE_SIZE)), angle=0, solidity=FULL)
+        tiles[(4, 9)] = Tile(height_array=[0] * TILE_SIZE, angle=0, solidity=FULL)
+        return tiles
+
+    @patch("speednik.renderer.pyxel")
+    def test_unique_profiles_rasterized_once(self, mock_pyxel):
+        from speednik.renderer import TerrainRenderer
+        terrain = TerrainRenderer(self._make_tiles())
+        assert terrain.profile_count == 2
+        assert terrain.chunk_count == 3
+        assert not mock_pyxel.line.called
+
+    @patch("speednik.renderer.pyxel")
+    def test_draw_blits_only_visible_chunks(self, mock_pyxel):
+        from speednik.renderer import TerrainRenderer
+        terrain = TerrainRenderer(self._make_tiles())
+        terrain.draw(0, 0)
+        assert mock_pyxel.blt.call_count == 1
+        mock_pyxel.blt.reset_mock()
+        terrain.draw(300, 0)
+        assert [c.args[:2] for c in mock_pyxel.blt.call_args_list] == [(256, 0), (512, 0)]
+        mock_pyxel.blt.reset_mock()
+        terrain.draw(0, 400)
+        assert not mock_pyxel.blt.called
+
+    @patch("speednik.renderer.pyxel")
+    def test_chunk_images_built_once(self, mock_pyxel):
+        from speednik.renderer import TerrainRenderer
+        terrain = TerrainRenderer(self._make_tiles())
+        created = mock_pyxel.Image.call_count
+        terrain.draw(0, 0)
+        terrain.draw(0, 8)
+        assert mock_pyxel.Image.call_count == created + 1
+
+    @patch("speednik.renderer.pyxel")
+    def test_terrain_renderer_shared_per_tiles_dict(self, mock_pyxel):
+        from speednik.renderer import terrain_renderer
+        tiles = self._make_tiles()
+        assert terrain_renderer(tiles) is terrain_renderer(tiles)
+        assert terrain_renderer(self._make_tiles()) is not terrain_renderer(tiles)
+
+    def test_invalid_chunk_size(self):
+        from speednik.renderer import TerrainRenderer
+        with pytest.raises(ValueError):
+            TerrainRenderer({}, chunk_width=100)
+
+
 # ---------------------------------------------------------------------------
 # Particles
 # ---------------------------------------------------------------------------
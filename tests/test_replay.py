@@ -0,0 +1,77 @@
+"""Tests for speednik/scenarios/replay.py — compact replays and replayer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from speednik.agents.actions import ACTION_JUMP, ACTION_NOOP, ACTION_RIGHT, ACTION_RIGHT_JUMP
+from speednik.scenarios import load_scenario, run_scenario
+from speednik.scenarios.conditions import StartOverride
+from speednik.scenarios.replay import (
+    REPLAY_MAGIC,
+    Replay,
+    encode_runs,
+    replay_metrics,
+    replay_trajectory,
+    run_replay,
+)
+
+SCENARIOS_DIR = Path(__file__).resolve().parent.parent / "scenarios"
+
+
+def test_encode_runs():
+    assert encode_runs([2, 2, 2, 0, 5, 5]) == [(2, 3), (0, 1), (5, 2)]
+    assert encode_runs([]) == []
+    with pytest.raises(ValueError):
+        encode_runs([2, 8])
+
+
+def test_bytes_round_trip():
+    actions = [ACTION_RIGHT] * 300 + [ACTION_RIGHT_JUMP] * 5 + [ACTION_NOOP]
+    replay = Replay.from_actions(
+        "pipeworks", actions,
+        start_override=StartOverride(x=100.5, y=200.0),
+        max_frames=600,
+        metadata={"name": "demo"},
+    )
+    data = replay.to_bytes()
+    assert data.startswith(REPLAY_MAGIC)
+    loaded = Replay.from_bytes(data)
+    assert loaded == replay
+    assert loaded.actions() == bytes(actions)
+    assert loaded.frames == len(actions)
+
+
+def test_from_bytes_rejects_corrupt_data():
+    data = Replay.from_actions("hillside", [ACTION_RIGHT] * 200).to_bytes()
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:-1])  # run length cut mid-varint
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:-2] + bytes((9, 1)))
+
+
+@pytest.mark.parametrize("name", ["gap_jump.yaml", "hillside_loop.yaml"])
+def test_replay_reconstructs_scenario(name, tmp_path):
+    scenario = load_scenario(SCENARIOS_DIR / name)
+    outcome = run_scenario(scenario)
+    replay = Replay.from_outcome(scenario, outcome)
+    path = tmp_path / "run.spkr"
+    replay.save(path)
+    assert path.stat().st_size < 1024
+
+    trajectory, sim = replay_trajectory(Replay.load(path))
+    assert trajectory == outcome.trajectory
+    assert replay_metrics(replay, scenario.metrics) == outcome.metrics
+
+
+def test_run_replay_matches_frame_by_frame_replay():
+    actions = ([ACTION_RIGHT] * 60 + [ACTION_JUMP] * 20 + [ACTION_RIGHT_JUMP] * 40) * 3
+    replay = Replay.from_actions("hillside", actions)
+    fast = run_replay(replay)
+    _, slow = replay_trajectory(replay)
+    assert fast.player.physics == slow.player.physics
+    assert fast.frame == slow.frame == len(actions)
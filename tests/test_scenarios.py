@@ -6,12 +6,14 @@ import textwrap
 from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
 import pytest
 import yaml
 
 from speednik.scenarios import (
     VALID_FAILURE_TYPES,
     VALID_SUCCESS_TYPES,
+    ConditionPlan,
     FailureCondition,
     FrameRecord,
     ScenarioDef,
@@ -22,7 +24,9 @@ from speednik.scenarios import (
     load_scenario,
     load_scenarios,
     run_scenario,
+    run_scenarios_lockstep,
 )
+from speednik.scenarios.conditions import SlidingRange
 
 SCENARIOS_DIR = Path("scenarios")
 
@@ -511,6 +515,86 @@ class TestCheckConditions:
         assert reason == "goal_reached"
 
 
+# ---------------------------------------------------------------------------
+# Incremental condition evaluation
+# ---------------------------------------------------------------------------
+
+
+class TestConditionEvaluator:
+    def test_sliding_range(self):
+        rng = SlidingRange(3)
+        for v in (5.0, 1.0, 3.0):
+            rng.push(v)
+        assert (rng.min, rng.max, rng.full) == (1.0, 5.0, True)
+        rng.push(4.0)  # 5.0 leaves the window
+        assert (rng.min, rng.max) == (1.0, 4.0)
+        rng.push(2.0)  # 1.0 leaves the window
+        assert rng.spread() == 2.0
+        with pytest.raises(ValueError):
+            SlidingRange(0)
+
+    def test_matches_check_conditions(self):
+        import random
+
+        rnd = random.Random(7)
+        xs = [100.0]
+        for _ in range(400):
+            step = rnd.choice([0.0, 0.0, 0.3, -0.4, 3.0])
+            xs.append(xs[-1] + step)
+        success = SuccessCondition(type="position_x_gte", value=10_000.0)
+        failure = FailureCondition(
+            type="any",
+            conditions=[
+                FailureCondition(type="player_dead"),
+                FailureCondition(type="any", conditions=[
+                    FailureCondition(type="stuck", tolerance=1.0, window=8),
+                ]),
+                FailureCondition(type="stuck", tolerance=2.0, window=20),
+            ],
+        )
+        sim = _make_sim()
+        evaluator = ConditionPlan(success, failure).evaluator()
+        trajectory = []
+        for frame, x in enumerate(xs):
+            sim.player.physics.x = x
+            trajectory.append(_FakeRecord(x=x))
+            expected = check_conditions(success, failure, sim, trajectory, frame, 600)
+            assert evaluator.check(sim, frame, 600) == expected
+
+    def test_reset_clears_window(self):
+        sim = _make_sim()
+        evaluator = ConditionPlan(
+            SuccessCondition(type="goal_reached"),
+            FailureCondition(type="stuck", tolerance=2.0, window=5),
+        ).evaluator()
+        results = [evaluator.check(sim, f, 600) for f in range(5)]
+        assert results[-1] == (False, "stuck")
+        evaluator.reset()
+        assert evaluator.check(sim, 0, 600) == (None, None)
+
+    def test_loader_compiles_once(self, tmp_path):
+        p = _write_yaml(tmp_path, "s", _minimal_scenario())
+        s = load_scenario(p)
+        plan = s.condition_plan()
+        assert s.condition_plan() is plan
+        assert plan.evaluator() is not plan.evaluator()
+        s.failure = FailureCondition(type="player_dead")
+        assert s.condition_plan() is not plan
+
+    def test_evaluators_of_one_plan_are_independent(self):
+        sim = _make_sim()
+        plan = ConditionPlan(
+            SuccessCondition(type="goal_reached"),
+            FailureCondition(type="stuck", tolerance=2.0, window=5),
+        )
+        first = plan.evaluator()
+        for f in range(4):
+            first.check(sim, f, 600)
+        second = plan.evaluator()
+        assert second.check(sim, 0, 600) == (None, None)
+        assert first.check(sim, 4, 600) == (False, "stuck")
+
+
 # ---------------------------------------------------------------------------
 # FrameRecord / ScenarioOutcome dataclass sanity
 # ---------------------------------------------------------------------------
@@ -747,6 +831,88 @@ class TestComputeMetrics:
         assert list(result.keys()) == ["max_x"]
 
 
+# ---------------------------------------------------------------------------
+# Trajectory: columnar storage
+# ---------------------------------------------------------------------------
+
+
+class TestTrajectory:
+    def _records(self, n):
+        return [
+            FrameRecord(
+                frame=i, x=100.0 + i * 0.25, y=400.0, x_vel=0.25 * (i % 4),
+                y_vel=-1.0, ground_speed=0.5, angle=i % 256,
+                on_ground=i % 2 == 0, state="running" if i % 5 else "jumping",
+                action=i % 8, reward=0.01 * i, rings=i // 10,
+                events=["RingCollectedEvent"] if i % 7 == 0 else [],
+            )
+            for i in range(n)
+        ]
+
+    def test_round_trip_across_chunks(self):
+        from speednik.scenarios.trajectory import Trajectory
+
+        records = self._records(50)
+        traj = Trajectory(capacity=16)
+        for r in records:
+            traj.append_record(r)
+        assert len(traj) == 50
+        assert list(traj) == records
+        assert traj[-1] == records[-1]
+        assert traj[10:13] == records[10:13]
+        assert traj.column("x").tolist() == [r.x for r in records]
+        assert traj.column("state")[5] == "jumping"
+        assert traj.tail("x", 20).tolist() == [r.x for r in records[-20:]]
+
+    def test_event_table(self):
+        from speednik.scenarios.trajectory import Trajectory
+
+        traj = Trajectory.from_records(self._records(15))
+        rows, names = traj.event_table()
+        assert rows.tolist() == [0, 7, 14]
+        assert names == ["RingCollectedEvent"] * 3
+
+    def test_to_records_matches_asdict(self):
+        from dataclasses import asdict
+
+        from speednik.scenarios.trajectory import Trajectory
+
+        records = self._records(20)
+        assert Trajectory.from_records(records).to_records() == [asdict(r) for r in records]
+
+    def test_pickle_keeps_used_rows_only(self):
+        import pickle
+
+        from speednik.scenarios.trajectory import Trajectory
+
+        traj = Trajectory(capacity=10_000)
+        for r in self._records(5):
+            traj.append_record(r)
+        clone = pickle.loads(pickle.dumps(traj))
+        assert clone == traj
+        assert len(pickle.dumps(traj)) < 10_000
+        clone.append_record(self._records(6)[-1])
+        assert len(clone) == 6
+
+    def test_metrics_match_list_input(self):
+        from speednik.scenarios.runner import compute_metrics
+        from speednik.scenarios.trajectory import Trajectory
+
+        records = self._records(200)
+        names = ["max_x", "average_speed", "peak_speed", "time_on_ground",
+                 "stuck_at", "velocity_profile", "total_reward"]
+        sim = _make_sim()
+        from_list = compute_metrics(names, records, sim, success=True)
+        from_traj = compute_metrics(names, Trajectory.from_records(records), sim, success=True)
+        assert from_traj == pytest.approx(from_list)
+
+    def test_unknown_column(self):
+        from speednik.scenarios.trajectory import Trajectory
+
+        with pytest.raises(ValueError):
+            Trajectory().column("nope")
+
+
 # ---------------------------------------------------------------------------
 # run_scenario: integration tests
 # ---------------------------------------------------------------------------
@@ -905,6 +1071,52 @@ class TestHillsideComplete:
         assert outcome.wall_time_ms > 0
 
 
+class TestLockstep:
+    def _policy_defs(self, tmp_path):
+        from dataclasses import replace
+
+        from speednik.agents.numpy_policy import save_policy_weights
+
+        rng = np.random.default_rng(0)
+        sizes = [26, 64, 64, 8]
+        layers = [(rng.standard_normal((a, b)), rng.standard_normal(b))
+                  for a, b in zip(sizes, sizes[1:])]
+        save_policy_weights(tmp_path / "actor.npz", layers)
+        base = load_scenario(SCENARIOS_DIR / "hillside_hold_right.yaml")
+        return [
+            replace(base, name=f"policy_{stage}", stage=stage, max_frames=150,
+                    agent="ppo_numpy",
+                    agent_params={"weights_path": str(tmp_path / "actor.npz")})
+            for stage in ("hillside", "pipeworks", "skybridge")
+        ]
+
+    def test_matches_run_scenario(self, tmp_path):
+        gap_jump = load_scenario(SCENARIOS_DIR / "gap_jump.yaml")
+        defs = self._policy_defs(tmp_path) + [gap_jump, gap_jump]  # same def twice
+        lockstep = run_scenarios_lockstep(defs)
+        for outcome, scenario_def in zip(lockstep, defs):
+            expected = run_scenario(scenario_def)
+            assert outcome.name == expected.name
+            assert (outcome.success, outcome.reason) == (expected.success, expected.reason)
+            assert outcome.metrics == expected.metrics
+            assert outcome.trajectory == expected.trajectory
+
+    def test_one_batch_call_per_frame(self, tmp_path, monkeypatch):
+        from speednik.agents.numpy_policy import NumpyPolicyAgent
+
+        calls = []
+        act_batch = NumpyPolicyAgent.act_batch
+
+        def spy(self, obs):
+            calls.append(len(obs))
+            return act_batch(self, obs)
+
+        monkeypatch.setattr(NumpyPolicyAgent, "act_batch", spy)
+        outcomes = run_scenarios_lockstep(self._policy_defs(tmp_path))
+        assert len(calls) == max(o.frames_elapsed for o in outcomes)
+        assert calls[0] == 3
+
+
 # ---------------------------------------------------------------------------
 # CLI: output.py — print_outcome, save_results, compare_results
 # ---------------------------------------------------------------------------
@@ -1069,6 +1281,88 @@ class TestSaveResults:
         assert data[0]["metrics"]["stuck_at"] is None
 
 
+class TestResultStream:
+    def _trajectory(self, n: int = 3):
+        from speednik.scenarios import Trajectory
+
+        traj = Trajectory(capacity=2)
+        for i in range(n):
+            traj.append(
+                i, 100.0 + i, 400.0, 1.0, 0.0, 1.0, 0, True, "running",
+                2, 0.01, i, ["RingCollectedEvent"] if i == 1 else (),
+            )
+        return traj
+
+    def test_ndjson_one_line_per_outcome(self, tmp_path):
+        import json
+
+        from speednik.scenarios.output import save_results
+
+        out_path = tmp_path / "results.ndjson"
+        save_results([_make_outcome(name="sc1"), _make_outcome(name="sc2")], out_path)
+        lines = out_path.read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["sc1", "sc2"]
+
+    def test_npz_sidecar_roundtrip(self, tmp_path):
+        from speednik.scenarios.output import (
+            ResultStream,
+            iter_results,
+            load_result_trajectory,
+        )
+
+        out_path = tmp_path / "run.jsonl"
+        outcome = _make_outcome(name="a/b")
+        outcome.trajectory = self._trajectory()
+        with ResultStream(out_path, include_trajectory=True, sidecar=True) as stream:
+            stream.write(outcome)
+            stream.write(_make_outcome(name="a/b"))
+        entries = list(iter_results(out_path))
+        assert entries[0]["trajectory_file"] == "run.trajectories/a_b.npz"
+        assert entries[1]["trajectory_file"] == "run.trajectories/a_b_2.npz"
+        assert "trajectory" not in entries[0]
+        loaded = load_result_trajectory(entries[0], out_path)
+        assert loaded == outcome.trajectory
+        assert loaded[1].events == ["RingCollectedEvent"]
+
+    def test_iter_results_drops_inline_trajectories(self, tmp_path):
+        from speednik.scenarios.output import iter_results, save_results
+
+        outcome = _make_outcome()
+        outcome.trajectory = self._trajectory()
+        for name in ("results.json", "results.ndjson"):
+            save_results([outcome], tmp_path / name, include_trajectory=True)
+            entries = list(iter_results(tmp_path / name))
+            assert entries[0]["name"] == "test_scenario"
+            assert "trajectory" not in entries[0]
+
+    def test_iter_results_streams_json_array(self, tmp_path, monkeypatch):
+        import json
+
+        from speednik.scenarios import output
+
+        outcomes = [_make_outcome(name=name) for name in ('a "[x]"', "b\\{", "c")]
+        for outcome in outcomes:
+            outcome.trajectory = self._trajectory()
+        out_path = tmp_path / "results.json"
+        output.save_results(outcomes, out_path, include_trajectory=True)
+        expected = json.loads(out_path.read_text())
+        for entry in expected:
+            del entry["trajectory"]
+        # Tiny chunks put every token across a chunk boundary somewhere.
+        monkeypatch.setattr(output, "_CHUNK_SIZE", 3)
+        assert list(output.iter_results(out_path)) == expected
+
+        out_path.write_text('[{"name": "a", "trajectory": [1, 2')
+        with pytest.raises(json.JSONDecodeError):
+            list(output.iter_results(out_path))
+
+    def test_npz_empty_trajectory(self, tmp_path):
+        from speednik.scenarios import Trajectory
+
+        Trajectory().save_npz(tmp_path / "t.npz")
+        assert len(Trajectory.load_npz(tmp_path / "t.npz")) == 0
+
+
 class TestMetricDirection:
     def test_all_dispatch_metrics_have_direction(self):
         from speednik.scenarios.compare import METRIC_DIRECTION
@@ -1171,6 +1465,16 @@ class TestCompareResults:
         assert "+" in captured
         assert exit_code == 0  # improvements, no regressions
 
+    def test_compare_ndjson_baseline(self, tmp_path, capsys):
+        from speednik.scenarios.compare import compare_results
+        from speednik.scenarios.output import save_results
+
+        baseline_path = tmp_path / "baseline.ndjson"
+        save_results([_make_outcome(name="sc1", metrics={"max_x": 1000.0})], baseline_path)
+        current = [_make_outcome(name="sc1", success=False, metrics={"max_x": 900.0})]
+        assert compare_results(current, baseline_path) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
     def test_compare_new_scenario(self, tmp_path, capsys):
         from speednik.scenarios.compare import compare_results
 
@@ -1510,6 +1814,65 @@ class TestCliMain:
         assert "trajectory" in data[0]
         assert len(data[0]["trajectory"]) > 0
 
+    def test_cli_jobs_matches_serial(self, tmp_path, capsys):
+        import json
+
+        from speednik.scenarios.cli import main
+
+        paths = ["scenarios/hillside_hold_right.yaml", "scenarios/gap_jump.yaml"]
+        results = {}
+        for jobs in ("1", "2"):
+            out_path = tmp_path / f"jobs{jobs}.json"
+            with pytest.raises(SystemExit):
+                main(paths + ["--jobs", jobs, "-o", str(out_path)])
+            data = json.loads(out_path.read_text())
+            for entry in data:
+                entry.pop("wall_time_ms")
+            results[jobs] = data
+        assert [d["name"] for d in results["2"]] == ["hillside_hold_right", "gap_jump"]
+        assert results["2"] == results["1"]
+        assert capsys.readouterr().out.count("gap_jump") >= 2
+
+    def test_cli_stream_output_with_sidecars(self, tmp_path):
+        from speednik.scenarios.cli import main
+        from speednik.scenarios.output import iter_results, load_result_trajectory
+
+        out_path = tmp_path / "run.ndjson"
+        with pytest.raises(SystemExit):
+            main(["scenarios/gap_jump.yaml", "-o", str(out_path), "--trajectory-npz"])
+        (entry,) = iter_results(out_path)
+        trajectory = load_result_trajectory(entry, out_path)
+        assert len(trajectory) == entry["frames_elapsed"]
+
+    def test_cli_trajectory_npz_needs_stream_output(self, tmp_path):
+        from speednik.scenarios.cli import main
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(["scenarios/gap_jump.yaml", "-o", str(tmp_path / "r.json"),
+                  "--trajectory-npz"])
+        assert exc_info.value.code == 2
+
+    def test_cli_lockstep(self, tmp_path):
+        import json
+
+        from speednik.scenarios.cli import main
+
+        out_path = tmp_path / "lockstep.json"
+        with pytest.raises(SystemExit):
+            main(["scenarios/gap_jump.yaml", "--lockstep", "-o", str(out_path)])
+        (entry,) = json.loads(out_path.read_text())
+        assert entry["name"] == "gap_jump"
+        with pytest.raises(SystemExit) as exc_info:
+            main(["scenarios/gap_jump.yaml", "--lockstep", "--jobs", "2"])
+        assert exc_info.value.code == 2
+
+    def test_cli_jobs_must_be_positive(self):
+        from speednik.scenarios.cli import main
+
+        with pytest.raises(SystemExit) as exc_info:
+            main(["scenarios/gap_jump.yaml", "--jobs", "0"])
+        assert exc_info.value.code == 2
+
 
 # ---------------------------------------------------------------------------
 # CLI: No Pyxel imports in new modules
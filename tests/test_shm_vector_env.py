@@ -0,0 +1,51 @@
+"""Tests for speednik/shm_vector_env.py — shared-memory multiprocess vector env."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from speednik.shm_vector_env import SharedMemoryVectorEnv
+from speednik.vector_env import INFO_KEYS, SpeednikVectorEnv
+
+
+@pytest.fixture
+def shm_env():
+    envs = SharedMemoryVectorEnv(num_envs=5, num_workers=2, max_steps=40)
+    yield envs
+    envs.close()
+
+
+def test_matches_in_process_vector_env(shm_env):
+    ref = SpeednikVectorEnv(num_envs=5, max_steps=40)
+    obs, info = shm_env.reset(seed=0)
+    ref_obs, ref_info = ref.reset(seed=0)
+    np.testing.assert_array_equal(obs, ref_obs)
+    rng = np.random.default_rng(0)
+    # Long enough to cross max_steps and exercise NEXT_STEP autoreset.
+    for _ in range(100):
+        actions = rng.integers(0, 8, size=5)
+        got = shm_env.step(actions)
+        want = ref.step(actions)
+        for a, b in zip(got[:4], want[:4]):
+            np.testing.assert_array_equal(a, b)
+        for key in INFO_KEYS:
+            np.testing.assert_array_equal(got[4][key], want[4][key])
+
+
+def test_partial_reset(shm_env):
+    shm_env.reset()
+    for _ in range(10):
+        shm_env.step(np.full(5, 2))
+    _, info = shm_env.reset(options={"reset_mask": np.array([1, 0, 0, 1, 0], dtype=bool)})
+    assert info["frame"].tolist() == [0, 10, 10, 0, 10]
+
+
+def test_workers_capped_by_num_envs():
+    envs = SharedMemoryVectorEnv(num_envs=2, num_workers=8)
+    try:
+        assert envs.num_workers == 2
+    finally:
+        envs.close()
+    assert envs.closed
+    assert all(not p.is_alive() for p in envs._processes)
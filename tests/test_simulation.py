@@ -1,10 +1,13 @@
-"""Tests for speednik/simulation.py — SimState, create_sim, event types."""
+"""Tests for speednik/simulation.py — SimState, create_sim, event types, snapshots."""
 
 from __future__ import annotations
 
+import copy
 import inspect
 from pathlib import Path
 
+import pytest
+
 from speednik.simulation import (
     CheckpointEvent,
     DamageEvent,
@@ -13,8 +16,15 @@ from speednik.simulation import (
     RingCollectedEvent,
     SimState,
     SpringEvent,
+    clear_stage_cache,
     create_sim,
+    get_stage_template,
+    sim_restore,
+    sim_snapshot,
+    sim_step,
 )
+from speednik.objects import Ring
+from speednik.physics import InputState
 
 
 # ---------------------------------------------------------------------------
@@ -165,3 +175,125 @@ def test_sim_state_defaults():
     assert sim.deaths == 0
     assert sim.goal_reached is False
     assert sim.player_dead is False
+
+
+# ---------------------------------------------------------------------------
+# Stage cache
+# ---------------------------------------------------------------------------
+
+def test_stage_template_cached():
+    assert get_stage_template("hillside") is get_stage_template("hillside")
+
+
+def test_create_sim_shares_terrain():
+    a = create_sim("hillside")
+    b = create_sim("hillside")
+    assert a.tile_lookup is b.tile_lookup
+
+
+def test_create_sim_entities_independent():
+    """Mutating one sim's entities must not leak into later sims."""
+    a = create_sim("skybridge")
+    a.rings[0].collected = True
+    a.enemies[0].alive = False
+    a.checkpoints[0].activated = True
+    a.rings.clear()
+
+    b = create_sim("skybridge")
+    assert len(b.rings) == len(get_stage_template("skybridge").rings)
+    assert b.rings[0].collected is False
+    assert b.enemies[0].alive is True
+    assert b.checkpoints[0].activated is False
+
+
+def test_create_sim_after_play_matches_fresh():
+    sim = create_sim("hillside")
+    inp = InputState(right=True)
+    for _ in range(300):
+        sim_step(sim, inp)
+
+    cached = create_sim("hillside")
+    clear_stage_cache()
+    fresh = create_sim("hillside")
+    assert cached.rings == fresh.rings
+    assert cached.enemies == fresh.enemies
+    assert cached.springs == fresh.springs
+    assert cached.liquid_zones == fresh.liquid_zones
+    assert cached.player.physics == fresh.player.physics
+
+
+# ---------------------------------------------------------------------------
+# Snapshot / restore
+# ---------------------------------------------------------------------------
+
+def _run(sim, frames, inp=InputState(right=True)):
+    return [[type(e) for e in sim_step(sim, inp)] for _ in range(frames)]
+
+
+def _state(sim):
+    return (
+        sim.frame, sim.max_x_reached, sim.rings_collected, sim.deaths,
+        sim.goal_reached, sim.player_dead, copy.deepcopy(sim.player),
+        copy.deepcopy(sim.rings), copy.deepcopy(sim.springs),
+        copy.deepcopy(sim.checkpoints), copy.deepcopy(sim.liquid_zones),
+        copy.deepcopy(sim.enemies),
+    )
+
+
+def test_restore_replays_identically():
+    sim = create_sim("skybridge")
+    _run(sim, 120)
+    snap = sim_snapshot(sim)
+    before = _state(sim)
+    first = _run(sim, 400)
+    after = _state(sim)
+    assert sim.rings_collected > before[2], "branch should collect rings"
+    assert not all(e.alive for e in sim.enemies), "branch should destroy enemies"
+
+    sim_restore(sim, snap)
+    assert _state(sim) == before
+    assert _run(sim, 400) == first
+    assert _state(sim) == after
+
+
+def test_restore_into_another_sim():
+    a = create_sim("skybridge")
+    _run(a, 200)
+    snap = sim_snapshot(a)
+    b = create_sim("skybridge")
+    sim_restore(b, snap)
+    assert _state(b) == _state(a)
+    assert b.tile_lookup is a.tile_lookup
+
+
+def test_restore_revives_indexed_entities():
+    sim = create_sim("hillside")
+    snap = sim_snapshot(sim)
+    ring = sim.rings[0]
+    sim.entity_index.rings(sim.rings).remove(ring)
+    ring.collected = True
+    enemy = sim.enemies[0]
+    sim.entity_index.enemies(sim.enemies).remove(enemy)
+    enemy.alive = False
+
+    sim_restore(sim, snap)
+    assert not ring.collected and enemy.alive
+    assert ring in sim.entity_index.rings(sim.rings).query(ring.x, ring.x)
+    assert enemy in sim.entity_index.enemies(sim.enemies).query(enemy.x, enemy.x)
+
+
+def test_restore_after_appending_entity():
+    sim = create_sim("hillside")
+    extra = Ring(x=0.0, y=0.0)
+    sim.rings.append(extra)
+    snap = sim_snapshot(sim)
+    extra.collected = True
+    sim_restore(sim, snap)
+    assert not extra.collected
+    assert len(snap.rings) == len(sim.rings)
+
+
+def test_restore_rejects_mismatched_sim():
+    snap = sim_snapshot(create_sim("hillside"))
+    with pytest.raises(ValueError):
+        sim_restore(create_sim("pipeworks"), snap)
@@ -0,0 +1,152 @@
+"""Tests for speednik/spatial.py — broad-phase entity index."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from speednik.agents.actions import ACTION_RIGHT, action_to_input
+from speednik.enemies import Enemy, check_enemy_collision, enemy_x_extent, load_enemies
+from speednik.objects import Ring, check_ring_collection
+from speednik.player import create_player
+from speednik.simulation import create_sim, sim_step
+from speednik.spatial import INDEX_CELL_SIZE, EntityIndex, SpatialIndex
+
+
+def _point_index(xs: list[float]) -> tuple[list[Ring], SpatialIndex[Ring]]:
+    rings = [Ring(x=x, y=0.0) for x in xs]
+    return rings, SpatialIndex(rings, lambda r: (r.x, r.x))
+
+
+# ---------------------------------------------------------------------------
+# SpatialIndex
+# ---------------------------------------------------------------------------
+
+class TestSpatialIndex:
+    def test_query_single_cell(self):
+        rings, index = _point_index([10.0, 500.0, 20.0])
+        assert index.query(0, 30) == [rings[0], rings[2]]
+        assert index.query(1000, 1000) == []
+
+    def test_query_spanning_cells_keeps_list_order(self):
+        rings, index = _point_index([200.0, 10.0, 130.0, 70.0])
+        assert index.query(0, 250) == rings
+
+    def test_wide_extent_listed_once(self):
+        items = [Ring(x=100.0, y=0.0)]
+        index = SpatialIndex(items, lambda r: (r.x - 200, r.x + 200))
+        assert index.query(-100, 300) == items
+
+    def test_negative_coordinates(self):
+        rings, index = _point_index([-5.0, 5.0])
+        assert index.query(-10, -1) == [rings[0]]
+
+    def test_remove(self):
+        rings, index = _point_index([10.0, 20.0, 30.0])
+        index.remove(rings[1])
+        index.remove(rings[1])  # second removal is a no-op
+        assert index.query(0, INDEX_CELL_SIZE - 1) == [rings[0], rings[2]]
+        assert len(index) == 2
+
+    def test_set_removed(self):
+        rings, index = _point_index([10.0, 20.0, 30.0])
+        index.remove(rings[0])
+        index.set_removed(frozenset({1, 2}))
+        assert index.removed == frozenset({1, 2})
+        assert index.query(0, INDEX_CELL_SIZE - 1) == [rings[0]]
+        index.set_removed(frozenset())
+        assert index.query(0, INDEX_CELL_SIZE - 1) == rings
+        with pytest.raises(ValueError):
+            index.set_removed(frozenset({3}))
+
+    def test_indexes_detects_replaced_or_resized_list(self):
+        rings, index = _point_index([10.0])
+        assert index.indexes(rings)
+        assert not index.indexes(list(rings))
+        rings.append(Ring(x=20.0, y=0.0))
+        assert not index.indexes(rings)
+
+    def test_rebind(self):
+        rings, index = _point_index([10.0, 300.0])
+        index.remove(rings[0])
+        copies = [copy.copy(r) for r in rings]
+        clone = index.rebind(copies)
+        assert clone.query(0, 400) == [copies[1]]
+        clone.remove(copies[1])
+        assert index.query(0, 400) == [rings[1]]
+        with pytest.raises(ValueError):
+            index.rebind(copies[:1])
+
+    def test_deepcopy_keeps_removal_working(self):
+        rings, index = _point_index([10.0, 20.0])
+        index.remove(rings[0])  # builds the id() position map
+        rings2, index2 = copy.deepcopy((rings, index))
+        index2.remove(rings2[1])
+        assert index2.query(0, 30) == []
+        assert index.query(0, 30) == [rings[1]]
+
+    def test_invalid_cell_size(self):
+        with pytest.raises(ValueError):
+            SpatialIndex([], lambda r: (0, 0), cell_size=0)
+
+
+# ---------------------------------------------------------------------------
+# Collision checks with an index
+# ---------------------------------------------------------------------------
+
+def test_ring_collection_drops_collected_rings():
+    player = create_player(100.0, 100.0)
+    rings = [Ring(x=100.0, y=100.0), Ring(x=600.0, y=100.0)]
+    index = SpatialIndex(rings, lambda r: (r.x - 16, r.x + 16))
+    check_ring_collection(player, rings, index)
+    assert rings[0].collected
+    assert len(index) == 1
+
+
+def test_crab_extent_covers_patrol():
+    crab = load_enemies([{"type": "enemy_crab", "x": 300, "y": 0}])[0]
+    lo, hi = enemy_x_extent(crab)
+    assert lo < 300 - 32 and hi > 300 + 32
+
+
+def test_enemy_collision_drops_destroyed_enemy():
+    player = create_player(100.0, 100.0)
+    player.physics.is_rolling = True
+    player.physics.ground_speed = 12.0
+    enemies = [Enemy(x=100.0, y=100.0, enemy_type="enemy_buzzer")]
+    index = SpatialIndex(enemies, enemy_x_extent)
+    check_enemy_collision(player, enemies, index)
+    assert not enemies[0].alive
+    assert len(index) == 0
+
+
+# ---------------------------------------------------------------------------
+# Simulation wiring
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("stage", ["hillside", "pipeworks", "skybridge"])
+def test_sim_matches_full_scan(stage):
+    indexed = create_sim(stage)
+    scanned = create_sim(stage)
+    scanned.entity_index = None
+    prev_a = prev_b = False
+    for frame in range(600):
+        action = ACTION_RIGHT if frame % 90 < 70 else 0
+        inp_a, prev_a = action_to_input(action, prev_a)
+        inp_b, prev_b = action_to_input(action, prev_b)
+        ev_a = sim_step(indexed, inp_a)
+        ev_b = sim_step(scanned, inp_b)
+        assert [type(e) for e in ev_a] == [type(e) for e in ev_b]
+        pa, pb = indexed.player.physics, scanned.player.physics
+        assert (pa.x, pa.y, pa.x_vel, pa.y_vel) == (pb.x, pb.y, pb.x_vel, pb.y_vel)
+    assert indexed.rings_collected == scanned.rings_collected
+
+
+def test_sim_index_rebuilt_after_append():
+    sim = create_sim("hillside")
+    px, py = sim.player.physics.x, sim.player.physics.y
+    sim.rings.append(Ring(x=px, y=py))
+    sim_step(sim, action_to_input(0, False)[0])
+    assert sim.rings[-1].collected
+    assert isinstance(sim.entity_index, EntityIndex)
@@ -0,0 +1,143 @@
+"""Tests for scenario sweeps — sweep schema, prefix cache and sweep runner."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from speednik.scenarios import load_scenario, load_scenarios, load_sweep, run_scenario
+from speednik.scenarios.sweep import PrefixCache, main, run_sweep
+
+SWEEPS_DIR = Path(__file__).resolve().parent.parent / "scenarios" / "sweeps"
+
+
+def _write_sweep(tmp_path: Path, sweep: dict, **overrides) -> Path:
+    data = {
+        "name": "sw",
+        "stage": "hillside",
+        "agent": "spindash",
+        "agent_params": {"charge_frames": 3, "redash_speed": 0.15},
+        "max_frames": 240,
+        "success": {"type": "goal_reached"},
+        "failure": {"type": "player_dead"},
+        "metrics": ["max_x", "velocity_profile"],
+        "sweep": sweep,
+    }
+    data.update(overrides)
+    p = tmp_path / "sw.yaml"
+    p.write_text(yaml.dump(data, sort_keys=False))
+    return p
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+def test_expand_product_in_file_order(tmp_path):
+    sweep = load_sweep(_write_sweep(tmp_path, {
+        "stage": ["hillside", "pipeworks"],
+        "agent_params.charge_frames": [2, 4],
+    }))
+    defs = sweep.expand()
+    assert [(d.stage, d.agent_params["charge_frames"]) for d in defs] == [
+        ("hillside", 2), ("hillside", 4), ("pipeworks", 2), ("pipeworks", 4),
+    ]
+    assert defs[1].name == "sw[stage=hillside,charge_frames=4]"
+    assert defs[1].agent_params["redash_speed"] == 0.15
+    assert sweep.base.agent_params["charge_frames"] == 3
+
+
+def test_inclusive_range_and_start_override(tmp_path):
+    sweep = load_sweep(_write_sweep(
+        tmp_path,
+        {"start_override.x": {"start": 100, "stop": 400, "step": 100}},
+        start_override={"x": 50, "y": 300},
+    ))
+    starts = [(d.start_override.x, d.start_override.y) for d in sweep.expand()]
+    assert starts == [(100.0, 300.0), (200.0, 300.0), (300.0, 300.0), (400.0, 300.0)]
+
+
+@pytest.mark.parametrize("sweep", [
+    {"goal": [1, 2]},
+    {"start_override.x": [100]},  # no base start_override
+    {"max_frames": []},
+    {"max_frames": {"start": 1, "stop": 5, "step": 0}},
+])
+def test_invalid_sweeps(tmp_path, sweep):
+    with pytest.raises(ValueError):
+        load_sweep(_write_sweep(tmp_path, sweep))
+
+
+def test_loaders_and_sweep_files(tmp_path):
+    path = _write_sweep(tmp_path, {"agent_params.charge_frames": [2, 4, 6]})
+    with pytest.raises(ValueError):
+        load_scenario(path)
+    assert len(load_scenarios([path])) == 3
+
+
+def test_shipped_sweeps_load():
+    for path in sorted(SWEEPS_DIR.glob("*.yaml")):
+        assert load_sweep(path).expand()
+
+
+# ---------------------------------------------------------------------------
+# Prefix cache
+# ---------------------------------------------------------------------------
+
+def test_prefix_cache_matches_run_scenario(tmp_path):
+    sweep = load_sweep(_write_sweep(tmp_path, {
+        "agent_params.redash_speed": [0.1, 0.15, 0.3],
+        "agent_params.charge_frames": [3, 5],
+    }))
+    cache = PrefixCache(interval=16)
+    for scenario_def in sweep.expand():
+        cached = cache.run(scenario_def)
+        expected = run_scenario(scenario_def)
+        assert (cached.success, cached.reason) == (expected.success, expected.reason)
+        assert cached.metrics == expected.metrics
+        assert cached.trajectory == expected.trajectory
+    assert cache.frames_reused > 0
+
+
+def test_prefix_cache_reuses_identical_run(tmp_path):
+    scenario_def = load_sweep(_write_sweep(
+        tmp_path, {"agent_params.charge_frames": [3]},
+    )).expand()[0]
+    cache = PrefixCache()
+    first = cache.run(scenario_def)
+    simulated = cache.frames_simulated
+    second = cache.run(scenario_def)
+    assert cache.frames_simulated == simulated
+    assert second.trajectory == first.trajectory
+
+
+# ---------------------------------------------------------------------------
+# Sweep runner
+# ---------------------------------------------------------------------------
+
+def test_run_sweep_parallel_matches_serial(tmp_path):
+    sweep = load_sweep(_write_sweep(tmp_path, {
+        "stage": ["hillside", "pipeworks"],
+        "agent_params.charge_frames": [2, 4],
+    }, max_frames=120))
+    serial = run_sweep(sweep)
+    parallel = run_sweep(sweep, jobs=2)
+    assert serial.rows() == parallel.rows()
+    rows = serial.rows()
+    assert rows[0]["stage"] == "hillside" and rows[0]["frames"] == 120
+    assert "velocity_profile" not in rows[0]
+    table = serial.format_table().splitlines()
+    assert table[0].split()[:3] == ["stage", "agent_params.charge_frames", "success"]
+    assert len(table) == 2 + len(rows)
+    with pytest.raises(ValueError):
+        run_sweep(sweep, jobs=0)
+
+
+def test_main_exits_nonzero_when_a_point_fails(tmp_path, capsys):
+    path = _write_sweep(tmp_path, {"agent_params.charge_frames": [2, 4]}, max_frames=30)
+    with pytest.raises(SystemExit) as exc_info:
+        main([str(path)])
+    assert exc_info.value.code == 1
+    assert "2 points: 0 passed, 2 failed" in capsys.readouterr().out
@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import math
+import weakref
+
+import numpy as np
+import pytest
+
 from speednik.constants import WALL_SENSOR_EXTENT, STANDING_HEIGHT_RADIUS
 from speednik.physics import PhysicsState, calculate_landing_speed
 from speednik.terrain import (
@@ -17,19 +23,27 @@ from speednik.terrain import (
     TOP_ONLY,
     UP,
     SensorResult,
+    TerrainPyramid,
     Tile,
+    TileGrid,
     TileLookup,
+    cast_terrain_ray,
+    cast_terrain_rays,
     find_ceiling,
     find_floor,
     find_wall_push,
     get_quadrant,
     resolve_collision,
+    terrain_pyramid,
     _sensor_cast_down,
     _sensor_cast_up,
     _sensor_cast_left,
     _sensor_cast_right,
+    _find_left_edge,
+    _find_right_edge,
     _floor_solidity_filter,
     _no_top_only_filter,
+    _resolve_fast,
 )
 
 
@@ -119,6 +133,35 @@ class TestTile:
         for row in range(8, 16):
             assert wa[row] == 0, f"row {row}"
 
+    def test_edge_tables_match_scan(self):
+        """Cached edge tables equal a direct column scan for varied profiles."""
+        profiles = [
+            [16] * 16,
+            [0] * 16,
+            list(range(1, 17)),
+            list(range(16, 0, -1)),
+            [0, 0, 5, 16, 16, 3, 0, 0, 9, 9, 0, 12, 0, 0, 1, 0],
+        ]
+        for heights in profiles:
+            t = Tile(height_array=list(heights), angle=0, solidity=FULL)
+            for row in range(TILE_SIZE):
+                solid = [col for col in range(TILE_SIZE) if heights[col] > row]
+                assert _find_left_edge(t, row) == (solid[0] if solid else -1)
+                assert _find_right_edge(t, row) == (solid[-1] if solid else -1)
+
+    def test_width_array_returns_copy(self):
+        t = flat_tile()
+        t.width_array()[0] = 0
+        assert t.width_array() == [16] * 16
+
+    def test_build_edge_tables_after_edit(self):
+        t = Tile(height_array=[0] * 16, angle=0, solidity=FULL)
+        assert _find_left_edge(t, 0) == -1
+        t.height_array[4] = 16
+        t.build_edge_tables()
+        assert _find_left_edge(t, 0) == 4
+        assert t.width_array() == [0] * 16
+
 
 # ---------------------------------------------------------------------------
 # TestGetQuadrant
@@ -811,3 +854,364 @@ class TestTwoPassQuadrantResolve:
             f"Two-pass snap should correct x to 92.0, got {state.x}. "
             "Without the fix, x stays at 100.0 and the correction is deferred one frame."
         )
+
+
+# ---------------------------------------------------------------------------
+# TileGrid
+# ---------------------------------------------------------------------------
+
+class TestTileGrid:
+    def _tiles(self):
+        slope = Tile(height_array=list(range(16)), angle=20, solidity=TOP_ONLY, tile_type=SURFACE_LOOP)
+        return {
+            (0, 0): flat_tile(),
+            (2, 1): slope,
+            (1, 1): empty_tile(solidity=NOT_SOLID),
+        }
+
+    def test_lookup_contract(self):
+        tiles = self._tiles()
+        grid = TileGrid.from_tiles(tiles)
+        assert (grid.rows, grid.cols) == (2, 3)
+        for key, tile in tiles.items():
+            assert grid(*key) is tile
+            assert grid.lookup(*key) is tile
+        assert grid(1, 0) is None
+        assert grid(-1, 0) is None
+        assert grid(0, -1) is None
+        assert grid(3, 0) is None
+        assert grid(0, 2) is None
+
+    def test_arrays_match_tiles(self):
+        grid = TileGrid.from_tiles(self._tiles())
+        assert grid.heights.shape == (2, 3, TILE_SIZE)
+        assert grid.heights.dtype == np.uint8
+        assert grid.heights[1, 2].tolist() == list(range(16))
+        assert grid.angles[1, 2] == 20
+        assert grid.solidity[1, 2] == TOP_ONLY
+        assert grid.tile_type[1, 2] == SURFACE_LOOP
+        assert grid.occupied.tolist() == [[1, 0, 0], [0, 1, 1]]
+
+    def test_edge_arrays_match_tiles(self):
+        tiles = self._tiles()
+        grid = TileGrid.from_tiles(tiles)
+        for (tx, ty), tile in tiles.items():
+            widths, left, right = tile.build_edge_tables()
+            assert grid.widths[ty, tx].tolist() == widths
+            assert grid.left_edges[ty, tx].tolist() == left
+            assert grid.right_edges[ty, tx].tolist() == right
+
+    def test_vectorized_accessors(self):
+        grid = TileGrid.from_tiles(self._tiles())
+        idx = grid.cell_index(np.array([0, 2, 1, -1, 5]), np.array([0, 1, 0, 0, 1]))
+        assert grid.column_heights(idx, np.array([3, 7, 0, 0, 0])).tolist() == [16, 7, 0, 0, 0]
+        assert grid.cell_solidity(idx).tolist() == [FULL, TOP_ONLY, NOT_SOLID, NOT_SOLID, NOT_SOLID]
+        assert grid.cell_angles(idx).tolist() == [0, 20, 0, 0, 0]
+        assert grid.cell_tile_type(idx).tolist() == [0, SURFACE_LOOP, 0, 0, 0]
+
+    def test_round_trip_from_arrays(self):
+        grid = TileGrid.from_tiles(self._tiles())
+        rebuilt = TileGrid(grid.heights, grid.angles, grid.solidity, grid.tile_type, grid.occupied)
+        assert rebuilt.tiles == self._tiles()
+
+    def test_tiles_built_lazily_and_cached(self):
+        grid = TileGrid.from_tiles(self._tiles())
+        rebuilt = TileGrid.from_tables(grid.rows, grid.cols, grid.tables)
+        assert np.shares_memory(rebuilt.heights, grid.heights)
+        assert all(cell is None for cell in rebuilt.lookup._cells)
+        tile = rebuilt(2, 1)
+        assert tile == self._tiles()[(2, 1)]
+        assert rebuilt.lookup(2, 1) is tile and rebuilt.tiles[(2, 1)] is tile
+        assert rebuilt(1, 0) is None
+        assert list(rebuilt.tiles) == [(0, 0), (1, 1), (2, 1)]
+        assert len(rebuilt.tiles) == 3
+        assert (1, 0) not in rebuilt.tiles and "x" not in rebuilt.tiles
+
+    def test_from_tables_rejects_wrong_size(self):
+        grid = TileGrid.from_tiles(self._tiles())
+        with pytest.raises(ValueError):
+            TileGrid.from_tables(grid.rows, grid.cols + 1, grid.tables)
+
+    def test_sensor_results_match_dict_lookup(self):
+        tiles = self._tiles()
+        grid = TileGrid.from_tiles(tiles)
+        dict_lookup = make_tile_lookup(tiles)
+        for y in range(-8, 40, 3):
+            for x in range(-8, 56, 3):
+                for cast in (_sensor_cast_down, _sensor_cast_up, _sensor_cast_left, _sensor_cast_right):
+                    assert cast(x, y, grid.lookup, _no_top_only_filter) == cast(
+                        x, y, dict_lookup, _no_top_only_filter
+                    )
+
+
+# ---------------------------------------------------------------------------
+# TerrainPyramid
+# ---------------------------------------------------------------------------
+
+class TestTerrainPyramid:
+    def _grid(self):
+        tiles = {(x, 20): flat_tile() for x in range(24)}
+        tiles[(5, 3)] = half_height_tile()
+        tiles[(9, 9)] = empty_tile()
+        tiles[(10, 10)] = flat_tile(solidity=NOT_SOLID)
+        return TileGrid.from_tiles(tiles, cols=30, rows=21)
+
+    def test_level_flags(self):
+        pyramid = self._grid().pyramid
+        assert [e.shape for e in pyramid.empty] == [(21, 30), (6, 8), (2, 2)]
+        assert not pyramid.empty[0][3, 5] and not pyramid.empty[0][9, 9]
+        assert pyramid.empty[0][10, 10]
+        assert not pyramid.empty[1][0, 1] and pyramid.empty[1][0, 3]
+        assert not pyramid.empty[1][2, 2]
+        assert pyramid.empty[2].tolist() == [[False, True], [False, False]]
+        assert pyramid.full[0][20, :24].all() and not pyramid.full[0][20, 24:].any()
+        assert not pyramid.full[0][3, 5]
+        # The half-height tile keeps its 4-block out of "full"; the padded
+        # edge keeps the last row of blocks out too.
+        assert not pyramid.full[1].any()
+
+    def test_span_and_region_queries(self):
+        pyramid = self._grid().pyramid
+        assert pyramid.empty_span(20, 2) == 16
+        assert pyramid.empty_span(2, 2) == 4
+        assert pyramid.empty_span(5, 3) == 0
+        assert pyramid.empty_span(4, 3) == 1
+        assert pyramid.empty_span(-1, 0) == 0
+        tx, ty = np.array([20, 2, 5, 4, -1, 99]), np.array([2, 2, 3, 3, 0, 0])
+        assert pyramid.empty_spans(tx, ty).tolist() == [16, 4, 0, 1, 0, 0]
+        assert pyramid.region_empty(0, 0, 29, 2)
+        assert not pyramid.region_empty(0, 0, 29, 3)
+        assert pyramid.region_empty(12, 0, 29, 19)
+        assert not pyramid.region_empty(6, 0, 29, 19)
+        assert pyramid.region_empty(-5, -5, -1, 40)
+        assert pyramid.region_full(0, 20, 23, 20)
+        assert not pyramid.region_full(0, 19, 23, 20)
+        assert not pyramid.region_full(0, 20, 24, 20)
+        assert not pyramid.region_full(0, 20, 3, 21)
+
+    def test_reachable_from_grid_and_lookup(self):
+        grid = self._grid()
+        assert terrain_pyramid(grid) is grid.pyramid
+        assert terrain_pyramid(grid.lookup) is grid.pyramid
+        assert terrain_pyramid(make_tile_lookup(grid.tiles)) is None
+
+    def test_lookup_does_not_keep_grid_alive(self):
+        grid = self._grid()
+        lookup = grid.lookup
+        ref = weakref.ref(grid)
+        del grid
+        assert ref() is None
+        assert terrain_pyramid(lookup) is not None
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(5)
+        heights = rng.choice([0, 16, 7], size=(19, 37, TILE_SIZE), p=[0.8, 0.15, 0.05]).astype(np.uint8)
+        heights[rng.random((19, 37)) < 0.5] = 0
+        solidity = rng.choice([FULL, TOP_ONLY, NOT_SOLID], size=(19, 37)).astype(np.uint8)
+        occupied = (rng.random((19, 37)) < 0.4).astype(np.uint8)
+        pyramid = TerrainPyramid.from_cells(heights, solidity, occupied)
+        solid = (occupied != 0) & (solidity != NOT_SOLID)
+        full = solid & (solidity == FULL) & (heights.min(axis=2) == TILE_SIZE)
+        for _ in range(200):
+            x0, y0 = rng.integers(-3, 40), rng.integers(-3, 22)
+            x1, y1 = x0 + rng.integers(0, 20), y0 + rng.integers(0, 12)
+            box = (slice(max(y0, 0), max(y1 + 1, 0)), slice(max(x0, 0), max(x1 + 1, 0)))
+            assert pyramid.region_empty(x0, y0, x1, y1) == (not solid[box].any())
+            inside = x0 >= 0 and y0 >= 0 and x1 < 37 and y1 < 19
+            assert pyramid.region_full(x0, y0, x1, y1) == (inside and full[box].all())
+
+
+class TestResolveFastPath:
+    def _grid(self):
+        tiles = {(x, 10): flat_tile(angle=2) for x in range(20)}
+        tiles[(12, 9)] = flat_tile(angle=64)
+        return TileGrid.from_tiles(tiles, rows=14)
+
+    def test_open_air(self):
+        grid = self._grid()
+        state = PhysicsState(x=40.0, y=40.0, on_ground=False, y_vel=3.0)
+        before = PhysicsState(**vars(state))
+        assert _resolve_fast(state, grid.lookup, grid.pyramid)
+        assert state == before
+        state = PhysicsState(x=40.0, y=40.0, on_ground=True, angle=5)
+        assert _resolve_fast(state, grid.lookup, grid.pyramid)
+        assert not state.on_ground and state.angle == 0
+
+    def test_flat_ground_snaps_to_tile_top(self):
+        grid = self._grid()
+        state = PhysicsState(x=40.0, y=143.5, on_ground=True, ground_speed=2.0, adhesion_miss_count=1)
+        assert _resolve_fast(state, grid.lookup, grid.pyramid)
+        assert (state.y, state.angle, state.adhesion_miss_count) == (140.0, 2, 0)
+
+    def test_falls_back_near_walls_and_edges(self):
+        grid = self._grid()
+        for x in (190.0, 315.0, 330.0):
+            state = PhysicsState(x=x, y=140.0, on_ground=True)
+            assert not _resolve_fast(state, grid.lookup, grid.pyramid)
+            assert state == PhysicsState(x=x, y=140.0, on_ground=True)
+
+    def test_matches_full_resolution(self):
+        rng = np.random.default_rng(7)
+        heights = rng.choice([0, 8, 16], size=(12, 14, 1)).repeat(TILE_SIZE, axis=2).astype(np.uint8)
+        heights[5, 3] = np.arange(TILE_SIZE)
+        solidity = rng.choice([FULL, FULL, TOP_ONLY, LRB_ONLY, NOT_SOLID], size=(12, 14)).astype(np.uint8)
+        angles = rng.choice([0, 4, 64, 128, 250], size=(12, 14)).astype(np.uint8)
+        tile_type = np.zeros((12, 14), dtype=np.uint8)
+        occupied = (rng.random((12, 14)) < 0.3).astype(np.uint8)
+        grid = TileGrid(heights, angles, solidity, tile_type, occupied)
+        plain = make_tile_lookup(grid.tiles)
+        for _ in range(3000):
+            y = rng.uniform(-40, 230)
+            if rng.random() < 0.5:
+                y = y // TILE_SIZE * TILE_SIZE - rng.choice([14.0, 20.0, 19.5, 22.0])
+            state = PhysicsState(
+                x=rng.uniform(-40, 260), y=y,
+                x_vel=rng.uniform(-8, 8), y_vel=rng.uniform(-8, 8),
+                ground_speed=rng.uniform(-12, 12),
+                angle=int(rng.choice([0, 0, 64, 128, rng.integers(256)])),
+                on_ground=bool(rng.random() < 0.7), is_rolling=bool(rng.random() < 0.3),
+                adhesion_miss_count=int(rng.integers(3)),
+            )
+            fast = PhysicsState(**vars(state))
+            resolve_collision(state, plain)
+            resolve_collision(fast, grid.lookup)
+            assert fast == state
+
+
+# ---------------------------------------------------------------------------
+# TestCastTerrainRay
+# ---------------------------------------------------------------------------
+
+class TestCastTerrainRay:
+    def test_ray_down_to_flat_ground(self):
+        lookup = make_tile_lookup({(0, 2): flat_tile(angle=3)})
+        assert cast_terrain_ray(lookup, 8.0, 16.0, 90) == (16.0, 3)
+
+    def test_ray_horizontal_no_obstacle(self):
+        lookup = make_tile_lookup({(0, 2): flat_tile()})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 0) == (128.0, 0)
+
+    def test_ray_horizontal_into_wall(self):
+        lookup = make_tile_lookup({(2, 0): flat_tile(angle=64)})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 0) == (24.0, 64)
+
+    def test_ray_left_into_wall(self):
+        lookup = make_tile_lookup({(0, 0): flat_tile(angle=192)})
+        dist, angle = cast_terrain_ray(lookup, 40.0, 8.0, 180)
+        assert abs(dist - 24.0) < 1e-9
+        assert angle == 192
+
+    def test_ray_45_degrees_down_right(self):
+        lookup = make_tile_lookup({(x, 3): flat_tile() for x in range(8)})
+        dist, _ = cast_terrain_ray(lookup, 8.0, 8.0, 45)
+        assert abs(dist - 40.0 * 2 ** 0.5) < 1e-9
+
+    def test_ray_origin_inside_solid(self):
+        lookup = make_tile_lookup({(0, 0): flat_tile(angle=7)})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 0) == (0.0, 7)
+
+    def test_ray_down_to_half_height_tile(self):
+        lookup = make_tile_lookup({(0, 1): half_height_tile(angle=5)})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 90) == (16.0, 5)
+
+    def test_ray_hits_slope_column_profile(self):
+        # Slope height at column c is c+1, so the surface above column 4 is y=11.
+        lookup = make_tile_lookup({(0, 0): slope_45_tile(angle=32)})
+        dist, angle = cast_terrain_ray(lookup, 4.5, -20.0, 90)
+        assert abs(dist - 31.0) < 1e-9
+        assert angle == 32
+        # A horizontal ray at y=12.5 first meets the column of height 4 (c=3).
+        dist, _ = cast_terrain_ray(lookup, -10.0, 12.5, 0)
+        assert abs(dist - 13.0) < 1e-9
+
+    def test_max_range_clamp(self):
+        lookup = make_tile_lookup({(0, 3): flat_tile()})
+        assert cast_terrain_ray(lookup, 8.0, 0.0, 90, max_range=32.0) == (32.0, 0)
+
+    def test_ray_up_to_ceiling(self):
+        lookup = make_tile_lookup({(0, 0): flat_tile(angle=128)})
+        dist, angle = cast_terrain_ray(lookup, 8.0, 24.0, 270)
+        assert abs(dist - 8.0) < 1e-9
+        assert angle == 128
+
+    def test_not_solid_tile_ignored(self):
+        lookup = make_tile_lookup({(0, 1): flat_tile(solidity=NOT_SOLID)})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 90) == (128.0, 0)
+
+    def test_top_only_tile_is_solid_for_rays(self):
+        lookup = make_tile_lookup({(0, 1): flat_tile(solidity=TOP_ONLY)})
+        assert cast_terrain_ray(lookup, 8.0, 8.0, 90)[0] == 8.0
+
+    def test_matches_pixel_stepping(self):
+        """Agrees with a fine sub-pixel march over the same pixel-solid test."""
+        tiles = {
+            (1, 2): slope_45_tile(angle=10),
+            (2, 2): flat_tile(angle=20),
+            (3, 1): half_height_tile(angle=30),
+            (0, 0): Tile(height_array=[0, 3, 9, 16] * 4, angle=40, solidity=FULL),
+        }
+        lookup = make_tile_lookup(tiles)
+
+        def pixel_solid(px, py):
+            tile = lookup(px // TILE_SIZE, py // TILE_SIZE)
+            if tile is None or tile.solidity == NOT_SOLID:
+                return False
+            return py % TILE_SIZE >= TILE_SIZE - tile.height_array[px % TILE_SIZE]
+
+        rng = np.random.default_rng(3)
+        for _ in range(60):
+            ox, oy = rng.uniform(-8, 72), rng.uniform(-8, 56)
+            angle = rng.uniform(0, 360)
+            dist, _ = cast_terrain_ray(lookup, ox, oy, angle, max_range=64.0)
+            dx, dy = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+            marched = 64.0
+            for k in range(64 * 32 + 1):
+                t = k / 32
+                if pixel_solid(math.floor(ox + t * dx), math.floor(oy + t * dy)):
+                    marched = t
+                    break
+            assert abs(dist - marched) <= 1 / 32 + 1e-9, (ox, oy, angle, dist, marched)
+
+
+class TestCastTerrainRays:
+    def _grid(self):
+        return TileGrid.from_tiles({
+            (1, 2): slope_45_tile(angle=10),
+            (2, 2): flat_tile(angle=20),
+            (3, 1): half_height_tile(angle=30),
+            (4, 0): flat_tile(angle=50, solidity=NOT_SOLID),
+            (0, 0): Tile(height_array=[0, 3, 9, 16] * 4, angle=40, solidity=FULL),
+        })
+
+    def test_matches_scalar(self):
+        grid = self._grid()
+        rng = np.random.default_rng(4)
+        xs = rng.uniform(-16, 96, 300)
+        ys = rng.uniform(-16, 64, 300)
+        angles = np.concatenate([rng.uniform(-180, 360, 200), np.tile([0, 90, 180, 270, 45], 20)])
+        dist, surface = cast_terrain_rays(grid, xs, ys, angles, 64.0)
+        for i in range(len(xs)):
+            assert (dist[i], surface[i]) == cast_terrain_ray(
+                grid.lookup, xs[i], ys[i], angles[i], 64.0
+            ), i
+
+    def test_pyramid_skip_matches_tile_walk(self):
+        tiles = {(x, 30): flat_tile(angle=x) for x in range(40)}
+        tiles[(17, 12)] = slope_45_tile(angle=99)
+        grid = TileGrid.from_tiles(tiles)
+        plain = make_tile_lookup(tiles)
+        rng = np.random.default_rng(6)
+        xs = np.concatenate([rng.uniform(-16, 660, 300), np.full(40, 256.0)])
+        ys = np.concatenate([rng.uniform(-16, 500, 300), np.full(40, 192.0)])
+        angles = np.concatenate([rng.uniform(0, 360, 300), np.arange(0, 360, 9)])
+        dist, surface = cast_terrain_rays(grid, xs, ys, angles, 300.0)
+        for i in range(len(xs)):
+            expected = cast_terrain_ray(plain, xs[i], ys[i], angles[i], 300.0)
+            assert cast_terrain_ray(grid.lookup, xs[i], ys[i], angles[i], 300.0) == expected, i
+            assert (dist[i], surface[i]) == expected, i
+
+    def test_broadcasts_angles_over_one_origin(self):
+        grid = self._grid()
+        dist, surface = cast_terrain_rays(grid, 8.0, 8.0, [0, 90, 180, 270])
+        assert dist.shape == surface.shape == (4,)
+        assert dist.dtype == np.float64 and surface.dtype == np.int64
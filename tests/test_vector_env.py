@@ -0,0 +1,175 @@
+"""Tests for speednik/vector_env.py — native vector environment."""
+
+from __future__ import annotations
+
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium.vector import AutoresetMode
+
+import speednik.env_registration  # noqa: F401
+from speednik.agents.actions import ACTION_NOOP, ACTION_RIGHT
+from speednik.env import SpeednikEnv
+from speednik.observation import OBS_DIM, OBS_DIM_BASE
+from speednik.vector_env import INFO_KEYS, SpeednikVectorEnv
+
+
+# ---------------------------------------------------------------------------
+# Spaces and construction
+# ---------------------------------------------------------------------------
+
+def test_spaces():
+    envs = SpeednikVectorEnv(num_envs=3)
+    assert envs.single_observation_space.shape == (OBS_DIM,)
+    assert envs.observation_space.shape == (3, OBS_DIM)
+    assert envs.action_space.shape == (3,)
+
+
+def test_no_raycast_obs_dim():
+    envs = SpeednikVectorEnv(num_envs=2, use_raycasts=False)
+    obs, _ = envs.reset(seed=0)
+    assert obs.shape == (2, OBS_DIM_BASE)
+
+
+def test_invalid_num_envs():
+    with pytest.raises(ValueError):
+        SpeednikVectorEnv(num_envs=0)
+
+
+def test_make_vec_uses_vector_entry_point():
+    envs = gym.make_vec("speednik/Hillside-v0", num_envs=4)
+    assert isinstance(envs.unwrapped, SpeednikVectorEnv)
+    assert envs.unwrapped.max_steps == 3600
+    nr = gym.make_vec("speednik/Pipeworks-NoRay-v0", num_envs=2)
+    assert nr.single_observation_space.shape == (OBS_DIM_BASE,)
+
+
+# ---------------------------------------------------------------------------
+# Equivalence with SpeednikEnv
+# ---------------------------------------------------------------------------
+
+def test_matches_single_env():
+    n = 3
+    envs = SpeednikVectorEnv(num_envs=n)
+    singles = [SpeednikEnv() for _ in range(n)]
+    obs, info = envs.reset(seed=0)
+    for i, env in enumerate(singles):
+        single_obs, single_info = env.reset(seed=0)
+        np.testing.assert_array_equal(obs[i], single_obs)
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        actions = rng.integers(0, envs.single_action_space.n, size=n)
+        obs, rewards, term, trunc, info = envs.step(actions)
+        for i, env in enumerate(singles):
+            s_obs, s_rew, s_term, s_trunc, s_info = env.step(int(actions[i]))
+            np.testing.assert_array_equal(obs[i], s_obs)
+            assert rewards[i] == s_rew
+            assert term[i] == s_term and trunc[i] == s_trunc
+            for key in INFO_KEYS:
+                assert info[key][i] == s_info[key]
+
+
+def test_frame_skip_matches_single_env():
+    n = 2
+    envs = SpeednikVectorEnv(num_envs=n, max_steps=50, frame_skip=3)
+    singles = [SpeednikEnv(max_steps=50, frame_skip=3) for _ in range(n)]
+    envs.reset(seed=0)
+    for env in singles:
+        env.reset(seed=0)
+    rng = np.random.default_rng(1)
+    for _ in range(40):  # crosses a truncation and autoreset
+        actions = rng.integers(0, envs.single_action_space.n, size=n)
+        obs, rewards, term, trunc, info = envs.step(actions)
+        for i, env in enumerate(singles):
+            if env._step_count >= 50:  # NEXT_STEP autoreset consumes this step
+                env.reset(seed=0)
+                continue
+            s_obs, s_rew, s_term, s_trunc, s_info = env.step(int(actions[i]))
+            np.testing.assert_array_equal(obs[i], s_obs)
+            assert rewards[i] == s_rew
+            assert term[i] == s_term and trunc[i] == s_trunc
+            assert info["frame"][i] == s_info["frame"]
+
+
+def test_make_vec_frame_skip_variant():
+    envs = gym.make_vec("speednik/Pipeworks-FrameSkip4-v0", num_envs=2)
+    assert envs.unwrapped.frame_skip == 4
+    assert envs.unwrapped.max_steps == 5400
+
+
+def test_grid_obs_mode_matches_single_env():
+    envs = gym.make_vec("speednik/Hillside-Grid8-v0", num_envs=2)
+    assert envs.single_observation_space.shape == (5, 28, 32)
+    env = gym.make("speednik/Hillside-Grid8-v0")
+    obs, _ = envs.reset(seed=0)
+    s_obs, _ = env.reset(seed=0)
+    assert obs.shape == (2, 5, 28, 32)
+    np.testing.assert_array_equal(obs[0], s_obs)
+    for _ in range(30):
+        obs, *_ = envs.step(np.array([ACTION_RIGHT, ACTION_RIGHT]))
+        s_obs, *_ = env.step(ACTION_RIGHT)
+    np.testing.assert_array_equal(obs[1], s_obs)
+
+
+def test_invalid_obs_mode():
+    with pytest.raises(ValueError):
+        SpeednikVectorEnv(num_envs=1, obs_mode="pixels")
+
+
+def test_info_has_masks():
+    envs = SpeednikVectorEnv(num_envs=2)
+    _, info = envs.reset()
+    for key in INFO_KEYS:
+        assert info[key].shape == (2,)
+        assert info[f"_{key}"].all()
+
+
+def test_copy_false_reuses_buffer():
+    envs = SpeednikVectorEnv(num_envs=2, copy=False)
+    obs0, _ = envs.reset()
+    obs1, *_ = envs.step(np.full(2, ACTION_RIGHT))
+    assert obs0 is obs1
+
+
+# ---------------------------------------------------------------------------
+# Autoreset
+# ---------------------------------------------------------------------------
+
+def test_next_step_autoreset():
+    envs = SpeednikVectorEnv(num_envs=2, max_steps=5)
+    envs.reset()
+    actions = np.full(2, ACTION_RIGHT)
+    for _ in range(4):
+        _, _, _, trunc, _ = envs.step(actions)
+        assert not trunc.any()
+    _, _, _, trunc, info = envs.step(actions)
+    assert trunc.all()
+    assert (info["frame"] == 5).all()
+    obs, rewards, term, trunc, info = envs.step(actions)
+    assert not (term | trunc).any()
+    assert (rewards == 0.0).all()
+    assert (info["frame"] == 0).all()
+
+
+def test_same_step_autoreset():
+    envs = SpeednikVectorEnv(
+        num_envs=2, max_steps=3, autoreset_mode=AutoresetMode.SAME_STEP,
+    )
+    envs.reset()
+    actions = np.full(2, ACTION_NOOP)
+    envs.step(actions)
+    envs.step(actions)
+    obs, _, _, trunc, info = envs.step(actions)
+    assert trunc.all()
+    assert info["_final_obs"].all()
+    assert (info["final_info"]["frame"] == 3).all()
+    assert (info["frame"] == 0).all()
+
+
+def test_partial_reset_mask():
+    envs = SpeednikVectorEnv(num_envs=3)
+    envs.reset()
+    for _ in range(10):
+        envs.step(np.full(3, ACTION_RIGHT))
+    _, info = envs.reset(options={"reset_mask": np.array([True, False, True])})
+    assert info["frame"].tolist() == [0, 10, 0]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark SharedMemoryVectorEnv scaling from one worker to all cores.
+
+Steps a fixed number of environments with random actions and reports
+env-steps per second for each worker count, alongside the in-process
+SpeednikVectorEnv as the single-core reference.
+
+Usage:
+    python tools/bench_vector_env.py [--envs N] [--steps N] [--workers 1 2 4 ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from speednik.shm_vector_env import SharedMemoryVectorEnv  # noqa: E402
+from speednik.vector_env import SpeednikVectorEnv  # noqa: E402
+
+
+def _default_workers() -> list[int]:
+    cores = os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    counts.append(cores)
+    return counts
+
+
+def _time_env(envs, steps: int, seed: int) -> float:
+    """Return env-steps/s over *steps* vector steps after a short warmup."""
+    rng = np.random.default_rng(seed)
+    envs.reset(seed=seed)
+    actions = rng.integers(0, envs.single_action_space.n, size=(steps + 10, envs.num_envs))
+    for a in actions[:10]:
+        envs.step(a)
+    start = time.perf_counter()
+    for a in actions[10:]:
+        envs.step(a)
+    elapsed = time.perf_counter() - start
+    return envs.num_envs * steps / elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stage", default="hillside")
+    parser.add_argument("--envs", type=int, default=64, help="Total environments (default: 64)")
+    parser.add_argument("--steps", type=int, default=200, help="Vector steps per run (default: 200)")
+    parser.add_argument(
+        "--workers", type=int, nargs="*", default=None,
+        help="Worker counts to try (default: powers of two up to all cores)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    workers = args.workers or _default_workers()
+    if any(w < 1 for w in workers):
+        parser.error("worker counts must be positive")
+
+    envs = SpeednikVectorEnv(num_envs=args.envs, stage=args.stage)
+    baseline = _time_env(envs, args.steps, args.seed)
+    envs.close()
+    print(f"{'in-process':>12}  {baseline:>12,.0f} steps/s  1.00x")
+
+    for w in workers:
+        envs = SharedMemoryVectorEnv(num_envs=args.envs, stage=args.stage, num_workers=w)
+        try:
+            rate = _time_env(envs, args.steps, args.seed)
+        finally:
+            envs.close()
+        print(f"{f'{w} workers':>12}  {rate:>12,.0f} steps/s  {rate / baseline:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Compile stage terrain JSON into the packed binary format.
+
+Writes tiles.bin next to each stage's tile_map.json. load_stage memory-maps
+the compiled file whenever it is at least as new as its JSON sources, and
+falls back to parsing JSON otherwise.
+
+Usage:
+    python tools/compile_stages.py [stage ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from speednik.level import _DATA_DIRS, compile_stage  # noqa: E402
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "stages", nargs="*", metavar="stage",
+        help=f"Stages to compile (default: all of {', '.join(sorted(_DATA_DIRS))})",
+    )
+    args = parser.parse_args(argv)
+
+    stages = args.stages or sorted(_DATA_DIRS)
+    unknown = [s for s in stages if s not in _DATA_DIRS]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    for stage in stages:
+        path = compile_stage(stage)
+        print(f"{stage}: {path} ({path.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,7 @@
 #   2. Default env_id changed to "speednik/Hillside-v0"
 #   3. make_env wrapper stack: NormalizeObservation, NormalizeReward, clip transforms
 #   4. Model checkpoint saved at end of training
+#   5. Native SpeednikVectorEnv via gym.make_vec (SyncVectorEnv only for video capture)
 import os
 import random
 import time
@@ -50,6 +51,8 @@ class Args:
     """the learning rate of the optimizer"""
     num_envs: int = 4
     """the number of parallel game environments"""
+    native_vector_env: bool = True
+    """if toggled, step all envs in one SpeednikVectorEnv instead of a SyncVectorEnv"""
     num_steps: int = 128
     """the number of steps to run in each environment per policy rollout"""
     anneal_lr: bool = True
@@ -106,6 +109,21 @@ def make_env(env_id, idx, capture_video, run_name):
     return thunk
 
 
+def make_vector_env(env_id, num_envs):
+    envs = gym.make_vec(
+        env_id,
+        num_envs=num_envs,
+        vectorization_mode="vector_entry_point",
+        autoreset_mode=gym.vector.AutoresetMode.SAME_STEP,
+    )
+    envs = gym.wrappers.vector.RecordEpisodeStatistics(envs)
+    envs = gym.wrappers.vector.NormalizeObservation(envs)
+    envs = gym.wrappers.vector.TransformObservation(envs, lambda obs: np.clip(obs, -10, 10))
+    envs = gym.wrappers.vector.NormalizeReward(envs, gamma=0.99)
+    envs = gym.wrappers.vector.TransformReward(envs, lambda r: np.clip(r, -10, 10))
+    return envs
+
+
 def layer_init(layer, std=np.sqrt(2), bias_const=0.0):
     torch.nn.init.orthogonal_(layer.weight, std)
     torch.nn.init.constant_(layer.bias, bias_const)
@@ -174,9 +192,12 @@ if __name__ == "__main__":
     device = torch.device("cuda" if torch.cuda.is_available() and args.cuda else "cpu")
 
     # env setup
-    envs = gym.vector.SyncVectorEnv(
-        [make_env(args.env_id, i, args.capture_video, run_name) for i in range(args.num_envs)],
-    )
+    if args.native_vector_env and not args.capture_video:
+        envs = make_vector_env(args.env_id, args.num_envs)
+    else:
+        envs = gym.vector.SyncVectorEnv(
+            [make_env(args.env_id, i, args.capture_video, run_name) for i in range(args.num_envs)],
+        )
     assert isinstance(envs.single_action_space, gym.spaces.Discrete), "only discrete action space is supported"
 
     agent = Agent(envs).to(device)
@@ -222,7 +243,12 @@ if __name__ == "__main__":
             rewards[step] = torch.tensor(reward).to(device).view(-1)
             next_obs, next_done = torch.Tensor(next_obs).to(device), torch.Tensor(next_done).to(device)
 
-            if "final_info" in infos:
+            if "_episode" in infos:
+                for i in np.flatnonzero(infos["_episode"]):
+                    print(f"global_step={global_step}, episodic_return={infos['episode']['r'][i]}")
+                    writer.add_scalar("charts/episodic_return", infos["episode"]["r"][i], global_step)
+                    writer.add_scalar("charts/episodic_length", infos["episode"]["l"][i], global_step)
+            elif "final_info" in infos:
                 for info in infos["final_info"]:
                     if info and "episode" in info:
                         print(f"global_step={global_step}, episodic_return={info['episode']['r']}")